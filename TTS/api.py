@@ -6,7 +6,6 @@ from typing import Union
 import numpy as np
 from torch import nn
 
-from TTS.utils.audio.numpy_transforms import save_wav
 from TTS.utils.manage import ModelManager
 from TTS.utils.synthesizer import Synthesizer
 from TTS.config import load_config
@@ -375,6 +374,8 @@ class TTS(nn.Module):
                 Output file path. Defaults to "output.wav".
         """
         wav = self.voice_conversion(source_wav=source_wav, target_wav=target_wav)
+        from TTS.utils.audio.numpy_transforms import save_wav  # pylint: disable=import-outside-toplevel
+
         save_wav(wav=wav, path=file_path, sample_rate=self.voice_converter.vc_config.audio.output_sample_rate)
         return file_path
 
@@ -455,4 +456,6 @@ class TTS(nn.Module):
         wav = self.tts_with_vc(
             text=text, language=language, speaker_wav=speaker_wav, speaker=speaker, split_sentences=split_sentences
         )
+        from TTS.utils.audio.numpy_transforms import save_wav  # pylint: disable=import-outside-toplevel
+
         save_wav(wav=wav, path=file_path, sample_rate=self.voice_converter.vc_config.audio.output_sample_rate)
@@ -0,0 +1,90 @@
+"""Measure the dataloader throughput of the packed F0 and energy caches"""
+import argparse
+import os
+import shutil
+import time
+from argparse import RawTextHelpFormatter
+
+import numpy as np
+import torch
+from torch.utils.data import DataLoader, Dataset
+
+from TTS.config import load_config
+from TTS.tts.datasets import load_tts_samples
+from TTS.tts.datasets.dataset import EnergyDataset, F0Dataset
+from TTS.utils.audio import AudioProcessor
+
+
+class NpyFileDataset(Dataset):
+    """Reads the arrays from one `.npy` file per sample like the former cache format."""
+
+    def __init__(self, files):
+        self.files = files
+
+    def __getitem__(self, idx):
+        return torch.from_numpy(np.load(self.files[idx]))
+
+    def __len__(self):
+        return len(self.files)
+
+
+def run_epoch(name, dataset, batch_size, num_workers, collate_fn):
+    loader = DataLoader(dataset, batch_size=batch_size, shuffle=True, num_workers=num_workers, collate_fn=collate_fn)
+    start_time = time.time()
+    for _ in loader:
+        pass
+    process_time = time.time() - start_time
+    print(f" > {name}: {process_time:.2f}s | {len(dataset) / process_time:.1f} samples/s")
+
+
+def main():
+    # pylint: disable=bad-option-value
+    parser = argparse.ArgumentParser(
+        description="""Measure the dataloader throughput of the packed F0 or energy cache.\n\n"""
+        """The cold epoch computes the features and appends them to an empty cache, the warm epochs read them back """
+        """from the packed cache and from one `.npy` file per sample as the former cache format did. Drop the OS """
+        """page cache before the run (`echo 3 > /proc/sys/vm/drop_caches`) to measure the reads from disk.\n\n"""
+        """
+    Example runs:
+
+    python TTS/bin/benchmark_feature_cache.py --config_path config.json --cache_path /tmp/f0_cache
+    python TTS/bin/benchmark_feature_cache.py --config_path config.json --cache_path /tmp/energy_cache --feature energy --num_workers 4
+    """,
+        formatter_class=RawTextHelpFormatter,
+    )
+    parser.add_argument("--config_path", type=str, help="Path to dataset config file.", required=True)
+    parser.add_argument("--cache_path", type=str, help="Empty folder for the benchmark caches.", required=True)
+    parser.add_argument("--feature", type=str, choices=["pitch", "energy"], help="Cached feature.", default="pitch")
+    parser.add_argument("--batch_size", type=int, help="Batch size of the dataloader.", default=32)
+    parser.add_argument("--num_workers", type=int, help="Number of dataloader workers.", default=0)
+    args = parser.parse_args()
+
+    c = load_config(args.config_path)
+    samples, _ = load_tts_samples(c.datasets, eval_split=False)
+    print(f" > Number of samples: {len(samples)}")
+    ap = AudioProcessor.init_from_config(c)
+
+    if os.path.exists(args.cache_path):
+        shutil.rmtree(args.cache_path)
+    os.makedirs(args.cache_path)
+    dataset_class = F0Dataset if args.feature == "pitch" else EnergyDataset
+    # an existing cache folder skips the precomputation, so the first epoch computes the features
+    kwargs = {"normalize_f0": False} if args.feature == "pitch" else {"normalize_energy": False}
+    dataset = dataset_class(samples, ap, cache_path=args.cache_path, **kwargs)
+    run_epoch("cold, computing", dataset, args.batch_size, args.num_workers, dataset.collate_fn)
+
+    dataset = dataset_class(samples, ap, cache_path=args.cache_path, **kwargs)
+    run_epoch("warm, packed cache", dataset, args.batch_size, args.num_workers, dataset.collate_fn)
+
+    # export the packed cache to the former one file per sample format
+    npy_path = os.path.join(args.cache_path, "npy")
+    os.makedirs(npy_path)
+    files = []
+    for idx, key in enumerate(dataset.cache.keys()):
+        files.append(os.path.join(npy_path, f"{idx}.npy"))
+        np.save(files[-1], dataset.cache.get(key))
+    run_epoch("warm, per-sample files", NpyFileDataset(files), args.batch_size, args.num_workers, list)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Measure the import time of the 🐸TTS entry points with `python -X importtime`"""
+import argparse
+import statistics
+import subprocess
+import sys
+from argparse import RawTextHelpFormatter
+from typing import Dict, List, Tuple
+
+# modules that should only be imported once a model needs them
+HEAVY_MODULES = ["inflect", "gruut", "pypinyin", "jamo", "librosa", "matplotlib", "pandas", "pysbd"]
+
+
+def get_import_times(statement: str) -> Dict[str, Tuple[int, int]]:
+    """Run the statement in a fresh interpreter and return the import times of all the modules it loads.
+
+    Args:
+        statement (str): Python code to run, e.g. `import TTS.api`.
+
+    Returns:
+        Dict[str, Tuple[int, int]]: self and cumulative import time in microseconds keyed by module name.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True, check=True
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, cumulative_time, module_name = line[len("import time:") :].split("|")
+        import_times[module_name.strip()] = (int(self_time), int(cumulative_time))
+    return import_times
+
+
+def get_slowest_imports(import_times: Dict[str, Tuple[int, int]], num_imports: int) -> List[Tuple[str, int]]:
+    """Return the top-level packages that take the most time to import themselves."""
+    package_times = {}
+    for module_name, (self_time, _) in import_times.items():
+        package = module_name.split(".")[0]
+        package_times[package] = package_times.get(package, 0) + self_time
+    return sorted(package_times.items(), key=lambda item: item[1], reverse=True)[:num_imports]
+
+
+def main():
+    # pylint: disable=bad-option-value
+    parser = argparse.ArgumentParser(
+        description="""Measure the import time of the 🐸TTS entry points.\n\n"""
+        """
+    Each module is imported in a fresh interpreter with `python -X importtime`. The script exits with an error when
+    an import takes longer than `--max_time` or loads one of the `--heavy_modules`, so it can be used as a regression
+    check.
+
+    Example runs:
+
+    python TTS/bin/benchmark_import_time.py
+    python TTS/bin/benchmark_import_time.py --modules TTS.api TTS.utils.synthesizer --num_runs 5 --max_time 3
+    """,
+        formatter_class=RawTextHelpFormatter,
+    )
+    parser.add_argument(
+        "--modules",
+        type=str,
+        nargs="+",
+        help="Modules to import.",
+        default=["TTS.api", "TTS.utils.synthesizer", "TTS.bin.synthesize", "TTS.tts.utils.text.cleaners"],
+    )
+    parser.add_argument("--num_runs", type=int, help="Number of runs averaged for each module.", default=3)
+    parser.add_argument("--num_slowest", type=int, help="Number of the slowest packages to report.", default=5)
+    parser.add_argument(
+        "--heavy_modules",
+        type=str,
+        nargs="*",
+        help="Packages that must not be imported by the modules.",
+        default=HEAVY_MODULES,
+    )
+    parser.add_argument("--max_time", type=float, help="Maximum import time in seconds.", default=None)
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        times = []
+        for _ in range(args.num_runs):
+            import_times = get_import_times(f"import {module}")
+            times.append(import_times[module][1] / 1e6)
+        import_time = statistics.median(times)
+        print(f" > {module} | Import time: {import_time:.3f}s")
+        for package, self_time in get_slowest_imports(import_times, args.num_slowest):
+            print(f"   | {package}: {self_time / 1e6:.3f}s")
+
+        heavy_modules = [name for name in args.heavy_modules if name in import_times]
+        if heavy_modules:
+            print(f" [!] {module} imports {', '.join(heavy_modules)}")
+            failed = True
+        if args.max_time is not None and import_time > args.max_time:
+            print(f" [!] {module} takes longer than {args.max_time}s to import")
+            failed = True
+    sys.exit(int(failed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Compare the speed of the monotonic alignment search backends"""
+import argparse
+import time
+from argparse import RawTextHelpFormatter
+
+import torch
+
+from TTS.tts.utils.helpers import CYTHON, NUMBA, maximum_path, sequence_mask
+
+
+def get_inputs(batch_size: int, encoder_length: int, decoder_length: int, device: str):
+    """Return random scores and the attention mask of a batch with random lengths up to the given ones."""
+    value = torch.randn(batch_size, encoder_length, decoder_length, device=device)
+    x_lengths = torch.randint(encoder_length // 2, encoder_length + 1, (batch_size,), device=device)
+    y_lengths = torch.randint(decoder_length // 2, decoder_length + 1, (batch_size,), device=device)
+    x_lengths[0], y_lengths[0] = encoder_length, decoder_length
+    y_lengths = torch.maximum(x_lengths, y_lengths)
+    mask = sequence_mask(x_lengths, encoder_length)[:, :, None] * sequence_mask(y_lengths, decoder_length)[:, None]
+    return value, mask.float()
+
+
+def run(backend: str, value: torch.Tensor, mask: torch.Tensor, num_runs: int) -> float:
+    """Return the mean time of a call in seconds."""
+    start_time = time.time()
+    for _ in range(num_runs):
+        maximum_path(value, mask, backend)
+    if value.is_cuda:
+        torch.cuda.synchronize()
+    return (time.time() - start_time) / num_runs
+
+
+def main():
+    # pylint: disable=bad-option-value
+    parser = argparse.ArgumentParser(
+        description="""Compare the speed of the monotonic alignment search backends.\n\n"""
+        """
+    Example runs:
+
+    python TTS/bin/benchmark_mas.py --batch_sizes 1 16 64 --lengths 50x200 150x800
+    python TTS/bin/benchmark_mas.py --backends numba torch --use_cuda
+    """,
+        formatter_class=RawTextHelpFormatter,
+    )
+    available_backends = [backend for backend, ok in [("cython", CYTHON), ("numba", NUMBA)] if ok] + ["torch", "numpy"]
+    parser.add_argument("--backends", type=str, nargs="+", help="Backends to compare.", default=available_backends)
+    parser.add_argument("--batch_sizes", type=int, nargs="+", help="Batch sizes.", default=[1, 16, 64])
+    parser.add_argument(
+        "--lengths",
+        type=str,
+        nargs="+",
+        help="Maximum encoder and decoder lengths as `<encoder_length>x<decoder_length>`.",
+        default=["50x200", "150x800"],
+    )
+    parser.add_argument("--num_runs", type=int, help="Number of runs averaged for each setting.", default=5)
+    parser.add_argument("--use_cuda", action="store_true", help="Run on the GPU.")
+    args = parser.parse_args()
+
+    device = "cuda" if args.use_cuda else "cpu"
+    for lengths in args.lengths:
+        encoder_length, decoder_length = [int(length) for length in lengths.split("x")]
+        for batch_size in args.batch_sizes:
+            value, mask = get_inputs(batch_size, encoder_length, decoder_length, device)
+            reference = None
+            for backend in args.backends:
+                # warm up, it also compiles the numba kernel
+                path = maximum_path(value, mask, backend)
+                if reference is None:
+                    reference = path
+                process_time = run(backend, value, mask, args.num_runs)
+                print(
+                    f" > T_en: {encoder_length} | T_de: {decoder_length} | Batch size: {batch_size}"
+                    f" | Backend: {backend} | Time: {process_time * 1000:.2f}ms"
+                    f" | Same path: {torch.equal(path, reference)}"
+                )
+
+
+if __name__ == "__main__":
+    main()
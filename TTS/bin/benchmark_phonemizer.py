@@ -0,0 +1,76 @@
+"""Compare the throughput of the espeak phonemizer backends"""
+import argparse
+import time
+from argparse import RawTextHelpFormatter
+
+from TTS.tts.utils.text.phonemizers.espeak_wrapper import ESpeak, get_espeak_lib
+
+
+def load_texts(metadata_path: str, max_lines: int):
+    texts = []
+    with open(metadata_path, "r", encoding="utf-8") as f:
+        for line in f:
+            cols = line.rstrip("\n").split("|")
+            # LJSpeech format: id|text|normalized text
+            texts.append(cols[2] if len(cols) > 2 else cols[-1])
+            if max_lines and len(texts) >= max_lines:
+                break
+    return texts
+
+
+def run(name: str, phonemizer: ESpeak, texts, num_workers: int = 0):
+    start_time = time.time()
+    phonemes = phonemizer.phonemize_batch(texts, num_workers=num_workers)
+    process_time = time.time() - start_time
+    print(f" > {name}: {process_time:.2f}s | {len(texts) / process_time:.1f} lines/s")
+    return phonemes
+
+
+def main():
+    # pylint: disable=bad-option-value
+    parser = argparse.ArgumentParser(
+        description="""Compare the throughput of the espeak executable and the in-process libespeak-ng backends and """
+        """check that they give the same phonemes.\n\n"""
+        """
+    Example runs:
+
+    python TTS/bin/benchmark_phonemizer.py --metadata_path /data/LJSpeech-1.1/metadata.csv
+    python TTS/bin/benchmark_phonemizer.py --metadata_path /data/LJSpeech-1.1/metadata.csv --num_workers 8
+    """,
+        formatter_class=RawTextHelpFormatter,
+    )
+    parser.add_argument(
+        "--metadata_path",
+        type=str,
+        help="Path to the LJSpeech metadata.csv.",
+        default="tests/data/ljspeech/metadata.csv",
+    )
+    parser.add_argument("--language", type=str, help="espeak language code.", default="en-us")
+    parser.add_argument("--max_lines", type=int, help="Maximum number of lines to phonemize. 0 for all.", default=0)
+    parser.add_argument("--num_workers", type=int, help="Number of worker processes of the pool.", default=0)
+    args = parser.parse_args()
+
+    texts = load_texts(args.metadata_path, args.max_lines)
+    print(f" > Number of lines: {len(texts)}")
+
+    exe_phonemes = run("espeak-ng executable", ESpeak(args.language, use_lib=False), texts)
+    if get_espeak_lib() is None:
+        print(" [!] libespeak-ng not found, set PHONEMIZER_ESPEAK_LIBRARY to its path.")
+        return
+    lib_phonemes = run("libespeak-ng", ESpeak(args.language, use_lib=True), texts)
+    if args.num_workers > 1:
+        lib_phonemes = run(
+            f"libespeak-ng with {args.num_workers} workers",
+            ESpeak(args.language, use_lib=True),
+            texts,
+            num_workers=args.num_workers,
+        )
+
+    mismatches = [(text, a, b) for text, a, b in zip(texts, exe_phonemes, lib_phonemes) if a != b]
+    print(f" > Mismatches: {len(mismatches)}")
+    for text, exe_ph, lib_ph in mismatches[:10]:
+        print(f"   | > {text}\n   |   executable: {exe_ph}\n   |   library:    {lib_ph}")
+
+
+if __name__ == "__main__":
+    main()
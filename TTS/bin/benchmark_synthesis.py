@@ -0,0 +1,90 @@
+"""Compare the real-time factor of per-sentence and batched synthesis"""
+import argparse
+import time
+from argparse import RawTextHelpFormatter
+
+import torch
+
+from TTS.utils.synthesizer import Synthesizer
+
+DEFAULT_TEXT = (
+    "The quick brown fox jumps over the lazy dog. "
+    "Batched inference runs many sentences through the model at once. "
+    "Short one. "
+    "This sentence is a bit longer than the others so that the batch needs some padding to be built. "
+    "How fast is it? "
+    "Let's find out by measuring the real-time factor of both synthesis modes."
+)
+
+
+def run(synthesizer: Synthesizer, text: str, batch_size: int, speaker_name: str, language_name: str):
+    """Synthesize the text and return the processing time and the audio duration in seconds.
+
+    A batch size of 1 runs the per-sentence loop of `Synthesizer.tts()`, larger ones its batched inference. The
+    audio duration includes the pauses `Synthesizer.tts()` adds between the sentences in both cases.
+    """
+    start_time = time.time()
+    wav = synthesizer.tts(text, speaker_name=speaker_name, language_name=language_name, batch_size=batch_size)
+    if synthesizer.use_cuda:
+        torch.cuda.synchronize()
+    return time.time() - start_time, len(wav) / synthesizer.output_sample_rate
+
+
+def main():
+    # pylint: disable=bad-option-value
+    parser = argparse.ArgumentParser(
+        description="""Compare the real-time factor of per-sentence and batched synthesis.\n\n"""
+        """
+    Example runs:
+
+    python TTS/bin/benchmark_synthesis.py --model_path model.pth --config_path config.json --batch_sizes 1 4 16
+    python TTS/bin/benchmark_synthesis.py --model_path model.pth --config_path config.json --text_file texts.txt
+    """,
+        formatter_class=RawTextHelpFormatter,
+    )
+    parser.add_argument("--model_path", type=str, help="Path to the TTS model checkpoint.", required=True)
+    parser.add_argument("--config_path", type=str, help="Path to the TTS model config.", required=True)
+    parser.add_argument("--vocoder_path", type=str, help="Path to the vocoder checkpoint.", default="")
+    parser.add_argument("--vocoder_config_path", type=str, help="Path to the vocoder config.", default="")
+    parser.add_argument("--text_file", type=str, help="Text file with the input text.", default=None)
+    parser.add_argument("--speaker_idx", type=str, help="Speaker name for multi-speaker models.", default="")
+    parser.add_argument("--language_idx", type=str, help="Language name for multi-lingual models.", default="")
+    parser.add_argument(
+        "--batch_sizes", type=int, nargs="+", help="Batch sizes to compare. 1 is per-sentence.", default=[1, 4, 8]
+    )
+    parser.add_argument("--num_runs", type=int, help="Number of runs averaged for each batch size.", default=3)
+    parser.add_argument("--use_cuda", action="store_true", help="Run the models on the GPU.")
+    args = parser.parse_args()
+
+    synthesizer = Synthesizer(
+        tts_checkpoint=args.model_path,
+        tts_config_path=args.config_path,
+        vocoder_checkpoint=args.vocoder_path,
+        vocoder_config=args.vocoder_config_path,
+        use_cuda=args.use_cuda,
+    )
+
+    text = DEFAULT_TEXT
+    if args.text_file:
+        with open(args.text_file, "r", encoding="utf-8") as f:
+            text = f.read()
+    sentences = synthesizer.split_into_sentences(text)
+    print(f" > Number of sentences: {len(sentences)}")
+
+    # warm up
+    run(synthesizer, sentences[0], 1, args.speaker_idx, args.language_idx)
+
+    for batch_size in args.batch_sizes:
+        process_time = audio_time = 0
+        for _ in range(args.num_runs):
+            run_process_time, run_audio_time = run(synthesizer, text, batch_size, args.speaker_idx, args.language_idx)
+            process_time += run_process_time
+            audio_time += run_audio_time
+        print(
+            f" > Batch size: {batch_size} | Processing time: {process_time / args.num_runs:.3f}s"
+            f" | Real-time factor: {process_time / audio_time:.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Compare the latency and the real-time factor of full-utterance and streaming GAN vocoding"""
+import argparse
+import time
+from argparse import RawTextHelpFormatter
+
+import torch
+
+from TTS.config import load_config
+from TTS.vocoder.configs import FullbandMelganConfig, HifiganConfig, MelganConfig, MultibandMelganConfig
+from TTS.vocoder.models import setup_generator, setup_model
+from TTS.vocoder.utils.streaming import StreamingVocoder, measure_receptive_field
+
+CONFIGS = {
+    "hifigan": HifiganConfig,
+    "melgan": MelganConfig,
+    "multiband_melgan": MultibandMelganConfig,
+    "fullband_melgan": FullbandMelganConfig,
+}
+
+
+def sync(use_cuda: bool):
+    if use_cuda:
+        torch.cuda.synchronize()
+
+
+def run_full(generator, mel: torch.Tensor, use_cuda: bool):
+    """Vocode the whole melspectrogram and return the output and the processing time."""
+    start_time = time.time()
+    with torch.no_grad():
+        wav = generator.inference(mel)
+    sync(use_cuda)
+    return wav, time.time() - start_time
+
+
+def run_stream(vocoder: StreamingVocoder, mel: torch.Tensor, use_cuda: bool):
+    """Vocode the melspectrogram chunk by chunk and return the output, the first chunk latency and the processing
+    time."""
+    start_time = time.time()
+    first_chunk_time = None
+    chunks = []
+    for chunk in vocoder.stream(mel):
+        sync(use_cuda)
+        if first_chunk_time is None:
+            first_chunk_time = time.time() - start_time
+        chunks.append(chunk)
+    return torch.cat(chunks, dim=-1), first_chunk_time, time.time() - start_time
+
+
+def main():
+    # pylint: disable=bad-option-value
+    parser = argparse.ArgumentParser(
+        description="""Compare the latency and the real-time factor of full-utterance and streaming vocoding.\n\n"""
+        """
+    Example runs:
+
+    # randomly initialized generators of the default configs
+    python TTS/bin/benchmark_vocoder_streaming.py --models hifigan multiband_melgan --chunk_sizes 16 32 64
+
+    # a trained vocoder
+    python TTS/bin/benchmark_vocoder_streaming.py --vocoder_path model.pth --vocoder_config_path config.json
+    """,
+        formatter_class=RawTextHelpFormatter,
+    )
+    parser.add_argument("--vocoder_path", type=str, help="Path to the vocoder checkpoint.", default=None)
+    parser.add_argument("--vocoder_config_path", type=str, help="Path to the vocoder config.", default=None)
+    parser.add_argument(
+        "--models",
+        type=str,
+        nargs="+",
+        help="Randomly initialized generators to compare when no vocoder is given.",
+        choices=list(CONFIGS.keys()),
+        default=list(CONFIGS.keys()),
+    )
+    parser.add_argument("--num_frames", type=int, help="Number of frames of the input melspectrogram.", default=800)
+    parser.add_argument(
+        "--chunk_sizes", type=int, nargs="+", help="Number of frames vocoded at once.", default=[16, 32, 64]
+    )
+    parser.add_argument("--num_runs", type=int, help="Number of runs averaged for each setting.", default=3)
+    parser.add_argument("--use_cuda", action="store_true", help="Run the models on the GPU.")
+    args = parser.parse_args()
+
+    generators = {}
+    if args.vocoder_path:
+        config = load_config(args.vocoder_config_path)
+        model = setup_model(config)
+        model.load_checkpoint(config, args.vocoder_path, eval=True)
+        generators[config.model] = (model.model_g, config)
+    else:
+        for name in args.models:
+            config = CONFIGS[name]()
+            generators[name] = (setup_generator(config).eval(), config)
+
+    for name, (generator, config) in generators.items():
+        if args.use_cuda:
+            generator.cuda()
+        mel = torch.randn(1, config.audio.num_mels, args.num_frames, device="cuda" if args.use_cuda else "cpu")
+        start_time = time.time()
+        context_size = measure_receptive_field(generator, config.audio.num_mels)
+        print(f" > {name} | Receptive field: {context_size} frames" f" | Measured in: {time.time() - start_time:.3f}s")
+
+        # warm up
+        full_wav, _ = run_full(generator, mel, args.use_cuda)
+        audio_time = full_wav.shape[-1] / config.audio.sample_rate
+        process_time = sum(run_full(generator, mel, args.use_cuda)[1] for _ in range(args.num_runs)) / args.num_runs
+        print(f"   Full utterance | Latency: {process_time:.3f}s | Real-time factor: {process_time / audio_time:.3f}")
+
+        for chunk_size in args.chunk_sizes:
+            vocoder = StreamingVocoder(generator, chunk_size=chunk_size, context_size=context_size)
+            first_chunk_time = process_time = 0
+            for _ in range(args.num_runs):
+                wav, run_first_chunk_time, run_process_time = run_stream(vocoder, mel, args.use_cuda)
+                first_chunk_time += run_first_chunk_time
+                process_time += run_process_time
+            print(
+                f"   Chunk size: {chunk_size} | Latency: {first_chunk_time / args.num_runs:.3f}s"
+                f" | Processing time: {process_time / args.num_runs:.3f}s"
+                f" | Real-time factor: {process_time / args.num_runs / audio_time:.3f}"
+                f" | Max. difference: {(wav - full_wav).abs().max().item():.2e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
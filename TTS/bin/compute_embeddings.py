@@ -1,4 +1,5 @@
 import argparse
+import json
 import os
 from argparse import RawTextHelpFormatter
 
@@ -12,6 +13,29 @@ from TTS.tts.utils.managers import save_file
 from TTS.tts.utils.speakers import SpeakerManager
 
 
+def load_progress_file(path):
+    """Load the embeddings written to the progress file by an interrupted run.
+
+    Args:
+        path (str): Path to the progress file.
+
+    Returns:
+        Dict: Embeddings keyed by `audio_unique_name`.
+    """
+    embeddings = {}
+    if not os.path.exists(path):
+        return embeddings
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError:
+                # a line is cut if the run was killed while writing it
+                continue
+            embeddings[item["audio_unique_name"]] = item["embedding"]
+    return embeddings
+
+
 def compute_embeddings(
     model_path,
     config_path,
@@ -26,8 +50,13 @@ def compute_embeddings(
     meta_file_val=None,
     disable_cuda=False,
     no_eval=False,
+    batch_size=None,
+    num_workers=0,
 ):
     use_cuda = torch.cuda.is_available() and not disable_cuda
+    if batch_size is None:
+        # on CPU the windows of a single clip are already enough to keep the encoder busy
+        batch_size = 32 if use_cuda else 1
 
     if config_dataset_path is not None:
         c_dataset = load_config(config_dataset_path)
@@ -57,15 +86,29 @@ def compute_embeddings(
 
     class_name_key = encoder_manager.encoder_config.class_name_key
 
+    if os.path.isdir(output_path):
+        mapping_file_path = os.path.join(output_path, "speakers.pth")
+    else:
+        mapping_file_path = output_path
+
+    if os.path.dirname(mapping_file_path) != "":
+        os.makedirs(os.path.dirname(mapping_file_path), exist_ok=True)
+
     # compute speaker embeddings
     if old_speakers_file is not None and old_append:
         speaker_mapping = encoder_manager.embeddings
     else:
         speaker_mapping = {}
 
-    for fields in tqdm(samples):
+    # embeddings are appended to the progress file as they are computed to resume an interrupted run
+    progress_file_path = mapping_file_path + ".partial.jsonl"
+    computed_embeddings = load_progress_file(progress_file_path)
+    if computed_embeddings:
+        print(f" > Resuming from {len(computed_embeddings)} embeddings in {progress_file_path}")
+
+    new_samples = []
+    for fields in samples:
         class_name = fields[class_name_key]
-        audio_file = fields["audio_file"]
         embedding_key = fields["audio_unique_name"]
 
         # Only update the speaker name when the embedding is already in the old file.
@@ -76,27 +119,33 @@ def compute_embeddings(
         if old_speakers_file is not None and embedding_key in encoder_manager.clip_ids:
             # get the embedding from the old file
             embedd = encoder_manager.get_embedding_by_clip(embedding_key)
+        elif embedding_key in computed_embeddings:
+            embedd = computed_embeddings[embedding_key]
         else:
-            # extract the embedding
-            embedd = encoder_manager.compute_embedding_from_clip(audio_file)
+            new_samples.append(fields)
+            embedd = None
 
         # create speaker_mapping if target dataset is defined
         speaker_mapping[embedding_key] = {}
         speaker_mapping[embedding_key]["name"] = class_name
         speaker_mapping[embedding_key]["embedding"] = embedd
 
+    # extract the embeddings
+    with open(progress_file_path, "a", encoding="utf-8") as progress_file:
+        embeddings = encoder_manager.compute_embeddings_from_clips(
+            [fields["audio_file"] for fields in new_samples], batch_size=batch_size, num_workers=num_workers
+        )
+        for idx, embedd in tqdm(embeddings, total=len(new_samples)):
+            embedding_key = new_samples[idx]["audio_unique_name"]
+            speaker_mapping[embedding_key]["embedding"] = embedd
+            progress_file.write(json.dumps({"audio_unique_name": embedding_key, "embedding": embedd}) + "\n")
+            progress_file.flush()
+
     if speaker_mapping:
         # save speaker_mapping if target dataset is defined
-        if os.path.isdir(output_path):
-            mapping_file_path = os.path.join(output_path, "speakers.pth")
-        else:
-            mapping_file_path = output_path
-
-        if os.path.dirname(mapping_file_path) != "":
-            os.makedirs(os.path.dirname(mapping_file_path), exist_ok=True)
-
         save_file(speaker_mapping, mapping_file_path)
         print("Speaker embeddings saved at:", mapping_file_path)
+    os.remove(progress_file_path)
 
 
 if __name__ == "__main__":
@@ -131,7 +180,7 @@ if __name__ == "__main__":
     parser.add_argument(
         "--output_path",
         type=str,
-        help="Path for output `pth` or `json` file.",
+        help="Path for output `pth`, `json` or `npy` file. `npy` files are memory-mapped when they are loaded.",
         default="speakers.pth",
     )
     parser.add_argument(
@@ -147,6 +196,18 @@ if __name__ == "__main__":
         action="store_true",
     )
     parser.add_argument("--disable_cuda", type=bool, help="Flag to disable cuda.", default=False)
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        help="Number of audio clips run through the encoder at once. Defaults to 32 on GPU and 1 on CPU.",
+        default=None,
+    )
+    parser.add_argument(
+        "--num_workers",
+        type=int,
+        help="Number of processes loading the audio clips. Defaults to 0, loading them in the main process.",
+        default=0,
+    )
     parser.add_argument("--no_eval", help="Do not compute eval?. Default False", default=False, action="store_true")
     parser.add_argument(
         "--formatter_name",
@@ -194,4 +255,6 @@ if __name__ == "__main__":
         meta_file_val=args.meta_file_val,
         disable_cuda=args.disable_cuda,
         no_eval=args.no_eval,
+        batch_size=args.batch_size,
+        num_workers=args.num_workers,
     )
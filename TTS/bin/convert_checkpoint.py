@@ -0,0 +1,62 @@
+"""Convert training checkpoints to weight-only inference checkpoints that load faster"""
+import argparse
+import os
+from argparse import RawTextHelpFormatter
+
+from TTS.utils.io import load_fsspec, save_inference_checkpoint
+
+
+def get_output_path(checkpoint_path: str, output_format: str) -> str:
+    stem = os.path.splitext(checkpoint_path)[0]
+    if output_format == "safetensors":
+        return stem + ".safetensors"
+    return stem + "_inference.pth"
+
+
+def main():
+    # pylint: disable=bad-option-value
+    parser = argparse.ArgumentParser(
+        description="""Convert training checkpoints to weight-only inference checkpoints.\n\n"""
+        """The optimizer, scaler and scheduler states are dropped. The `.safetensors` files are memory-mapped by
+`load_fsspec()`, so only the weights that are used are read from the disk. A `model_file.safetensors` next to
+`model_file.pth` is used instead of it by the model manager.
+
+    Example runs:
+
+    python TTS/bin/convert_checkpoint.py --checkpoint_paths ~/.local/share/tts/tts_models--en--ljspeech--vits/model_file.pth
+    python TTS/bin/convert_checkpoint.py --checkpoint_paths model.pth --output_format torch
+    """,
+        formatter_class=RawTextHelpFormatter,
+    )
+    parser.add_argument("--checkpoint_paths", type=str, nargs="+", help="Paths to the checkpoints.", required=True)
+    parser.add_argument(
+        "--output_path",
+        type=str,
+        help="Output path of a single checkpoint. Defaults to the checkpoint path with the `.safetensors` extension,"
+        " or the `_inference.pth` suffix for the torch format.",
+        default=None,
+    )
+    parser.add_argument(
+        "--output_format",
+        type=str,
+        help="Format of the default output path: `safetensors`, or `torch` for a `torch.save()` file. The format of `--output_path` follows its extension.",
+        choices=["safetensors", "torch"],
+        default="safetensors",
+    )
+    args = parser.parse_args()
+
+    if args.output_path is not None and len(args.checkpoint_paths) > 1:
+        raise ValueError(" [!] `--output_path` can only be used with a single checkpoint.")
+    for checkpoint_path in args.checkpoint_paths:
+        output_path = args.output_path or get_output_path(checkpoint_path, args.output_format)
+        # the checkpoints can hold configs and other python objects
+        state = load_fsspec(checkpoint_path, map_location="cpu", weights_only=False)
+        save_inference_checkpoint(state, output_path)
+        print(
+            f" > {checkpoint_path} ({os.path.getsize(checkpoint_path) / 1024**2:.1f} MB)"
+            f" -> {output_path} ({os.path.getsize(output_path) / 1024**2:.1f} MB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
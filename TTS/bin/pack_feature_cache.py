@@ -0,0 +1,48 @@
+"""Pack the per-sample phoneme, F0 and energy cache files into single-file packed caches"""
+import argparse
+import os
+from argparse import RawTextHelpFormatter
+
+import numpy as np
+
+from TTS.tts.datasets.packed_cache import PackedArrayCache
+
+# cache file name, dtype, suffix of the per-sample files
+CACHES = {
+    "phonemes": ("phonemes", np.int32, "_phoneme.npy"),
+    "pitch": ("pitch", np.float32, "_pitch.npy"),
+    "energy": ("energy", np.float32, "_energy.npy"),
+}
+
+
+def main():
+    # pylint: disable=bad-option-value
+    parser = argparse.ArgumentParser(
+        description="""Pack the `.npy` files of a phoneme, F0 or energy cache folder into a single data file and """
+        """its index. The datasets read the packed cache and keep adding the new samples to it.\n\n"""
+        """
+    Example runs:
+
+    python TTS/bin/pack_feature_cache.py phonemes /data/phoneme_cache
+    python TTS/bin/pack_feature_cache.py pitch /data/f0_cache --remove
+    """,
+        formatter_class=RawTextHelpFormatter,
+    )
+    parser.add_argument("cache_type", type=str, choices=list(CACHES.keys()), help="Type of the cached features.")
+    parser.add_argument("cache_path", type=str, help="Path to the cache folder.")
+    parser.add_argument(
+        "--remove", action="store_true", help="Remove the per-sample files after packing them.", default=False
+    )
+    args = parser.parse_args()
+
+    name, dtype, suffix = CACHES[args.cache_type]
+    cache = PackedArrayCache(args.cache_path, name, dtype)
+    num_files = cache.import_files(suffix, remove=args.remove)
+    print(f" > Packed {num_files} files into {cache.data_path}")
+    print(f" > Number of cached samples: {len(cache)}")
+    if os.path.exists(cache.data_path):
+        print(f" > Cache size: {os.path.getsize(cache.data_path) / 1024 ** 2:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
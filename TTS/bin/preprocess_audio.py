@@ -0,0 +1,73 @@
+import argparse
+from argparse import RawTextHelpFormatter
+
+from TTS.tts.datasets.preprocess import preprocess_dataset
+
+
+def main():
+    # pylint: disable=bad-option-value
+    parser = argparse.ArgumentParser(
+        description="""Resample, trim the silences and normalize the loudness of a dataset in a single pass.\n\n"""
+        """
+    Each file is read once, processed in memory and written once to the output folder, keeping the folder structure.
+    The processed files are listed with their lengths in `audio_manifest.jsonl` in the output folder, which
+    `load_tts_samples()` uses instead of reading the audio files again. Runs resume where the last one stopped.
+
+    Example runs:
+
+    python TTS/bin/preprocess_audio.py --input_dir /root/LJSpeech-1.1/ --output_dir /root/LJSpeech-1.1-22k/ --sample_rate 22050
+    python TTS/bin/preprocess_audio.py --input_dir /root/VCTK/ --output_dir /root/VCTK-16k/ --sample_rate 16000 --vad --db_level -27 --num_workers 8
+    """,
+        formatter_class=RawTextHelpFormatter,
+    )
+    parser.add_argument("--input_dir", type=str, help="Dataset root folder.", required=True)
+    parser.add_argument("--output_dir", type=str, help="Output folder.", required=True)
+    parser.add_argument(
+        "--audio_glob", type=str, help="Glob of the audio files relative to `input_dir`.", default="**/*.wav"
+    )
+    parser.add_argument("--output_ext", type=str, help="Format of the output files.", default="wav")
+    parser.add_argument(
+        "--copy_glob",
+        type=str,
+        nargs="*",
+        help="Globs of the files copied to the output folder as they are, e.g. metadata files.",
+        default=["**/*.csv", "**/*.txt"],
+    )
+    parser.add_argument("--sample_rate", type=int, help="Output sample rate. Defaults to the original.", default=None)
+    parser.add_argument(
+        "--vad", default=False, action="store_true", help="Trim the silences with the Silero VAD. Defaults to False."
+    )
+    parser.add_argument(
+        "--trim_just_beginning_and_end",
+        type=lambda x: x.lower() in ["true", "1", "yes"],
+        default=True,
+        help="If True, the VAD only trims the beginning and the end of the audio. Defaults to True.",
+    )
+    parser.add_argument("--db_level", type=float, help="Target RMS level in dB, e.g. -27.", default=None)
+    parser.add_argument("--use_cuda", type=bool, help="Run the VAD on the GPU.", default=False)
+    parser.add_argument("--use_onnx", type=bool, help="Use the ONNX VAD model.", default=False)
+    parser.add_argument("--num_workers", type=int, help="Number of worker processes.", default=1)
+    parser.add_argument(
+        "--force", default=False, action="store_true", help="Process the files again even if they are already done."
+    )
+    args = parser.parse_args()
+
+    preprocess_dataset(
+        args.input_dir,
+        args.output_dir,
+        audio_glob=args.audio_glob,
+        output_ext=args.output_ext,
+        copy_globs=args.copy_glob,
+        num_workers=args.num_workers,
+        force=args.force,
+        sample_rate=args.sample_rate,
+        vad=args.vad,
+        trim_just_beginning_and_end=args.trim_just_beginning_and_end,
+        db_level=args.db_level,
+        use_cuda=args.use_cuda,
+        use_onnx=args.use_onnx,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -335,14 +335,11 @@ def main():
 
     with contextlib.redirect_stdout(None if args.pipe_out else sys.stdout):
         # Late-import to make things load faster
-        from TTS.api import TTS
         from TTS.utils.manage import ModelManager
-        from TTS.utils.synthesizer import Synthesizer
 
         # load model manager
         path = Path(__file__).parent / "../.models.json"
         manager = ModelManager(path, progress_bar=args.progress_bar)
-        api = TTS()
 
         tts_path = None
         tts_config_path = None
@@ -372,6 +369,9 @@ def main():
             manager.model_info_by_full_name(model_query_full_name)
             sys.exit()
 
+        # Listing and model info only need the model manager, the synthesis stack is loaded from here on
+        from TTS.utils.synthesizer import Synthesizer
+
         # CASE3: load pre-trained model paths
         if args.model_name is not None and not args.model_path:
             model_path, config_path, model_item = manager.download_model(args.model_name)
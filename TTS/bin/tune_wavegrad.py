@@ -1,36 +1,52 @@
-"""Search a good noise schedule for WaveGrad for a given number of inference iterations"""
+"""Search good noise schedules for WaveGrad for a few numbers of inference iterations.
+
+The best schedule for each number of iterations is stored with its error and real-time factor in a cache next to the
+checkpoint. `Wavegrad.load_checkpoint()` loads the cache and `Wavegrad.inference(max_rtf=...)` or the
+`inference_max_rtf` config field pick a schedule from it.
+"""
 import argparse
-from itertools import product as cartesian_product
 
 import numpy as np
 import torch
-from torch.utils.data import DataLoader
-from tqdm import tqdm
 
 from TTS.config import load_config
 from TTS.utils.audio import AudioProcessor
 from TTS.vocoder.datasets.preprocess import load_wav_data
 from TTS.vocoder.datasets.wavegrad_dataset import WaveGradDataset
 from TTS.vocoder.models import setup_model
+from TTS.vocoder.utils.noise_schedule import NoiseScheduleCache, search_noise_schedules
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--model_path", type=str, help="Path to model checkpoint.")
     parser.add_argument("--config_path", type=str, help="Path to model config file.")
     parser.add_argument("--data_path", type=str, help="Path to data directory.")
-    parser.add_argument("--output_path", type=str, help="path for output file including file name and extension.")
+    parser.add_argument(
+        "--output_path",
+        type=str,
+        default=None,
+        help="Path to save the best schedule of the first `--num_iter` as a .npy file for `load_noise_schedule()`.",
+    )
+    parser.add_argument(
+        "--cache_path",
+        type=str,
+        default=None,
+        help="Path to the noise schedule cache. Defaults to `<model_path>_noise_schedules.json`.",
+    )
     parser.add_argument(
         "--num_iter",
         type=int,
-        help="Number of model inference iterations that you like to optimize noise schedule for.",
+        nargs="+",
+        default=[6, 12, 25],
+        help="Numbers of model inference iterations that you like to optimize noise schedules for.",
     )
     parser.add_argument("--use_cuda", action="store_true", help="enable CUDA.")
-    parser.add_argument("--num_samples", type=int, default=1, help="Number of datasamples used for inference.")
+    parser.add_argument("--num_samples", type=int, default=4, help="Number of datasamples used for inference.")
     parser.add_argument(
         "--search_depth",
         type=int,
-        default=3,
-        help="Search granularity. Increasing this increases the run-time exponentially.",
+        default=5,
+        help="Search granularity. The number of candidates for each number of iterations is its square.",
     )
 
     # load config
@@ -40,7 +56,7 @@ if __name__ == "__main__":
     # setup audio processor
     ap = AudioProcessor(**config.audio)
 
-    # load dataset
+    # load the data once, all the candidates are evaluated on the same batch
     _, train_data = load_wav_data(args.data_path, 0)
     train_data = train_data[: args.num_samples]
     dataset = WaveGradDataset(
@@ -56,48 +72,26 @@ if __name__ == "__main__":
         use_cache=False,
         verbose=True,
     )
-    loader = DataLoader(
-        dataset,
-        batch_size=1,
-        shuffle=False,
-        collate_fn=dataset.collate_full_clips,
-        drop_last=False,
-        num_workers=config.num_loader_workers,
-        pin_memory=False,
-    )
+    samples = [dataset[idx] for idx in range(len(dataset))]
+    mels, _ = dataset.collate_full_clips(samples)
+    lengths = torch.tensor([mel.shape[1] for mel, _ in samples])
 
     # setup the model
     model = setup_model(config)
+    model.load_checkpoint(config, args.model_path, eval=True)
     if args.use_cuda:
         model.cuda()
+        mels = mels.cuda()
 
-    # setup optimization parameters
-    base_values = sorted(10 * np.random.uniform(size=args.search_depth))
-    print(f" > base values: {base_values}")
-    exponents = 10 ** np.linspace(-6, -1, num=args.num_iter)
-    best_error = float("inf")
-    best_schedule = None  # pylint: disable=C0103
-    total_search_iter = len(base_values) ** args.num_iter
-    for base in tqdm(cartesian_product(base_values, repeat=args.num_iter), total=total_search_iter):
-        beta = exponents * base
-        model.compute_noise_level(beta)
-        for data in loader:
-            mel, audio = data
-            y_hat = model.inference(mel.cuda() if args.use_cuda else mel)
-
-            if args.use_cuda:
-                y_hat = y_hat.cpu()
-            y_hat = y_hat.numpy()
-
-            mel_hat = []
-            for i in range(y_hat.shape[0]):
-                m = ap.melspectrogram(y_hat[i, 0])[:, :-1]
-                mel_hat.append(torch.from_numpy(m))
+    # the errors of different searches are measured on different data, so the previous cache is replaced
+    cache = NoiseScheduleCache.from_checkpoint(args.model_path)
+    cache_path = args.cache_path or NoiseScheduleCache.get_path(args.model_path)
+    search_noise_schedules(model, mels, lengths, ap, args.num_iter, args.search_depth, cache=cache)
+    cache.save(cache_path)
+    print(f" > Noise schedules saved to {cache_path}")
+    for num_steps in sorted(cache.schedules):
+        schedule = cache.schedules[num_steps]
+        print(f" > {num_steps} steps - MSE: {schedule['error']:.5f} - RTF: {schedule['rtf']:.3f}")
 
-            mel_hat = torch.stack(mel_hat)
-            mse = torch.sum((mel - mel_hat) ** 2).mean()
-            if mse.item() < best_error:
-                best_error = mse.item()
-                best_schedule = {"beta": beta}
-                print(f" > Found a better schedule. - MSE: {mse.item()}")
-                np.save(args.output_path, best_schedule)
+    if args.output_path:
+        np.save(args.output_path, {"beta": np.array(cache.select(num_steps=args.num_iter[0])["beta"])})
@@ -80,6 +80,10 @@ class BaseAudioConfig(Coqpit):
         griffin_lim_iters (int):
             Number of Griffing Lim iterations. Defaults to 60.
 
+        griffin_lim_momentum (float):
+            Momentum of the fast Griffin-Lim used by the batched inference. 0 runs the plain Griffin-Lim. Around 0.99
+            it converges in fewer `griffin_lim_iters`. Defaults to 0.0.
+
         num_mels (int):
             Number of mel-basis frames that defines the frame lengths of each mel-spectrogram frame. Defaults to 80.
 
@@ -135,6 +139,7 @@ class BaseAudioConfig(Coqpit):
     # griffin-lim params
     power: float = 1.5
     griffin_lim_iters: int = 60
+    griffin_lim_momentum: float = 0.0
     # mel-spec params
     num_mels: int = 80
     mel_fmin: float = 0.0
@@ -175,6 +180,7 @@ class BaseAudioConfig(Coqpit):
         check_argument("ref_level_db", c, restricted=True, min_val=0, max_val=1000)
         check_argument("power", c, restricted=True, min_val=1, max_val=5)
         check_argument("griffin_lim_iters", c, restricted=True, min_val=10, max_val=1000)
+        check_argument("griffin_lim_momentum", c, restricted=False, min_val=0, max_val=0.999)
 
         # normalization parameters
         check_argument("signal_norm", c, restricted=True)
@@ -221,6 +227,12 @@ class BaseDatasetConfig(Coqpit):
         meta_file_attn_mask (str):
             Path to the file that lists the attention mask files used with models that require attention masks to
             train the duration predictor.
+
+        index_path (str):
+            Path to the index file of the dataset. If set, the formatted samples and their audio and text lengths are
+            read from the index instead of formatting the meta files and reading every audio file again. The index is
+            built on the first run and rebuilt when a meta file changes. See `TTS.tts.datasets.dataset_index`.
+            Defaults to `""` (disabled).
     """
 
     formatter: str = ""
@@ -232,6 +244,7 @@ class BaseDatasetConfig(Coqpit):
     phonemizer: str = ""
     meta_file_val: str = ""
     meta_file_attn_mask: str = ""
+    index_path: str = ""
 
     def check_values(
         self,
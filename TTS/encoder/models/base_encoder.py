@@ -64,11 +64,18 @@ class BaseEncoder(nn.Module):
     def inference(self, x, l2_norm=True):
         return self.forward(x, l2_norm)
 
-    @torch.no_grad()
-    def compute_embedding(self, x, num_frames=250, num_eval=10, return_mean=True, l2_norm=True):
-        """
-        Generate embeddings for a batch of utterances
-        x: 1xTxD
+    def get_eval_frames(self, x, num_frames=250, num_eval=10):
+        """Slice `num_eval` evenly spaced windows of `num_frames` frames from an utterance. These are the encoder
+        inputs `compute_embedding()` averages over.
+
+        Args:
+            x (Tensor): Utterance of shape :math:`(1, T, ...)`.
+            num_frames (int): Number of spectrogram frames in a window. It is mapped to samples if the model computes
+                the spectrogram itself. Defaults to 250.
+            num_eval (int): Number of windows. Defaults to 10.
+
+        Returns:
+            Tensor: Windows of shape :math:`(num_eval, min(T, num_frames), ...)`.
         """
         # map to the waveform size
         if self.use_torch_spec:
@@ -88,13 +95,41 @@ class BaseEncoder(nn.Module):
             frames = x[:, offset:end_offset]
             frames_batch.append(frames)
 
-        frames_batch = torch.cat(frames_batch, dim=0)
+        return torch.cat(frames_batch, dim=0)
+
+    @torch.no_grad()
+    def compute_embedding(self, x, num_frames=250, num_eval=10, return_mean=True, l2_norm=True):
+        """
+        Generate embeddings for a batch of utterances
+        x: 1xTxD
+        """
+        frames_batch = self.get_eval_frames(x, num_frames=num_frames, num_eval=num_eval)
         embeddings = self.inference(frames_batch, l2_norm=l2_norm)
 
         if return_mean:
             embeddings = torch.mean(embeddings, dim=0, keepdim=True)
         return embeddings
 
+    @torch.no_grad()
+    def compute_embedding_from_frames(self, frames_batch, l2_norm=True):
+        """Compute the mean embeddings of several utterances at once.
+
+        Windows of different utterances must have the same shape to be batched together, which is the case for all
+        the utterances longer than the window.
+
+        Args:
+            frames_batch (Tensor): Windows of each utterance returned by `get_eval_frames()`, stacked to
+                :math:`(B, num_eval, ...)`.
+            l2_norm (bool): Whether to L2-normalize the window embeddings before averaging. Defaults to True.
+
+        Returns:
+            Tensor: One embedding per utterance of shape :math:`(B, D)`, the same as `compute_embedding()` returns
+            for each of them.
+        """
+        batch_size, num_eval = frames_batch.shape[:2]
+        embeddings = self.inference(frames_batch.flatten(0, 1), l2_norm=l2_norm)
+        return embeddings.view(batch_size, num_eval, -1).mean(dim=1)
+
     def get_criterion(self, c: Coqpit, num_classes=None):
         if c.loss == "ge2e":
             criterion = GE2ELoss(loss_method="softmax")
@@ -0,0 +1,334 @@
+"""Asynchronous (ASGI) TTS server with a pool of model-worker processes.
+
+The HTTP requests are handled by an asyncio event loop and the synthesis runs in worker processes sharing the model
+weights through `torch.multiprocessing` shared memory, so N workers do not hold N copies of the model.
+
+Example run:
+
+    python TTS/server/asgi.py --model_name tts_models/en/ljspeech/vits --num_workers 4 --threads_per_worker 2
+"""
+import asyncio
+import io
+import itertools
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+from urllib.parse import parse_qs
+
+import torch
+import torch.multiprocessing as mp
+
+from TTS.server.utils import create_argparser, get_model_paths, load_synthesizer, style_wav_uri_to_dict
+from TTS.utils.manage import ModelManager
+
+
+class QueueFullError(Exception):
+    """Raised when the worker pool already has `max_queue_size` requests in flight."""
+
+
+class SynthesisError(Exception):
+    """Raised when a worker fails to synthesize a request."""
+
+
+def _worker_loop(synthesizer: "Synthesizer", num_threads: int, tasks: mp.Queue, results: mp.Queue) -> None:
+    torch.set_num_threads(num_threads)
+    results.put(None)  # ready
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        request_id, deadline, kwargs = task
+        if deadline is not None and time.time() > deadline:
+            # the client is gone, do not waste time on it
+            results.put((request_id, None, "timeout"))
+            continue
+        try:
+            wav = synthesizer.tts(**kwargs)
+            out = io.BytesIO()
+            synthesizer.save_wav(wav, out)
+            results.put((request_id, out.getvalue(), None))
+        except Exception as e:  # pylint: disable=broad-except
+            results.put((request_id, None, f"{type(e).__name__}: {e}"))
+
+
+class ModelWorkerPool:
+    """Pool of processes running a :class:`TTS.utils.synthesizer.Synthesizer` for an asyncio server.
+
+    The model weights are moved to shared memory before the workers are spawned, so the workers map the same memory
+    instead of copying the models. Each worker synthesizes one request at a time with `num_threads` torch threads.
+
+    `synthesize()` is a coroutine: the requests are sent to the workers through a queue and a thread resolves their
+    futures on the event loop when the results come back.
+
+    Args:
+        synthesizer (Synthesizer): loaded synthesizer.
+        num_workers (int): number of worker processes. Defaults to 1.
+        num_threads (int): number of torch threads of each worker. Defaults to 1.
+        max_queue_size (int): maximum number of requests in flight. More requests raise :class:`QueueFullError`.
+            Defaults to 64.
+
+    Example:
+        >>> pool = ModelWorkerPool(synthesizer, num_workers=4)
+        >>> pool.start()
+        >>> wav_bytes = await pool.synthesize("Hello there.", timeout=30)
+        >>> pool.stop()
+    """
+
+    def __init__(
+        self, synthesizer: "Synthesizer", num_workers: int = 1, num_threads: int = 1, max_queue_size: int = 64
+    ):
+        if num_workers < 1:
+            raise ValueError(f" [!] `num_workers` must be a positive number, got {num_workers}.")
+        self.synthesizer = synthesizer
+        self.num_workers = num_workers
+        self.num_threads = num_threads
+        self.max_queue_size = max_queue_size
+        # spawn works with CUDA and does not inherit the OpenMP state of the parent process
+        self._ctx = mp.get_context("spawn")
+        self._tasks = None
+        self._results = None
+        self._workers: List[mp.Process] = []
+        self._dispatcher = None
+        self._pending: Dict[int, Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._workers)
+
+    @property
+    def num_pending(self) -> int:
+        """Number of requests queued or being synthesized."""
+        return len(self._pending)
+
+    def start(self) -> None:
+        """Move the models to shared memory and start the workers. It returns when all the workers are ready."""
+        self.synthesizer.tts_model.share_memory()
+        if self.synthesizer.vocoder_model is not None:
+            self.synthesizer.vocoder_model.share_memory()
+        self._tasks = self._ctx.Queue()
+        self._results = self._ctx.Queue()
+        for _ in range(self.num_workers):
+            worker = self._ctx.Process(
+                target=_worker_loop, args=(self.synthesizer, self.num_threads, self._tasks, self._results), daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+        # wait for the workers to load the models, so the requests do not time out while they start
+        for _ in self._workers:
+            self._results.get()
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+
+    def stop(self) -> None:
+        for _ in self._workers:
+            self._tasks.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+        self._results.put(None)
+        self._dispatcher.join()
+
+    def _dispatch(self) -> None:
+        while True:
+            result = self._results.get()
+            if result is None:
+                break
+            request_id, wav, error = result
+            with self._lock:
+                pending = self._pending.get(request_id)
+            if pending is not None:
+                loop, future = pending
+                loop.call_soon_threadsafe(self._resolve, future, wav, error)
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, wav: bytes, error: str) -> None:
+        if future.done():
+            # timed out
+            return
+        if error is not None:
+            future.set_exception(SynthesisError(error))
+        else:
+            future.set_result(wav)
+
+    async def synthesize(
+        self,
+        text: str,
+        speaker_name: str = "",
+        language_name: str = "",
+        style_wav: Union[str, Dict] = None,
+        timeout: float = None,
+    ) -> bytes:
+        """Synthesize a text in a worker process.
+
+        Args:
+            text (str): input text.
+            speaker_name (str): speaker id for multi-speaker models.
+            language_name (str): language id for multi-language models.
+            style_wav (Union[str, Dict]): style waveform or gst style for GST models.
+            timeout (float): maximum time in seconds to wait for the result. Defaults to None.
+
+        Returns:
+            bytes: the WAV file.
+
+        Raises:
+            QueueFullError: if `max_queue_size` requests are already in flight.
+            asyncio.TimeoutError: if the request is not done within `timeout` seconds.
+            SynthesisError: if the worker fails.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if len(self._pending) >= self.max_queue_size:
+                raise QueueFullError(f" [!] {len(self._pending)} requests are already waiting.")
+            request_id = next(self._ids)
+            self._pending[request_id] = (loop, future)
+        deadline = time.time() + timeout if timeout is not None else None
+        kwargs = {"text": text, "speaker_name": speaker_name, "language_name": language_name, "style_wav": style_wav}
+        self._tasks.put((request_id, deadline, kwargs))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            with self._lock:
+                del self._pending[request_id]
+
+
+class TTSApp:
+    """ASGI application serving `/api/tts` with a :class:`ModelWorkerPool`.
+
+    The request parameters are read from the headers, the query string or a form-encoded body like the Flask server.
+    It responds with 429 when the pool queue is full and 504 when the synthesis takes longer than `request_timeout`.
+
+    Args:
+        pool (ModelWorkerPool): worker pool. It is started and stopped by the ASGI lifespan events if it is not
+            running.
+        request_timeout (float): maximum time in seconds to synthesize a request. Defaults to 60.
+    """
+
+    def __init__(self, pool: ModelWorkerPool, request_timeout: float = 60.0):
+        self.pool = pool
+        self.request_timeout = request_timeout
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                if not self.pool.is_running:
+                    self.pool.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.pool.stop()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def _respond(send, status: int, body: bytes, content_type: str, headers: List = None):
+        headers = [(b"content-type", content_type.encode()), (b"content-length", str(len(body)).encode())] + (
+            headers or []
+        )
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _respond_json(self, send, status: int, data: Dict, headers: List = None):
+        await self._respond(send, status, json.dumps(data).encode(), "application/json", headers)
+
+    @staticmethod
+    async def _read_params(scope, receive) -> Dict[str, str]:
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+        params = {key: values[0] for key, values in parse_qs(scope.get("query_string", b"").decode()).items()}
+        params.update({key: values[0] for key, values in parse_qs(body.decode()).items()})
+        headers = {key.decode().lower(): value.decode() for key, value in scope.get("headers", [])}
+        for header, param in [("text", "text"), ("speaker-id", "speaker_id"), ("language-id", "language_id")]:
+            if headers.get(header):
+                params[param] = headers[header]
+        if headers.get("style-wav"):
+            params["style_wav"] = headers["style-wav"]
+        return params
+
+    async def _http(self, scope, receive, send):
+        if scope["path"] == "/health":
+            await self._respond_json(send, 200, {"workers": self.pool.num_workers, "pending": self.pool.num_pending})
+            return
+        if scope["path"] != "/api/tts":
+            await self._respond_json(send, 404, {"error": "Not found."})
+            return
+        if scope["method"] not in ["GET", "POST"]:
+            await self._respond_json(send, 405, {"error": "Use GET or POST."})
+            return
+
+        params = await self._read_params(scope, receive)
+        text = params.get("text", "")
+        if not text.strip():
+            await self._respond_json(send, 400, {"error": "`text` is empty."})
+            return
+        print(f" > Model input: {text}")
+        try:
+            wav = await self.pool.synthesize(
+                text,
+                speaker_name=params.get("speaker_id", ""),
+                language_name=params.get("language_id", ""),
+                style_wav=style_wav_uri_to_dict(params.get("style_wav", "")),
+                timeout=self.request_timeout,
+            )
+        except QueueFullError:
+            await self._respond_json(send, 429, {"error": "Too many requests."}, [(b"retry-after", b"1")])
+        except asyncio.TimeoutError:
+            await self._respond_json(send, 504, {"error": "Synthesis timed out."})
+        except SynthesisError as e:
+            await self._respond_json(send, 500, {"error": str(e)})
+        else:
+            await self._respond(send, 200, wav, "audio/wav")
+
+
+def main():
+    parser = create_argparser()
+    parser.add_argument("--host", type=str, default="::", help="host to listen on.")
+    parser.add_argument("--num_workers", type=int, default=1, help="Number of model-worker processes.")
+    parser.add_argument("--threads_per_worker", type=int, default=1, help="Number of torch threads of each worker.")
+    parser.add_argument(
+        "--max_queue_size",
+        type=int,
+        default=64,
+        help="Maximum number of requests queued or being synthesized. More requests get a 429 response.",
+    )
+    parser.add_argument(
+        "--request_timeout", type=float, default=60.0, help="Maximum time in seconds to synthesize a request."
+    )
+    args = parser.parse_args()
+
+    try:
+        import uvicorn  # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+        raise ImportError(" [!] The ASGI server needs uvicorn. Install it with `pip install uvicorn`.") from e
+
+    manager = ModelManager(Path(__file__).parent / "../.models.json")
+    if args.list_models:
+        manager.list_models()
+        return
+    synthesizer = load_synthesizer(*get_model_paths(args, manager), use_cuda=args.use_cuda)
+    pool = ModelWorkerPool(
+        synthesizer,
+        num_workers=args.num_workers,
+        num_threads=args.threads_per_worker,
+        max_queue_size=args.max_queue_size,
+    )
+    app = TTSApp(pool, request_timeout=args.request_timeout)
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
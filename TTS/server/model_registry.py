@@ -0,0 +1,236 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List
+
+import torch
+
+from TTS.server.scheduler import BatchScheduler
+from TTS.server.utils import load_synthesizer
+
+
+def get_model_memory(synthesizer: "Synthesizer") -> int:
+    """Return the size in bytes of the parameters and buffers of the models of a synthesizer."""
+    memory = 0
+    for model in [synthesizer.tts_model, synthesizer.vocoder_model, getattr(synthesizer, "vc_model", None)]:
+        if isinstance(model, torch.nn.Module):
+            for tensor in list(model.parameters()) + list(model.buffers()):
+                memory += tensor.numel() * tensor.element_size()
+    return memory
+
+
+@dataclass
+class LoadedModel:
+    """A model loaded by the :class:`ModelRegistry` with the scheduler running it.
+
+    Args:
+        name (str): model name.
+        synthesizer (Synthesizer): synthesizer running the model.
+        scheduler (BatchScheduler): scheduler batching the requests of the model.
+        memory (int): size of the model weights in bytes.
+        pinned (bool): never evict the model.
+    """
+
+    name: str
+    synthesizer: "Synthesizer"
+    scheduler: BatchScheduler
+    memory: int
+    pinned: bool = False
+    in_flight: int = 0
+    retired: bool = False
+
+
+class ModelRegistry:
+    """Load models on demand and keep the most recently used ones in memory.
+
+    A model is loaded the first time it is requested, in a background thread, and requests for a model being loaded
+    wait for the same load. When more than `max_models` models or more than `max_memory` bytes of weights are
+    loaded, the least recently used models are evicted. Pinned models are never evicted and do not count towards
+    `max_models`.
+
+    Evicting or reloading a model does not drop the requests it is serving: the model leaves the registry right away,
+    so new requests load it again, but its scheduler keeps running until its last request is done.
+
+    Args:
+        manager (ModelManager): manager of the released models, used by the default loader.
+        model_names (List[str]): names of the models that can be loaded. None allows every released model. Defaults
+            to None.
+        max_models (int): maximum number of models kept in memory, besides the pinned ones. Defaults to 2.
+        max_memory (int): maximum size in bytes of the weights of the models kept in memory, besides the pinned ones.
+            0 for no limit. Defaults to 0.
+        use_cuda (bool): run the models on the GPU. Defaults to False.
+        max_batch_size (int): `max_batch_size` of the schedulers. Defaults to 8.
+        max_wait_time (float): `max_wait_time` of the schedulers. Defaults to 0.01.
+        loader (Callable): function loading a :class:`Synthesizer` from a model name. Defaults to loading the released
+            model and its default vocoder with `manager`.
+
+    Example:
+        >>> registry = ModelRegistry(manager, ["tts_models/en/ljspeech/vits", "tts_models/de/thorsten/vits"])
+        >>> with registry.model("tts_models/de/thorsten/vits") as model:
+        >>>     wav = model.scheduler.submit("Hallo Welt.").result()
+    """
+
+    def __init__(
+        self,
+        manager: "ModelManager",
+        model_names: List[str] = None,
+        max_models: int = 2,
+        max_memory: int = 0,
+        use_cuda: bool = False,
+        max_batch_size: int = 8,
+        max_wait_time: float = 0.01,
+        loader: Callable = None,
+    ):
+        if max_models < 1:
+            raise ValueError(f" [!] `max_models` must be a positive number, got {max_models}.")
+        self.manager = manager
+        self.model_names = model_names
+        self.max_models = max_models
+        self.max_memory = max_memory
+        self.use_cuda = use_cuda
+        self.max_batch_size = max_batch_size
+        self.max_wait_time = max_wait_time
+        self.loader = loader or self.load_released_model
+        self._models: Dict[str, LoadedModel] = OrderedDict()
+        self._loading: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        # one load at a time bounds the memory peak
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-model-loader")
+
+    def load_released_model(self, model_name: str) -> "Synthesizer":
+        """Download a released model and its default vocoder and load them."""
+        model_path, config_path, model_item = self.manager.download_model(model_name)
+        vocoder_path, vocoder_config_path = None, None
+        if model_item.get("default_vocoder") is not None:
+            vocoder_path, vocoder_config_path, _ = self.manager.download_model(model_item["default_vocoder"])
+        return load_synthesizer(
+            model_path, config_path, None, vocoder_path, vocoder_config_path, use_cuda=self.use_cuda
+        )
+
+    @property
+    def loaded_models(self) -> List[str]:
+        """Names of the loaded models, from the least to the most recently used."""
+        return list(self._models.keys())
+
+    @property
+    def memory(self) -> int:
+        """Size in bytes of the weights of the loaded models that are not pinned."""
+        return sum(model.memory for model in self._models.values() if not model.pinned)
+
+    def is_available(self, model_name: str) -> bool:
+        """Return True if the model is loaded or can be loaded."""
+        return model_name in self._models or self.model_names is None or model_name in self.model_names
+
+    def add(self, model_name: str, synthesizer: "Synthesizer", pinned: bool = False) -> LoadedModel:
+        """Register a loaded synthesizer, replacing the model with the same name."""
+        scheduler = BatchScheduler(synthesizer, max_batch_size=self.max_batch_size, max_wait_time=self.max_wait_time)
+        scheduler.start()
+        model = LoadedModel(model_name, synthesizer, scheduler, get_model_memory(synthesizer), pinned=pinned)
+        with self._lock:
+            old_model = self._models.pop(model_name, None)
+            if old_model is not None:
+                # a reloaded model stays pinned
+                model.pinned = model.pinned or old_model.pinned
+            self._models[model_name] = model
+            if old_model is not None:
+                self._retire(old_model)
+            self._evict()
+        return model
+
+    def load(self, model_name: str, reload: bool = False) -> Future:
+        """Load a model in the background.
+
+        Args:
+            model_name (str): model name.
+            reload (bool): load the model again even if it is loaded, e.g. after the model files are updated. The
+                loaded model serves the requests until the new one is ready. Defaults to False.
+
+        Returns:
+            Future: resolves to the :class:`LoadedModel`.
+        """
+        if not self.is_available(model_name):
+            raise KeyError(f" [!] Model {model_name} is not available.")
+        with self._lock:
+            if not reload and model_name in self._models:
+                future = Future()
+                future.set_result(self._models[model_name])
+                return future
+            if model_name not in self._loading:
+                self._loading[model_name] = self._executor.submit(self._load, model_name)
+            return self._loading[model_name]
+
+    def _load(self, model_name: str) -> LoadedModel:
+        try:
+            print(f" > Loading model {model_name}")
+            return self.add(model_name, self.loader(model_name))
+        except Exception as e:
+            print(f" [!] Failed to load model {model_name}: {e}")
+            raise
+        finally:
+            with self._lock:
+                del self._loading[model_name]
+
+    def acquire(self, model_name: str) -> LoadedModel:
+        """Get a model, loading it if needed, and keep it running until :meth:`release` is called."""
+        while True:
+            model = self.load(model_name).result()
+            with self._lock:
+                if model.retired:
+                    # evicted in the meantime
+                    continue
+                model.in_flight += 1
+                self._models.move_to_end(model_name)
+                return model
+
+    def release(self, model: LoadedModel) -> None:
+        with self._lock:
+            model.in_flight -= 1
+            if model.retired and model.in_flight == 0:
+                self._stop(model)
+
+    @contextmanager
+    def model(self, model_name: str) -> Iterator[LoadedModel]:
+        """Context manager acquiring and releasing a model."""
+        model = self.acquire(model_name)
+        try:
+            yield model
+        finally:
+            self.release(model)
+
+    def _evict(self) -> None:
+        """Evict the least recently used models until the limits are met. Call it with the lock held."""
+        while True:
+            unpinned = [model for model in self._models.values() if not model.pinned]
+            over_memory = self.max_memory > 0 and self.memory > self.max_memory
+            # the most recently used model is kept even if it is larger than `max_memory`
+            if len(unpinned) <= 1 or (len(unpinned) <= self.max_models and not over_memory):
+                return
+            model = unpinned[0]
+            print(f" > Evicting model {model.name}")
+            del self._models[model.name]
+            self._retire(model)
+
+    def _retire(self, model: LoadedModel) -> None:
+        model.retired = True
+        if model.in_flight == 0:
+            self._stop(model)
+
+    def _stop(self, model: LoadedModel) -> None:
+        model.scheduler.stop()
+        if self.use_cuda:
+            torch.cuda.empty_cache()
+
+    def info(self) -> List[Dict]:
+        """Return the name, size in MB and number of in-flight requests of the loaded models."""
+        with self._lock:
+            return [
+                {
+                    "name": model.name,
+                    "memory_mb": round(model.memory / 1024**2, 1),
+                    "in_flight": model.in_flight,
+                    "pinned": model.pinned,
+                }
+                for model in self._models.values()
+            ]
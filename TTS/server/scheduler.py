@@ -0,0 +1,283 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Tuple, Union
+
+import numpy as np
+
+
+@dataclass
+class SynthesisRequest:
+    """A text waiting to be synthesized by the :class:`BatchScheduler`.
+
+    Args:
+        text (str): input text.
+        speaker_name (str): speaker id for multi-speaker models.
+        language_name (str): language id for multi-language models.
+        style_wav (Union[str, Dict]): style waveform or gst style for GST models.
+        stream (bool): send the waveform chunks to `chunks` as they are synthesized.
+    """
+
+    text: str
+    speaker_name: str = ""
+    language_name: str = ""
+    style_wav: Union[str, Dict] = None
+    stream: bool = False
+    future: Future = field(default_factory=Future)
+    chunks: queue.Queue = field(default_factory=queue.Queue)
+    sentences: List[str] = field(default_factory=list)
+    wavs: List[np.ndarray] = field(default_factory=list)
+    num_done: int = 0
+    speaker_input: Tuple = None
+
+    @property
+    def conditioning_key(self) -> Tuple:
+        """Sentences with the same key can be synthesized in the same batch."""
+        return (self.speaker_name, self.language_name, repr(self.style_wav))
+
+
+class BatchScheduler:
+    """Schedule concurrent synthesis requests on a single :class:`TTS.utils.synthesizer.Synthesizer`.
+
+    Every request is split into sentences that are put in a shared queue. A worker thread takes up to
+    `max_batch_size` sentences from the queue, waiting at most `max_wait_time` seconds for new ones to arrive, groups
+    them by speaker, language and style and passes every group to `Synthesizer.synthesize_batch()`. So sentences of
+    different requests share the padded TTS model and vocoder forward passes and a long text does not block the short
+    ones queued after it.
+
+    Streaming requests are queued the same way but their sentences are synthesized one at a time with
+    `Synthesizer.tts_stream()` and the chunks are handed over to the caller as soon as they are ready.
+
+    The worker thread is the only one running the models, so no extra locking is needed around the synthesizer.
+
+    Args:
+        synthesizer (Synthesizer): synthesizer running the models.
+        max_batch_size (int): maximum number of sentences synthesized together. Defaults to 8.
+        max_wait_time (float): maximum time in seconds to wait for a batch to fill up. Defaults to 0.01.
+        split_sentences (bool): split the input texts into sentences. Defaults to True.
+
+    Example:
+        >>> scheduler = BatchScheduler(synthesizer, max_batch_size=16)
+        >>> scheduler.start()
+        >>> wav = scheduler.submit("Hello there. How are you?").result()
+        >>> scheduler.stop()
+    """
+
+    def __init__(
+        self,
+        synthesizer: "Synthesizer",
+        max_batch_size: int = 8,
+        max_wait_time: float = 0.01,
+        split_sentences: bool = True,
+    ):
+        if max_batch_size < 1:
+            raise ValueError(f" [!] `max_batch_size` must be a positive number, got {max_batch_size}.")
+        self.synthesizer = synthesizer
+        self.max_batch_size = max_batch_size
+        self.max_wait_time = max_wait_time
+        self.split_sentences = split_sentences
+        self._queue = queue.Queue()
+        self._worker = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    @property
+    def is_running(self) -> bool:
+        return self._worker is not None and self._worker.is_alive()
+
+    def start(self) -> None:
+        """Start the worker thread."""
+        if self.is_running:
+            return
+        self._worker = threading.Thread(target=self._run, name="tts-batch-scheduler", daemon=True)
+        self._worker.start()
+
+    def stop(self) -> None:
+        """Synthesize the queued sentences and stop the worker thread."""
+        if not self.is_running:
+            return
+        self._queue.put(None)
+        self._worker.join()
+        self._worker = None
+
+    def submit(
+        self, text: str, speaker_name: str = "", language_name: str = "", style_wav: Union[str, Dict] = None
+    ) -> Future:
+        """Queue a text for synthesis.
+
+        Args:
+            text (str): input text.
+            speaker_name (str, optional): speaker id for multi-speaker models. Defaults to "".
+            language_name (str, optional): language id for multi-language models. Defaults to "".
+            style_wav (Union[str, Dict], optional): style waveform or gst style for GST models. Defaults to None.
+
+        Returns:
+            Future: resolves to the waveform of the whole text with silences between the sentences, as returned by
+            `Synthesizer.tts()`.
+        """
+        request = SynthesisRequest(
+            text=text, speaker_name=speaker_name, language_name=language_name, style_wav=style_wav
+        )
+        self._queue_request(request)
+        return request.future
+
+    def submit_stream(
+        self, text: str, speaker_name: str = "", language_name: str = "", style_wav: Union[str, Dict] = None
+    ) -> Iterator[np.ndarray]:
+        """Queue a text for streaming synthesis.
+
+        Args:
+            text (str): input text.
+            speaker_name (str, optional): speaker id for multi-speaker models. Defaults to "".
+            language_name (str, optional): language id for multi-language models. Defaults to "".
+            style_wav (Union[str, Dict], optional): style waveform or gst style for GST models. Defaults to None.
+
+        Returns:
+            Iterator[np.ndarray]: waveform chunks as yielded by `Synthesizer.tts_stream()`. Closing the iterator
+            cancels the sentences that are not synthesized yet.
+        """
+        request = SynthesisRequest(
+            text=text, speaker_name=speaker_name, language_name=language_name, style_wav=style_wav, stream=True
+        )
+        self._queue_request(request)
+        return self._iter_chunks(request)
+
+    def _queue_request(self, request: SynthesisRequest) -> None:
+        if not request.text:
+            self._fail(request, ValueError(" [!] You need to define `text` for synthesis."))
+            return
+        request.sentences = (
+            self.synthesizer.split_into_sentences(request.text) if self.split_sentences else [request.text]
+        )
+        if not request.sentences:
+            self._fail(request, ValueError(f" [!] No sentence found in the input text: {request.text}"))
+            return
+        request.wavs = [None] * len(request.sentences)
+        for idx in range(len(request.sentences)):
+            self._queue.put((request, idx))
+
+    @staticmethod
+    def _iter_chunks(request: SynthesisRequest) -> Iterator[np.ndarray]:
+        try:
+            while True:
+                chunk = request.chunks.get()
+                if chunk is None:
+                    return
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+        finally:
+            # the remaining sentences are skipped if the consumer stops early
+            request.future.cancel()
+
+    @staticmethod
+    def _fail(request: SynthesisRequest, error: Exception) -> None:
+        try:
+            request.future.set_exception(error)
+        except InvalidStateError:  # already failed or cancelled by the consumer
+            return
+        request.chunks.put(error)
+
+    @staticmethod
+    def _finish(request: SynthesisRequest, result) -> None:
+        try:
+            request.future.set_result(result)
+        except InvalidStateError:  # cancelled by the consumer
+            return
+        request.chunks.put(None)
+
+    def _collect_batch(self) -> Tuple[List[Tuple[SynthesisRequest, int]], bool]:
+        """Block for the first sentence and then collect more until the batch is full or the wait time is over."""
+        jobs = []
+        job = self._queue.get()
+        if job is None:
+            return jobs, True
+        jobs.append(job)
+        deadline = time.monotonic() + self.max_wait_time
+        while len(jobs) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                job = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                return jobs, True
+            jobs.append(job)
+        return jobs, False
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            jobs, stop = self._collect_batch()
+            # skip the sentences of the requests that have already failed
+            jobs = [job for job in jobs if not job[0].future.done()]
+            groups = {}
+            for request, idx in jobs:
+                if request.stream:
+                    self._stream_sentence(request, idx)
+                else:
+                    groups.setdefault(request.conditioning_key, []).append((request, idx))
+            for group in groups.values():
+                self._synthesize_group(group)
+
+    def _stream_sentence(self, request: SynthesisRequest, idx: int) -> None:
+        try:
+            for chunk in self.synthesizer.tts_stream(
+                request.sentences[idx],
+                speaker_name=request.speaker_name,
+                language_name=request.language_name,
+                style_wav=request.style_wav,
+                split_sentences=False,
+            ):
+                if request.future.done():
+                    return
+                request.chunks.put(chunk)
+        except Exception as e:  # pylint: disable=broad-except
+            self._fail(request, e)
+            return
+        request.num_done += 1
+        if request.num_done == len(request.sentences):
+            self._finish(request, None)
+
+    def _synthesize_group(self, jobs: List[Tuple[SynthesisRequest, int]]) -> None:
+        first_request = jobs[0][0]
+        try:
+            if first_request.speaker_input is None:
+                # resolved once per request instead of once per batch
+                first_request.speaker_input = self.synthesizer._get_speaker_input(  # pylint: disable=protected-access
+                    first_request.speaker_name
+                )
+            wavs = self.synthesizer.synthesize_batch(
+                [request.sentences[idx] for request, idx in jobs],
+                speaker_name=first_request.speaker_name,
+                language_name=first_request.language_name,
+                style_wav=first_request.style_wav,
+                speaker_input=first_request.speaker_input,
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            if len(jobs) == 1:
+                self._fail(first_request, e)
+                return
+            # retry the sentences one by one so that only the failing requests get the error
+            for job in jobs:
+                if not job[0].future.done():
+                    self._synthesize_group([job])
+            return
+        for (request, idx), wav in zip(jobs, wavs):
+            request.wavs[idx] = wav
+            request.num_done += 1
+            if request.num_done == len(request.sentences):
+                self._finish(request, self._join_sentences(request.wavs))
+
+    @staticmethod
+    def _join_sentences(wavs: List[np.ndarray]) -> np.ndarray:
+        """Concatenate the sentence waveforms with the same silence `Synthesizer.tts()` puts between them."""
+        silence = np.zeros(10000, dtype=np.float32)
+        return np.concatenate([np.concatenate([np.asarray(wav, dtype=np.float32), silence]) for wav in wavs])
@@ -1,117 +1,102 @@
 #!flask/bin/python
-import argparse
 import io
-import json
 import os
 import sys
 from pathlib import Path
-from threading import Lock
-from typing import Union
 from urllib.parse import parse_qs
 
-from flask import Flask, render_template, render_template_string, request, send_file
+from flask import Flask, Response, render_template, render_template_string, request, send_file, stream_with_context
 
 from TTS.config import load_config
+from TTS.server.model_registry import ModelRegistry
+from TTS.server.utils import (
+    convert_boolean,
+    create_argparser,
+    get_model_paths,
+    load_synthesizer,
+    style_wav_uri_to_dict,
+)
+from TTS.utils.audio.numpy_transforms import wav_stream_header, wav_to_pcm16
 from TTS.utils.manage import ModelManager
-from TTS.utils.synthesizer import Synthesizer
-
-
-def create_argparser():
-    def convert_boolean(x):
-        return x.lower() in ["true", "1", "yes"]
-
-    parser = argparse.ArgumentParser()
-    parser.add_argument(
-        "--list_models",
-        type=convert_boolean,
-        nargs="?",
-        const=True,
-        default=False,
-        help="list available pre-trained tts and vocoder models.",
-    )
-    parser.add_argument(
-        "--model_name",
-        type=str,
-        default="tts_models/en/ljspeech/tacotron2-DDC",
-        help="Name of one of the pre-trained tts models in format <language>/<dataset>/<model_name>",
-    )
-    parser.add_argument("--vocoder_name", type=str, default=None, help="name of one of the released vocoder models.")
-
-    # Args for running custom models
-    parser.add_argument("--config_path", default=None, type=str, help="Path to model config file.")
-    parser.add_argument(
-        "--model_path",
-        type=str,
-        default=None,
-        help="Path to model file.",
-    )
-    parser.add_argument(
-        "--vocoder_path",
-        type=str,
-        help="Path to vocoder model file. If it is not defined, model uses GL as vocoder. Please make sure that you installed vocoder library before (WaveRNN).",
-        default=None,
-    )
-    parser.add_argument("--vocoder_config_path", type=str, help="Path to vocoder model config file.", default=None)
-    parser.add_argument("--speakers_file_path", type=str, help="JSON file for multi-speaker model.", default=None)
-    parser.add_argument("--port", type=int, default=5002, help="port to listen on.")
-    parser.add_argument("--use_cuda", type=convert_boolean, default=False, help="true to use CUDA.")
-    parser.add_argument("--debug", type=convert_boolean, default=False, help="true to enable Flask debug mode.")
-    parser.add_argument("--show_details", type=convert_boolean, default=False, help="Generate model detail page.")
-    return parser
-
 
 # parse the args
-args = create_argparser().parse_args()
+parser = create_argparser()
+parser.add_argument("--debug", type=convert_boolean, default=False, help="true to enable Flask debug mode.")
+parser.add_argument("--show_details", type=convert_boolean, default=False, help="Generate model detail page.")
+parser.add_argument(
+    "--max_batch_size",
+    type=int,
+    default=8,
+    help="Maximum number of sentences, possibly from different requests, synthesized in one batch.",
+)
+parser.add_argument(
+    "--max_wait_time",
+    type=float,
+    default=0.01,
+    help="Maximum time in seconds to wait for more sentences before running a batch.",
+)
+parser.add_argument(
+    "--models",
+    type=str,
+    nargs="*",
+    default=[],
+    help="Names of released models loaded on demand besides `model_name`. Requests choose them with `model`.",
+)
+parser.add_argument(
+    "--max_loaded_models",
+    type=int,
+    default=2,
+    help="Maximum number of on-demand models kept in memory. The least recently used ones are unloaded.",
+)
+parser.add_argument(
+    "--max_models_memory",
+    type=float,
+    default=0,
+    help="Maximum size in MB of the weights of the on-demand models kept in memory. 0 for no limit.",
+)
+args = parser.parse_args()
 
 path = Path(__file__).parent / "../.models.json"
 manager = ModelManager(path)
 
+# CASE1: list pre-trained TTS models
 if args.list_models:
     manager.list_models()
     sys.exit()
 
 # update in-use models to the specified released models.
-model_path = None
-config_path = None
-speakers_file_path = None
-vocoder_path = None
-vocoder_config_path = None
+model_path, config_path, speakers_file_path, vocoder_path, vocoder_config_path = get_model_paths(args, manager)
 
-# CASE1: list pre-trained TTS models
-if args.list_models:
-    manager.list_models()
-    sys.exit()
+# load models
+synthesizer = load_synthesizer(
+    model_path, config_path, speakers_file_path, vocoder_path, vocoder_config_path, use_cuda=args.use_cuda
+)
 
-# CASE2: load pre-trained model paths
-if args.model_name is not None and not args.model_path:
-    model_path, config_path, model_item = manager.download_model(args.model_name)
-    args.vocoder_name = model_item["default_vocoder"] if args.vocoder_name is None else args.vocoder_name
+# the startup model stays loaded, the models in `--models` are loaded when they are requested. Every model queues its
+# requests and synthesizes the sentences of concurrent requests in batches.
+default_model_name = args.model_name if args.model_path is None else "default"
 
-if args.vocoder_name is not None and not args.vocoder_path:
-    vocoder_path, vocoder_config_path, _ = manager.download_model(args.vocoder_name)
 
-# CASE3: set custom model paths
-if args.model_path is not None:
-    model_path = args.model_path
-    config_path = args.config_path
-    speakers_file_path = args.speakers_file_path
+def load_model(model_name: str) -> "Synthesizer":
+    if model_name == default_model_name:
+        # reload the startup model from the same files
+        return load_synthesizer(
+            model_path, config_path, speakers_file_path, vocoder_path, vocoder_config_path, use_cuda=args.use_cuda
+        )
+    return registry.load_released_model(model_name)
 
-if args.vocoder_path is not None:
-    vocoder_path = args.vocoder_path
-    vocoder_config_path = args.vocoder_config_path
 
-# load models
-synthesizer = Synthesizer(
-    tts_checkpoint=model_path,
-    tts_config_path=config_path,
-    tts_speakers_file=speakers_file_path,
-    tts_languages_file=None,
-    vocoder_checkpoint=vocoder_path,
-    vocoder_config=vocoder_config_path,
-    encoder_checkpoint="",
-    encoder_config="",
+registry = ModelRegistry(
+    manager,
+    model_names=args.models,
+    max_models=args.max_loaded_models,
+    max_memory=int(args.max_models_memory * 1024**2),
     use_cuda=args.use_cuda,
+    max_batch_size=args.max_batch_size,
+    max_wait_time=args.max_wait_time,
+    loader=load_model,
 )
+registry.add(default_model_name, synthesizer, pinned=True)
 
 use_multi_speaker = hasattr(synthesizer.tts_model, "num_speakers") and (
     synthesizer.tts_model.num_speakers > 1 or synthesizer.tts_speakers_file is not None
@@ -128,25 +113,6 @@ use_gst = synthesizer.tts_config.get("use_gst", False)
 app = Flask(__name__)
 
 
-def style_wav_uri_to_dict(style_wav: str) -> Union[str, dict]:
-    """Transform an uri style_wav, in either a string (path to wav file to be use for style transfer)
-    or a dict (gst tokens/values to be use for styling)
-
-    Args:
-        style_wav (str): uri
-
-    Returns:
-        Union[str, dict]: path to file (str) or gst style (dict)
-    """
-    if style_wav:
-        if os.path.isfile(style_wav) and style_wav.endswith(".wav"):
-            return style_wav  # style_wav is a .wav file located on the server
-
-        style_wav = json.loads(style_wav)
-        return style_wav  # style_wav is a gst dictionary with {token1_id : token1_weigth, ...}
-    return None
-
-
 @app.route("/")
 def index():
     return render_template(
@@ -185,68 +151,169 @@ def details():
     )
 
 
-lock = Lock()
+def get_model_name() -> str:
+    """Get the model requested with the `model` or `voice` parameter"""
+    return (
+        request.headers.get("model")
+        or request.values.get("model")
+        or request.values.get("voice")
+        or request.values.get("VOICE")
+        or default_model_name
+    )
+
+
+def model_not_available(model_name: str):
+    return f"Model {model_name} is not available. Available models: {', '.join(served_model_names())}", 404
+
+
+def served_model_names():
+    return [default_model_name] + [name for name in args.models if name != default_model_name]
+
+
+@app.route("/api/models", methods=["GET"])
+def list_models():
+    """List the models that can be requested and the loaded ones"""
+    return {"models": served_model_names(), "loaded": registry.info()}
+
+
+@app.route("/api/models/load", methods=["POST"])
+def load_model_endpoint():
+    """Load a model in the background, or reload it with `reload=true`, without blocking the requests"""
+    model_name = get_model_name()
+    if not registry.is_available(model_name):
+        return model_not_available(model_name)
+    registry.load(model_name, reload=request.values.get("reload", "false").lower() in ["true", "1", "yes"])
+    return {"model": model_name, "status": "loading"}, 202
 
 
 @app.route("/api/tts", methods=["GET", "POST"])
 def tts():
-    with lock:
-        text = request.headers.get("text") or request.values.get("text", "")
-        speaker_idx = request.headers.get("speaker-id") or request.values.get("speaker_id", "")
-        language_idx = request.headers.get("language-id") or request.values.get("language_id", "")
-        style_wav = request.headers.get("style-wav") or request.values.get("style_wav", "")
-        style_wav = style_wav_uri_to_dict(style_wav)
-
-        print(f" > Model input: {text}")
-        print(f" > Speaker Idx: {speaker_idx}")
-        print(f" > Language Idx: {language_idx}")
-        wavs = synthesizer.tts(text, speaker_name=speaker_idx, language_name=language_idx, style_wav=style_wav)
+    model_name = get_model_name()
+    if not registry.is_available(model_name):
+        return model_not_available(model_name)
+    text = request.headers.get("text") or request.values.get("text", "")
+    speaker_idx = request.headers.get("speaker-id") or request.values.get("speaker_id", "")
+    language_idx = request.headers.get("language-id") or request.values.get("language_id", "")
+    style_wav = request.headers.get("style-wav") or request.values.get("style_wav", "")
+    style_wav = style_wav_uri_to_dict(style_wav)
+
+    print(f" > Model input: {text}")
+    print(f" > Speaker Idx: {speaker_idx}")
+    print(f" > Language Idx: {language_idx}")
+    with registry.model(model_name) as model:
+        wavs = model.scheduler.submit(
+            text, speaker_name=speaker_idx, language_name=language_idx, style_wav=style_wav
+        ).result()
         out = io.BytesIO()
-        synthesizer.save_wav(wavs, out)
+        model.synthesizer.save_wav(wavs, out)
     return send_file(out, mimetype="audio/wav")
 
 
+@app.route("/api/tts/stream", methods=["GET", "POST"])
+def tts_stream():
+    """Streaming endpoint sending the audio of each sentence as soon as it is synthesized"""
+    model_name = get_model_name()
+    if not registry.is_available(model_name):
+        return model_not_available(model_name)
+    text = request.headers.get("text") or request.values.get("text", "")
+    speaker_idx = request.headers.get("speaker-id") or request.values.get("speaker_id", "")
+    language_idx = request.headers.get("language-id") or request.values.get("language_id", "")
+    style_wav = request.headers.get("style-wav") or request.values.get("style_wav", "")
+    style_wav = style_wav_uri_to_dict(style_wav)
+    audio_format = request.values.get("format", "wav")
+    if audio_format not in ["wav", "pcm"]:
+        return f"Unsupported stream format: {audio_format}. Use `wav` or `pcm`.", 400
+
+    print(f" > Model input: {text}")
+    print(f" > Speaker Idx: {speaker_idx}")
+    print(f" > Language Idx: {language_idx}")
+    # the model is released when the response is closed
+    model = registry.acquire(model_name)
+    chunks = model.scheduler.submit_stream(
+        text, speaker_name=speaker_idx, language_name=language_idx, style_wav=style_wav
+    )
+    sample_rate = model.synthesizer.output_sample_rate
+
+    def generate():
+        if audio_format == "wav":
+            yield wav_stream_header(sample_rate=sample_rate)
+        for chunk in chunks:
+            yield wav_to_pcm16(wav=chunk)
+
+    if audio_format == "wav":
+        mimetype = "audio/wav"
+    else:
+        mimetype = f"audio/L16; rate={sample_rate}; channels=1"
+    response = Response(stream_with_context(generate()), mimetype=mimetype)
+    response.call_on_close(lambda: registry.release(model))
+    return response
+
+
 # Basic MaryTTS compatibility layer
 
 
+def get_model_details(model_name: str):
+    if model_name == "default":
+        return ["", "en", "", "default"]
+    return model_name.split("/")
+
+
+def get_mary_tts_voices():
+    """Map the MaryTTS voice names to the model names and locales"""
+    voices = {}
+    for model_name in served_model_names():
+        model_details = get_model_details(model_name)
+        # the short name unless two models have the same one
+        name = model_details[3] if model_details[3] not in voices else model_name
+        voices[name] = (model_name, model_details[1])
+    return voices
+
+
 @app.route("/locales", methods=["GET"])
 def mary_tts_api_locales():
     """MaryTTS-compatible /locales endpoint"""
-    # NOTE: We currently assume there is only one model active at the same time
-    if args.model_name is not None:
-        model_details = args.model_name.split("/")
-    else:
-        model_details = ["", "en", "", "default"]
-    return render_template_string("{{ locale }}\n", locale=model_details[1])
+    locales = list(dict.fromkeys(locale for _, locale in get_mary_tts_voices().values()))
+    return render_template_string("{% for locale in locales %}{{ locale }}\n{% endfor %}", locales=locales)
 
 
 @app.route("/voices", methods=["GET"])
 def mary_tts_api_voices():
     """MaryTTS-compatible /voices endpoint"""
-    # NOTE: We currently assume there is only one model active at the same time
-    if args.model_name is not None:
-        model_details = args.model_name.split("/")
-    else:
-        model_details = ["", "en", "", "default"]
     return render_template_string(
-        "{{ name }} {{ locale }} {{ gender }}\n", name=model_details[3], locale=model_details[1], gender="u"
+        "{% for name, (_, locale) in voices.items() %}{{ name }} {{ locale }} {{ gender }}\n{% endfor %}",
+        voices=get_mary_tts_voices(),
+        gender="u",
     )
 
 
 @app.route("/process", methods=["GET", "POST"])
 def mary_tts_api_process():
     """MaryTTS-compatible /process endpoint"""
-    with lock:
-        if request.method == "POST":
-            data = parse_qs(request.get_data(as_text=True))
-            # NOTE: we ignore param. LOCALE and VOICE for now since we have only one active model
-            text = data.get("INPUT_TEXT", [""])[0]
-        else:
-            text = request.args.get("INPUT_TEXT", "")
-        print(f" > Model input: {text}")
-        wavs = synthesizer.tts(text)
+    if request.method == "POST":
+        data = {key: values[0] for key, values in parse_qs(request.get_data(as_text=True)).items()}
+    else:
+        data = request.args
+    text = data.get("INPUT_TEXT", "")
+    voices = get_mary_tts_voices()
+    # pick the model by VOICE, or else the first model of LOCALE
+    voice = data.get("VOICE")
+    locale = data.get("LOCALE")
+    if voice:
+        if voice not in voices:
+            return f"Voice {voice} is not available.", 404
+        model_name = voices[voice][0]
+    elif locale:
+        model_names = [model_name for model_name, voice_locale in voices.values() if voice_locale == locale]
+        if not model_names:
+            return f"Locale {locale} is not available.", 404
+        model_name = model_names[0]
+    else:
+        model_name = default_model_name
+    print(f" > Model input: {text}")
+    with registry.model(model_name) as model:
+        wavs = model.scheduler.submit(text).result()
         out = io.BytesIO()
-        synthesizer.save_wav(wavs, out)
+        model.synthesizer.save_wav(wavs, out)
     return send_file(out, mimetype="audio/wav")
 
 
@@ -56,6 +56,13 @@ class XttsConfig(BaseTTSConfig):
         sound_norm_refs (bool):
             Whether to normalize the conditioning audio. Defaults to `False`.
 
+        latent_cache_size (int):
+            Number of voices whose conditioning latents are kept in memory to skip recomputing them when the same
+            reference audio is used again. 0 disables the cache. Defaults to `16`.
+
+        latent_cache_dir (str):
+            Folder where the conditioning latents are also saved to be reused across restarts. Defaults to None.
+
     Note:
         Check :class:`TTS.tts.configs.shared_configs.BaseTTSConfig` for the inherited parameters.
 
@@ -105,3 +112,5 @@ class XttsConfig(BaseTTSConfig):
     gpt_cond_chunk_len: int = 4
     max_ref_len: int = 10
     sound_norm_refs: bool = False
+    latent_cache_size: int = 16
+    latent_cache_dir: str = None
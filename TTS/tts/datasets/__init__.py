@@ -7,7 +7,9 @@ from typing import Callable, Dict, List, Tuple, Union
 import numpy as np
 
 from TTS.tts.datasets.dataset import *
+from TTS.tts.datasets.dataset_index import DatasetIndex
 from TTS.tts.datasets.formatters import *
+from TTS.tts.datasets.preprocess import add_manifest_lengths, load_manifest
 
 
 def split_dataset(items, eval_split_max_size=None, eval_split_size=0.01):
@@ -67,6 +69,14 @@ def add_extra_keys(metadata, language, dataset_name):
     return metadata
 
 
+def _load_samples(formatter, formatter_name, root_path, meta_file, ignored_speakers, index=None):
+    if index is not None:
+        return index.load_samples(formatter, formatter_name, root_path, meta_file, ignored_speakers)
+    samples = formatter(root_path, meta_file, ignored_speakers=ignored_speakers)
+    # audio lengths of datasets preprocessed by `TTS/bin/preprocess_audio.py`
+    return add_manifest_lengths(samples, load_manifest(root_path))
+
+
 def load_tts_samples(
     datasets: Union[List[Dict], Dict],
     eval_split=True,
@@ -97,6 +107,9 @@ def load_tts_samples(
             If between 0.0 and 1.0 represents the proportion of the dataset to include in the evaluation set.
             If > 1, represents the absolute number of evaluation samples. Defaults to 0.01 (1%).
 
+    If a dataset sets `index_path`, its samples are read from the `DatasetIndex` with their `audio_length` and
+    `text_length`, so `TTSDataset` doesn't need to read the audio files to sort them.
+
     Returns:
         Tuple[List[List], List[List]: training and evaluation splits of the dataset.
     """
@@ -116,8 +129,9 @@ def load_tts_samples(
         # setup the right data processor
         if formatter is None:
             formatter = _get_formatter_by_name(formatter_name)
+        index = DatasetIndex(dataset["index_path"]) if dataset.get("index_path", None) else None
         # load train set
-        meta_data_train = formatter(root_path, meta_file_train, ignored_speakers=ignored_speakers)
+        meta_data_train = _load_samples(formatter, formatter_name, root_path, meta_file_train, ignored_speakers, index)
         assert len(meta_data_train) > 0, f" [!] No training samples found in {root_path}/{meta_file_train}"
 
         meta_data_train = add_extra_keys(meta_data_train, language, dataset_name)
@@ -126,7 +140,9 @@ def load_tts_samples(
         # load evaluation split if set
         if eval_split:
             if meta_file_val:
-                meta_data_eval = formatter(root_path, meta_file_val, ignored_speakers=ignored_speakers)
+                meta_data_eval = _load_samples(
+                    formatter, formatter_name, root_path, meta_file_val, ignored_speakers, index
+                )
                 meta_data_eval = add_extra_keys(meta_data_eval, language, dataset_name)
             else:
                 eval_size_per_dataset = eval_split_max_size // len(datasets) if eval_split_max_size else None
@@ -6,9 +6,10 @@ from typing import Dict, List, Union
 
 import numpy as np
 import torch
-import tqdm
 from torch.utils.data import Dataset
 
+from TTS.tts.datasets.packed_cache import PackedArrayCache
+from TTS.tts.datasets.precompute import precompute_dataset
 from TTS.tts.utils.data import prepare_data, prepare_stop_target, prepare_tensor
 from TTS.utils.audio import AudioProcessor
 from TTS.utils.audio.numpy_transforms import compute_energy as calculate_energy
@@ -47,7 +48,9 @@ def string2filename(string):
 def get_audio_size(audiopath):
     extension = audiopath.rpartition(".")[-1].lower()
     if extension not in {"mp3", "wav", "flac"}:
-        raise RuntimeError(f"The audio format {extension} is not supported, please convert the audio files to mp3, flac, or wav format!")
+        raise RuntimeError(
+            f"The audio format {extension} is not supported, please convert the audio files to mp3, flac, or wav format!"
+        )
 
     audio_info = mutagen.File(audiopath).info
     return int(audio_info.length * audio_info.sample_rate)
@@ -186,6 +189,9 @@ class TTSDataset(Dataset):
     def lengths(self):
         lens = []
         for item in self.samples:
+            if isinstance(item, dict) and item.get("audio_length") is not None:
+                lens.append(item["audio_length"])
+                continue
             _, wav_file, *_ = _parse_sample(item)
             audio_len = get_audio_size(wav_file)
             lens.append(audio_len)
@@ -306,7 +312,10 @@ class TTSDataset(Dataset):
     def _compute_lengths(samples):
         new_samples = []
         for item in samples:
-            audio_length = get_audio_size(item["audio_file"])
+            # the length is known for indexed and preprocessed datasets, see `load_tts_samples()`
+            audio_length = item.get("audio_length")
+            if audio_length is None:
+                audio_length = get_audio_size(item["audio_file"])
             text_lenght = len(item["text"])
             item["audio_length"] = audio_length
             item["text_length"] = text_lenght
@@ -356,17 +365,17 @@ class TTSDataset(Dataset):
         """
         samples = self._compute_lengths(self.samples)
 
-        # sort items based on the sequence length in ascending order
-        text_lengths = [i["text_length"] for i in samples]
-        audio_lengths = [i["audio_length"] for i in samples]
-        text_ignore_idx, text_keep_idx = self.filter_by_length(text_lengths, self.min_text_len, self.max_text_len)
-        audio_ignore_idx, audio_keep_idx = self.filter_by_length(audio_lengths, self.min_audio_len, self.max_audio_len)
-        keep_idx = list(set(audio_keep_idx) & set(text_keep_idx))
-        ignore_idx = list(set(audio_ignore_idx) | set(text_ignore_idx))
+        # filter and sort items based on the sequence length in ascending order
+        text_lengths = np.array([i["text_length"] for i in samples])
+        audio_lengths = np.array([i["audio_length"] for i in samples])
+        keep_mask = (text_lengths >= self.min_text_len) & (text_lengths <= self.max_text_len)
+        keep_mask &= (audio_lengths >= self.min_audio_len) & (audio_lengths <= self.max_audio_len)
+        keep_idx = np.flatnonzero(keep_mask)
+        num_ignored = len(samples) - len(keep_idx)
 
         samples = self._select_samples_by_idx(keep_idx, samples)
 
-        sorted_idxs = self.sort_by_length(samples)
+        sorted_idxs = np.argsort(audio_lengths[keep_idx], kind="stable")
 
         if self.start_by_longest:
             longest_idxs = sorted_idxs[-1]
@@ -398,7 +407,7 @@ class TTSDataset(Dataset):
             print(" | > Max audio length: {}".format(np.max(audio_lengths)))
             print(" | > Min audio length: {}".format(np.min(audio_lengths)))
             print(" | > Avg audio length: {}".format(np.mean(audio_lengths)))
-            print(f" | > Num. instances discarded samples: {len(ignore_idx)}")
+            print(f" | > Num. instances discarded samples: {num_ignored}")
             print(" | > Batch group size: {}.".format(self.batch_group_size))
 
     @staticmethod
@@ -578,7 +587,8 @@ class PhonemeDataset(Dataset):
     """Phoneme Dataset for converting input text to phonemes and then token IDs
 
     At initialization, it pre-computes the phonemes under `cache_path` and loads them in training to reduce data
-    loading latency. If `cache_path` is already present, it skips the pre-computation.
+    loading latency. The samples already in the cache are skipped, so an interrupted pre-computation resumes where it
+    stopped.
 
     Args:
         samples (Union[List[List], List[Dict]]):
@@ -588,7 +598,8 @@ class PhonemeDataset(Dataset):
             Tokenizer to convert input text to phonemes.
 
         cache_path (str):
-            Path to cache phonemes. If `cache_path` is already present or None, it skips the pre-computation.
+            Path to cache phonemes. If None, it skips the pre-computation. The token IDs of all the samples are packed
+            in a single file, see :class:`PackedArrayCache`.
 
         precompute_num_workers (int):
             Number of workers used for pre-computing the phonemes. Defaults to 0.
@@ -604,9 +615,11 @@ class PhonemeDataset(Dataset):
         self.samples = samples
         self.tokenizer = tokenizer
         self.cache_path = cache_path
-        if cache_path is not None and not os.path.exists(cache_path):
-            os.makedirs(cache_path)
-            self.precompute(precompute_num_workers)
+        self.cache = PackedArrayCache(cache_path, "phonemes", np.int32) if cache_path is not None else None
+        if cache_path is not None:
+            os.makedirs(cache_path, exist_ok=True)
+            if self.get_missing_indices():
+                self.precompute(precompute_num_workers)
 
     def __getitem__(self, index):
         item = self.samples[index]
@@ -622,32 +635,32 @@ class PhonemeDataset(Dataset):
 
         If the phonemes are already cached, load them from cache.
         """
-        file_ext = "_phoneme.npy"
-        cache_path = os.path.join(self.cache_path, file_name + file_ext)
-        try:
-            ids = np.load(cache_path)
-        except FileNotFoundError:
-            ids = self.tokenizer.text_to_ids(text, language=language)
-            np.save(cache_path, ids)
-        return ids
+        if self.cache is None:
+            return self.tokenizer.text_to_ids(text, language=language)
+        return self.cache.get_or_compute(
+            file_name,
+            lambda: self.tokenizer.text_to_ids(text, language=language),
+            legacy_file=os.path.join(self.cache_path, file_name + "_phoneme.npy"),
+        )
 
     def get_pad_id(self):
         """Get pad token ID for sequence padding"""
         return self.tokenizer.pad_id
 
-    def precompute(self, num_workers=1):
-        """Precompute phonemes for all samples.
+    def get_missing_indices(self):
+        """Get the indices of the samples that are not cached yet"""
+        return [
+            idx for idx, item in enumerate(self.samples) if string2filename(item["audio_unique_name"]) not in self.cache
+        ]
 
-        We use pytorch dataloader because we are lazy.
-        """
+    def _precompute_item(self, idx):
+        item = self.samples[idx]
+        self.compute_or_load(string2filename(item["audio_unique_name"]), item["text"], item["language"])
+
+    def precompute(self, num_workers=0, chunk_size=64):
+        """Precompute phonemes for the samples missing in the cache with a pool of `num_workers` processes."""
         print("[*] Pre-computing phonemes...")
-        with tqdm.tqdm(total=len(self)) as pbar:
-            batch_size = num_workers if num_workers > 0 else 1
-            dataloder = torch.utils.data.DataLoader(
-                batch_size=batch_size, dataset=self, shuffle=False, num_workers=num_workers, collate_fn=self.collate_fn
-            )
-            for _ in dataloder:
-                pbar.update(batch_size)
+        precompute_dataset(self, self.get_missing_indices(), num_workers=num_workers, chunk_size=chunk_size)
 
     def collate_fn(self, batch):
         ids = [item["token_ids"] for item in batch]
@@ -672,8 +685,9 @@ class PhonemeDataset(Dataset):
 class F0Dataset:
     """F0 Dataset for computing F0 from wav files in CPU
 
-    Pre-compute F0 values for all the samples at initialization if `cache_path` is not None or already present. It
-    also computes the mean and std of F0 values if `normalize_f0` is True.
+    Pre-compute F0 values for all the samples at initialization if `cache_path` is not None. The samples already in
+    the cache are skipped, so an interrupted pre-computation resumes where it stopped. It also computes the mean and
+    std of F0 values if `normalize_f0` is True.
 
     Args:
         samples (Union[List[List], List[Dict]]):
@@ -683,7 +697,8 @@ class F0Dataset:
             AudioProcessor to compute F0 from wav files.
 
         cache_path (str):
-            Path to cache F0 values. If `cache_path` is already present or None, it skips the pre-computation.
+            Path to cache F0 values. If None, it skips the pre-computation. The F0 values of all the samples
+            are packed in a single file, see :class:`PackedArrayCache`.
             Defaults to None.
 
         precompute_num_workers (int):
@@ -711,9 +726,12 @@ class F0Dataset:
         self.pad_id = 0.0
         self.mean = None
         self.std = None
-        if cache_path is not None and not os.path.exists(cache_path):
-            os.makedirs(cache_path)
-            self.precompute(precompute_num_workers)
+        self.cache = PackedArrayCache(cache_path, "pitch", np.float32) if cache_path is not None else None
+        if cache_path is not None:
+            os.makedirs(cache_path, exist_ok=True)
+            stats_missing = normalize_f0 and not os.path.exists(os.path.join(cache_path, "pitch_stats.npy"))
+            if stats_missing or self.get_missing_indices():
+                self.precompute(precompute_num_workers)
         if normalize_f0:
             self.load_stats(cache_path)
 
@@ -728,27 +746,29 @@ class F0Dataset:
     def __len__(self):
         return len(self.samples)
 
-    def precompute(self, num_workers=0):
-        print("[*] Pre-computing F0s...")
-        with tqdm.tqdm(total=len(self)) as pbar:
-            batch_size = num_workers if num_workers > 0 else 1
-            # we do not normalize at preproessing
-            normalize_f0 = self.normalize_f0
-            self.normalize_f0 = False
-            dataloder = torch.utils.data.DataLoader(
-                batch_size=batch_size, dataset=self, shuffle=False, num_workers=num_workers, collate_fn=self.collate_fn
-            )
-            computed_data = []
-            for batch in dataloder:
-                f0 = batch["f0"]
-                computed_data.append(f for f in f0)
-                pbar.update(batch_size)
-            self.normalize_f0 = normalize_f0
+    def get_missing_indices(self):
+        """Get the indices of the samples that are not cached yet"""
+        return [
+            idx for idx, item in enumerate(self.samples) if string2filename(item["audio_unique_name"]) not in self.cache
+        ]
+
+    def _precompute_item(self, idx):
+        item = self.samples[idx]
+        pitch = self.compute_or_load(item["audio_file"], string2filename(item["audio_unique_name"]))
+        # the stats ignore the unvoiced frames
+        return pitch[pitch != 0.0] if self.normalize_f0 else None
 
+    def precompute(self, num_workers=0, chunk_size=64):
+        """Precompute the F0 values missing in the cache with a pool of `num_workers` processes.
+
+        If `normalize_f0` is True, the cached values are read back too to compute the mean and std of all the samples
+        on the fly.
+        """
+        print("[*] Pre-computing F0s...")
+        indices = list(range(len(self))) if self.normalize_f0 else self.get_missing_indices()
+        stats = precompute_dataset(self, indices, num_workers=num_workers, chunk_size=chunk_size)
         if self.normalize_f0:
-            computed_data = [tensor for batch in computed_data for tensor in batch]  # flatten
-            pitch_mean, pitch_std = self.compute_pitch_stats(computed_data)
-            pitch_stats = {"mean": pitch_mean, "std": pitch_std}
+            pitch_stats = {"mean": np.float64(stats.mean), "std": np.float64(stats.std)}
             np.save(os.path.join(self.cache_path, "pitch_stats"), pitch_stats, allow_pickle=True)
 
     def get_pad_id(self):
@@ -797,11 +817,13 @@ class F0Dataset:
         """
         compute pitch and return a numpy array of pitch values
         """
-        pitch_file = self.create_pitch_file_path(audio_unique_name, self.cache_path)
-        if not os.path.exists(pitch_file):
-            pitch = self._compute_and_save_pitch(self.ap, wav_file, pitch_file)
-        else:
-            pitch = np.load(pitch_file)
+        if self.cache is None:
+            return self._compute_and_save_pitch(self.ap, wav_file).astype(np.float32)
+        pitch = self.cache.get_or_compute(
+            audio_unique_name,
+            lambda: self._compute_and_save_pitch(self.ap, wav_file),
+            legacy_file=self.create_pitch_file_path(audio_unique_name, self.cache_path),
+        )
         return pitch.astype(np.float32)
 
     def collate_fn(self, batch):
@@ -824,8 +846,9 @@ class F0Dataset:
 class EnergyDataset:
     """Energy Dataset for computing Energy from wav files in CPU
 
-    Pre-compute Energy values for all the samples at initialization if `cache_path` is not None or already present. It
-    also computes the mean and std of Energy values if `normalize_Energy` is True.
+    Pre-compute Energy values for all the samples at initialization if `cache_path` is not None. The samples already in
+    the cache are skipped, so an interrupted pre-computation resumes where it stopped. It also computes the mean and
+    std of Energy values if `normalize_Energy` is True.
 
     Args:
         samples (Union[List[List], List[Dict]]):
@@ -835,7 +858,8 @@ class EnergyDataset:
             AudioProcessor to compute Energy from wav files.
 
         cache_path (str):
-            Path to cache Energy values. If `cache_path` is already present or None, it skips the pre-computation.
+            Path to cache Energy values. If None, it skips the pre-computation. The Energy values of all the samples
+            are packed in a single file, see :class:`PackedArrayCache`.
             Defaults to None.
 
         precompute_num_workers (int):
@@ -862,9 +886,12 @@ class EnergyDataset:
         self.pad_id = 0.0
         self.mean = None
         self.std = None
-        if cache_path is not None and not os.path.exists(cache_path):
-            os.makedirs(cache_path)
-            self.precompute(precompute_num_workers)
+        self.cache = PackedArrayCache(cache_path, "energy", np.float32) if cache_path is not None else None
+        if cache_path is not None:
+            os.makedirs(cache_path, exist_ok=True)
+            stats_missing = normalize_energy and not os.path.exists(os.path.join(cache_path, "energy_stats.npy"))
+            if stats_missing or self.get_missing_indices():
+                self.precompute(precompute_num_workers)
         if normalize_energy:
             self.load_stats(cache_path)
 
@@ -879,27 +906,28 @@ class EnergyDataset:
     def __len__(self):
         return len(self.samples)
 
-    def precompute(self, num_workers=0):
-        print("[*] Pre-computing energys...")
-        with tqdm.tqdm(total=len(self)) as pbar:
-            batch_size = num_workers if num_workers > 0 else 1
-            # we do not normalize at preproessing
-            normalize_energy = self.normalize_energy
-            self.normalize_energy = False
-            dataloder = torch.utils.data.DataLoader(
-                batch_size=batch_size, dataset=self, shuffle=False, num_workers=num_workers, collate_fn=self.collate_fn
-            )
-            computed_data = []
-            for batch in dataloder:
-                energy = batch["energy"]
-                computed_data.append(e for e in energy)
-                pbar.update(batch_size)
-            self.normalize_energy = normalize_energy
+    def get_missing_indices(self):
+        """Get the indices of the samples that are not cached yet"""
+        return [
+            idx for idx, item in enumerate(self.samples) if string2filename(item["audio_unique_name"]) not in self.cache
+        ]
+
+    def _precompute_item(self, idx):
+        item = self.samples[idx]
+        energy = self.compute_or_load(item["audio_file"], string2filename(item["audio_unique_name"]))
+        return energy[energy != 0.0] if self.normalize_energy else None
+
+    def precompute(self, num_workers=0, chunk_size=64):
+        """Precompute the Energy values missing in the cache with a pool of `num_workers` processes.
 
+        If `normalize_energy` is True, the cached values are read back too to compute the mean and std of all the
+        samples on the fly.
+        """
+        print("[*] Pre-computing energys...")
+        indices = list(range(len(self))) if self.normalize_energy else self.get_missing_indices()
+        stats = precompute_dataset(self, indices, num_workers=num_workers, chunk_size=chunk_size)
         if self.normalize_energy:
-            computed_data = [tensor for batch in computed_data for tensor in batch]  # flatten
-            energy_mean, energy_std = self.compute_energy_stats(computed_data)
-            energy_stats = {"mean": energy_mean, "std": energy_std}
+            energy_stats = {"mean": np.float64(stats.mean), "std": np.float64(stats.std)}
             np.save(os.path.join(self.cache_path, "energy_stats"), energy_stats, allow_pickle=True)
 
     def get_pad_id(self):
@@ -949,11 +977,13 @@ class EnergyDataset:
         """
         compute energy and return a numpy array of energy values
         """
-        energy_file = self.create_energy_file_path(audio_unique_name, self.cache_path)
-        if not os.path.exists(energy_file):
-            energy = self._compute_and_save_energy(self.ap, wav_file, energy_file)
-        else:
-            energy = np.load(energy_file)
+        if self.cache is None:
+            return self._compute_and_save_energy(self.ap, wav_file).astype(np.float32)
+        energy = self.cache.get_or_compute(
+            audio_unique_name,
+            lambda: self._compute_and_save_energy(self.ap, wav_file),
+            legacy_file=self.create_energy_file_path(audio_unique_name, self.cache_path),
+        )
         return energy.astype(np.float32)
 
     def collate_fn(self, batch):
@@ -0,0 +1,135 @@
+import json
+import os
+from multiprocessing.pool import ThreadPool
+from typing import Callable, Dict, List
+
+from TTS.tts.datasets.preprocess import add_manifest_lengths, load_manifest
+
+
+def compute_sample_lengths(samples: List[Dict], num_workers: int = 8) -> List[Dict]:
+    """Set the `audio_length` in frames and the `text_length` in characters of the samples.
+
+    Lengths that are already set, e.g. from the manifest of a preprocessed dataset, are kept. The audio files are
+    read by a thread pool since the time goes to waiting for the file system.
+    """
+    from TTS.tts.datasets.dataset import get_audio_size  # pylint: disable=import-outside-toplevel
+
+    missing = [item for item in samples if item.get("audio_length") is None]
+    if num_workers > 1 and len(missing) > 1:
+        with ThreadPool(num_workers) as pool:
+            audio_lengths = pool.map(lambda item: get_audio_size(item["audio_file"]), missing, chunksize=64)
+    else:
+        audio_lengths = [get_audio_size(item["audio_file"]) for item in missing]
+    for item, audio_length in zip(missing, audio_lengths):
+        item["audio_length"] = audio_length
+    for item in samples:
+        item["text_length"] = len(item["text"])
+    return samples
+
+
+class DatasetIndex:
+    """Persisted samples of the meta files of datasets with their audio and text lengths.
+
+    Formatting a meta file and reading the length of every audio file takes minutes for large datasets, more so on
+    network file systems. The index stores the formatter output with the lengths in a single JSON file, so the next
+    runs read that file instead. The entry of a meta file is rebuilt when the modification time or the size of the
+    meta file changes, or when it is formatted with another formatter or other ignored speakers. For formatters that
+    scan the dataset folder instead of a meta file, the folder is checked.
+
+    Audio files changed in place are not detected. Delete the index file after modifying the audio files.
+
+    Args:
+        index_path (str): Path to the index file.
+
+    Example:
+        >>> index = DatasetIndex("/data/LJSpeech-1.1/index.json")
+        >>> samples = index.load_samples(ljspeech, "ljspeech", "/data/LJSpeech-1.1", "metadata.csv")
+    """
+
+    version = 1
+
+    def __init__(self, index_path: str):
+        self.index_path = index_path
+        self.entries = {}
+        if os.path.exists(index_path):
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") == self.version:
+                self.entries = index["entries"]
+
+    @staticmethod
+    def get_key(formatter_name: str, root_path: str, meta_file: str) -> str:
+        return f"{formatter_name}|{os.path.abspath(root_path)}|{meta_file}"
+
+    @staticmethod
+    def get_signature(formatter_name: str, root_path: str, meta_file: str, ignored_speakers: List[str]) -> Dict:
+        """Values that invalidate the entry of a meta file when they change."""
+        path = os.path.join(root_path, meta_file) if meta_file else root_path
+        if not os.path.exists(path):
+            path = root_path
+        stat = os.stat(path)
+        return {
+            "formatter": formatter_name,
+            "ignored_speakers": sorted(ignored_speakers) if ignored_speakers else [],
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+
+    def get_samples(
+        self, formatter_name: str, root_path: str, meta_file: str, ignored_speakers: List[str] = None
+    ) -> List[Dict]:
+        """Return the indexed samples of a meta file or None if they are missing or outdated."""
+        entry = self.entries.get(self.get_key(formatter_name, root_path, meta_file))
+        if entry is None or entry["signature"] != self.get_signature(
+            formatter_name, root_path, meta_file, ignored_speakers
+        ):
+            return None
+        # copies, so that changes to the samples don't end up in the index
+        return [dict(item) for item in entry["samples"]]
+
+    def set_samples(
+        self,
+        formatter_name: str,
+        root_path: str,
+        meta_file: str,
+        samples: List[Dict],
+        ignored_speakers: List[str] = None,
+    ) -> None:
+        """Index the samples of a meta file. Samples without lengths get them computed."""
+        samples = add_manifest_lengths(samples, load_manifest(root_path))
+        self.entries[self.get_key(formatter_name, root_path, meta_file)] = {
+            "signature": self.get_signature(formatter_name, root_path, meta_file, ignored_speakers),
+            "samples": [dict(item) for item in compute_sample_lengths(samples)],
+        }
+
+    def load_samples(
+        self,
+        formatter: Callable,
+        formatter_name: str,
+        root_path: str,
+        meta_file: str,
+        ignored_speakers: List[str] = None,
+    ) -> List[Dict]:
+        """Return the indexed samples of a meta file, or format it, index the samples and save the index.
+
+        Args:
+            formatter (Callable): Formatter function from `TTS.tts.datasets.formatters`.
+            formatter_name (str): Name of the formatter, used to tell entries apart.
+            root_path (str): Dataset root folder.
+            meta_file (str): Meta file name passed to the formatter.
+            ignored_speakers (List[str]): Speakers ignored by the formatter. Defaults to None.
+        """
+        samples = self.get_samples(formatter_name, root_path, meta_file, ignored_speakers)
+        if samples is None:
+            samples = formatter(root_path, meta_file, ignored_speakers=ignored_speakers)
+            self.set_samples(formatter_name, root_path, meta_file, samples, ignored_speakers)
+            self.save()
+        return samples
+
+    def save(self) -> None:
+        """Write the index to a temporary file and rename it, so readers never see a partial index."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.index_path)), exist_ok=True)
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": self.version, "entries": self.entries}, f)
+        os.replace(tmp_path, self.index_path)
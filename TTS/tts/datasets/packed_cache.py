@@ -0,0 +1,143 @@
+import os
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class PackedArrayCache:
+    """Cache of variable length 1D arrays packed in a single file.
+
+    The arrays are appended to `<name>.bin` and their position is appended to the `<name>.idx` index as
+    `key<TAB>offset<TAB>length` lines, so a whole dataset uses two files instead of one `.npy` file per sample. The
+    data file is memory-mapped for reading.
+
+    New arrays can be added at any time, also from several dataloader workers at once: appends are serialized with a
+    file lock and the index line is written after the data, so readers never see an incomplete entry. Readers pick up
+    the entries added by the other processes when they look for a missing key.
+
+    Args:
+        cache_path (str): folder of the cache files.
+        name (str): name of the cache files.
+        dtype (np.dtype): data type of the stored arrays.
+
+    Example:
+        >>> cache = PackedArrayCache("phoneme_cache", "phonemes", np.int32)
+        >>> ids = cache.get_or_compute(file_name, lambda: tokenizer.text_to_ids(text))
+    """
+
+    def __init__(self, cache_path: str, name: str, dtype: np.dtype):
+        self.cache_path = cache_path
+        self.data_path = os.path.join(cache_path, f"{name}.bin")
+        self.index_path = os.path.join(cache_path, f"{name}.idx")
+        self.dtype = np.dtype(dtype)
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._index_bytes = 0
+        self._data = None
+
+    def __getstate__(self):
+        # memory maps are not shared with the dataloader workers, they open their own
+        state = self.__dict__.copy()
+        state["_data"] = None
+        return state
+
+    def __contains__(self, key: str) -> bool:
+        if key not in self._index:
+            self._read_index()
+        return key in self._index
+
+    def __len__(self) -> int:
+        self._read_index()
+        return len(self._index)
+
+    def keys(self) -> List[str]:
+        """Keys of the cached arrays."""
+        self._read_index()
+        return list(self._index.keys())
+
+    def _read_index(self) -> None:
+        """Read the index entries added since the last call."""
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_bytes)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # entry being written by another process
+                    break
+                key, offset, length = line.decode("utf-8").rstrip("\n").split("\t")
+                self._index[key] = (int(offset), int(length))
+                self._index_bytes += len(line)
+
+    def _get_data(self, end: int) -> np.memmap:
+        """Memory-map the data file again if it has grown past the mapped part."""
+        if self._data is None or len(self._data) < end:
+            self._data = np.memmap(self.data_path, dtype=self.dtype, mode="r")
+        return self._data
+
+    def get(self, key: str) -> np.ndarray:
+        """Return the array stored under `key` or None if it is not cached."""
+        if key not in self:
+            return None
+        offset, length = self._index[key]
+        if length == 0:
+            return np.zeros(0, dtype=self.dtype)
+        return np.array(self._get_data(offset + length)[offset : offset + length])
+
+    def put(self, key: str, array: np.ndarray) -> None:
+        """Append an array to the cache."""
+        data = np.asarray(array, dtype=self.dtype).reshape(-1)
+        with open(self.index_path, "a", encoding="utf-8") as index_file:
+            if fcntl is not None:
+                fcntl.flock(index_file, fcntl.LOCK_EX)
+            with open(self.data_path, "ab") as data_file:
+                offset = data_file.seek(0, os.SEEK_END) // self.dtype.itemsize
+                data_file.write(data.tobytes())
+            index_file.write(f"{key}\t{offset}\t{len(data)}\n")
+        self._index[key] = (offset, len(data))
+
+    def get_or_compute(self, key: str, compute_fn: Callable, legacy_file: str = None) -> np.ndarray:
+        """Return the cached array or compute and cache it.
+
+        Args:
+            key (str): cache key.
+            compute_fn (Callable): function computing the array when it is not cached.
+            legacy_file (str, optional): `.npy` file of the former one file per sample cache. If it exists, it is
+                moved into the packed cache instead of computing the array again. Defaults to None.
+        """
+        array = self.get(key)
+        if array is not None:
+            return array
+        if legacy_file is not None and os.path.exists(legacy_file):
+            array = np.load(legacy_file)
+        else:
+            array = compute_fn()
+        self.put(key, array)
+        return array
+
+    def import_files(self, suffix: str, remove: bool = False) -> int:
+        """Pack the `<key><suffix>` files of the former one file per sample cache found in `cache_path`.
+
+        Args:
+            suffix (str): file name suffix of the cached arrays, e.g. `_phoneme.npy`.
+            remove (bool): remove the files after packing them. Defaults to False.
+
+        Returns:
+            int: number of packed files.
+        """
+        num_files = 0
+        for file_name in sorted(os.listdir(self.cache_path)):
+            if not file_name.endswith(suffix):
+                continue
+            key = file_name[: -len(suffix)]
+            file_path = os.path.join(self.cache_path, file_name)
+            if key not in self:
+                self.put(key, np.load(file_path))
+                num_files += 1
+            if remove:
+                os.remove(file_path)
+        return num_files
@@ -0,0 +1,103 @@
+import multiprocessing
+from typing import List
+
+import numpy as np
+import tqdm
+
+
+class RunningStats:
+    """Mean and standard deviation of a stream of values.
+
+    Each update folds the moments of a new batch of values into the running ones with Chan's parallel variant of
+    Welford's algorithm, so the values do not need to be kept in memory and the stats of several workers can be merged.
+
+    Example:
+        >>> stats = RunningStats()
+        >>> for pitch in pitches:
+        >>>     stats.update(pitch[pitch != 0.0])
+        >>> stats.mean, stats.std
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / self.count)) if self.count > 0 else 0.0
+
+    def _add_moments(self, count: int, mean: float, m2: float) -> None:
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta**2 * self.count * count / total
+        self.count = total
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of values."""
+        values = np.asarray(values, dtype=np.float64).reshape(-1)
+        if len(values) == 0:
+            return
+        mean = values.mean()
+        self._add_moments(len(values), mean, float(((values - mean) ** 2).sum()))
+
+    def merge(self, other: "RunningStats") -> None:
+        """Add the values seen by another instance."""
+        self._add_moments(other.count, other.mean, other.m2)
+
+
+_worker_dataset = None
+
+
+def _init_worker(dataset):
+    global _worker_dataset  # pylint: disable=global-statement
+    _worker_dataset = dataset
+
+
+def _precompute_chunk(indices: List[int], dataset=None):
+    if dataset is None:
+        dataset = _worker_dataset
+    stats = RunningStats()
+    for idx in indices:
+        values = dataset._precompute_item(idx)  # pylint: disable=protected-access
+        if values is not None:
+            stats.update(values)
+    return len(indices), stats
+
+
+def precompute_dataset(
+    dataset, indices: List[int], num_workers: int = 0, chunk_size: int = 64, desc: str = None
+) -> RunningStats:
+    """Run `dataset._precompute_item()` over the given samples with a pool of processes.
+
+    The samples are sent to the workers in chunks and each worker returns the :class:`RunningStats` of the values
+    returned by `_precompute_item()` for its chunk, so the features are never gathered in the main process. The
+    features are written to the dataset cache by the workers, so an interrupted run resumes where it stopped.
+
+    Args:
+        dataset (Dataset): dataset implementing `_precompute_item(idx)`, returning the values for the stats or None.
+        indices (List[int]): indices of the samples to process.
+        num_workers (int): number of worker processes. 0 processes the samples in the main process. Defaults to 0.
+        chunk_size (int): number of samples sent to a worker at once. Defaults to 64.
+        desc (str): description of the progress bar. Defaults to None.
+
+    Returns:
+        RunningStats: stats of the values returned for all the samples.
+    """
+    chunks = [indices[idx : idx + chunk_size] for idx in range(0, len(indices), chunk_size)]
+    stats = RunningStats()
+    with tqdm.tqdm(total=len(indices), desc=desc) as pbar:
+        if num_workers > 0:
+            with multiprocessing.Pool(num_workers, initializer=_init_worker, initargs=(dataset,)) as pool:
+                for num_samples, chunk_stats in pool.imap_unordered(_precompute_chunk, chunks):
+                    stats.merge(chunk_stats)
+                    pbar.update(num_samples)
+        else:
+            for chunk in chunks:
+                num_samples, chunk_stats = _precompute_chunk(chunk, dataset)
+                stats.merge(chunk_stats)
+                pbar.update(num_samples)
+    return stats
@@ -0,0 +1,270 @@
+"""Single pass audio preprocessing of a dataset: resampling, VAD trimming and loudness normalization.
+
+Every processed file is recorded in a manifest next to the output files. `load_tts_samples()` reads the sample lengths
+from it so the audio files don't have to be opened again to compute them.
+"""
+import glob
+import json
+import multiprocessing
+import os
+import shutil
+from typing import Dict, List, Tuple
+
+import numpy as np
+import soundfile as sf
+import torch
+import torchaudio
+from tqdm import tqdm
+
+MANIFEST_NAME = "audio_manifest.jsonl"
+
+
+def load_manifest(dataset_path: str) -> Dict[str, Dict]:
+    """Load the manifest of a preprocessed dataset.
+
+    Args:
+        dataset_path (str): Dataset root directory, i.e. the output directory of `preprocess_dataset()`.
+
+    Returns:
+        Dict[str, Dict]: Records keyed by the absolute path of the audio file. Empty if there is no manifest.
+    """
+    manifest_path = os.path.join(dataset_path, MANIFEST_NAME)
+    records = {}
+    if not os.path.exists(manifest_path):
+        return records
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # a line is cut if the run was killed while writing it
+                continue
+            records[os.path.abspath(os.path.join(dataset_path, record["audio_file"]))] = record
+    return records
+
+
+def add_manifest_lengths(samples: List[Dict], manifest: Dict[str, Dict]) -> List[Dict]:
+    """Set the `audio_length` of the samples listed in the manifest of a preprocessed dataset."""
+    for item in samples:
+        record = manifest.get(os.path.abspath(item["audio_file"]))
+        if record is not None:
+            item["audio_length"] = record["num_samples"]
+    return samples
+
+
+class AudioPreprocessor:
+    """Resample, trim the nonspeech parts and normalize the loudness of audio files in a single pass.
+
+    Each worker process creates one instance, so the VAD model is loaded once per worker.
+
+    Args:
+        sample_rate (int): Output sample rate. Defaults to None (keep the original).
+        vad (bool): Trim the nonspeech parts with the Silero VAD. Defaults to False.
+        trim_just_beginning_and_end (bool): Only trim the nonspeech parts at the beginning and the end.
+            Defaults to True.
+        db_level (float): Target RMS level in dB. Defaults to None (no normalization).
+        use_cuda (bool): Run the VAD on the GPU. Defaults to False.
+        use_onnx (bool): Use the ONNX VAD model. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = None,
+        vad: bool = False,
+        trim_just_beginning_and_end: bool = True,
+        db_level: float = None,
+        use_cuda: bool = False,
+        use_onnx: bool = False,
+    ):
+        self.sample_rate = sample_rate
+        self.trim_just_beginning_and_end = trim_just_beginning_and_end
+        self.db_level = db_level
+        self.use_cuda = use_cuda
+        self.vad_model_and_utils = None
+        if vad:
+            from TTS.utils.vad import get_vad_model_and_utils  # pylint: disable=import-outside-toplevel
+
+            # the model is downloaded by the main process, workers load it from the hub cache
+            self.vad_model_and_utils = get_vad_model_and_utils(use_cuda=use_cuda, use_onnx=use_onnx, force_reload=False)
+        self._resamplers = {}
+
+    def resample(self, wav: torch.Tensor, sample_rate: int) -> torch.Tensor:
+        if self.sample_rate is None or sample_rate == self.sample_rate:
+            return wav
+        # the resampling kernel is computed once per input sample rate
+        if sample_rate not in self._resamplers:
+            self._resamplers[sample_rate] = torchaudio.transforms.Resample(sample_rate, self.sample_rate)
+        return self._resamplers[sample_rate](wav[None])[0]
+
+    def process(self, wav: np.ndarray, sample_rate: int) -> Tuple[np.ndarray, int, bool]:
+        """Process a waveform.
+
+        Args:
+            wav (np.ndarray): Waveform of shape :math:`[T]` or :math:`[T, C]`. Channels are averaged.
+            sample_rate (int): Sample rate of the waveform.
+
+        Returns:
+            Tuple[np.ndarray, int, bool]: The processed waveform, its sample rate and whether it contains speech.
+        """
+        if wav.ndim > 1:
+            wav = wav.mean(axis=1)
+        wav = self.resample(torch.from_numpy(np.ascontiguousarray(wav, dtype=np.float32)), sample_rate)
+        sample_rate = self.sample_rate or sample_rate
+
+        is_speech = True
+        if self.vad_model_and_utils is not None:
+            from TTS.utils.vad import get_speech  # pylint: disable=import-outside-toplevel
+
+            wav, is_speech = get_speech(
+                self.vad_model_and_utils,
+                wav,
+                sample_rate,
+                trim_just_beginning_and_end=self.trim_just_beginning_and_end,
+                use_cuda=self.use_cuda,
+            )
+
+        wav = wav.cpu().numpy()
+        if self.db_level is not None and np.any(wav):
+            # normalize after trimming so that silences don't lower the RMS
+            from TTS.utils.audio.numpy_transforms import rms_volume_norm  # pylint: disable=import-outside-toplevel
+
+            wav = rms_volume_norm(x=wav, db_level=self.db_level)
+            peak = np.abs(wav).max()
+            if peak > 1.0:
+                wav = wav / peak * 0.999
+        return wav, sample_rate, is_speech
+
+    def process_file(self, input_path: str, output_path: str) -> Dict:
+        """Process an audio file and write the result.
+
+        The output is written to a temporary file first, so an existing output file is always complete.
+
+        Returns:
+            Dict: Sample rate, number of samples, duration and whether the file contains speech.
+        """
+        wav, sample_rate = sf.read(input_path, dtype="float32")
+        wav, sample_rate, is_speech = self.process(wav, sample_rate)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        output_format = os.path.splitext(output_path)[1][1:].upper()
+        tmp_path = os.path.join(os.path.dirname(output_path), f".{os.path.basename(output_path)}.part")
+        sf.write(tmp_path, wav, sample_rate, subtype="PCM_16", format=output_format)
+        os.replace(tmp_path, output_path)
+        return {
+            "sample_rate": sample_rate,
+            "num_samples": len(wav),
+            "duration": len(wav) / sample_rate,
+            "is_speech": is_speech,
+        }
+
+
+# the preprocessor of each worker process
+_preprocessor = None
+
+
+def _init_worker(preprocessor_args: Dict) -> None:
+    global _preprocessor  # pylint: disable=global-statement
+    torch.set_num_threads(1)
+    _preprocessor = AudioPreprocessor(**preprocessor_args)
+
+
+def _process_file(paths: Tuple[str, str]) -> Tuple[str, str, Dict, str]:
+    input_path, output_path = paths
+    try:
+        return input_path, output_path, _preprocessor.process_file(input_path, output_path), None
+    except Exception as e:  # pylint: disable=broad-except
+        return input_path, output_path, None, str(e)
+
+
+def preprocess_dataset(
+    input_dir: str,
+    output_dir: str,
+    audio_glob: str = "**/*.wav",
+    output_ext: str = "wav",
+    copy_globs: List[str] = ("**/*.csv", "**/*.txt"),
+    num_workers: int = 1,
+    force: bool = False,
+    **preprocessor_args,
+) -> Dict[str, Dict]:
+    """Preprocess all the audio files of a dataset into `output_dir`, keeping the directory structure.
+
+    The processed files are written to the manifest `output_dir/audio_manifest.jsonl` as they finish, so an
+    interrupted run resumes where it stopped. Files that are in the manifest and exist are skipped unless `force`
+    is set. The paths of the files that fail are written to `output_dir/failed_files.txt`.
+
+    Args:
+        input_dir (str): Dataset root directory.
+        output_dir (str): Output directory. It must be different from `input_dir`.
+        audio_glob (str): Glob of the audio files relative to `input_dir`. Defaults to `"**/*.wav"`.
+        output_ext (str): Format of the output files. Defaults to `"wav"`.
+        copy_globs (List[str]): Globs of the files copied as they are, e.g. metadata files.
+            Defaults to `("**/*.csv", "**/*.txt")`.
+        num_workers (int): Number of worker processes. Defaults to 1.
+        force (bool): Process the files again even if they are already done. Defaults to False.
+        **preprocessor_args: Arguments of `AudioPreprocessor`.
+
+    Returns:
+        Dict[str, Dict]: Manifest records keyed by the absolute output file path.
+    """
+    if os.path.abspath(input_dir) == os.path.abspath(output_dir):
+        raise ValueError(" [!] The output directory must be different from the input directory.")
+    os.makedirs(output_dir, exist_ok=True)
+
+    for copy_glob in copy_globs:
+        for path in glob.glob(os.path.join(input_dir, copy_glob), recursive=True):
+            output_path = os.path.join(output_dir, os.path.relpath(path, input_dir))
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            shutil.copyfile(path, output_path)
+
+    manifest = {} if force else load_manifest(output_dir)
+    input_paths = sorted(glob.glob(os.path.join(input_dir, audio_glob), recursive=True))
+    jobs = []
+    for input_path in input_paths:
+        output_path = os.path.splitext(os.path.join(output_dir, os.path.relpath(input_path, input_dir)))[0]
+        output_path = os.path.abspath(f"{output_path}.{output_ext}")
+        if output_path not in manifest or not os.path.exists(output_path):
+            jobs.append((input_path, output_path))
+    print(f" > Found {len(input_paths)} audio files, {len(input_paths) - len(jobs)} are already processed.")
+
+    if preprocessor_args.get("vad", False):
+        from TTS.utils.vad import get_vad_model_and_utils  # pylint: disable=import-outside-toplevel
+
+        # download the model once before the workers load it
+        get_vad_model_and_utils(use_onnx=preprocessor_args.get("use_onnx", False))
+
+    failed_files = []
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w", encoding="utf-8") as manifest_file:
+        # rewrite the records of the last runs, which drops the lines of files that are processed again and a line
+        # cut by an interrupted run
+        for output_path, record in manifest.items():
+            if os.path.exists(output_path):
+                manifest_file.write(json.dumps(record) + "\n")
+        if num_workers > 1:
+            pool = multiprocessing.Pool(num_workers, initializer=_init_worker, initargs=(preprocessor_args,))
+            results = pool.imap_unordered(_process_file, jobs, chunksize=8)
+        else:
+            pool = None
+            _init_worker(preprocessor_args)
+            results = map(_process_file, jobs)
+        try:
+            for input_path, output_path, record, error in tqdm(results, total=len(jobs)):
+                if error is not None:
+                    print(f" [!] Failed to process {input_path}: {error}")
+                    failed_files.append(input_path)
+                    continue
+                record = {
+                    "audio_file": os.path.relpath(output_path, output_dir),
+                    "source_file": os.path.relpath(input_path, input_dir),
+                    **record,
+                }
+                manifest[output_path] = record
+                manifest_file.write(json.dumps(record) + "\n")
+                manifest_file.flush()
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+    with open(os.path.join(output_dir, "failed_files.txt"), "w", encoding="utf-8") as f:
+        for path in failed_files:
+            f.write(path + "\n")
+    return manifest
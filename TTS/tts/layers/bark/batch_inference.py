@@ -0,0 +1,409 @@
+"""Batched and streaming versions of the Bark generation functions in `inference_funcs`.
+
+The functions decode several prompts together. Sequences that reach their end leave the batch, and their rows are
+removed from the KV-cache. `iter_audio_batch()` runs the fine model and the codec on chunks of the coarse codes as the
+coarse windows are generated, so that the first audio is ready before the whole utterance is generated.
+"""
+from typing import Iterator, List, Tuple
+
+import numpy as np
+import torch
+import tqdm
+from torch.nn import functional as F
+
+from TTS.tts.layers.bark.inference_funcs import _get_coarse_history, _get_semantic_input, _unflatten_codebooks
+from TTS.tts.layers.bark.load_model import clear_cuda_cache, inference_mode
+
+
+def _expand_history_prompts(history_prompts, num_prompts: int) -> List[Tuple]:
+    """Return a `(semantic_history, coarse_history, fine_history)` tuple per prompt from a single tuple, used for
+    all the prompts, or from a list of them."""
+    if history_prompts is None:
+        return [(None, None, None)] * num_prompts
+    if isinstance(history_prompts, tuple):
+        return [history_prompts] * num_prompts
+    if len(history_prompts) != num_prompts:
+        raise ValueError(f" [!] Expected {num_prompts} history prompts, got {len(history_prompts)}.")
+    return [(None, None, None) if prompt is None else prompt for prompt in history_prompts]
+
+
+def _has_history(history_prompt) -> bool:
+    return all(v is not None for v in history_prompt)
+
+
+def _select_rows(kv_cache, rows: torch.Tensor):
+    """Keep the `rows` of the batch in the per layer `(key, value)` cache."""
+    return tuple((key.index_select(0, rows), value.index_select(0, rows)) for key, value in kv_cache)
+
+
+def _sample_next(logits: torch.Tensor, temp: float, top_k: int = None, top_p: float = None):
+    """Sample a token per row of `logits` with the same top-p, top-k and temperature steps as `inference_funcs`.
+
+    Returns:
+        Tuple[torch.Tensor, torch.Tensor]: the tokens of shape :math:`[B]` and the probabilities of shape :math:`[B, V]`.
+    """
+    logits = logits.float()
+    if top_p is not None:
+        sorted_logits, sorted_indices = torch.sort(logits, dim=-1, descending=True)
+        cumulative_probs = torch.cumsum(F.softmax(sorted_logits, dim=-1), dim=-1)
+        sorted_indices_to_remove = cumulative_probs > top_p
+        sorted_indices_to_remove[:, 1:] = sorted_indices_to_remove[:, :-1].clone()
+        sorted_indices_to_remove[:, 0] = False
+        indices_to_remove = sorted_indices_to_remove.scatter(1, sorted_indices, sorted_indices_to_remove)
+        logits = logits.masked_fill(indices_to_remove, -float("Inf"))
+    if top_k is not None:
+        v, _ = torch.topk(logits, min(top_k, logits.size(-1)), dim=-1)
+        logits = logits.masked_fill(logits < v[:, [-1]], -float("Inf"))
+    probs = F.softmax(logits / temp, dim=-1)
+    return torch.multinomial(probs, num_samples=1).squeeze(1), probs
+
+
+def generate_text_semantic_batch(
+    texts: List[str],
+    model,
+    history_prompts=None,
+    temp=0.7,
+    top_k=None,
+    top_p=None,
+    silent=False,
+    min_eos_p=0.2,
+    max_gen_duration_s=None,
+    allow_early_stop=True,
+    **kwargs,  # pylint: disable=unused-argument
+) -> List[np.ndarray]:
+    """Generate the semantic tokens of several texts in one batch. See `generate_text_semantic()`.
+
+    All the inputs have the same length, so the sequences run in lockstep without padding. A sequence leaves the batch
+    when it predicts the end of sentence.
+
+    Args:
+        texts (List[str]): The texts to generate semantic tokens from.
+        model (BarkModel): The BarkModel to use for generating the semantic tokens.
+        history_prompts (Union[tuple, List[tuple]]): A `(semantic_history, coarse_history, fine_history)` prompt for
+            all the texts or a list with a prompt per text.
+
+    Returns:
+        List[np.ndarray]: The generated semantic tokens of each text.
+    """
+    history_prompts = _expand_history_prompts(history_prompts, len(texts))
+    x = torch.stack(
+        [_get_semantic_input(text, model, history_prompt=prompt) for text, prompt in zip(texts, history_prompts)]
+    )
+    outputs = [[] for _ in texts]
+    with inference_mode():
+        x_input = x.to(model.device)
+        n_tot_steps = 768
+        active = list(range(len(texts)))  # index of the text of each row of the batch
+        kv_cache = None
+        for n in tqdm.tqdm(range(n_tot_steps), disable=silent):
+            logits, kv_cache = model.semantic_model(x_input, merge_context=True, use_cache=True, past_kv=kv_cache)
+            relevant_logits = logits[:, 0, : model.config.SEMANTIC_VOCAB_SIZE]
+            if allow_early_stop:
+                relevant_logits = torch.hstack((relevant_logits, logits[:, 0, [model.config.SEMANTIC_PAD_TOKEN]]))
+            item_next, probs = _sample_next(relevant_logits, temp, top_k=top_k, top_p=top_p)
+            if allow_early_stop:
+                finished = item_next == model.config.SEMANTIC_VOCAB_SIZE
+                if min_eos_p is not None:
+                    finished |= probs[:, -1] >= min_eos_p
+                finished = finished.tolist()
+            else:
+                finished = [False] * len(active)
+            for row, (item, done) in enumerate(zip(item_next.tolist(), finished)):
+                if not done:
+                    outputs[active[row]].append(item)
+            if max_gen_duration_s is not None and (n + 1) / model.config.SEMANTIC_RATE_HZ > max_gen_duration_s:
+                break
+            keep = [row for row, done in enumerate(finished) if not done]
+            if not keep:
+                break
+            if len(keep) < len(active):
+                rows = torch.tensor(keep, device=item_next.device)
+                kv_cache = _select_rows(kv_cache, rows)
+                item_next = item_next.index_select(0, rows)
+                active = [active[row] for row in keep]
+            x_input = item_next[:, None]
+    clear_cuda_cache()
+    return [np.array(out, dtype=np.int64) for out in outputs]
+
+
+def iter_coarse_batch(
+    x_semantics: List[np.ndarray],
+    model,
+    history_prompts=None,
+    temp=0.7,
+    top_k=None,
+    top_p=None,
+    silent=False,
+    max_coarse_history=630,
+    sliding_window_len=60,
+) -> Iterator[Tuple[List[np.ndarray], List[bool]]]:
+    """Generate the coarse codes of several semantic token sequences, a sliding window at a time. See
+    `generate_coarse()`.
+
+    The sequences of a window are decoded in one batch per input length, which is the same for all of them unless
+    their histories differ. A sequence leaves the batch when all its codes are generated.
+
+    Args:
+        x_semantics (List[np.ndarray]): The semantic tokens of each sequence.
+        model (BarkModel): The BarkModel to use for generating the coarse audio codes.
+        history_prompts (Union[tuple, List[tuple]]): A prompt for all the sequences or a list with a prompt per
+            sequence.
+
+    Yields:
+        Tuple[List[np.ndarray], List[bool]]: For each sequence, the coarse codes generated in the window, of shape
+        `[N_COARSE_CODEBOOKS, T]` with `T` possibly 0, and whether all its codes are generated.
+    """
+    assert 60 <= max_coarse_history <= 630
+    assert max_coarse_history + sliding_window_len <= 1024 - 256
+    assert sliding_window_len % model.config.N_COARSE_CODEBOOKS == 0
+    history_prompts = _expand_history_prompts(history_prompts, len(x_semantics))
+    semantic_to_coarse_ratio = (
+        model.config.COARSE_RATE_HZ / model.config.SEMANTIC_RATE_HZ * model.config.N_COARSE_CODEBOOKS
+    )
+    max_semantic_history = int(np.floor(max_coarse_history / semantic_to_coarse_ratio))
+    base_semantic_idxs, n_steps, x_semantic_ins, x_coarse_ins = [], [], [], []
+    with inference_mode():
+        for x_semantic, prompt in zip(x_semantics, history_prompts):
+            x_semantic_history, x_coarse_history = _get_coarse_history(
+                model, max_semantic_history, history_prompt=prompt
+            )
+            n_steps.append(
+                int(
+                    round(
+                        np.floor(len(x_semantic) * semantic_to_coarse_ratio / model.config.N_COARSE_CODEBOOKS)
+                        * model.config.N_COARSE_CODEBOOKS
+                    )
+                )
+            )
+            base_semantic_idxs.append(len(x_semantic_history))
+            x_semantic_ins.append(
+                torch.from_numpy(np.hstack([x_semantic_history, x_semantic]).astype(np.int32)).to(model.device)
+            )
+            x_coarse_ins.append(torch.from_numpy(x_coarse_history.astype(np.int32)).to(model.device))
+    n_window_steps = int(np.ceil(max(n_steps) / sliding_window_len)) if n_steps else 0
+    infer_token = torch.tensor([model.config.COARSE_INFER_TOKEN], dtype=torch.int32, device=model.device)
+    for window in tqdm.tqdm(range(n_window_steps), disable=silent):
+        n_step = window * sliding_window_len  # the same for all the sequences in the window
+        new_tokens = [[] for _ in x_semantics]
+        groups = {}
+        for idx in range(len(x_semantics)):
+            if n_step >= n_steps[idx]:
+                continue
+            semantic_idx = base_semantic_idxs[idx] + int(round(n_step / semantic_to_coarse_ratio))
+            x_in = x_semantic_ins[idx][np.max([0, semantic_idx - max_semantic_history]) :][:256]
+            x_in = F.pad(x_in, (0, 256 - x_in.shape[-1]), "constant", model.config.COARSE_SEMANTIC_PAD_TOKEN)
+            x_in = torch.cat([x_in, infer_token, x_coarse_ins[idx][-max_coarse_history:]])
+            groups.setdefault(x_in.shape[0], []).append((idx, x_in))
+        # the context is not kept open while the caller runs
+        with inference_mode():
+            for group in groups.values():
+                active = [idx for idx, _ in group]
+                x_input = torch.stack([x_in for _, x_in in group])
+                kv_cache = None
+                for step in range(n_step, n_step + sliding_window_len):
+                    is_major_step = step % model.config.N_COARSE_CODEBOOKS == 0
+                    logits, kv_cache = model.coarse_model(x_input, use_cache=True, past_kv=kv_cache)
+                    logit_start_idx = (
+                        model.config.SEMANTIC_VOCAB_SIZE + (1 - int(is_major_step)) * model.config.CODEBOOK_SIZE
+                    )
+                    logit_end_idx = logit_start_idx + model.config.CODEBOOK_SIZE
+                    item_next, _ = _sample_next(logits[:, 0, logit_start_idx:logit_end_idx], temp, top_k, top_p)
+                    item_next = (item_next + logit_start_idx).to(torch.int32)
+                    for idx, item in zip(active, item_next.tolist()):
+                        new_tokens[idx].append(item)
+                    keep = [row for row, idx in enumerate(active) if step + 1 < n_steps[idx]]
+                    if not keep:
+                        break
+                    if len(keep) < len(active):
+                        rows = torch.tensor(keep, device=item_next.device)
+                        kv_cache = _select_rows(kv_cache, rows)
+                        item_next = item_next.index_select(0, rows)
+                        active = [active[row] for row in keep]
+                    x_input = item_next[:, None]
+        codes = []
+        for idx, tokens in enumerate(new_tokens):
+            tokens = np.array(tokens, dtype=np.int32)
+            x_coarse_ins[idx] = torch.cat([x_coarse_ins[idx], torch.from_numpy(tokens).to(model.device)])
+            codes.append(_unflatten_codebooks(tokens, model))
+        yield codes, [n_step + sliding_window_len >= num_steps for num_steps in n_steps]
+    clear_cuda_cache()
+
+
+def generate_coarse_batch(x_semantics: List[np.ndarray], model, history_prompts=None, **kwargs) -> List[np.ndarray]:
+    """Generate the coarse codes of several semantic token sequences. See `iter_coarse_batch()` for the arguments.
+
+    Returns:
+        List[np.ndarray]: The coarse codes of each sequence, of shape `[N_COARSE_CODEBOOKS, T]`.
+    """
+    codes = [[np.zeros((model.config.N_COARSE_CODEBOOKS, 0), dtype=np.int32)] for _ in x_semantics]
+    for window_codes, _ in iter_coarse_batch(x_semantics, model, history_prompts=history_prompts, **kwargs):
+        for idx, window_code in enumerate(window_codes):
+            codes[idx].append(window_code)
+    return [np.hstack(seq_codes) for seq_codes in codes]
+
+
+def generate_fine_batch(
+    x_coarse_gens: List[np.ndarray], model, fine_histories: List[np.ndarray] = None, temp=0.5
+) -> List[np.ndarray]:
+    """Generate the fine codes of several coarse code chunks with one pass of the fine model per codebook.
+
+    Each chunk fills the 1024 frames of the fine model with its history, like the first loop of `generate_fine()`, so
+    chunks are limited to 512 frames and histories are trimmed to 512 frames.
+
+    Args:
+        x_coarse_gens (List[np.ndarray]): The coarse codes of each chunk, of shape `[N_COARSE_CODEBOOKS, T]`.
+        model (BarkModel): The BarkModel to use for generating the fine codes.
+        fine_histories (List[np.ndarray]): The fine codes before each chunk, of shape `[N_FINE_CODEBOOKS, T]`, or None.
+        temp (float): The temperature to use for the generation. None picks the most likely codes.
+
+    Returns:
+        List[np.ndarray]: The fine codes of each chunk, of shape `[N_FINE_CODEBOOKS, T]`.
+    """
+    fine_histories = [None] * len(x_coarse_gens) if fine_histories is None else fine_histories
+    n_coarse = x_coarse_gens[0].shape[0]
+    in_arrs, n_histories = [], []
+    for x_coarse_gen, x_fine_history in zip(x_coarse_gens, fine_histories):
+        if x_coarse_gen.shape[0] != n_coarse or not 0 < x_coarse_gen.shape[1] <= 512:
+            raise ValueError(f" [!] Coarse chunks must have {n_coarse} codebooks and 1 to 512 frames.")
+        in_arr = np.vstack(
+            [
+                x_coarse_gen,
+                np.zeros((model.config.N_FINE_CODEBOOKS - n_coarse, x_coarse_gen.shape[1]))
+                + model.config.CODEBOOK_SIZE,
+            ]
+        ).astype(np.int32)
+        if x_fine_history is not None:
+            in_arr = np.hstack([x_fine_history[:, -512:].astype(np.int32), in_arr])
+        n_histories.append(in_arr.shape[1] - x_coarse_gen.shape[1])
+        # pad to the context of the non-causal model
+        in_arr = np.hstack(
+            [
+                in_arr,
+                np.zeros((model.config.N_FINE_CODEBOOKS, 1024 - in_arr.shape[1]), dtype=np.int32)
+                + model.config.CODEBOOK_SIZE,
+            ]
+        )
+        in_arrs.append(in_arr.T)
+    with inference_mode():
+        in_buffer = torch.from_numpy(np.stack(in_arrs)).to(model.device)
+        # the history frames are given, the following ones are predicted
+        fill_mask = (
+            torch.arange(1024, device=model.device)[None] >= torch.tensor(n_histories, device=model.device)[:, None]
+        )
+        for nn in range(n_coarse, model.config.N_FINE_CODEBOOKS):
+            logits = model.fine_model(nn, in_buffer)[:, :, : model.config.CODEBOOK_SIZE]
+            if temp is None:
+                codebook_preds = torch.argmax(logits, -1)
+            else:
+                probs = F.softmax(logits.float() / temp, dim=-1)
+                codebook_preds = torch.multinomial(probs.reshape(-1, probs.shape[-1]), num_samples=1)
+                codebook_preds = codebook_preds.reshape(probs.shape[:2])
+            in_buffer[:, :, nn] = torch.where(fill_mask, codebook_preds.to(in_buffer.dtype), in_buffer[:, :, nn])
+        gen_fine_arr = in_buffer.cpu().numpy().transpose(0, 2, 1)
+    return [
+        gen_fine_arr[idx, :, n_history : n_history + x_coarse_gen.shape[1]]
+        for idx, (x_coarse_gen, n_history) in enumerate(zip(x_coarse_gens, n_histories))
+    ]
+
+
+def codec_decode_batch(fine_tokens: List[np.ndarray], model) -> List[np.ndarray]:
+    """Turn the quantized audio codes of several sequences into audio arrays, decoding the ones of the same length
+    together. See `codec_decode()`."""
+    audio_arrs = [None] * len(fine_tokens)
+    groups = {}
+    for idx, tokens in enumerate(fine_tokens):
+        groups.setdefault(tokens.shape[-1], []).append(idx)
+    with inference_mode():
+        for idxs in groups.values():
+            arr = torch.from_numpy(np.stack([fine_tokens[idx] for idx in idxs]).astype(np.int64)).to(model.device)
+            emb = model.encodec.quantizer.decode(arr.transpose(0, 1))
+            out = model.encodec.decoder(emb).float().cpu().numpy()
+            for idx, audio_arr in zip(idxs, out):
+                audio_arrs[idx] = audio_arr.squeeze(0)
+    return audio_arrs
+
+
+def iter_audio_batch(
+    texts: List[str],
+    model,
+    history_prompts=None,
+    text_temp=0.7,
+    waveform_temp=0.7,
+    fine_temp=0.5,
+    stream_chunk_size=150,
+    decode_context_size=32,
+    silent=False,
+    **kwargs,
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """Generate the audio of several texts in batches and yield it in chunks as soon as they are decoded.
+
+    The semantic tokens of all the texts are generated first since the coarse model looks ahead in them. The coarse
+    codes are then generated a sliding window at a time. Every `stream_chunk_size` coarse frames of a text, the chunk
+    goes through the fine model, with the previous fine codes as history, and the codec. The codec decodes the chunk
+    after `decode_context_size` frames of the previous chunk, whose audio is dropped, to smooth the boundaries.
+
+    The fine codes differ from the ones of the single pass of `generate_fine()` since each chunk only sees the
+    previous ones.
+
+    Args:
+        texts (List[str]): The texts to be turned into audio.
+        model (BarkModel): The BarkModel to use for the generation.
+        history_prompts (Union[tuple, List[tuple]]): A prompt for all the texts or a list with a prompt per text.
+        text_temp (float): The temperature of the semantic model.
+        waveform_temp (float): The temperature of the coarse model.
+        fine_temp (float): The temperature of the fine model.
+        stream_chunk_size (int): The number of coarse frames decoded at a time, at most 512. 75 frames are one second.
+        decode_context_size (int): The number of frames of the previous chunk decoded again before a chunk.
+        silent (bool): Whether to silence the tqdm progress bars.
+        **kwargs: Additional arguments of `generate_text_semantic_batch()`.
+
+    Yields:
+        Tuple[int, np.ndarray]: The index of the text and the next chunk of its audio at 24kHz.
+    """
+    if not 0 < stream_chunk_size <= 512:
+        raise ValueError(f" [!] `stream_chunk_size` must be between 1 and 512, got {stream_chunk_size}.")
+    history_prompts = _expand_history_prompts(history_prompts, len(texts))
+    x_semantics = generate_text_semantic_batch(
+        texts, model, history_prompts=history_prompts, temp=text_temp, silent=silent, **kwargs
+    )
+    # texts without semantic tokens have no audio
+    idxs = [idx for idx, x_semantic in enumerate(x_semantics) if len(x_semantic) > 0]
+    if not idxs:
+        return
+    pending = {idx: np.zeros((model.config.N_COARSE_CODEBOOKS, 0), dtype=np.int32) for idx in idxs}
+    fine_histories = {idx: history_prompts[idx][2] if _has_history(history_prompts[idx]) else None for idx in idxs}
+    decoded = {idx: None for idx in idxs}
+    for window_codes, finished in iter_coarse_batch(
+        [x_semantics[idx] for idx in idxs],
+        model,
+        history_prompts=[history_prompts[idx] for idx in idxs],
+        temp=waveform_temp,
+        silent=silent,
+    ):
+        for idx, codes in zip(idxs, window_codes):
+            pending[idx] = np.hstack([pending[idx], codes])
+        while True:
+            ready = [
+                idx
+                for idx, done in zip(idxs, finished)
+                if pending[idx].shape[1] >= stream_chunk_size or (done and pending[idx].shape[1] > 0)
+            ]
+            if not ready:
+                break
+            chunks = [pending[idx][:, :stream_chunk_size] for idx in ready]
+            for idx in ready:
+                pending[idx] = pending[idx][:, stream_chunk_size:]
+            fine_chunks = generate_fine_batch(chunks, model, [fine_histories[idx] for idx in ready], temp=fine_temp)
+            tokens = []
+            for idx, fine_chunk in zip(ready, fine_chunks):
+                history = fine_histories[idx]
+                fine_histories[idx] = fine_chunk if history is None else np.hstack([history, fine_chunk])[:, -512:]
+                context = decoded[idx]
+                tokens.append(fine_chunk if context is None else np.hstack([context, fine_chunk]))
+                decoded[idx] = fine_chunk[:, -decode_context_size:] if decode_context_size > 0 else None
+            for idx, fine_chunk, chunk_tokens, audio_arr in zip(
+                ready, fine_chunks, tokens, codec_decode_batch(tokens, model)
+            ):
+                # drop the audio of the context frames
+                hop_length = audio_arr.shape[-1] // chunk_tokens.shape[-1]
+                yield idx, audio_arr[(chunk_tokens.shape[-1] - fine_chunk.shape[-1]) * hop_length :]
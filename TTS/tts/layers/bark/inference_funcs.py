@@ -149,41 +149,9 @@ def generate_voice(
     np.savez(output_path, fine_prompt=codes, coarse_prompt=codes[:2, :], semantic_prompt=semantic_tokens)
 
 
-def generate_text_semantic(
-    text,
-    model,
-    history_prompt=None,
-    temp=0.7,
-    top_k=None,
-    top_p=None,
-    silent=False,
-    min_eos_p=0.2,
-    max_gen_duration_s=None,
-    allow_early_stop=True,
-    base=None,
-    use_kv_caching=True,
-    **kwargs,  # pylint: disable=unused-argument
-):
-    """Generate semantic tokens from text.
-
-    Args:
-        text (str): The text to generate semantic tokens from.
-        model (BarkModel): The BarkModel to use for generating the semantic tokens.
-        history_prompt (tuple): A tuple of (semantic_history, coarse_history, fine_history) to use as a prompt for the generation.
-        temp (float): The temperature to use for the generation.
-        top_k (int): The number of top tokens to consider for the generation.
-        top_p (float): The cumulative probability to consider for the generation.
-        silent (bool): Whether to silence the tqdm progress bar.
-        min_eos_p (float): The minimum probability to consider for the end of sentence token.
-        max_gen_duration_s (float): The maximum duration in seconds to generate for.
-        allow_early_stop (bool): Whether to allow the generation to stop early.
-        base (tuple): A tuple of (semantic_history, coarse_history, fine_history) to use as a base for the generation.
-        use_kv_caching (bool): Whether to use key-value caching for the generation.
-        **kwargs: Additional keyword arguments. They are ignored.
-
-    Returns:
-        np.ndarray: The generated semantic tokens.
-    """
+def _get_semantic_input(text, model, history_prompt=None, base=None):
+    """Return the input of the semantic model: the text tokens and the semantic history, each padded to 256 tokens,
+    followed by the infer token."""
     assert isinstance(text, str)
     text = _normalize_whitespace(text)
     assert len(text.strip()) > 0
@@ -226,8 +194,47 @@ def generate_text_semantic(
         semantic_history = np.array([model.config.SEMANTIC_PAD_TOKEN] * 256)
     x = torch.from_numpy(
         np.hstack([encoded_text, semantic_history, np.array([model.config.SEMANTIC_INFER_TOKEN])]).astype(np.int64)
-    )[None]
-    assert x.shape[1] == 256 + 256 + 1
+    )
+    assert x.shape[0] == 256 + 256 + 1
+    return x
+
+
+def generate_text_semantic(
+    text,
+    model,
+    history_prompt=None,
+    temp=0.7,
+    top_k=None,
+    top_p=None,
+    silent=False,
+    min_eos_p=0.2,
+    max_gen_duration_s=None,
+    allow_early_stop=True,
+    base=None,
+    use_kv_caching=True,
+    **kwargs,  # pylint: disable=unused-argument
+):
+    """Generate semantic tokens from text.
+
+    Args:
+        text (str): The text to generate semantic tokens from.
+        model (BarkModel): The BarkModel to use for generating the semantic tokens.
+        history_prompt (tuple): A tuple of (semantic_history, coarse_history, fine_history) to use as a prompt for the generation.
+        temp (float): The temperature to use for the generation.
+        top_k (int): The number of top tokens to consider for the generation.
+        top_p (float): The cumulative probability to consider for the generation.
+        silent (bool): Whether to silence the tqdm progress bar.
+        min_eos_p (float): The minimum probability to consider for the end of sentence token.
+        max_gen_duration_s (float): The maximum duration in seconds to generate for.
+        allow_early_stop (bool): Whether to allow the generation to stop early.
+        base (tuple): A tuple of (semantic_history, coarse_history, fine_history) to use as a base for the generation.
+        use_kv_caching (bool): Whether to use key-value caching for the generation.
+        **kwargs: Additional keyword arguments. They are ignored.
+
+    Returns:
+        np.ndarray: The generated semantic tokens.
+    """
+    x = _get_semantic_input(text, model, history_prompt=history_prompt, base=base)[None]
     with inference_mode():
         x = x.to(model.device)
         n_tot_steps = 768
@@ -304,50 +311,11 @@ def _flatten_codebooks(arr, offset_size):
     return flat_arr
 
 
-def generate_coarse(
-    x_semantic,
-    model,
-    history_prompt=None,
-    temp=0.7,
-    top_k=None,
-    top_p=None,
-    silent=False,
-    max_coarse_history=630,  # min 60 (faster), max 630 (more context)
-    sliding_window_len=60,
-    base=None,
-    use_kv_caching=True,
-):
-    """Generate coarse audio codes from semantic tokens.
-
-    Args:
-        x_semantic (np.ndarray): The semantic tokens to generate coarse audio codes from.
-        model (BarkModel): The BarkModel to use for generating the coarse audio codes.
-        history_prompt (tuple): A tuple of (semantic_history, coarse_history, fine_history) to use as a prompt for the generation.
-        temp (float): The temperature to use for the generation.
-        top_k (int): The number of top tokens to consider for the generation.
-        top_p (float): The cumulative probability to consider for the generation.
-        silent (bool): Whether to silence the tqdm progress bar.
-        max_coarse_history (int): The maximum number of coarse audio codes to use as history.
-        sliding_window_len (int): The length of the sliding window to use for the generation.
-        base (tuple): A tuple of (semantic_history, coarse_history, fine_history) to use as a base for the generation.
-        use_kv_caching (bool): Whether to use key-value caching for the generation.
-
-    Returns:
-        np.ndarray: The generated coarse audio codes.
-    """
-    assert (
-        isinstance(x_semantic, np.ndarray)
-        and len(x_semantic.shape) == 1
-        and len(x_semantic) > 0
-        and x_semantic.min() >= 0
-        and x_semantic.max() <= model.config.SEMANTIC_VOCAB_SIZE - 1
-    )
-    assert 60 <= max_coarse_history <= 630
-    assert max_coarse_history + sliding_window_len <= 1024 - 256
+def _get_coarse_history(model, max_semantic_history, history_prompt=None, base=None):
+    """Return the semantic and the flattened coarse histories of the prompt, trimmed to match each other."""
     semantic_to_coarse_ratio = (
         model.config.COARSE_RATE_HZ / model.config.SEMANTIC_RATE_HZ * model.config.N_COARSE_CODEBOOKS
     )
-    max_semantic_history = int(np.floor(max_coarse_history / semantic_to_coarse_ratio))
     if all(v is not None for v in history_prompt) or base is not None:
         if history_prompt is not None:
             x_history = history_prompt
@@ -392,6 +360,64 @@ def generate_coarse(
     else:
         x_semantic_history = np.array([], dtype=np.int32)
         x_coarse_history = np.array([], dtype=np.int32)
+    return x_semantic_history, x_coarse_history
+
+
+def _unflatten_codebooks(flat_arr, model):
+    """Turn the flat coarse model outputs into the codes of the coarse codebooks, the inverse of `_flatten_codebooks`."""
+    arr = flat_arr.reshape(-1, model.config.N_COARSE_CODEBOOKS).T - model.config.SEMANTIC_VOCAB_SIZE
+    for n in range(1, model.config.N_COARSE_CODEBOOKS):
+        arr[n, :] -= n * model.config.CODEBOOK_SIZE
+    return arr
+
+
+def generate_coarse(
+    x_semantic,
+    model,
+    history_prompt=None,
+    temp=0.7,
+    top_k=None,
+    top_p=None,
+    silent=False,
+    max_coarse_history=630,  # min 60 (faster), max 630 (more context)
+    sliding_window_len=60,
+    base=None,
+    use_kv_caching=True,
+):
+    """Generate coarse audio codes from semantic tokens.
+
+    Args:
+        x_semantic (np.ndarray): The semantic tokens to generate coarse audio codes from.
+        model (BarkModel): The BarkModel to use for generating the coarse audio codes.
+        history_prompt (tuple): A tuple of (semantic_history, coarse_history, fine_history) to use as a prompt for the generation.
+        temp (float): The temperature to use for the generation.
+        top_k (int): The number of top tokens to consider for the generation.
+        top_p (float): The cumulative probability to consider for the generation.
+        silent (bool): Whether to silence the tqdm progress bar.
+        max_coarse_history (int): The maximum number of coarse audio codes to use as history.
+        sliding_window_len (int): The length of the sliding window to use for the generation.
+        base (tuple): A tuple of (semantic_history, coarse_history, fine_history) to use as a base for the generation.
+        use_kv_caching (bool): Whether to use key-value caching for the generation.
+
+    Returns:
+        np.ndarray: The generated coarse audio codes.
+    """
+    assert (
+        isinstance(x_semantic, np.ndarray)
+        and len(x_semantic.shape) == 1
+        and len(x_semantic) > 0
+        and x_semantic.min() >= 0
+        and x_semantic.max() <= model.config.SEMANTIC_VOCAB_SIZE - 1
+    )
+    assert 60 <= max_coarse_history <= 630
+    assert max_coarse_history + sliding_window_len <= 1024 - 256
+    semantic_to_coarse_ratio = (
+        model.config.COARSE_RATE_HZ / model.config.SEMANTIC_RATE_HZ * model.config.N_COARSE_CODEBOOKS
+    )
+    max_semantic_history = int(np.floor(max_coarse_history / semantic_to_coarse_ratio))
+    x_semantic_history, x_coarse_history = _get_coarse_history(
+        model, max_semantic_history, history_prompt=history_prompt, base=base
+    )
     # start loop
     n_steps = int(
         round(
@@ -472,11 +498,7 @@ def generate_coarse(
     gen_coarse_arr = x_coarse_in.detach().cpu().numpy().squeeze()[len(x_coarse_history) :]
     del x_coarse_in
     assert len(gen_coarse_arr) == n_steps
-    gen_coarse_audio_arr = (
-        gen_coarse_arr.reshape(-1, model.config.N_COARSE_CODEBOOKS).T - model.config.SEMANTIC_VOCAB_SIZE
-    )
-    for n in range(1, model.config.N_COARSE_CODEBOOKS):
-        gen_coarse_audio_arr[n, :] -= n * model.config.CODEBOOK_SIZE
+    gen_coarse_audio_arr = _unflatten_codebooks(gen_coarse_arr, model)
     clear_cuda_cache()
     return gen_coarse_audio_arr
 
@@ -10,6 +10,7 @@ import tqdm
 
 from TTS.tts.layers.bark.model import GPT, GPTConfig
 from TTS.tts.layers.bark.model_fine import FineGPT, FineGPTConfig
+from TTS.utils.io import load_fsspec
 
 if (
     torch.cuda.is_available()
@@ -118,7 +119,7 @@ def load_model(ckpt_path, device, config, model_type="text"):
         logger.info(f"{model_type} model not found, downloading...")
         _download(config.REMOTE_MODEL_PATHS[model_type]["path"], ckpt_path, config.CACHE_DIR)
 
-    checkpoint = torch.load(ckpt_path, map_location=device)
+    checkpoint = load_fsspec(ckpt_path, map_location=device)
     # this is a hack
     model_args = checkpoint["model_args"]
     if "input_vocab_size" not in model_args:
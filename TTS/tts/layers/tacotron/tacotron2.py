@@ -326,14 +326,17 @@ class Decoder(nn.Module):
         outputs, stop_tokens, alignments = self._parse_outputs(outputs, stop_tokens, alignments)
         return outputs, alignments, stop_tokens
 
-    def inference(self, inputs):
+    def inference(self, inputs, mask=None):
         r"""Decoder inference without teacher forcing and use
-        Stopnet to stop decoder.
+        Stopnet to stop decoder. In batch mode the decoder runs until every
+        sample predicts its stop token.
         Args:
             inputs: Encoder outputs.
+            mask: Attention mask for padded encoder outputs in batch mode.
 
         Shapes:
             - inputs: (B, T, D_out_enc)
+            - mask: (B, T_in)
             - outputs: (B, T_mel, D_mel)
             - alignments: (B, T_in, T_out)
             - stop_tokens: (B, T_out)
@@ -341,10 +344,11 @@ class Decoder(nn.Module):
         memory = self.get_go_frame(inputs)
         memory = self._update_memory(memory)
 
-        self._init_states(inputs, mask=None)
+        self._init_states(inputs, mask=mask)
         self.attention.init_states(inputs)
 
         outputs, stop_tokens, alignments, t = [], [], [], 0
+        stopped = torch.zeros(inputs.shape[0], dtype=torch.bool, device=inputs.device)
         while True:
             memory = self.prenet(memory)
             decoder_output, alignment, stop_token = self.decode(memory)
@@ -353,7 +357,9 @@ class Decoder(nn.Module):
             stop_tokens += [stop_token]
             alignments += [alignment]
 
-            if stop_token > self.stop_threshold and t > inputs.shape[0] // 2:
+            if t > inputs.shape[0] // 2:
+                stopped |= stop_token.view(-1) > self.stop_threshold
+            if stopped.all():
                 break
             if len(outputs) == self.max_decoder_steps:
                 print(f"   > Decoder stopped with `max_decoder_steps` {self.max_decoder_steps}")
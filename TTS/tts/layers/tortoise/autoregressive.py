@@ -45,6 +45,8 @@ class GPT2InferenceModel(GPT2PreTrainedModel):
         self.embeddings = embeddings
         self.lm_head = nn.Sequential(norm, linear)
         self.kv_cache = kv_cache
+        # latents of the generated tokens, collected when it is a list
+        self.collected_latents = None
 
     def store_mel_emb(self, mel_emb):
         self.cached_mel_emb = mel_emb
@@ -133,7 +135,11 @@ class GPT2InferenceModel(GPT2PreTrainedModel):
             return_dict=return_dict,
         )
         hidden_states = transformer_outputs[0]
-        lm_logits = self.lm_head(hidden_states)
+        latents = self.lm_head[0](hidden_states)
+        lm_logits = self.lm_head[1](latents)
+        if self.collected_latents is not None:
+            # the last position is the input of the token being generated
+            self.collected_latents.append(latents[:, -1:])
 
         if not return_dict:
             return (lm_logits,) + transformer_outputs[1:]
@@ -557,8 +563,15 @@ class UnifiedVoice(nn.Module):
         max_generate_length=None,
         typical_sampling=False,
         typical_mass=0.9,
+        return_latents=False,
         **hf_generate_kwargs,
     ):
+        """Generate mel codes.
+
+        If `return_latents` is True, the final hidden states the codes were sampled from are returned as well. They
+        are the latents `forward(..., return_latent=True)` computes for the codes, so the diffusion model can be
+        conditioned on them without another forward pass.
+        """
         text_inputs = F.pad(text_inputs, (0, 1), value=self.stop_text_token)
         text_inputs, text_targets = self.build_aligned_inputs_and_targets(
             text_inputs, self.start_text_token, self.stop_text_token
@@ -596,16 +609,27 @@ class UnifiedVoice(nn.Module):
         max_length = (
             trunc_index + self.max_mel_tokens - 1 if max_generate_length is None else trunc_index + max_generate_length
         )
-        gen = self.inference_model.generate(
-            inputs,
-            bos_token_id=self.start_mel_token,
-            pad_token_id=self.stop_mel_token,
-            eos_token_id=self.stop_mel_token,
-            max_length=max_length,
-            logits_processor=logits_processor,
-            num_return_sequences=num_return_sequences,
-            **hf_generate_kwargs,
-        )
+        if return_latents:
+            assert input_tokens is None, "Latents can't be returned for the input tokens."
+            self.inference_model.collected_latents = []
+        try:
+            gen = self.inference_model.generate(
+                inputs,
+                bos_token_id=self.start_mel_token,
+                pad_token_id=self.stop_mel_token,
+                eos_token_id=self.stop_mel_token,
+                max_length=max_length,
+                logits_processor=logits_processor,
+                num_return_sequences=num_return_sequences,
+                **hf_generate_kwargs,
+            )
+            if return_latents:
+                # one latent per generated code
+                latents = torch.cat(self.inference_model.collected_latents, dim=1)
+        finally:
+            self.inference_model.collected_latents = None
+        if return_latents:
+            return gen[:, trunc_index:], latents
         return gen[:, trunc_index:]
 
 
@@ -358,7 +358,7 @@ class GaussianDiffusion:
 
         if self.conditioning_free:
             if self.ramp_conditioning_free:
-                assert t.shape[0] == 1  # This should only be used in inference.
+                assert (t == t[0]).all()  # This should only be used in inference, where the batch shares a timestep.
                 cfk = self.conditioning_free_k * (1 - self._scale_timesteps(t)[0].item() / self.num_timesteps)
             else:
                 cfk = self.conditioning_free_k
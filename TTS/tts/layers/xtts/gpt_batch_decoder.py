@@ -0,0 +1,281 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import torch
+import torch.nn.functional as F
+
+
+@dataclass
+class DecodeSequence:
+    """A sentence decoded by the :class:`GPTBatchDecoder`.
+
+    Args:
+        prefix_emb (torch.Tensor): conditioning latents followed by the text embeddings. Shape :math:`[1, T, C]`.
+        max_new_tokens (int): maximum number of audio tokens to generate.
+        temperature (float): softmax temperature.
+        top_k (int): number of most likely tokens kept for sampling. 0 keeps all of them.
+        top_p (float): cumulative probability of the most likely tokens kept for sampling.
+        repetition_penalty (float): penalty for the tokens generated before.
+        do_sample (bool): sample the next token instead of taking the most likely one.
+    """
+
+    prefix_emb: torch.Tensor
+    max_new_tokens: int
+    temperature: float = 0.75
+    top_k: int = 50
+    top_p: float = 0.85
+    repetition_penalty: float = 10.0
+    do_sample: bool = True
+    tokens: List[int] = field(default_factory=list)
+    finished: bool = False
+
+    @property
+    def codes(self) -> torch.Tensor:
+        """Generated audio tokens, ending with the stop token unless `max_new_tokens` was reached. Shape [1, T]."""
+        return torch.tensor(self.tokens, dtype=torch.long).unsqueeze(0)
+
+
+class GPTBatchDecoder:
+    """Continuous batching autoregressive decoder for the XTTS GPT and the Tortoise `UnifiedVoice`.
+
+    `GPT.generate()` decodes a single sentence per call and keeps one conditioning prefix in the model. This decoder
+    runs many sentences, each with its own conditioning latents, through the same decoding loop:
+
+    - New sequences are prefilled together with their prefixes left-padded to the same length, and their KV-cache is
+      merged into the running batch.
+    - Every step feeds the last token of all the running sequences in a single forward pass. The attention mask hides
+      the padding, and the audio position embedding is computed per sequence.
+    - A sequence leaves the batch as soon as it predicts the stop token or reaches `max_new_tokens`. Its rows are
+      removed from the KV-cache and queued sequences take the free slots at the next step.
+
+    The sampling follows the logits processors used by `GPT.generate()` with the same settings, but beam search is not
+    supported.
+
+    Args:
+        gpt (GPT): XTTS GPT model or Tortoise `UnifiedVoice` model.
+        max_batch_size (int): maximum number of sequences decoded together. Defaults to 8.
+
+    Example:
+        >>> decoder = GPTBatchDecoder(model.gpt, max_batch_size=16)
+        >>> seqs = [decoder.add(gpt_cond_latent, text_tokens) for text_tokens in sentences]
+        >>> decoder.run()
+        >>> codes = [seq.codes for seq in seqs]
+    """
+
+    def __init__(self, gpt: "GPT", max_batch_size: int = 8):
+        if max_batch_size < 1:
+            raise ValueError(f" [!] `max_batch_size` must be a positive number, got {max_batch_size}.")
+        self.gpt = gpt
+        self.max_batch_size = max_batch_size
+        if hasattr(gpt, "start_audio_token"):
+            self.start_audio_token, self.stop_audio_token = gpt.start_audio_token, gpt.stop_audio_token
+            self.max_new_tokens = gpt.max_gen_mel_tokens
+        else:
+            # Tortoise `UnifiedVoice` names the audio tokens after the mel codes
+            self.start_audio_token, self.stop_audio_token = gpt.start_mel_token, gpt.stop_mel_token
+            self.max_new_tokens = gpt.max_mel_tokens - 1
+        self._queue = deque()
+        self._active = []
+        self._past = None  # per layer (key, value) of shape [B, H, T, D]
+        self._attention_mask = None  # [B, T]
+        self._cache_cls = None
+
+    @property
+    def device(self):
+        return next(self.gpt.parameters()).device
+
+    @property
+    def num_pending(self) -> int:
+        """Number of sequences queued or being decoded."""
+        return len(self._queue) + len(self._active)
+
+    def add(
+        self,
+        cond_latents: torch.Tensor,
+        text_tokens: torch.Tensor,
+        max_new_tokens: int = None,
+        temperature: float = 0.75,
+        top_k: int = 50,
+        top_p: float = 0.85,
+        repetition_penalty: float = 10.0,
+        do_sample: bool = True,
+    ) -> DecodeSequence:
+        """Queue a sentence for decoding. It joins the batch at the next step with a free slot.
+
+        Args:
+            cond_latents (torch.Tensor): GPT conditioning latents of the speaker. Shape :math:`[1, T_c, C]`.
+            text_tokens (torch.Tensor): text token IDs. Shape :math:`[1, T_t]`.
+            max_new_tokens (int, optional): maximum number of generated tokens. Defaults to the maximum of the model.
+
+        Returns:
+            DecodeSequence: the sequence, filled with the generated tokens as the decoding goes.
+        """
+        text_tokens = F.pad(text_tokens.to(self.device), (0, 1), value=self.gpt.stop_text_token)
+        text_tokens = F.pad(text_tokens, (1, 0), value=self.gpt.start_text_token)
+        text_emb = self.gpt.text_embedding(text_tokens) + self.gpt.text_pos_embedding(text_tokens)
+        seq = DecodeSequence(
+            prefix_emb=torch.cat([cond_latents.to(self.device, text_emb.dtype), text_emb], dim=1),
+            max_new_tokens=max_new_tokens or self.max_new_tokens,
+            temperature=temperature,
+            top_k=top_k,
+            top_p=top_p,
+            repetition_penalty=repetition_penalty,
+            do_sample=do_sample,
+        )
+        self._queue.append(seq)
+        return seq
+
+    @torch.inference_mode()
+    def step(self) -> List[DecodeSequence]:
+        """Admit the queued sequences that fit in the batch and generate one token for all the running ones.
+
+        Returns:
+            List[DecodeSequence]: the sequences finished at this step.
+        """
+        if self._active:
+            logits = self._decode_step()
+            finished = self._sample_and_update(self._active, logits)
+        else:
+            finished = []
+        newcomers = []
+        while self._queue and len(self._active) + len(newcomers) < self.max_batch_size:
+            newcomers.append(self._queue.popleft())
+        if newcomers:
+            # the first token of the new sequences comes from the prefill pass
+            past, attention_mask, logits = self._prefill(newcomers)
+            self._merge(newcomers, past, attention_mask)
+            finished += self._sample_and_update(newcomers, logits)
+        self._evict_finished()
+        return finished
+
+    def run(self) -> None:
+        """Decode until every queued sequence is finished."""
+        while self.num_pending:
+            self.step()
+
+    def cancel(self) -> List[DecodeSequence]:
+        """Drop the queued and running sequences, e.g. when enough sequences are finished.
+
+        Returns:
+            List[DecodeSequence]: the dropped sequences. They are left unfinished.
+        """
+        dropped = list(self._active) + list(self._queue)
+        self._queue.clear()
+        self._active, self._past, self._attention_mask = [], None, None
+        return dropped
+
+    def _logits(self, hidden_states: torch.Tensor) -> torch.Tensor:
+        return self.gpt.mel_head(self.gpt.final_norm(hidden_states))
+
+    def _prefill(self, seqs: List[DecodeSequence]) -> Tuple[Tuple, torch.Tensor, torch.Tensor]:
+        start_token = torch.tensor([[self.start_audio_token]], device=self.device)
+        start_emb = self.gpt.mel_embedding(start_token) + self.gpt.mel_pos_embedding(start_token)
+        embs = [torch.cat([seq.prefix_emb, start_emb.to(seq.prefix_emb.dtype)], dim=1)[0] for seq in seqs]
+        max_len = max(emb.shape[0] for emb in embs)
+        inputs_embeds = embs[0].new_zeros(len(embs), max_len, embs[0].shape[1])
+        attention_mask = torch.zeros(len(embs), max_len, dtype=torch.long, device=self.device)
+        for idx, emb in enumerate(embs):
+            inputs_embeds[idx, max_len - emb.shape[0] :] = emb
+            attention_mask[idx, max_len - emb.shape[0] :] = 1
+        outputs = self.gpt.gpt(inputs_embeds=inputs_embeds, attention_mask=attention_mask, use_cache=True)
+        logits = self._logits(outputs.last_hidden_state[:, -1])
+        return self._to_legacy_cache(outputs.past_key_values), attention_mask, logits
+
+    def _decode_step(self) -> torch.Tensor:
+        last_tokens = torch.tensor([seq.tokens[-1] for seq in self._active], device=self.device)
+        # the start token is at position 0, so the n-th generated token is at position n
+        positions = torch.tensor([len(seq.tokens) for seq in self._active], device=self.device)
+        inputs_embeds = self.gpt.mel_embedding(last_tokens) + self.gpt.mel_pos_embedding.emb(positions)
+        self._attention_mask = F.pad(self._attention_mask, (0, 1), value=1)
+        outputs = self.gpt.gpt(
+            inputs_embeds=inputs_embeds.unsqueeze(1),
+            past_key_values=self._from_legacy_cache(self._past),
+            attention_mask=self._attention_mask,
+            use_cache=True,
+        )
+        self._past = self._to_legacy_cache(outputs.past_key_values)
+        return self._logits(outputs.last_hidden_state[:, -1])
+
+    def _to_legacy_cache(self, past_key_values) -> Tuple:
+        # newer transformers versions return a `Cache` object instead of tuples
+        if isinstance(past_key_values, tuple):
+            return past_key_values
+        self._cache_cls = type(past_key_values)
+        if hasattr(past_key_values, "to_legacy_cache"):
+            return past_key_values.to_legacy_cache()
+        return tuple((layer.keys, layer.values) for layer in past_key_values.layers)
+
+    def _from_legacy_cache(self, past_key_values: Tuple):
+        if self._cache_cls is None:
+            return past_key_values
+        if hasattr(self._cache_cls, "from_legacy_cache"):
+            return self._cache_cls.from_legacy_cache(past_key_values)
+        return self._cache_cls(past_key_values)
+
+    def _merge(self, seqs: List[DecodeSequence], past: Tuple, attention_mask: torch.Tensor) -> None:
+        """Add the KV-cache of the new sequences to the running batch, left-padding the shorter one."""
+        if not self._active:
+            self._active, self._past, self._attention_mask = list(seqs), past, attention_mask
+            return
+        old_len, new_len = self._attention_mask.shape[1], attention_mask.shape[1]
+        max_len = max(old_len, new_len)
+        self._past = tuple(
+            tuple(
+                torch.cat([F.pad(old, (0, 0, max_len - old_len, 0)), F.pad(new, (0, 0, max_len - new_len, 0))], dim=0)
+                for old, new in zip(old_layer, new_layer)
+            )
+            for old_layer, new_layer in zip(self._past, past)
+        )
+        self._attention_mask = torch.cat(
+            [F.pad(self._attention_mask, (max_len - old_len, 0)), F.pad(attention_mask, (max_len - new_len, 0))], dim=0
+        )
+        self._active += seqs
+
+    def _evict_finished(self) -> None:
+        """Remove the finished sequences from the batch and drop the padding columns nobody attends to anymore."""
+        keep = [idx for idx, seq in enumerate(self._active) if not seq.finished]
+        if len(keep) == len(self._active):
+            return
+        if not keep:
+            self._active, self._past, self._attention_mask = [], None, None
+            return
+        self._active = [self._active[idx] for idx in keep]
+        keep = torch.tensor(keep, device=self.device)
+        attention_mask = self._attention_mask.index_select(0, keep)
+        start = int(attention_mask.any(dim=0).long().argmax())
+        self._attention_mask = attention_mask[:, start:]
+        self._past = tuple(
+            tuple(state.index_select(0, keep)[:, :, start:] for state in layer_past) for layer_past in self._past
+        )
+
+    def _sample_and_update(self, seqs: List[DecodeSequence], logits: torch.Tensor) -> List[DecodeSequence]:
+        finished = []
+        for seq, seq_logits in zip(seqs, logits.float()):
+            token = self._sample(seq, seq_logits)
+            seq.tokens.append(token)
+            if token == self.stop_audio_token or len(seq.tokens) >= seq.max_new_tokens:
+                seq.finished = True
+                finished.append(seq)
+        return finished
+
+    def _sample(self, seq: DecodeSequence, logits: torch.Tensor) -> int:
+        """Pick the next token with the same logits processing as the HuggingFace `generate()` API."""
+        if seq.repetition_penalty != 1.0:
+            # `GPT.generate()` also penalizes its dummy prefix IDs (1) and the start token
+            ids = torch.tensor(list({1, self.start_audio_token, *seq.tokens}), device=logits.device)
+            scores = logits[ids]
+            logits[ids] = torch.where(scores < 0, scores * seq.repetition_penalty, scores / seq.repetition_penalty)
+        if not seq.do_sample:
+            return int(logits.argmax())
+        logits = logits / seq.temperature
+        if seq.top_k > 0:
+            kth_value = torch.topk(logits, min(seq.top_k, logits.shape[-1])).values[-1]
+            logits[logits < kth_value] = -float("inf")
+        if seq.top_p < 1.0:
+            sorted_logits, sorted_indices = torch.sort(logits)
+            cumulative_probs = sorted_logits.softmax(dim=-1).cumsum(dim=-1)
+            to_remove = cumulative_probs <= (1 - seq.top_p)
+            to_remove[-1] = False  # keep at least the most likely token
+            logits[sorted_indices[to_remove]] = -float("inf")
+        return int(torch.multinomial(logits.softmax(dim=-1), num_samples=1))
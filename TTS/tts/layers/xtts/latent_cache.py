@@ -0,0 +1,121 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+import torch
+
+
+class ConditioningLatentCache:
+    """LRU cache of the XTTS conditioning latents keyed by the content of the reference audio files.
+
+    Computing the latents means loading, resampling and encoding the reference audio on every call, so repeatedly
+    cloning the same voice pays that cost every time. The key is a hash of the audio file bytes and of the parameters
+    used to compute the latents, so renaming or moving a file still hits the cache while editing it does not. The
+    parameters include the fingerprint of the model weights from `compute_fingerprint()`, so the latents of another
+    checkpoint are never returned.
+
+    When `cache_dir` is set, the latents are also saved as `.npy` files that are memory-mapped back when a key is not
+    in memory, so the cache survives restarts and can be shared by several processes.
+
+    The cache can be pickled, e.g. to send the model to worker processes. The lock is recreated on unpickling.
+
+    Args:
+        max_size (int): maximum number of voices kept in memory. 0 disables the in-memory cache. Defaults to 16.
+        cache_dir (str, optional): folder for the on-disk cache. Defaults to None.
+    """
+
+    def __init__(self, max_size: int = 16, cache_dir: str = None):
+        self.max_size = max_size
+        self.cache_dir = cache_dir
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def compute_key(audio_paths: Union[str, List[str]], **params) -> str:
+        """Hash the content of the audio files together with the latent computation parameters."""
+        if not isinstance(audio_paths, (list, tuple)):
+            audio_paths = [audio_paths]
+        hasher = hashlib.sha256()
+        for audio_path in audio_paths:
+            with open(audio_path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    hasher.update(block)
+            # separate the files so that the key depends on how the bytes are split
+            hasher.update(b"\0")
+        hasher.update(repr(sorted(params.items())).encode("utf-8"))
+        return hasher.hexdigest()
+
+    @staticmethod
+    def compute_fingerprint(*state_dicts: Dict[str, torch.Tensor]) -> str:
+        """Hash the weights of the modules computing the latents."""
+        hasher = hashlib.sha256()
+        for state_dict in state_dicts:
+            for name, tensor in state_dict.items():
+                hasher.update(name.encode("utf-8"))
+                hasher.update(tensor.detach().cpu().contiguous().reshape(-1).view(torch.uint8).numpy().tobytes())
+        return hasher.hexdigest()
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        return (
+            os.path.join(self.cache_dir, f"{key}_gpt_cond_latent.npy"),
+            os.path.join(self.cache_dir, f"{key}_speaker_embedding.npy"),
+        )
+
+    def get(self, key: str, device: torch.device = None) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Return the cached `(gpt_cond_latent, speaker_embedding)` or None when the key is not found."""
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return tuple(latent.to(device) for latent in self._cache[key])
+        if self.cache_dir is None:
+            return None
+        gpt_path, speaker_path = self._paths(key)
+        if not (os.path.exists(gpt_path) and os.path.exists(speaker_path)):
+            return None
+        # copy-on-write mapping: the file pages are only read when the latents are used and the tensors stay writable
+        latents = tuple(torch.from_numpy(np.load(path, mmap_mode="c")).to(device) for path in (gpt_path, speaker_path))
+        self._add(key, latents)
+        return latents
+
+    def put(self, key: str, gpt_cond_latent: torch.Tensor, speaker_embedding: torch.Tensor) -> None:
+        """Store the latents in memory and on disk."""
+        self._add(key, (gpt_cond_latent, speaker_embedding))
+        if self.cache_dir is None:
+            return
+        for path, latent in zip(self._paths(key), (gpt_cond_latent, speaker_embedding)):
+            # write to a temporary file first so that other processes never read a partial file
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, latent.detach().cpu().numpy())
+            os.replace(tmp_path, path)
+
+    def _add(self, key: str, latents: Tuple[torch.Tensor, torch.Tensor]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._cache[key] = latents
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        """Empty the in-memory cache. The on-disk files are kept."""
+        with self._lock:
+            self._cache.clear()
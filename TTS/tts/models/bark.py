@@ -1,12 +1,13 @@
 import os
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterator, List, Optional, Tuple
 
 import numpy as np
 from coqpit import Coqpit
 from encodec import EncodecModel
 from transformers import BertTokenizer
 
+from TTS.tts.layers.bark.batch_inference import iter_audio_batch
 from TTS.tts.layers.bark.inference_funcs import (
     codec_decode,
     generate_coarse,
@@ -163,6 +164,56 @@ class Bark(BaseTTS):
         )
         return audio_arr, [x_semantic, c, f]
 
+    def generate_audio_stream(
+        self,
+        texts: List[str],
+        history_prompt=None,
+        text_temp: float = 0.7,
+        waveform_temp: float = 0.7,
+        **kwargs,
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        """Generate the audio of several texts in a batch and yield it in chunks as soon as they are decoded.
+
+        Args:
+            texts: texts to be turned into audio
+            history_prompt: history choice for audio cloning, for all the texts or a list with one per text
+            text_temp: generation temperature (1.0 more diverse, 0.0 more conservative)
+            waveform_temp: generation temperature (1.0 more diverse, 0.0 more conservative)
+            **kwargs: streaming and semantic generation settings of
+                `TTS.tts.layers.bark.batch_inference.iter_audio_batch()`
+
+        Yields:
+            the index of the text and the next numpy audio chunk of it at sample frequency 24khz
+        """
+        yield from iter_audio_batch(
+            texts,
+            self,
+            history_prompts=history_prompt,
+            text_temp=text_temp,
+            waveform_temp=waveform_temp,
+            **kwargs,
+        )
+
+    def generate_audio_batch(
+        self,
+        texts: List[str],
+        history_prompt=None,
+        text_temp: float = 0.7,
+        waveform_temp: float = 0.7,
+        **kwargs,
+    ) -> List[np.ndarray]:
+        """Generate the audio of several texts in a batch. See `generate_audio_stream()` for the arguments.
+
+        Returns:
+            numpy audio arrays at sample frequency 24khz
+        """
+        audio_chunks = [[] for _ in texts]
+        for idx, audio_chunk in self.generate_audio_stream(
+            texts, history_prompt=history_prompt, text_temp=text_temp, waveform_temp=waveform_temp, **kwargs
+        ):
+            audio_chunks[idx].append(audio_chunk)
+        return [np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.float32) for chunks in audio_chunks]
+
     def generate_voice(self, audio, speaker_id, voice_dir):
         """Generate a voice from the given audio and text.
 
@@ -28,6 +28,8 @@ class BaseTTS(BaseTrainerModel):
     """
 
     MODEL_TYPE = "tts"
+    # set by the models whose `inference()` handles padded batches with `x_lengths` and returns `y_mask`
+    SUPPORTS_BATCH_INFERENCE = False
 
     def __init__(
         self,
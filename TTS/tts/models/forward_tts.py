@@ -197,6 +197,8 @@ class ForwardTTS(BaseTTS):
         >>> model = ForwardTTS(config)
     """
 
+    SUPPORTS_BATCH_INFERENCE = True
+
     # pylint: disable=dangerous-default-value
     def __init__(
         self,
@@ -299,7 +301,7 @@ class ForwardTTS(BaseTTS):
         if config.use_d_vector_file:
             self.embedded_speaker_dim = config.d_vector_dim
             if self.args.d_vector_dim != self.args.hidden_channels:
-                #self.proj_g = nn.Conv1d(self.args.d_vector_dim, self.args.hidden_channels, 1)
+                # self.proj_g = nn.Conv1d(self.args.d_vector_dim, self.args.hidden_channels, 1)
                 self.proj_g = nn.Linear(in_features=self.args.d_vector_dim, out_features=self.args.hidden_channels)
         # init speaker embedding layer
         if config.use_speaker_embedding and not config.use_d_vector_file:
@@ -354,9 +356,9 @@ class ForwardTTS(BaseTTS):
         """Format predicted durations.
         1. Convert to linear scale from log scale
         2. Apply the length scale for speed adjustment
-        3. Apply masking.
-        4. Cast 0 durations to 1.
-        5. Round the duration values.
+        3. Cast 0 durations to 1.
+        4. Round the duration values.
+        5. Apply masking.
 
         Args:
             o_dr_log: Log scale durations.
@@ -368,7 +370,7 @@ class ForwardTTS(BaseTTS):
         """
         o_dr = (torch.exp(o_dr_log) - 1) * x_mask * self.length_scale
         o_dr[o_dr < 1] = 1.0
-        o_dr = torch.round(o_dr)
+        o_dr = torch.round(o_dr) * x_mask
         return o_dr
 
     def _forward_encoder(
@@ -404,13 +406,13 @@ class ForwardTTS(BaseTTS):
         # [B, T, C]
         x_emb = self.emb(x)
         # encoder pass
-	#o_en = self.encoder(torch.transpose(x_emb, 1, -1), x_mask)
+        # o_en = self.encoder(torch.transpose(x_emb, 1, -1), x_mask)
         o_en = self.encoder(torch.transpose(x_emb, 1, -1), x_mask, g)
         # speaker conditioning
         # TODO: try different ways of conditioning
-        if g is not None: 
+        if g is not None:
             if hasattr(self, "proj_g"):
-                g = self.proj_g(g.view(g.shape[0], -1)).unsqueeze(-1)            
+                g = self.proj_g(g.view(g.shape[0], -1)).unsqueeze(-1)
             o_en = o_en + g
         return o_en, x_mask, g, x_emb
 
@@ -675,7 +677,8 @@ class ForwardTTS(BaseTTS):
 
         Args:
             x (torch.LongTensor): Input character sequence.
-            aux_input (Dict): Auxiliary model inputs. Defaults to `{"d_vectors": None, "speaker_ids": None}`.
+            aux_input (Dict): Auxiliary model inputs. Defaults to `{"d_vectors": None, "speaker_ids": None}`. To run
+                in batch mode, provide `x_lengths` else model assumes that the batch size is 1.
 
         Shapes:
             - x: [B, T_max]
@@ -683,7 +686,9 @@ class ForwardTTS(BaseTTS):
             - g: [B, C]
         """
         g = self._set_speaker_input(aux_input)
-        x_lengths = torch.tensor(x.shape[1:2]).to(x.device)
+        x_lengths = aux_input.get("x_lengths", None)
+        if x_lengths is None:
+            x_lengths = torch.tensor(x.shape[1:2]).to(x.device)
         x_mask = torch.unsqueeze(sequence_mask(x_lengths, x.shape[1]), 1).to(x.dtype).float()
         # encoder pass
         o_en, x_mask, g, _ = self._forward_encoder(x, x_mask, g)
@@ -710,6 +715,7 @@ class ForwardTTS(BaseTTS):
             "pitch": o_pitch,
             "energy": o_energy,
             "durations_log": o_dr_log,
+            "y_mask": torch.unsqueeze(sequence_mask(y_lengths, None), 1).to(o_de.dtype),
         }
         return outputs
 
@@ -11,6 +11,7 @@ from TTS.tts.layers.tacotron.capacitron_layers import CapacitronVAE
 from TTS.tts.layers.tacotron.gst_layers import GST
 from TTS.tts.layers.tacotron.tacotron2 import Decoder, Encoder, Postnet
 from TTS.tts.models.base_tacotron import BaseTacotron
+from TTS.tts.utils.helpers import sequence_mask
 from TTS.tts.utils.measures import alignment_diagonal_score
 from TTS.tts.utils.speakers import SpeakerManager
 from TTS.tts.utils.text.tokenizer import TTSTokenizer
@@ -43,6 +44,8 @@ class Tacotron2(BaseTacotron):
             Speaker manager for multi-speaker training. Uuse only for multi-speaker training. Defaults to None.
     """
 
+    SUPPORTS_BATCH_INFERENCE = True
+
     def __init__(
         self,
         config: "Tacotron2Config",
@@ -245,7 +248,13 @@ class Tacotron2(BaseTacotron):
         """
         aux_input = self._format_aux_input(aux_input)
         embedded_inputs = self.embedding(text).transpose(1, 2)
-        encoder_outputs = self.encoder.inference(embedded_inputs)
+        input_mask = None
+        if aux_input.get("x_lengths", None) is not None and text.shape[0] > 1:
+            # batch mode, the inputs must be sorted by length
+            encoder_outputs = self.encoder(embedded_inputs, aux_input["x_lengths"])
+            input_mask = sequence_mask(aux_input["x_lengths"], text.shape[1])
+        else:
+            encoder_outputs = self.encoder.inference(embedded_inputs)
 
         if self.gst and self.use_gst:
             # B x gst_dim
@@ -276,18 +285,17 @@ class Tacotron2(BaseTacotron):
 
         if self.num_speakers > 1:
             if not self.use_d_vector_file:
-                embedded_speakers = self.speaker_embedding(aux_input["speaker_ids"])[None]
-                # reshape embedded_speakers
-                if embedded_speakers.ndim == 1:
-                    embedded_speakers = embedded_speakers[None, None, :]
-                elif embedded_speakers.ndim == 2:
-                    embedded_speakers = embedded_speakers[None, :]
+                embedded_speakers = self.speaker_embedding(aux_input["speaker_ids"])
+                # reshape embedded_speakers to [B, 1, C]
+                embedded_speakers = embedded_speakers.view(-1, 1, embedded_speakers.shape[-1])
             else:
                 embedded_speakers = aux_input["d_vectors"]
+                if embedded_speakers.ndim == 2:
+                    embedded_speakers = embedded_speakers.unsqueeze(1)
 
             encoder_outputs = self._concat_speaker_embedding(encoder_outputs, embedded_speakers)
 
-        decoder_outputs, alignments, stop_tokens = self.decoder.inference(encoder_outputs)
+        decoder_outputs, alignments, stop_tokens = self.decoder.inference(encoder_outputs, mask=input_mask)
         postnet_outputs = self.postnet(decoder_outputs)
         postnet_outputs = decoder_outputs + postnet_outputs
         decoder_outputs, postnet_outputs, alignments = self.shape_outputs(decoder_outputs, postnet_outputs, alignments)
@@ -296,9 +304,25 @@ class Tacotron2(BaseTacotron):
             "decoder_outputs": decoder_outputs,
             "alignments": alignments,
             "stop_tokens": stop_tokens,
+            "y_mask": self._compute_y_mask(stop_tokens),
         }
         return outputs
 
+    def _compute_y_mask(self, stop_tokens: torch.Tensor) -> torch.Tensor:
+        """Compute the output mask of each sample from the first step its stop token is predicted.
+
+        Shapes:
+            - stop_tokens: :math:`[B, T_steps, 1]`
+            - y_mask: :math:`[B, 1, T_steps * r]`
+        """
+        stops = stop_tokens.view(stop_tokens.shape[0], -1) > self.decoder.stop_threshold
+        # the decoder does not stop in the first steps
+        stops[:, : stop_tokens.shape[0] // 2 + 1] = False
+        num_steps = stops.shape[1]
+        last_step = torch.where(stops.any(dim=1), stops.float().argmax(dim=1), num_steps - 1)
+        y_lengths = (last_step + 1) * self.decoder.r
+        return sequence_mask(y_lengths, num_steps * self.decoder.r).unsqueeze(1).float()
+
     def before_backward_pass(self, loss_dict, optimizer) -> None:
         # Extracting custom training specific operations for capacitron
         # from the trainer
@@ -1,8 +1,12 @@
+import inspect
 import os
 import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from dataclasses import dataclass
-from time import time
+from time import perf_counter, time
+from typing import Dict, List
 
 import torch
 import torch.nn.functional as F
@@ -21,7 +25,9 @@ from TTS.tts.layers.tortoise.random_latent_generator import RandomLatentConverte
 from TTS.tts.layers.tortoise.tokenizer import VoiceBpeTokenizer
 from TTS.tts.layers.tortoise.vocoder import VocConf, VocType
 from TTS.tts.layers.tortoise.wav2vec_alignment import Wav2VecAlignment
+from TTS.tts.layers.xtts.gpt_batch_decoder import GPTBatchDecoder
 from TTS.tts.models.base_tts import BaseTTS
+from TTS.utils.io import get_inference_checkpoint_path, load_fsspec
 
 
 def pad_or_truncate(t, length):
@@ -116,6 +122,54 @@ def fix_autoregressive_output(codes, stop_token, complain=True):
     return codes
 
 
+def trim_at_calm_tokens(codes, calm_token=83, max_calm_tokens=8):
+    """
+    Returns the number of codes up to the first run of more than `max_calm_tokens` "calm" tokens, which code silence.
+    The run gives the diffusion model some "breathing room" to terminate speech.
+    """
+    ctokens = 0
+    for idx, code in enumerate(codes.tolist()):
+        ctokens = ctokens + 1 if code == calm_token else 0
+        if ctokens > max_calm_tokens:
+            return idx
+    return len(codes)
+
+
+def get_reusable_latents_length(codes, stop_token):
+    """
+    Returns the number of latents collected while generating `codes` that are the same when they are computed again
+    from the output of `fix_autoregressive_output()`. Each latent only depends on the codes before it, and after the
+    first stop token the generated codes are padding that is replaced with calm tokens.
+    """
+    stop_token_indices = (codes == stop_token).nonzero()
+    if len(stop_token_indices) == 0:
+        return len(codes)
+    return stop_token_indices.min().item() + 1
+
+
+def get_diffusion_output_length(num_latents):
+    """
+    Returns the number of spectrogram frames the diffusion model generates for the given number of latents.
+    This diffusion model converts from 22kHz spectrogram codes to a 24kHz spectrogram signal.
+    """
+    return num_latents * 4 * 24000 // 22050
+
+
+@contextmanager
+def stage_timer(timings, stage, device=None):
+    """
+    Adds the wall time of the block to `timings[stage]`. CUDA is synchronized so that the time of the asynchronous
+    kernels is counted in the stage that launched them.
+    """
+    if device is not None and device.type == "cuda":
+        torch.cuda.synchronize(device)
+    start = perf_counter()
+    yield
+    if device is not None and device.type == "cuda":
+        torch.cuda.synchronize(device)
+    timings[stage] = timings.get(stage, 0.0) + perf_counter() - start
+
+
 def do_spectrogram_diffusion(
     diffusion_model,
     diffuser,
@@ -128,9 +182,7 @@ def do_spectrogram_diffusion(
     Uses the specified diffusion model to convert discrete codes into a spectrogram.
     """
     with torch.no_grad():
-        output_seq_len = (
-            latents.shape[1] * 4 * 24000 // 22050
-        )  # This diffusion model converts from 22kHz spectrogram codes to a 24kHz spectrogram signal.
+        output_seq_len = get_diffusion_output_length(latents.shape[1])
         output_shape = (latents.shape[0], 100, output_seq_len)
         precomputed_embeddings = diffusion_model.timestep_independent(
             latents, conditioning_latents, output_seq_len, False
@@ -510,7 +562,7 @@ class Tortoise(BaseTTS):
         Returns:
             A dictionary of the output values with `wav` as output waveform, `deterministic_seed` as seed used at inference,
             `text_input` as text token IDs after tokenizer, `voice_samples` as samples used for cloning, `conditioning_latents`
-            as latents used at inference.
+            as latents used at inference, `stage_timings` as the time spent in each inference stage.
 
         """
 
@@ -533,6 +585,7 @@ class Tortoise(BaseTTS):
             "text_inputs": outputs["text"],
             "voice_samples": outputs["voice_samples"],
             "conditioning_latents": outputs["conditioning_latents"],
+            "stage_timings": outputs["stage_timings"],
         }
 
         return return_dict
@@ -620,6 +673,11 @@ class Tortoise(BaseTTS):
         sampler="ddim",
         half=True,
         original_tortoise=False,
+        diffusion_batch_size=None,
+        latents_memory_budget_mb=512,
+        adaptive_sampling=False,
+        clvp_score_threshold=None,
+        autoregressive_time_budget=None,
         **hf_generate_kwargs,
     ):
         """
@@ -659,14 +717,96 @@ class Tortoise(BaseTTS):
                 As cond_free_k increases, the output becomes dominated by the conditioning-free signal.
             diffusion_temperature: (float) Controls the variance of the noise fed into the diffusion model. [0,1]. Values at 0
                                       are the "mean" prediction of the diffusion network and will sound bland and smeared.
+            diffusion_batch_size: (int) Number of candidates the diffusion model and the vocoder process at once. Shorter
+                candidates are padded with silence. Defaults to all the `k` candidates.
+            latents_memory_budget_mb: (int) Memory in MB for the autoregressive latents of all the samples, which are kept
+                on the CPU while CLVP ranks the samples if the models don't all stay on the device. The latents of the
+                best samples beyond the budget are computed again. Default=512.
+            adaptive_sampling: (bool) Sample the codes in waves of `autoregressive_batch_size` samples, each scored by
+                CLVP as soon as it is finished, and stop when the `k` best scores reach `clvp_score_threshold` or the
+                sampling takes longer than `autoregressive_time_budget`. `num_autoregressive_samples` is the maximum
+                number of samples. The samples leave the decoding batch at their stop token and the next wave takes
+                their slots. The HuggingFace generate arguments are not supported. Default=False.
+            clvp_score_threshold: (float) CLVP score the `k` best samples must reach to stop the adaptive sampling.
+                Default=None.
+            autoregressive_time_budget: (float) Time in seconds after which the adaptive sampling stops once it has
+                `k` samples. Default=None.
             hf_generate_kwargs: (**kwargs) The huggingface Transformers generate API is used for the autoregressive transformer.
                                     Extra keyword args fed to this function get forwarded directly to that API. Documentation
                                     here: https://huggingface.co/docs/transformers/internal/generation_utils
 
+        The conditioning, autoregressive and CLVP stages run first and keep the autoregressive latents of the best
+        samples. The diffusion and vocoder stages run next. The time of each stage is returned in `stage_timings`.
+        Use `inference_pipelined()` to overlap the stages of several texts.
+
         Returns:
             Generated audio clip(s) as a torch tensor. Shape 1,S if k=1 else, (k,1,S) where S is the sample length.
             Sample rate is 24kHz.
         """
+        state = self._generate_stage(
+            text,
+            voice_samples=voice_samples,
+            conditioning_latents=conditioning_latents,
+            k=k,
+            verbose=verbose,
+            use_deterministic_seed=use_deterministic_seed,
+            latent_averaging_mode=latent_averaging_mode,
+            num_autoregressive_samples=num_autoregressive_samples,
+            temperature=temperature,
+            length_penalty=length_penalty,
+            repetition_penalty=repetition_penalty,
+            top_p=top_p,
+            max_mel_tokens=max_mel_tokens,
+            half=half,
+            original_tortoise=original_tortoise,
+            latents_memory_budget_mb=latents_memory_budget_mb,
+            adaptive_sampling=adaptive_sampling,
+            clvp_score_threshold=clvp_score_threshold,
+            autoregressive_time_budget=autoregressive_time_budget,
+            **hf_generate_kwargs,
+        )
+        return self._decode_stage(
+            state,
+            verbose=verbose,
+            return_deterministic_state=return_deterministic_state,
+            diffusion_iterations=diffusion_iterations,
+            cond_free=cond_free,
+            cond_free_k=cond_free_k,
+            diffusion_temperature=diffusion_temperature,
+            sampler=sampler,
+            diffusion_batch_size=diffusion_batch_size,
+        )
+
+    def _generate_stage(
+        self,
+        text,
+        voice_samples=None,
+        conditioning_latents=None,
+        k=1,
+        verbose=True,
+        use_deterministic_seed=None,
+        latent_averaging_mode=0,
+        num_autoregressive_samples=16,
+        temperature=0.8,
+        length_penalty=1,
+        repetition_penalty=2.0,
+        top_p=0.8,
+        max_mel_tokens=500,
+        half=True,
+        original_tortoise=False,
+        latents_memory_budget_mb=512,
+        adaptive_sampling=False,
+        clvp_score_threshold=None,
+        autoregressive_time_budget=None,
+        **hf_generate_kwargs,
+    ) -> Dict:
+        """Compute the conditioning latents, sample codes with the autoregressive model and keep the `k` best codes
+        according to CLVP with their latents. See `inference()` for the arguments."""
+        if adaptive_sampling and hf_generate_kwargs:
+            raise ValueError(
+                f" [!] Adaptive sampling doesn't support the HuggingFace generate arguments {list(hf_generate_kwargs)}."
+            )
+        timings = {}
         deterministic_seed = deterministic_state(seed=use_deterministic_seed)
 
         text_tokens = torch.IntTensor(self.tokenizer.encode(text)).unsqueeze(0).to(self.device)
@@ -675,145 +815,326 @@ class Tortoise(BaseTTS):
             text_tokens.shape[-1] < 400
         ), "Too much text provided. Break the text up into separate segments and re-try inference."
 
-        if voice_samples is not None:
-            (
-                auto_conditioning,
-                diffusion_conditioning,
-                _,
-                _,
-            ) = self.get_conditioning_latents(
-                voice_samples,
-                return_mels=True,
-                latent_averaging_mode=latent_averaging_mode,
-                original_tortoise=original_tortoise,
-            )
-        elif conditioning_latents is not None:
-            auto_conditioning, diffusion_conditioning = conditioning_latents
-        else:
-            (
-                auto_conditioning,
-                diffusion_conditioning,
-            ) = self.get_random_conditioning_latents()
-        auto_conditioning = auto_conditioning.to(self.device)
-        diffusion_conditioning = diffusion_conditioning.to(self.device)
-
-        diffuser = load_discrete_vocoder_diffuser(
-            desired_diffusion_steps=diffusion_iterations, cond_free=cond_free, cond_free_k=cond_free_k, sampler=sampler
-        )
+        with stage_timer(timings, "conditioning", self.device):
+            if voice_samples is not None:
+                (
+                    auto_conditioning,
+                    diffusion_conditioning,
+                    _,
+                    _,
+                ) = self.get_conditioning_latents(
+                    voice_samples,
+                    return_mels=True,
+                    latent_averaging_mode=latent_averaging_mode,
+                    original_tortoise=original_tortoise,
+                )
+            elif conditioning_latents is not None:
+                auto_conditioning, diffusion_conditioning = conditioning_latents
+            else:
+                (
+                    auto_conditioning,
+                    diffusion_conditioning,
+                ) = self.get_random_conditioning_latents()
+            auto_conditioning = auto_conditioning.to(self.device)
+            diffusion_conditioning = diffusion_conditioning.to(self.device)
 
         # in the case of single_sample,
-        orig_batch_size = self.autoregressive_batch_size
-        while num_autoregressive_samples % self.autoregressive_batch_size:
-            self.autoregressive_batch_size //= 2
-        with torch.no_grad():
-            samples = []
-            num_batches = num_autoregressive_samples // self.autoregressive_batch_size
-            stop_mel_token = self.autoregressive.stop_mel_token
-            calm_token = (
-                83  # This is the token for coding silence, which is fixed in place with "fix_autoregressive_output"
-            )
-            self.autoregressive = self.autoregressive.to(self.device)
-            if verbose:
-                print("Generating autoregressive samples..")
+        batch_size = self.autoregressive_batch_size
+        while num_autoregressive_samples % batch_size:
+            batch_size //= 2
+        num_batches = num_autoregressive_samples // batch_size
+        # When the models stay on the device, each batch is scored by CLVP as soon as it is generated and only the
+        # `k` best samples are kept. Otherwise all the batches are generated before CLVP is moved to the device and
+        # the latents are kept on the CPU within the memory budget.
+        models_on_device = self.high_vram or self.device.type == "cpu"
+        latents_budget = None if models_on_device else latents_memory_budget_mb * 1024**2
+        stop_mel_token = self.autoregressive.stop_mel_token
+
+        def generate_batches():
+            latents_size = 0
             with self.temporary_cuda(self.autoregressive) as autoregressive, torch.autocast(
                 device_type="cuda", dtype=torch.float16, enabled=half
             ):
-                for b in tqdm(range(num_batches), disable=not verbose):
-                    codes = autoregressive.inference_speech(
-                        auto_conditioning,
-                        text_tokens,
-                        do_sample=True,
-                        top_p=top_p,
-                        temperature=temperature,
-                        num_return_sequences=self.autoregressive_batch_size,
-                        length_penalty=length_penalty,
-                        repetition_penalty=repetition_penalty,
-                        max_generate_length=max_mel_tokens,
-                        **hf_generate_kwargs,
-                    )
+                for _ in tqdm(range(num_batches), disable=not verbose):
+                    with stage_timer(timings, "autoregressive", self.device):
+                        codes, latents = autoregressive.inference_speech(
+                            auto_conditioning,
+                            text_tokens,
+                            do_sample=True,
+                            top_p=top_p,
+                            temperature=temperature,
+                            num_return_sequences=batch_size,
+                            length_penalty=length_penalty,
+                            repetition_penalty=repetition_penalty,
+                            max_generate_length=max_mel_tokens,
+                            return_latents=True,
+                            **hf_generate_kwargs,
+                        )
                     padding_needed = max_mel_tokens - codes.shape[1]
                     codes = F.pad(codes, (0, padding_needed), value=stop_mel_token)
-                    samples.append(codes)
-            self.autoregressive_batch_size = orig_batch_size  # in the case of single_sample
+                    if latents_budget is not None:
+                        latents_size += latents.numel() * latents.element_size()
+                        # the latents that don't fit are computed again for the best samples
+                        latents = latents.cpu() if latents_size <= latents_budget else None
+                    yield codes, latents
+
+        if verbose:
+            print("Generating autoregressive samples..")
+        with torch.no_grad():
+            if adaptive_sampling:
+                candidates = self._sample_adaptively(
+                    auto_conditioning,
+                    text_tokens,
+                    k=k,
+                    max_samples=num_autoregressive_samples,
+                    wave_size=batch_size,
+                    temperature=temperature,
+                    repetition_penalty=repetition_penalty,
+                    top_p=top_p,
+                    max_mel_tokens=max_mel_tokens,
+                    clvp_score_threshold=clvp_score_threshold,
+                    time_budget=autoregressive_time_budget,
+                    half=half,
+                    verbose=verbose,
+                    timings=timings,
+                )
+            else:
+                batches = generate_batches()
+                if not models_on_device:
+                    batches = list(batches)
+
+                candidates = []
+                with self.temporary_cuda(self.clvp) as clvp, torch.autocast(
+                    device_type="cuda", dtype=torch.float16, enabled=half
+                ):
+                    for codes, latents in batches:
+                        candidates = self._rank_candidates(clvp, text_tokens, codes, latents, candidates, k, timings)
+                del batches
+
+            best_latents = self._get_best_latents(candidates, auto_conditioning, text_tokens, timings)
+            del auto_conditioning
 
-            clip_results = []
-            with self.temporary_cuda(self.clvp) as clvp, torch.autocast(
-                device_type="cuda", dtype=torch.float16, enabled=half
-            ):
-                for batch in tqdm(samples, disable=not verbose):
-                    for i in range(batch.shape[0]):
-                        batch[i] = fix_autoregressive_output(batch[i], stop_mel_token)
-                    clvp_res = clvp(
-                        text_tokens.repeat(batch.shape[0], 1),
-                        batch,
-                        return_loss=False,
-                    )
-                    clip_results.append(clvp_res)
-
-                clip_results = torch.cat(clip_results, dim=0)
-                samples = torch.cat(samples, dim=0)
-                best_results = samples[torch.topk(clip_results, k=k).indices]
-            del samples
-
-            # The diffusion model actually wants the last hidden layer from the autoregressive model as conditioning
-            # inputs. Re-produce those for the top results. This could be made more efficient by storing all of these
-            # results, but will increase memory usage.
-            with self.temporary_cuda(self.autoregressive) as autoregressive:
-                best_latents = autoregressive(
-                    auto_conditioning.repeat(k, 1),
-                    text_tokens.repeat(k, 1),
+        return {
+            "text": text,
+            "latents": best_latents,
+            "diffusion_conditioning": diffusion_conditioning,
+            "deterministic_seed": deterministic_seed,
+            "voice_samples": voice_samples,
+            "conditioning_latents": conditioning_latents,
+            "timings": timings,
+        }
+
+    def _rank_candidates(self, clvp, text_tokens, codes, latents, candidates, k, timings) -> List:
+        """Score the codes with CLVP and return the `k` best `(score, codes, latents)` of them and of `candidates`,
+        best first. `latents` can be None. Only the latents up to the first stop token are kept, see
+        `get_reusable_latents_length()`."""
+        stop_mel_token = self.autoregressive.stop_mel_token
+        with stage_timer(timings, "clvp", self.device):
+            num_latents = [get_reusable_latents_length(sample_codes, stop_mel_token) for sample_codes in codes]
+            for i in range(codes.shape[0]):
+                codes[i] = fix_autoregressive_output(codes[i], stop_mel_token)
+            clvp_res = clvp(
+                text_tokens.repeat(codes.shape[0], 1),
+                codes,
+                return_loss=False,
+            )
+        for i in range(codes.shape[0]):
+            candidates.append(
+                (clvp_res[i].item(), codes[i], None if latents is None else latents[i, : num_latents[i]].clone())
+            )
+        return sorted(candidates, key=lambda candidate: candidate[0], reverse=True)[:k]
+
+    def _get_best_latents(self, candidates, auto_conditioning, text_tokens, timings) -> List[torch.Tensor]:
+        """Return the diffusion model conditioning of the `(score, codes, latents)` candidates."""
+        calm_token = (
+            83  # This is the token for coding silence, which is fixed in place with "fix_autoregressive_output"
+        )
+        # The diffusion model wants the last hidden layer from the autoregressive model as conditioning inputs.
+        # They are kept from the generation and trimmed where the codes turn to silence, or after the stop token
+        # since the latents past it are computed from padding instead of calm tokens. The calm tokens after the stop
+        # token only code the trailing silence, so they are not worth a second autoregressive pass. The latents are
+        # only computed again for the best results whose latents were not kept.
+        best_results = torch.stack([candidate[1] for candidate in candidates])
+        lengths = [trim_at_calm_tokens(codes, calm_token) for codes in best_results]
+        best_latents = [
+            None if latents is None else latents[:length].float()
+            for (_, _, latents), length in zip(candidates, lengths)
+        ]
+        missing = [idx for idx, latents in enumerate(best_latents) if latents is None]
+        if missing:
+            codes = best_results[missing]
+            with stage_timer(timings, "autoregressive", self.device), self.temporary_cuda(
+                self.autoregressive
+            ) as autoregressive:
+                latents = autoregressive(
+                    auto_conditioning.repeat(len(missing), 1),
+                    text_tokens.repeat(len(missing), 1),
                     torch.tensor([text_tokens.shape[-1]], device=text_tokens.device),
-                    best_results,
+                    codes,
                     torch.tensor(
-                        [best_results.shape[-1] * self.autoregressive.mel_length_compression],
+                        [codes.shape[-1] * self.autoregressive.mel_length_compression],
                         device=text_tokens.device,
                     ),
                     return_latent=True,
                     clip_inputs=False,
                 )
-            del auto_conditioning
+            for latent, idx in zip(latents, missing):
+                best_latents[idx] = latent[: lengths[idx]]
+        return best_latents
 
-            if verbose:
-                print("Transforming autoregressive outputs into audio..")
-            wav_candidates = []
-            for b in range(best_results.shape[0]):
-                codes = best_results[b].unsqueeze(0)
-                latents = best_latents[b].unsqueeze(0)
-
-                # Find the first occurrence of the "calm" token and trim the codes to that.
-                ctokens = 0
-                for code in range(codes.shape[-1]):
-                    if codes[0, code] == calm_token:
-                        ctokens += 1
-                    else:
-                        ctokens = 0
-                    if ctokens > 8:  # 8 tokens gives the diffusion model some "breathing room" to terminate speech.
-                        latents = latents[:, :code]
-                        break
-                with self.temporary_cuda(self.diffusion) as diffusion:
+    def _sample_adaptively(
+        self,
+        auto_conditioning,
+        text_tokens,
+        k,
+        max_samples,
+        wave_size,
+        temperature,
+        repetition_penalty,
+        top_p,
+        max_mel_tokens,
+        clvp_score_threshold=None,
+        time_budget=None,
+        half=True,
+        verbose=True,
+        timings=None,
+    ) -> List:
+        """Sample codes in waves of `wave_size` samples and return the `k` best `(score, codes, None)` according to
+        CLVP, best first.
+
+        The samples run through a :class:`GPTBatchDecoder`, so a sample leaves the decoding batch at its stop token and
+        a sample of the next wave takes its slot. A wave is scored by CLVP as soon as all its samples are finished. The
+        sampling stops when the `k` best scores reach `clvp_score_threshold`, when it takes longer than `time_budget`
+        seconds and there are `k` samples, or after `max_samples` samples. The latents are not kept since the samples
+        stop at the stop token, before the silence the diffusion model is conditioned on. See `inference()` for the
+        arguments.
+        """
+        stop_mel_token = self.autoregressive.stop_mel_token
+        timings = {} if timings is None else timings
+        start_time = perf_counter()
+        candidates = []
+        waves = deque()
+        num_samples = 0
+        with self.temporary_cuda(self.autoregressive) as autoregressive, self.temporary_cuda(
+            self.clvp
+        ) as clvp, torch.autocast(device_type="cuda", dtype=torch.float16, enabled=half), tqdm(
+            total=max_samples, disable=not verbose
+        ) as pbar:
+            decoder = GPTBatchDecoder(autoregressive, max_batch_size=wave_size)
+            cond_latents = auto_conditioning.unsqueeze(1)
+            while True:
+                out_of_time = time_budget is not None and perf_counter() - start_time >= time_budget
+                num_pending = sum(len(wave) for wave in waves)
+                # one wave is queued ahead, so that its samples take the slots of the finished ones
+                if (
+                    len(waves) < 2
+                    and num_samples < max_samples
+                    and (not out_of_time or len(candidates) + num_pending < k)
+                ):
+                    wave_samples = min(wave_size, max_samples - num_samples)
+                    waves.append(
+                        [
+                            # `add()` wraps the text in start and stop tokens like `UnifiedVoice.inference_speech()`
+                            decoder.add(
+                                cond_latents,
+                                text_tokens,
+                                max_new_tokens=max_mel_tokens,
+                                temperature=temperature,
+                                top_p=top_p,
+                                repetition_penalty=repetition_penalty,
+                            )
+                            for _ in range(wave_samples)
+                        ]
+                    )
+                    num_samples += wave_samples
+                if not waves:
+                    break
+                with stage_timer(timings, "autoregressive", self.device):
+                    decoder.step()
+                while waves and all(seq.finished for seq in waves[0]):
+                    wave = waves.popleft()
+                    codes = torch.cat(
+                        [
+                            F.pad(seq.codes, (0, max_mel_tokens - seq.codes.shape[1]), value=stop_mel_token)
+                            for seq in wave
+                        ]
+                    ).to(self.device)
+                    candidates = self._rank_candidates(clvp, text_tokens, codes, None, candidates, k, timings)
+                    pbar.update(len(wave))
+                if len(candidates) >= k and (
+                    out_of_time or (clvp_score_threshold is not None and candidates[-1][0] >= clvp_score_threshold)
+                ):
+                    decoder.cancel()
+                    break
+        if verbose:
+            print(f" > Adaptive sampling scored {pbar.n} samples out of {max_samples}.")
+        return candidates
+
+    def _decode_stage(
+        self,
+        state,
+        verbose=True,
+        return_deterministic_state=False,
+        diffusion_iterations=100,
+        cond_free=True,
+        cond_free_k=2,
+        diffusion_temperature=1.0,
+        sampler="ddim",
+        diffusion_batch_size=None,
+    ) -> Dict:
+        """Turn the latents of the best codes into waveforms with the diffusion model and the vocoder, a batch of
+        candidates at a time. See `inference()` for the arguments."""
+        timings = state["timings"]
+        diffuser = load_discrete_vocoder_diffuser(
+            desired_diffusion_steps=diffusion_iterations, cond_free=cond_free, cond_free_k=cond_free_k, sampler=sampler
+        )
+        best_latents = state["latents"]
+        diffusion_batch_size = diffusion_batch_size or len(best_latents)
+
+        if verbose:
+            print("Transforming autoregressive outputs into audio..")
+        wav_candidates = []
+        with torch.no_grad():
+            for start in range(0, len(best_latents), diffusion_batch_size):
+                batch = best_latents[start : start + diffusion_batch_size]
+                # Shorter latents are padded with their last latent, which codes silence, and the outputs are trimmed
+                # to the length of each candidate.
+                max_length = max(latents.shape[0] for latents in batch)
+                latents = torch.stack([torch.cat([x, x[-1:].expand(max_length - x.shape[0], -1)]) for x in batch]).to(
+                    self.device
+                )
+                with stage_timer(timings, "diffusion", self.device), self.temporary_cuda(self.diffusion) as diffusion:
                     mel = do_spectrogram_diffusion(
                         diffusion,
                         diffuser,
                         latents,
-                        diffusion_conditioning,
+                        state["diffusion_conditioning"],
                         temperature=diffusion_temperature,
                         verbose=verbose,
                     )
-                with self.temporary_cuda(self.vocoder) as vocoder:
-                    wav = vocoder.inference(mel)
-                    wav_candidates.append(wav.cpu())
+                with stage_timer(timings, "vocoder", self.device), self.temporary_cuda(self.vocoder) as vocoder:
+                    wav = vocoder.inference(mel).cpu()
+                hop_length = wav.shape[-1] // mel.shape[-1]
+                for idx, latent in enumerate(batch):
+                    num_samples = get_diffusion_output_length(latent.shape[0]) * hop_length
+                    wav_candidates.append(wav[idx : idx + 1, :, :num_samples])
+
+        def potentially_redact(clip, text):
+            if self.enable_redaction:
+                return self.aligner.redact(clip.squeeze(1), text).unsqueeze(1)
+            return clip
 
-            def potentially_redact(clip, text):
-                if self.enable_redaction:
-                    return self.aligner.redact(clip.squeeze(1), text).unsqueeze(1)
-                return clip
+        if self.enable_redaction:
+            with stage_timer(timings, "redaction"):
+                wav_candidates = [potentially_redact(wav_candidate, state["text"]) for wav_candidate in wav_candidates]
 
-            wav_candidates = [potentially_redact(wav_candidate, text) for wav_candidate in wav_candidates]
+        if len(wav_candidates) > 1:
+            res = wav_candidates
+        else:
+            res = wav_candidates[0]
 
-            if len(wav_candidates) > 1:
-                res = wav_candidates
-            else:
-                res = wav_candidates[0]
+        if verbose:
+            print(" > Stage timings: " + ", ".join(f"{stage}: {seconds:.2f}s" for stage, seconds in timings.items()))
 
         return_dict = {
             "wav": res,
@@ -821,17 +1142,57 @@ class Tortoise(BaseTTS):
             "text": None,
             "voice_samples": None,
             "conditioning_latents": None,
+            "stage_timings": timings,
         }
         if return_deterministic_state:
             return_dict = {
                 "wav": res,
-                "deterministic_seed": deterministic_seed,
-                "text": text,
-                "voice_samples": voice_samples,
-                "conditioning_latents": conditioning_latents,
+                "deterministic_seed": state["deterministic_seed"],
+                "text": state["text"],
+                "voice_samples": state["voice_samples"],
+                "conditioning_latents": state["conditioning_latents"],
+                "stage_timings": timings,
             }
         return return_dict
 
+    def inference_pipelined(self, texts: List[str], **kwargs):
+        """Synthesize several texts, computing the conditioning latents, the autoregressive samples and the CLVP
+        ranking of a text while the diffusion model and the vocoder run on the previous one.
+
+        The stages overlap only if the models stay on the device, i.e. on CPU or with `high_vram`. Otherwise the texts
+        are synthesized one after the other since both stages would move the same models in and out of the GPU. The
+        global random state is shared by the stages, so the outputs are not reproducible with
+        `use_deterministic_seed`.
+
+        Args:
+            texts (List[str]): Texts to be spoken.
+            **kwargs: Inference settings. See `inference()`.
+
+        Yields:
+            Dict: The output of `inference()` for each text, in order.
+        """
+        if not (self.high_vram or self.device.type == "cpu"):
+            for text in texts:
+                yield self.inference(text, **kwargs)
+            return
+
+        decode_args = [name for name in inspect.signature(self._decode_stage).parameters if name != "state"]
+        decode_kwargs = {name: value for name, value in kwargs.items() if name in decode_args}
+        generate_kwargs = {name: value for name, value in kwargs.items() if name not in decode_args}
+        if "verbose" in kwargs:
+            generate_kwargs["verbose"] = kwargs["verbose"]
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            previous = None
+            for text in texts:
+                # queued behind the previous text, so at most one text waits for the decoding stages
+                current = executor.submit(self._generate_stage, text, **generate_kwargs)
+                if previous is not None:
+                    yield self._decode_stage(previous.result(), **decode_kwargs)
+                previous = current
+            if previous is not None:
+                yield self._decode_stage(previous.result(), **decode_kwargs)
+
     def forward(self):
         raise NotImplementedError("Tortoise Training is not implemented")
 
@@ -870,30 +1231,37 @@ class Tortoise(BaseTTS):
         """
         if self.models_dir is None:
             self.models_dir = checkpoint_dir
-        ar_path = ar_checkpoint_path or os.path.join(checkpoint_dir, "autoregressive.pth")
-        diff_path = diff_checkpoint_path or os.path.join(checkpoint_dir, "diffusion_decoder.pth")
-        clvp_path = clvp_checkpoint_path or os.path.join(checkpoint_dir, "clvp2.pth")
-        vocoder_checkpoint_path = vocoder_checkpoint_path or os.path.join(checkpoint_dir, "vocoder.pth")
+        # prefer the inference checkpoints made by `TTS/bin/convert_checkpoint.py`
+        ar_path = ar_checkpoint_path or get_inference_checkpoint_path(
+            os.path.join(checkpoint_dir, "autoregressive.pth")
+        )
+        diff_path = diff_checkpoint_path or get_inference_checkpoint_path(
+            os.path.join(checkpoint_dir, "diffusion_decoder.pth")
+        )
+        clvp_path = clvp_checkpoint_path or get_inference_checkpoint_path(os.path.join(checkpoint_dir, "clvp2.pth"))
+        vocoder_checkpoint_path = vocoder_checkpoint_path or get_inference_checkpoint_path(
+            os.path.join(checkpoint_dir, "vocoder.pth")
+        )
         self.mel_norm_path = os.path.join(checkpoint_dir, "mel_norms.pth")
 
         if os.path.exists(ar_path):
             # remove keys from the checkpoint that are not in the model
-            checkpoint = torch.load(ar_path, map_location=torch.device("cpu"))
+            checkpoint = load_fsspec(ar_path, map_location=torch.device("cpu"))
 
             # strict set False
             # due to removed `bias` and `masked_bias` changes in Transformers
             self.autoregressive.load_state_dict(checkpoint, strict=False)
 
         if os.path.exists(diff_path):
-            self.diffusion.load_state_dict(torch.load(diff_path), strict=strict)
+            self.diffusion.load_state_dict(load_fsspec(diff_path), strict=strict)
 
         if os.path.exists(clvp_path):
-            self.clvp.load_state_dict(torch.load(clvp_path), strict=strict)
+            self.clvp.load_state_dict(load_fsspec(clvp_path), strict=strict)
 
         if os.path.exists(vocoder_checkpoint_path):
             self.vocoder.load_state_dict(
                 config.model_args.vocoder.value.optionally_index(
-                    torch.load(
+                    load_fsspec(
                         vocoder_checkpoint_path,
                         map_location=torch.device("cpu"),
                     )
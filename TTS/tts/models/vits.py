@@ -294,6 +294,9 @@ class VitsDataset(TTSDataset):
     def lengths(self):
         lens = []
         for item in self.samples:
+            if isinstance(item, dict) and item.get("audio_length") is not None:
+                lens.append(item["audio_length"])
+                continue
             _, wav_file, *_ = _parse_sample(item)
             audio_len = os.path.getsize(wav_file) / 16 * 8  # assuming 16bit audio
             lens.append(audio_len)
@@ -628,6 +631,8 @@ class Vits(BaseTTS):
         >>> model = Vits(config)
     """
 
+    SUPPORTS_BATCH_INFERENCE = True
+
     def __init__(
         self,
         config: Coqpit,
@@ -1567,7 +1572,8 @@ class Vits(BaseTTS):
                 w_sampler,
                 data=data_items,
                 batch_size=config.eval_batch_size if is_eval else config.batch_size,
-                sort_key=lambda x: os.path.getsize(x["audio_file"]),
+                # lengths computed by `preprocess_samples()`
+                sort_key=[item["audio_length"] for item in data_items],
                 drop_last=True,
             )
         else:
@@ -8,12 +8,14 @@ import torchaudio
 from coqpit import Coqpit
 
 from TTS.tts.layers.xtts.gpt import GPT
+from TTS.tts.layers.xtts.gpt_batch_decoder import GPTBatchDecoder
 from TTS.tts.layers.xtts.hifigan_decoder import HifiDecoder
+from TTS.tts.layers.xtts.latent_cache import ConditioningLatentCache
 from TTS.tts.layers.xtts.stream_generator import init_stream_support
 from TTS.tts.layers.xtts.tokenizer import VoiceBpeTokenizer, split_sentence
 from TTS.tts.layers.xtts.xtts_manager import SpeakerManager, LanguageManager
 from TTS.tts.models.base_tts import BaseTTS
-from TTS.utils.io import load_fsspec
+from TTS.utils.io import get_inference_checkpoint_path, load_fsspec
 
 init_stream_support()
 
@@ -214,6 +216,10 @@ class Xtts(BaseTTS):
         self.gpt = None
         self.init_models()
         self.register_buffer("mel_stats", torch.ones(80))
+        self.latent_cache = ConditioningLatentCache(
+            max_size=config.latent_cache_size, cache_dir=config.latent_cache_dir
+        )
+        self.latent_cache_fingerprint = None
 
     def init_models(self):
         """Initialize the models. We do it here since we need to load the tokenizer first."""
@@ -332,6 +338,7 @@ class Xtts(BaseTTS):
         librosa_trim_db=None,
         sound_norm_refs=False,
         load_sr=22050,
+        use_cache=True,
     ):
         """Get the conditioning latents for the GPT model from the given audio.
 
@@ -343,6 +350,8 @@ class Xtts(BaseTTS):
             librosa_trim_db (int, optional): Trim the audio using this value. If None, not trimming. Defaults to None.
             sound_norm_refs (bool, optional): Whether to normalize the audio. Defaults to False.
             load_sr (int, optional): Sample rate to load the audio. Defaults to 24000.
+            use_cache (bool, optional): Reuse the latents computed before for the same audio files and parameters.
+                Defaults to True.
         """
         # deal with multiples references
         if not isinstance(audio_path, list):
@@ -350,6 +359,30 @@ class Xtts(BaseTTS):
         else:
             audio_paths = audio_path
 
+        cache_key = None
+        if use_cache:
+            if self.latent_cache_fingerprint is None:
+                # weights of the modules computing the latents, reset by `load_checkpoint()`
+                modules = [self.gpt.conditioning_encoder, self.hifigan_decoder.speaker_encoder]
+                if self.gpt.use_perceiver_resampler:
+                    modules.append(self.gpt.conditioning_perceiver)
+                self.latent_cache_fingerprint = self.latent_cache.compute_fingerprint(
+                    {"mel_stats": self.mel_stats}, *[module.state_dict() for module in modules]
+                )
+            cache_key = self.latent_cache.compute_key(
+                audio_paths,
+                model=self.latent_cache_fingerprint,
+                max_ref_length=max_ref_length,
+                gpt_cond_len=gpt_cond_len,
+                gpt_cond_chunk_len=gpt_cond_chunk_len,
+                librosa_trim_db=librosa_trim_db,
+                sound_norm_refs=sound_norm_refs,
+                load_sr=load_sr,
+            )
+            latents = self.latent_cache.get(cache_key, device=self.device)
+            if latents is not None:
+                return latents
+
         speaker_embeddings = []
         audios = []
         speaker_embedding = None
@@ -377,6 +410,8 @@ class Xtts(BaseTTS):
             speaker_embedding = torch.stack(speaker_embeddings)
             speaker_embedding = speaker_embedding.mean(dim=0)
 
+        if cache_key is not None:
+            self.latent_cache.put(cache_key, gpt_cond_latents, speaker_embedding)
         return gpt_cond_latents, speaker_embedding
 
     def synthesize(self, text, config, speaker_wav, language, speaker_id=None, **kwargs):
@@ -418,6 +453,43 @@ class Xtts(BaseTTS):
         })
         return self.full_inference(text, speaker_wav, language, **settings)
 
+    def synthesize_stream(self, text, config, speaker_wav, language, speaker_id=None, **kwargs):
+        """Synthesize speech with the given input text and yield the waveform in chunks while it is decoded.
+
+        Args:
+            text (str): Input text.
+            config (XttsConfig): Config with inference parameters.
+            speaker_wav (list): List of paths to the speaker audio files to be used for cloning.
+            language (str): Language ID of the speaker.
+            **kwargs: Inference settings. See `inference_stream()`.
+
+        Yields:
+            np.ndarray: Chunks of the output waveform.
+        """
+        assert (
+            "zh-cn" if language == "zh" else language in self.config.languages
+        ), f" ❗ Language {language} is not supported. Supported languages are {self.config.languages}"
+        settings = {
+            "temperature": config.temperature,
+            "length_penalty": config.length_penalty,
+            "repetition_penalty": config.repetition_penalty,
+            "top_k": config.top_k,
+            "top_p": config.top_p,
+        }
+        settings.update(kwargs)  # allow overriding of preset settings with kwargs
+        if speaker_id is not None:
+            gpt_cond_latent, speaker_embedding = self.speaker_manager.speakers[speaker_id].values()
+        else:
+            gpt_cond_latent, speaker_embedding = self.get_conditioning_latents(
+                audio_path=speaker_wav,
+                gpt_cond_len=config.gpt_cond_len,
+                gpt_cond_chunk_len=config.gpt_cond_chunk_len,
+                max_ref_length=config.max_ref_len,
+                sound_norm_refs=config.sound_norm_refs,
+            )
+        for wav_chunk in self.inference_stream(text, language, gpt_cond_latent, speaker_embedding, **settings):
+            yield wav_chunk.cpu().numpy()
+
     @torch.inference_mode()
     def full_inference(
         self,
@@ -582,6 +654,138 @@ class Xtts(BaseTTS):
             "speaker_embedding": speaker_embedding,
         }
 
+    def synthesize_batch(self, texts, config, speaker_wav, language, speaker_id=None, **kwargs):
+        """Synthesize several sentences with the same voice by decoding them together. See `inference_batch()`.
+
+        Args:
+            texts (List[str]): Input sentences.
+            config (XttsConfig): Config with inference parameters.
+            speaker_wav (list): List of paths to the speaker audio files to be used for cloning.
+            language (str): Language ID of the speaker.
+            **kwargs: Inference settings. See `inference_batch()`.
+
+        Returns:
+            List[np.ndarray]: One waveform per sentence.
+        """
+        assert (
+            "zh-cn" if language == "zh" else language in self.config.languages
+        ), f" ❗ Language {language} is not supported. Supported languages are {self.config.languages}"
+        settings = {
+            "temperature": config.temperature,
+            "repetition_penalty": config.repetition_penalty,
+            "top_k": config.top_k,
+            "top_p": config.top_p,
+        }
+        settings.update(kwargs)  # allow overriding of preset settings with kwargs
+        if speaker_id is not None:
+            gpt_cond_latent, speaker_embedding = self.speaker_manager.speakers[speaker_id].values()
+        else:
+            gpt_cond_latent, speaker_embedding = self.get_conditioning_latents(
+                audio_path=speaker_wav,
+                gpt_cond_len=config.gpt_cond_len,
+                gpt_cond_chunk_len=config.gpt_cond_chunk_len,
+                max_ref_length=config.max_ref_len,
+                sound_norm_refs=config.sound_norm_refs,
+            )
+        outputs = self.inference_batch(texts, language, gpt_cond_latent, speaker_embedding, **settings)
+        return [out["wav"] for out in outputs]
+
+    @torch.inference_mode()
+    def inference_batch(
+        self,
+        texts,
+        language,
+        gpt_cond_latents,
+        speaker_embeddings,
+        # GPT inference
+        temperature=0.75,
+        repetition_penalty=10.0,
+        top_k=50,
+        top_p=0.85,
+        do_sample=True,
+        speed=1.0,
+        max_batch_size=8,
+    ):
+        """Synthesize several sentences at once with continuous batching of the GPT decoding.
+
+        All the sentences run through a single :class:`GPTBatchDecoder` loop. When a sentence is finished, the next one
+        takes its place in the batch, so short and long sentences can be mixed without waiting for the longest one.
+        Each sentence can have its own voice.
+
+        Args:
+            texts (List[str]): Input sentences.
+            language (str): Language of the sentences.
+            gpt_cond_latents (Union[torch.Tensor, List[torch.Tensor]]): GPT conditioning latents shared by all the
+                sentences or one per sentence.
+            speaker_embeddings (Union[torch.Tensor, List[torch.Tensor]]): speaker embeddings shared by all the
+                sentences or one per sentence.
+            max_batch_size (int): Maximum number of sentences decoded together. Defaults to 8.
+
+            See `inference()` for the other arguments. Beam search is not supported.
+
+        Returns:
+            List[Dict]: `inference()` outputs of each sentence.
+        """
+        language = language.split("-")[0]  # remove the country code
+        length_scale = 1.0 / max(speed, 0.05)
+        if not isinstance(gpt_cond_latents, (list, tuple)):
+            gpt_cond_latents = [gpt_cond_latents] * len(texts)
+        if not isinstance(speaker_embeddings, (list, tuple)):
+            speaker_embeddings = [speaker_embeddings] * len(texts)
+        gpt_cond_latents = [latent.to(self.device) for latent in gpt_cond_latents]
+        speaker_embeddings = [embedding.to(self.device) for embedding in speaker_embeddings]
+
+        decoder = GPTBatchDecoder(self.gpt, max_batch_size=max_batch_size)
+        text_tokens_list, seqs = [], []
+        for sent, gpt_cond_latent in zip(texts, gpt_cond_latents):
+            sent = sent.strip().lower()
+            text_tokens = torch.IntTensor(self.tokenizer.encode(sent, lang=language)).unsqueeze(0).to(self.device)
+            assert (
+                text_tokens.shape[-1] < self.args.gpt_max_text_tokens
+            ), " ❗ XTTS can only generate text with a maximum of 400 tokens."
+            text_tokens_list.append(text_tokens)
+            seqs.append(
+                decoder.add(
+                    gpt_cond_latent,
+                    text_tokens,
+                    temperature=temperature,
+                    top_k=top_k,
+                    top_p=top_p,
+                    repetition_penalty=repetition_penalty,
+                    do_sample=do_sample,
+                )
+            )
+        decoder.run()
+
+        outputs = []
+        for seq, text_tokens, gpt_cond_latent, speaker_embedding in zip(
+            seqs, text_tokens_list, gpt_cond_latents, speaker_embeddings
+        ):
+            gpt_codes = seq.codes.to(self.device)
+            expected_output_len = torch.tensor([gpt_codes.shape[-1] * self.gpt.code_stride_len], device=self.device)
+            text_len = torch.tensor([text_tokens.shape[-1]], device=self.device)
+            gpt_latents = self.gpt(
+                text_tokens,
+                text_len,
+                gpt_codes,
+                expected_output_len,
+                cond_latents=gpt_cond_latent,
+                return_attentions=False,
+                return_latent=True,
+            )
+            if length_scale != 1.0:
+                gpt_latents = F.interpolate(
+                    gpt_latents.transpose(1, 2), scale_factor=length_scale, mode="linear"
+                ).transpose(1, 2)
+            outputs.append(
+                {
+                    "wav": self.hifigan_decoder(gpt_latents, g=speaker_embedding).cpu().squeeze().numpy(),
+                    "gpt_latents": gpt_latents.cpu().numpy(),
+                    "speaker_embedding": speaker_embedding,
+                }
+            )
+        return outputs
+
     def handle_chunks(self, wav_gen, wav_gen_prev, wav_overlap, overlap_len):
         """Handle chunk formatting in streaming mode"""
         wav_chunk = wav_gen[:-overlap_len]
@@ -754,7 +958,7 @@ class Xtts(BaseTTS):
             None
         """
 
-        model_path = checkpoint_path or os.path.join(checkpoint_dir, "model.pth")
+        model_path = checkpoint_path or get_inference_checkpoint_path(os.path.join(checkpoint_dir, "model.pth"))
         vocab_path = vocab_path or os.path.join(checkpoint_dir, "vocab.json")
 
         if speaker_file_path is None and checkpoint_dir is not None:
@@ -780,6 +984,8 @@ class Xtts(BaseTTS):
                 self.gpt.init_gpt_for_inference(kv_cache=self.args.kv_cache)
             self.load_state_dict(checkpoint, strict=strict)
 
+        self.latent_cache_fingerprint = None
+
         if eval:
             self.hifigan_decoder.eval()
             self.gpt.init_gpt_for_inference(kv_cache=self.args.kv_cache, use_deepspeed=use_deepspeed)
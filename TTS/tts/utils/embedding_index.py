@@ -0,0 +1,194 @@
+import json
+import os
+from typing import Dict, List, Tuple, Union
+
+import fsspec
+import numpy as np
+
+
+class EmbeddingIndex:
+    """Array backed store of clip embeddings with a cosine similarity search.
+
+    The embeddings are kept in a single `[num_clips, embedding_dim]` matrix, grouped by name, with a row index for
+    the clip IDs and cached per name centroids. It is saved as a `.npy` matrix that can be memory-mapped and a `.json`
+    file with the clip IDs and names next to it.
+
+    Args:
+        clip_ids (List[str]): Clip ID of each row.
+        names (List[str]): Name (e.g. speaker) of each row.
+        embeddings (np.ndarray): Embedding matrix of shape :math:`[num_clips, embedding_dim]`.
+
+    Examples:
+        >>> index = EmbeddingIndex.from_dict(load_file("speakers.pth"), dtype=np.float16)
+        >>> index.save("speakers.npy")
+        >>> index = EmbeddingIndex.load("speakers.npy", mmap=True)
+        >>> index.search(embedding, k=3, by="name")
+        [('p225', 0.91), ('p228', 0.83), ('p251', 0.8)]
+    """
+
+    def __init__(self, clip_ids: List[str], names: List[str], embeddings: np.ndarray):
+        if len(clip_ids) != len(names) or len(clip_ids) != embeddings.shape[0]:
+            raise ValueError(
+                f" [!] {len(clip_ids)} clip IDs, {len(names)} names and {embeddings.shape[0]} embeddings don't match."
+            )
+        self.embeddings = embeddings
+        self.clip_ids = list(clip_ids)
+        self.clip_to_row = {clip_id: row for row, clip_id in enumerate(self.clip_ids)}
+        self.row_names = list(names)
+        # rows are expected to be grouped by name but any order works
+        self.names, self.name_ids, counts = np.unique(self.row_names, return_inverse=True, return_counts=True)
+        self.names = self.names.tolist()
+        self.name_to_id = {name: idx for idx, name in enumerate(self.names)}
+        self.name_counts = counts
+        self.name_offsets = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+        self._name_order = None
+        self._centroids = None
+        self._normalized_embeddings = None
+        self._normalized_centroids = None
+
+    def __len__(self):
+        return len(self.clip_ids)
+
+    @property
+    def embedding_dim(self) -> int:
+        return self.embeddings.shape[1]
+
+    @classmethod
+    def from_dict(cls, embeddings: Dict, dtype: np.dtype = np.float32) -> "EmbeddingIndex":
+        """Build the index from the `{clip_id: {"name": ..., "embedding": [...]}}` mapping of the embedding files.
+
+        Args:
+            embeddings (Dict): Embeddings keyed by clip ID.
+            dtype (np.dtype): Storage type of the matrix. Use `np.float16` to halve the memory. Defaults to
+                `np.float32`.
+        """
+        clip_ids = sorted(embeddings.keys(), key=lambda clip_id: (embeddings[clip_id]["name"], clip_id))
+        names = [embeddings[clip_id]["name"] for clip_id in clip_ids]
+        if clip_ids:
+            matrix = np.array([embeddings[clip_id]["embedding"] for clip_id in clip_ids], dtype=dtype)
+        else:
+            matrix = np.zeros((0, 0), dtype=dtype)
+        return cls(clip_ids, names, matrix)
+
+    def to_dict(self) -> Dict:
+        """Return the embeddings in the `{clip_id: {"name": ..., "embedding": ...}}` format. The embeddings are rows of
+        the matrix, so no memory is copied."""
+        return {
+            clip_id: {"name": name, "embedding": embedding}
+            for clip_id, name, embedding in zip(self.clip_ids, self.row_names, self.embeddings)
+        }
+
+    @staticmethod
+    def get_metadata_path(path: str) -> str:
+        return os.path.splitext(path)[0] + ".json"
+
+    def save(self, path: str) -> None:
+        """Save the matrix to `path` in `.npy` format and the clip IDs and names to a `.json` file next to it.
+
+        Args:
+            path (str): Path to the `.npy` file.
+        """
+        with fsspec.open(path, "wb") as f:
+            np.save(f, np.ascontiguousarray(self.embeddings))
+        with fsspec.open(self.get_metadata_path(path), "w") as f:
+            json.dump({"clip_ids": self.clip_ids, "names": self.row_names}, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "EmbeddingIndex":
+        """Load an index saved by `save()`.
+
+        Args:
+            path (str): Path to the `.npy` file.
+            mmap (bool): Memory-map the matrix instead of reading it. Only rows that are used are read from disk.
+                Defaults to True.
+        """
+        with fsspec.open(cls.get_metadata_path(path), "r") as f:
+            metadata = json.load(f)
+        if mmap and os.path.exists(path):
+            embeddings = np.load(path, mmap_mode="r")
+        else:
+            with fsspec.open(path, "rb") as f:
+                embeddings = np.load(f)
+        return cls(metadata["clip_ids"], metadata["names"], embeddings)
+
+    def get_embedding(self, clip_id: str) -> np.ndarray:
+        return self.embeddings[self.clip_to_row[clip_id]]
+
+    def get_embeddings_by_name(self, name: str) -> np.ndarray:
+        """Get all the embeddings of a name as a matrix."""
+        name_id = self.name_to_id[name]
+        offset = self.name_offsets[name_id]
+        return self.embeddings[self.name_order[offset : offset + self.name_counts[name_id]]]
+
+    @property
+    def name_order(self) -> np.ndarray:
+        """Row indices sorted by name."""
+        if self._name_order is None:
+            self._name_order = np.argsort(self.name_ids, kind="stable")
+        return self._name_order
+
+    @property
+    def centroids(self) -> np.ndarray:
+        """Mean embedding of each name in `self.names`, computed once in float32."""
+        if self._centroids is None:
+            if len(self) == 0:
+                return np.zeros((0, self.embedding_dim), dtype=np.float32)
+            if np.all(self.name_ids[:-1] <= self.name_ids[1:]):
+                # rows are grouped by name, avoid copying the matrix
+                embeddings = self.embeddings
+            else:
+                embeddings = self.embeddings[self.name_order]
+            sums = np.add.reduceat(embeddings, self.name_offsets, axis=0, dtype=np.float32)
+            self._centroids = sums / self.name_counts[:, None]
+        return self._centroids
+
+    def get_centroid(self, name: str) -> np.ndarray:
+        return self.centroids[self.name_to_id[name]]
+
+    @staticmethod
+    def _normalize(embeddings: np.ndarray) -> np.ndarray:
+        embeddings = embeddings.astype(np.float32)
+        norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-8)
+
+    def search(
+        self, embedding: Union[np.ndarray, List], k: int = 1, by: str = "name"
+    ) -> Union[List[Tuple[str, float]], List[List[Tuple[str, float]]]]:
+        """Find the most similar entries to the given embeddings by cosine similarity.
+
+        Args:
+            embedding (Union[np.ndarray, List]): Query embedding of shape :math:`[D]` or a batch of them of shape
+                :math:`[B, D]`.
+            k (int): Number of results per query. Defaults to 1.
+            by (str): Compare with the centroid of each name (`"name"`) or with each clip (`"clip"`). Defaults to
+                `"name"`.
+
+        Returns:
+            List of `(name or clip ID, similarity)` sorted by decreasing similarity, or one such list per query.
+        """
+        if by == "name":
+            if self._normalized_centroids is None:
+                self._normalized_centroids = self._normalize(self.centroids)
+            keys, candidates = self.names, self._normalized_centroids
+        elif by == "clip":
+            if self._normalized_embeddings is None:
+                self._normalized_embeddings = self._normalize(self.embeddings)
+            keys, candidates = self.clip_ids, self._normalized_embeddings
+        else:
+            raise ValueError(f" [!] Unknown search target `{by}`, use `name` or `clip`.")
+
+        queries = np.asarray(embedding, dtype=np.float32)
+        single_query = queries.ndim == 1
+        scores = self._normalize(np.atleast_2d(queries)) @ candidates.T
+        k = min(k, len(keys))
+        # top-k in linear time, then sort only the k best
+        top_k = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_k_scores = np.take_along_axis(scores, top_k, axis=1)
+        order = np.argsort(-top_k_scores, axis=1)
+        top_k = np.take_along_axis(top_k, order, axis=1)
+        top_k_scores = np.take_along_axis(top_k_scores, order, axis=1)
+        results = [
+            [(keys[idx], float(score)) for idx, score in zip(indices, row_scores)]
+            for indices, row_scores in zip(top_k, top_k_scores)
+        ]
+        return results[0] if single_query else results
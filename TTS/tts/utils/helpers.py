@@ -1,3 +1,5 @@
+import importlib.util
+
 import numpy as np
 import torch
 from scipy.stats import betabinom
@@ -10,6 +12,9 @@ try:
 except ModuleNotFoundError:
     CYTHON = False
 
+# numba is imported on the first use, it is slow to import
+NUMBA = importlib.util.find_spec("numba") is not None
+
 
 class StandardScaler:
     """StandardScaler for mean-scale normalization with the given mean and scale values."""
@@ -169,10 +174,51 @@ def generate_path(duration, mask):
     return path
 
 
-def maximum_path(value, mask):
+def get_maximum_path_backend(value: torch.Tensor) -> str:
+    """Return the fastest available monotonic alignment search backend for a tensor.
+
+    The compiled CPU kernels are faster than the torch loop even with the copies to and from the GPU, because the
+    torch loop launches a few kernels for each decoder frame.
+    """
     if CYTHON:
+        return "cython"
+    if NUMBA:
+        return "numba"
+    if value.is_cuda:
+        return "torch"
+    return "numpy"
+
+
+def maximum_path(value, mask, backend: str = None):
+    """Monotonic alignment search.
+
+    Args:
+        value (torch.Tensor): log-likelihood of aligning each encoder step to each decoder step.
+        mask (torch.Tensor): attention mask.
+        backend (str): "cython", "numba", "torch" or "numpy". Defaults to the fastest available backend, see
+            :func:`get_maximum_path_backend`.
+
+    Shapes:
+        - value: :math:`[B, T_en, T_de]`
+        - mask: :math:`[B, T_en, T_de]`
+    """
+    backend = backend or get_maximum_path_backend(value)
+    if backend == "cython":
         return maximum_path_cython(value, mask)
-    return maximum_path_numpy(value, mask)
+    if backend == "numba":
+        return maximum_path_numba(value, mask)
+    if backend == "torch":
+        return maximum_path_torch(value, mask)
+    if backend == "numpy":
+        return maximum_path_numpy(value, mask)
+    raise ValueError(f" [!] Unknown monotonic alignment search backend: {backend}.")
+
+
+def _get_path_lengths(mask: torch.Tensor):
+    mask = mask.data.cpu()
+    t_x_max = mask.sum(1)[:, 0].numpy().astype(np.int32)
+    t_y_max = mask.sum(2)[:, 0].numpy().astype(np.int32)
+    return t_x_max, t_y_max
 
 
 def maximum_path_cython(value, mask):
@@ -186,14 +232,64 @@ def maximum_path_cython(value, mask):
     dtype = value.dtype
     value = value.data.cpu().numpy().astype(np.float32)
     path = np.zeros_like(value).astype(np.int32)
-    mask = mask.data.cpu().numpy()
-
-    t_x_max = mask.sum(1)[:, 0].astype(np.int32)
-    t_y_max = mask.sum(2)[:, 0].astype(np.int32)
+    t_x_max, t_y_max = _get_path_lengths(mask)
     maximum_path_c(path, value, t_x_max, t_y_max)
     return torch.from_numpy(path).to(device=device, dtype=dtype)
 
 
+def maximum_path_numba(value, mask):
+    """Numba version of :func:`maximum_path_cython`, running the samples of the batch in parallel threads.
+    Shapes:
+        - value: :math:`[B, T_en, T_de]`
+        - mask: :math:`[B, T_en, T_de]`
+    """
+    # pylint: disable=import-outside-toplevel
+    from TTS.tts.utils.monotonic_align.numba_core import maximum_path_numba as maximum_path_nb
+
+    value = value * mask
+    device = value.device
+    dtype = value.dtype
+    value = np.ascontiguousarray(value.data.cpu().numpy(), dtype=np.float32)
+    path = np.zeros(value.shape, dtype=np.int32)
+    t_x_max, t_y_max = _get_path_lengths(mask)
+    maximum_path_nb(path, value, t_x_max, t_y_max, np.float32(-1e9))
+    return torch.from_numpy(path).to(device=device, dtype=dtype)
+
+
+@torch.no_grad()
+def maximum_path_torch(value, mask, max_neg_val=-1e9):
+    """Batched torch version running on the device of the inputs, without copying them to the CPU.
+
+    It runs the same steps as :func:`maximum_path_numpy` and keeps the path directions in a bool tensor.
+
+    Shapes:
+        - value: :math:`[B, T_en, T_de]`
+        - mask: :math:`[B, T_en, T_de]`
+    """
+    dtype = value.dtype
+    mask = mask.bool()
+    b, t_x, t_y = value.shape
+    # [T_de, B, T_en] so that each decoder step reads and writes contiguous memory
+    value = (value.float() * mask).permute(2, 0, 1).contiguous()
+    direction = torch.empty(t_y, b, t_x, dtype=torch.bool, device=value.device)
+    v = torch.zeros(b, t_x, device=value.device)
+    x_range = torch.arange(t_x, device=value.device)
+    for j in range(t_y):
+        v0 = F.pad(v, [1, 0], value=max_neg_val)[:, :-1]
+        max_mask = v >= v0
+        direction[j] = max_mask
+        v = torch.where(x_range <= j, torch.maximum(v, v0) + value[j], max_neg_val)
+    direction = direction | ~mask.permute(2, 0, 1)
+
+    path = torch.zeros(t_y, b, t_x, device=value.device)
+    index = mask[:, :, 0].sum(1) - 1
+    index_range = torch.arange(b, device=value.device)
+    for j in reversed(range(t_y)):
+        path[j, index_range, index] = 1
+        index = index + direction[j, index_range, index].long() - 1
+    return (path.permute(1, 2, 0) * mask).to(dtype)
+
+
 def maximum_path_numpy(value, mask, max_neg_val=None):
     """
     Monotonic alignment search algorithm
@@ -211,7 +307,9 @@ def maximum_path_numpy(value, mask, max_neg_val=None):
     mask = mask.cpu().detach().numpy().astype(bool)
 
     b, t_x, t_y = value.shape
-    direction = np.zeros(value.shape, dtype=np.int64)
+    # [t_y, b, t_x] so that each decoder step reads and writes contiguous memory
+    value = np.ascontiguousarray(value.transpose(2, 0, 1))
+    direction = np.zeros((t_y, b, t_x), dtype=bool)
     v = np.zeros((b, t_x), dtype=np.float32)
     x_range = np.arange(t_x, dtype=np.float32).reshape(1, -1)
     for j in range(t_y):
@@ -219,19 +317,19 @@ def maximum_path_numpy(value, mask, max_neg_val=None):
         v1 = v
         max_mask = v1 >= v0
         v_max = np.where(max_mask, v1, v0)
-        direction[:, :, j] = max_mask
+        direction[j] = max_mask
 
         index_mask = x_range <= j
-        v = np.where(index_mask, v_max + value[:, :, j], max_neg_val)
-    direction = np.where(mask, direction, 1)
+        v = np.where(index_mask, v_max + value[j], max_neg_val)
+    direction = direction | ~mask.transpose(2, 0, 1)
 
-    path = np.zeros(value.shape, dtype=np.float32)
+    path = np.zeros((t_y, b, t_x), dtype=np.float32)
     index = mask[:, :, 0].sum(1).astype(np.int64) - 1
     index_range = np.arange(b)
     for j in reversed(range(t_y)):
-        path[index_range, index, j] = 1
-        index = index + direction[index_range, index, j] - 1
-    path = path * mask.astype(np.float32)
+        path[j, index_range, index] = 1
+        index = index + direction[j, index_range, index] - 1
+    path = path.transpose(1, 2, 0) * mask.astype(np.float32)
     path = torch.from_numpy(path).to(device=device, dtype=dtype)
     return path
 
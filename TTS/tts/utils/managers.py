@@ -1,13 +1,15 @@
 import json
 import random
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Union
 
 import fsspec
 import numpy as np
 import torch
+from torch.utils.data import DataLoader, Dataset
 
 from TTS.config import load_config
 from TTS.encoder.utils.generic_utils import setup_encoder_model
+from TTS.tts.utils.embedding_index import EmbeddingIndex
 from TTS.utils.audio import AudioProcessor
 
 
@@ -18,6 +20,8 @@ def load_file(path: str):
     elif path.endswith(".pth"):
         with fsspec.open(path, "rb") as f:
             return torch.load(f, map_location="cpu")
+    elif path.endswith(".npy"):
+        return EmbeddingIndex.load(path).to_dict()
     else:
         raise ValueError("Unsupported file type")
 
@@ -25,10 +29,13 @@ def load_file(path: str):
 def save_file(obj: Any, path: str):
     if path.endswith(".json"):
         with fsspec.open(path, "w") as f:
-            json.dump(obj, f, indent=4)
+            # embeddings loaded from an `EmbeddingIndex` are numpy arrays
+            json.dump(obj, f, indent=4, default=lambda x: x.tolist())
     elif path.endswith(".pth"):
         with fsspec.open(path, "wb") as f:
             torch.save(obj, f)
+    elif path.endswith(".npy"):
+        EmbeddingIndex.from_dict(obj).save(path)
     else:
         raise ValueError("Unsupported file type")
 
@@ -106,6 +113,25 @@ class BaseIDManager:
         return ids
 
 
+class EncoderInputDataset(Dataset):
+    """Load audio clips and turn them into speaker encoder inputs in the `DataLoader` workers.
+
+    Args:
+        wav_files (List[str]): Audio file paths.
+        load_fn (Callable): Function mapping a file path to the encoder inputs of the clip.
+    """
+
+    def __init__(self, wav_files: List[str], load_fn: Callable):
+        self.wav_files = wav_files
+        self.load_fn = load_fn
+
+    def __len__(self):
+        return len(self.wav_files)
+
+    def __getitem__(self, idx):
+        return idx, self.load_fn(self.wav_files[idx])
+
+
 class EmbeddingManager(BaseIDManager):
     """Base `Embedding` Manager class. Every new `Embedding` manager must inherit this.
     It defines common `Embedding` manager specific functions.
@@ -125,6 +151,10 @@ class EmbeddingManager(BaseIDManager):
     `audio_file_key` is a unique key to the audio file in the dataset. It can be the path to the file or any other unique key.
     `embedding` is the embedding vector of the audio file.
     `name` can be name of the speaker of the audio file.
+
+    Embeddings can also be stored as an :class:`EmbeddingIndex` in a `.npy` file, which is memory-mapped instead of
+    being loaded as nested lists. The index is built on demand for `search_embeddings()` and, once it exists, serves
+    the mean embeddings from its cached centroids.
     """
 
     def __init__(
@@ -137,9 +167,10 @@ class EmbeddingManager(BaseIDManager):
     ):
         super().__init__(id_file_path=id_file_path)
 
-        self.embeddings = {}
+        self._embeddings = {}
         self.embeddings_by_names = {}
         self.clip_ids = []
+        self._embedding_index = None
         self.encoder = None
         self.encoder_ap = None
         self.use_cuda = use_cuda
@@ -153,6 +184,16 @@ class EmbeddingManager(BaseIDManager):
         if encoder_model_path and encoder_config_path:
             self.init_encoder(encoder_model_path, encoder_config_path, use_cuda)
 
+    @property
+    def embeddings(self) -> Dict:
+        """Embeddings keyed by clip ID. Setting them drops the embedding index."""
+        return self._embeddings
+
+    @embeddings.setter
+    def embeddings(self, embeddings: Dict) -> None:
+        self._embeddings = embeddings
+        self._embedding_index = None
+
     @property
     def num_embeddings(self):
         """Get number of embeddings."""
@@ -170,18 +211,35 @@ class EmbeddingManager(BaseIDManager):
             return len(self.embeddings[list(self.embeddings.keys())[0]]["embedding"])
         return 0
 
+    @property
+    def embedding_index(self) -> EmbeddingIndex:
+        """Array backed copy of `self.embeddings`, built on first use. It is built again when the number of embeddings
+        changes. Call `reset_embedding_index()` after changing the values of `self.embeddings` in place."""
+        if not self._is_embedding_index_current():
+            self._embedding_index = EmbeddingIndex.from_dict(self.embeddings)
+        return self._embedding_index
+
+    def _is_embedding_index_current(self) -> bool:
+        return self._embedding_index is not None and len(self._embedding_index) == len(self.embeddings)
+
+    def reset_embedding_index(self) -> None:
+        self._embedding_index = None
+
     @property
     def embedding_names(self):
         """Get embedding names."""
         return list(self.embeddings_by_names.keys())
 
     def save_embeddings_to_file(self, file_path: str) -> None:
-        """Save embeddings to a json file.
+        """Save embeddings to a json, pth or npy file.
 
         Args:
             file_path (str): Path to the output file.
         """
-        save_file(self.embeddings, file_path)
+        if file_path.endswith(".npy"):
+            self.embedding_index.save(file_path)
+        else:
+            save_file(self.embeddings, file_path)
 
     @staticmethod
     def read_embeddings_from_file(file_path: str):
@@ -190,7 +248,15 @@ class EmbeddingManager(BaseIDManager):
         Args:
             file_path (str): Path to the file.
         """
-        embeddings = load_file(file_path)
+        return EmbeddingManager.parse_embeddings(load_file(file_path))
+
+    @staticmethod
+    def parse_embeddings(embeddings: Dict):
+        """Get the name IDs, clip IDs and the embeddings grouped by name from an embedding mapping.
+
+        Args:
+            embeddings (Dict): Embeddings keyed by clip ID.
+        """
         speakers = sorted({x["name"] for x in embeddings.values()})
         name_to_id = {name: i for i, name in enumerate(speakers)}
         clip_ids = list(set(sorted(clip_name for clip_name in embeddings.keys())))
@@ -209,9 +275,15 @@ class EmbeddingManager(BaseIDManager):
         Args:
             file_path (str): Path to the target json file.
         """
-        self.name_to_id, self.clip_ids, self.embeddings, self.embeddings_by_names = self.read_embeddings_from_file(
-            file_path
-        )
+        embedding_index = None
+        if file_path.endswith(".npy"):
+            embedding_index = EmbeddingIndex.load(file_path)
+            embeddings = embedding_index.to_dict()
+        else:
+            embeddings = load_file(file_path)
+        self.name_to_id, self.clip_ids, self.embeddings, self.embeddings_by_names = self.parse_embeddings(embeddings)
+        # keep the memory-mapped index the embeddings are views of
+        self._embedding_index = embedding_index
 
     def load_embeddings_from_list_of_files(self, file_paths: List[str]) -> None:
         """Load embeddings from a list of json files and don't allow duplicate keys.
@@ -285,17 +357,33 @@ class EmbeddingManager(BaseIDManager):
         Returns:
             np.ndarray: Mean embedding.
         """
+        if num_samples is None and self._is_embedding_index_current():
+            # cached in the index
+            return self._embedding_index.get_centroid(idx)
         embeddings = self.get_embeddings_by_name(idx)
         if num_samples is None:
-            embeddings = np.stack(embeddings).mean(0)
+            return np.stack(embeddings).mean(0)
+        assert len(embeddings) >= num_samples, f" [!] {idx} has number of samples < {num_samples}"
+        if randomize:
+            embeddings = np.stack(random.choices(embeddings, k=num_samples)).mean(0)
         else:
-            assert len(embeddings) >= num_samples, f" [!] {idx} has number of samples < {num_samples}"
-            if randomize:
-                embeddings = np.stack(random.choices(embeddings, k=num_samples)).mean(0)
-            else:
-                embeddings = np.stack(embeddings[:num_samples]).mean(0)
+            embeddings = np.stack(embeddings[:num_samples]).mean(0)
         return embeddings
 
+    def search_embeddings(self, embedding: Union[np.ndarray, List], k: int = 1, by: str = "name") -> List:
+        """Find the closest names or clips to an embedding by cosine similarity.
+
+        Args:
+            embedding (Union[np.ndarray, List]): Query embedding of shape :math:`[D]` or :math:`[B, D]`.
+            k (int, optional): Number of results. Defaults to 1.
+            by (str, optional): Compare with the mean embedding of each name (`"name"`) or with each clip (`"clip"`).
+                Defaults to "name".
+
+        Returns:
+            List: `(name or clip ID, similarity)` pairs sorted by decreasing similarity, one list per query for a batch.
+        """
+        return self.embedding_index.search(embedding, k=k, by=by)
+
     def get_random_embedding(self) -> Any:
         """Get a random embedding.
 
@@ -328,6 +416,23 @@ class EmbeddingManager(BaseIDManager):
         )
         self.encoder_ap = AudioProcessor(**self.encoder_config.audio)
 
+    def load_encoder_input(self, wav_file: str) -> torch.Tensor:
+        """Load an audio file and compute the speaker encoder input.
+
+        Args:
+            wav_file (str): Target file path.
+
+        Returns:
+            torch.Tensor: Mel spectrogram or waveform of shape :math:`(1, ...)`.
+        """
+        waveform = self.encoder_ap.load_wav(wav_file, sr=self.encoder_ap.sample_rate)
+        if not self.encoder_config.model_params.get("use_torch_spec", False):
+            m_input = self.encoder_ap.melspectrogram(waveform)
+            m_input = torch.from_numpy(m_input)
+        else:
+            m_input = torch.from_numpy(waveform)
+        return m_input.unsqueeze(0)
+
     def compute_embedding_from_clip(self, wav_file: Union[str, List[str]]) -> list:
         """Compute a embedding from a given audio file.
 
@@ -339,16 +444,9 @@ class EmbeddingManager(BaseIDManager):
         """
 
         def _compute(wav_file: str):
-            waveform = self.encoder_ap.load_wav(wav_file, sr=self.encoder_ap.sample_rate)
-            if not self.encoder_config.model_params.get("use_torch_spec", False):
-                m_input = self.encoder_ap.melspectrogram(waveform)
-                m_input = torch.from_numpy(m_input)
-            else:
-                m_input = torch.from_numpy(waveform)
-
+            m_input = self.load_encoder_input(wav_file)
             if self.use_cuda:
                 m_input = m_input.cuda()
-            m_input = m_input.unsqueeze(0)
             embedding = self.encoder.compute_embedding(m_input)
             return embedding
 
@@ -365,6 +463,64 @@ class EmbeddingManager(BaseIDManager):
         embedding = _compute(wav_file)
         return embedding[0].tolist()
 
+    def _load_encoder_frames(self, wav_file: str) -> torch.Tensor:
+        return self.encoder.get_eval_frames(self.load_encoder_input(wav_file))
+
+    def compute_embeddings_from_clips(
+        self, wav_files: List[str], batch_size: int = 32, num_workers: int = 0, max_pending_clips: int = None
+    ) -> Iterator[Tuple[int, list]]:
+        """Compute the embeddings of many audio files in batches.
+
+        The clips are loaded and featurized by `num_workers` `DataLoader` workers. The main process groups the
+        clips with the same encoder input shape, which are all the clips longer than the encoder window, and runs
+        the encoder once per `batch_size` clips. Clips shorter than the window rarely fill a group, so when more
+        than `max_pending_clips` clips are waiting the largest group is run as it is. Each embedding is the same as
+        `compute_embedding_from_clip()` returns for the file.
+
+        Args:
+            wav_files (List[str]): Audio file paths.
+            batch_size (int, optional): Number of clips run through the encoder at once. Defaults to 32.
+            num_workers (int, optional): Number of processes loading the audio. Defaults to 0.
+            max_pending_clips (int, optional): Number of clips kept in memory waiting for a full batch. Defaults
+                to `4 * batch_size`.
+
+        Yields:
+            Tuple[int, list]: Index of the file in `wav_files` and its embedding, in the order the batches finish.
+        """
+        loader = DataLoader(
+            EncoderInputDataset(wav_files, self._load_encoder_frames),
+            batch_size=None,
+            shuffle=False,
+            num_workers=num_workers,
+        )
+
+        def _compute(bucket):
+            indices, frames = zip(*bucket)
+            frames_batch = torch.stack(frames)
+            if self.use_cuda:
+                frames_batch = frames_batch.cuda()
+            embeddings = self.encoder.compute_embedding_from_frames(frames_batch)
+            return zip(indices, embeddings.tolist())
+
+        if max_pending_clips is None:
+            max_pending_clips = 4 * batch_size
+        buckets = {}
+        num_pending = 0
+        for idx, frames in loader:
+            bucket = buckets.setdefault(frames.shape, [])
+            bucket.append((idx, frames))
+            num_pending += 1
+            if len(bucket) == batch_size:
+                shape = frames.shape
+            elif num_pending > max_pending_clips:
+                shape = max(buckets, key=lambda shape: len(buckets[shape]))
+            else:
+                continue
+            num_pending -= len(buckets[shape])
+            yield from _compute(buckets.pop(shape))
+        for bucket in buckets.values():
+            yield from _compute(bucket)
+
     def compute_embeddings(self, feats: Union[torch.Tensor, np.ndarray]) -> List:
         """Compute embedding from features.
 
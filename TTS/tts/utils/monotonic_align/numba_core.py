@@ -0,0 +1,42 @@
+import numba
+import numpy as np
+
+
+@numba.njit(nogil=True, cache=False)
+def maximum_path_each(path, value, t_x, t_y, max_neg_val):
+    """Numba port of `maximum_path_each` in `core.pyx`. It accumulates the path scores in place in `value`."""
+    index = t_x - 1
+    for y in range(t_y):
+        for x in range(max(0, t_x + y - t_y), min(t_x, y + 1)):
+            if x == y:
+                v_cur = max_neg_val
+            else:
+                v_cur = value[x, y - 1]
+            if x == 0:
+                if y == 0:
+                    v_prev = 0.0
+                else:
+                    v_prev = max_neg_val
+            else:
+                v_prev = value[x - 1, y - 1]
+            value[x, y] = max(v_cur, v_prev) + value[x, y]
+
+    for y in range(t_y - 1, -1, -1):
+        path[index, y] = 1
+        if index != 0 and (index == y or value[index, y - 1] < value[index - 1, y - 1]):
+            index = index - 1
+
+
+@numba.njit(nogil=True, parallel=True, cache=False)
+def maximum_path_numba(paths, values, t_xs, t_ys, max_neg_val=np.float32(-1e9)):
+    """Run the monotonic alignment search on each sample of a batch in parallel threads.
+
+    Args:
+        paths (np.ndarray): zero initialized output paths. Shape :math:`[B, T_en, T_de]`, int32.
+        values (np.ndarray): path scores, overwritten. Shape :math:`[B, T_en, T_de]`, float32.
+        t_xs (np.ndarray): encoder lengths. Shape :math:`[B]`, int32.
+        t_ys (np.ndarray): decoder lengths. Shape :math:`[B]`, int32.
+        max_neg_val (float): score of the impossible paths.
+    """
+    for i in numba.prange(values.shape[0]):  # pylint: disable=not-an-iterable
+        maximum_path_each(paths[i], values[i], t_xs[i], t_ys[i], max_neg_val)
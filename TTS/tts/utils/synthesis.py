@@ -1,9 +1,11 @@
-from typing import Dict
+from typing import Dict, List
 
 import numpy as np
 import torch
 from torch import nn
 
+from TTS.tts.utils.data import prepare_data
+
 
 def numpy_to_torch(np_array, dtype, cuda=False, device="cpu"):
     if cuda:
@@ -32,8 +34,9 @@ def run_model_torch(
     style_text: str = None,
     d_vector: torch.Tensor = None,
     language_id: torch.Tensor = None,
+    input_lengths: torch.Tensor = None,
 ) -> Dict:
-    """Run a torch model for inference. It does not support batch inference.
+    """Run a torch model for inference. Batch inference requires `input_lengths` and a model that supports it.
 
     Args:
         model (nn.Module): The model to run inference.
@@ -41,11 +44,14 @@ def run_model_torch(
         speaker_id (int, optional): Input speaker ids for multi-speaker models. Defaults to None.
         style_mel (torch.Tensor, optional): Spectrograms used for voice styling . Defaults to None.
         d_vector (torch.Tensor, optional): d-vector for multi-speaker models    . Defaults to None.
+        input_lengths (torch.Tensor, optional): Lengths of the padded input sequences. Defaults to None, meaning
+            that the batch size is 1.
 
     Returns:
         Dict: model outputs.
     """
-    input_lengths = torch.tensor(inputs.shape[1:2]).to(inputs.device)
+    if input_lengths is None:
+        input_lengths = torch.tensor(inputs.shape[1:2]).to(inputs.device)
     if hasattr(model, "module"):
         _func = model.module.inference
     else:
@@ -69,11 +75,18 @@ def trim_silence(wav, ap):
 
 
 def inv_spectrogram(postnet_output, ap, CONFIG):
-    if CONFIG.model.lower() in ["tacotron"]:
-        wav = ap.inv_spectrogram(postnet_output.T)
-    else:
-        wav = ap.inv_melspectrogram(postnet_output.T)
-    return wav
+    return inv_spectrogram_batch([postnet_output], ap, CONFIG)[0]
+
+
+def inv_spectrogram_batch(postnet_outputs, ap, CONFIG):
+    """Convert a list of model outputs of shape `[T, C_spec]` to waveforms with the batched torch Griffin-Lim."""
+    return ap.inv_spectrogram_batch(
+        [
+            (output.detach().cpu().numpy() if torch.is_tensor(output) else np.asarray(output)).T
+            for output in postnet_outputs
+        ],
+        mel=CONFIG.model.lower() not in ["tacotron"],
+    )
 
 
 def id_to_torch(aux_id, cuda=False, device="cpu"):
@@ -95,22 +108,17 @@ def embedding_to_torch(d_vector, cuda=False, device="cpu"):
     return d_vector
 
 
-# TODO: perform GL with pytorch for batching
 def apply_griffin_lim(inputs, input_lens, CONFIG, ap):
-    """Apply griffin-lim to each sample iterating throught the first dimension.
+    """Apply griffin-lim to a padded batch of features in a single batched pass.
     Args:
         inputs (Tensor or np.Array): Features to be converted by GL. First dimension is the batch size.
         input_lens (Tensor or np.Array): 1D array of sample lengths.
         CONFIG (Dict): TTS config.
         ap (AudioProcessor): TTS audio processor.
     """
-    wavs = []
-    for idx, spec in enumerate(inputs):
-        wav_len = (input_lens[idx] * ap.hop_length) - ap.hop_length  # inverse librosa padding
-        wav = inv_spectrogram(spec, ap, CONFIG)
-        # assert len(wav) == wav_len, f" [!] wav lenght: {len(wav)} vs expected: {wav_len}"
-        wavs.append(wav[:wav_len])
-    return wavs
+    if torch.is_tensor(inputs):
+        inputs = inputs.detach().cpu().numpy()
+    return inv_spectrogram_batch([spec[: int(input_lens[idx])] for idx, spec in enumerate(inputs)], ap, CONFIG)
 
 
 def synthesis(
@@ -252,6 +260,98 @@ def synthesis(
     return return_dict
 
 
+def batch_synthesis(
+    model,
+    texts,
+    CONFIG,
+    use_cuda,
+    speaker_id=None,
+    d_vector=None,
+    language_id=None,
+) -> List[np.ndarray]:
+    """Synthesize a list of sentences sharing the same conditioning in a single padded forward pass.
+
+    The token ids are right padded and passed to the model with their lengths. The model must set
+    `SUPPORTS_BATCH_INFERENCE` and return `y_mask` so that the padded outputs can be trimmed back.
+
+    Args:
+        model (TTS.tts.models):
+            The TTS model to synthesize audio with.
+
+        texts (List[str]):
+            The input sentences to convert to speech.
+
+        CONFIG (Coqpit):
+            Model configuration.
+
+        use_cuda (bool):
+            Enable/disable CUDA.
+
+        speaker_id (int):
+            Speaker ID shared by all the sentences. Defaults to None.
+
+        d_vector (torch.Tensor):
+            d-vector shared by all the sentences in shape :math:`[1, D]`. Defaults to None.
+
+        language_id (int):
+            Language ID shared by all the sentences. Defaults to None.
+
+    Returns:
+        List[np.ndarray]: Model outputs of each sentence trimmed to their own length, :math:`[T, C_spec]`
+        spectrograms or :math:`[T,]` waveforms for end-to-end models.
+    """
+    # device
+    device = next(model.parameters()).device
+    if use_cuda:
+        device = "cuda"
+    batch_size = len(texts)
+
+    language_name = None
+    if language_id is not None:
+        language = [k for k, v in model.language_manager.name_to_id.items() if v == language_id]
+        assert len(language) == 1, "language_id must be a valid language"
+        language_name = language[0]
+
+    # convert text to padded sequences of token IDs sorted by decreasing length as required by the RNN encoders
+    token_ids = [
+        np.asarray(model.tokenizer.text_to_ids(text, language=language_name), dtype=np.int32) for text in texts
+    ]
+    order = sorted(range(batch_size), key=lambda idx: len(token_ids[idx]), reverse=True)
+    token_ids = [token_ids[idx] for idx in order]
+    text_lengths = numpy_to_torch([len(ids) for ids in token_ids], torch.long, device=device)
+    text_inputs = numpy_to_torch(prepare_data(token_ids), torch.long, device=device)
+
+    # share the conditioning inputs across the batch
+    if speaker_id is not None:
+        speaker_id = id_to_torch([speaker_id] * batch_size, device=device)
+
+    if d_vector is not None:
+        d_vector = embedding_to_torch(d_vector, device=device).expand(batch_size, -1)
+
+    if language_id is not None:
+        language_id = id_to_torch([language_id] * batch_size, device=device)
+
+    outputs = run_model_torch(
+        model,
+        text_inputs,
+        speaker_id,
+        d_vector=d_vector,
+        language_id=language_id,
+        input_lengths=text_lengths,
+    )
+    model_outputs = outputs["model_outputs"]
+    y_mask = outputs["y_mask"]
+    output_lengths = y_mask.sum(dim=[1, 2]).long()
+    if model_outputs.ndim == 3 and model_outputs.shape[1] == 1:  # [B, 1, T_wav]
+        model_outputs = model_outputs.squeeze(1)
+        output_lengths = output_lengths * (model_outputs.shape[1] // y_mask.shape[-1])
+    model_outputs = model_outputs.data.cpu().numpy()
+    outputs = [None] * batch_size
+    for idx, text_idx in enumerate(order):
+        outputs[text_idx] = model_outputs[idx, : output_lengths[idx]]
+    return outputs
+
+
 def transfer_voice(
     model,
     CONFIG,
@@ -1,8 +1,6 @@
 import re
 
-import inflect
-
-_inflect = inflect.engine()
+from TTS.tts.utils.text.english.number_norm import get_inflect_engine
 
 _time_re = re.compile(
     r"""\b
@@ -16,7 +14,7 @@ _time_re = re.compile(
 
 
 def _expand_num(n: int) -> str:
-    return _inflect.number_to_words(n)
+    return get_inflect_engine().number_to_words(n)
 
 
 def _expand_time_english(match: "re.Match") -> str:
@@ -1,79 +1,115 @@
-from TTS.tts.utils.text.phonemizers.bangla_phonemizer import BN_Phonemizer
-from TTS.tts.utils.text.phonemizers.base import BasePhonemizer
-from TTS.tts.utils.text.phonemizers.belarusian_phonemizer import BEL_Phonemizer
-from TTS.tts.utils.text.phonemizers.espeak_wrapper import ESpeak
-from TTS.tts.utils.text.phonemizers.gruut_wrapper import Gruut
-from TTS.tts.utils.text.phonemizers.ko_kr_phonemizer import KO_KR_Phonemizer
-from TTS.tts.utils.text.phonemizers.zh_cn_phonemizer import ZH_CN_Phonemizer
-
-try:
-    from TTS.tts.utils.text.phonemizers.ja_jp_phonemizer import JA_JP_Phonemizer
-except ImportError:
-    JA_JP_Phonemizer = None
-    pass
-
-PHONEMIZERS = {b.name(): b for b in (ESpeak, Gruut, KO_KR_Phonemizer, BN_Phonemizer)}
-
-
-ESPEAK_LANGS = list(ESpeak.supported_languages().keys())
-GRUUT_LANGS = list(Gruut.supported_languages())
-
-
-# Dict setting default phonemizers for each language
-# Add Gruut languages
-_ = [Gruut.name()] * len(GRUUT_LANGS)
-DEF_LANG_TO_PHONEMIZER = dict(list(zip(GRUUT_LANGS, _)))
-
-
-# Add ESpeak languages and override any existing ones
-_ = [ESpeak.name()] * len(ESPEAK_LANGS)
-_new_dict = dict(list(zip(list(ESPEAK_LANGS), _)))
-DEF_LANG_TO_PHONEMIZER.update(_new_dict)
-
-
-# Force default for some languages
-DEF_LANG_TO_PHONEMIZER["en"] = DEF_LANG_TO_PHONEMIZER["en-us"]
-DEF_LANG_TO_PHONEMIZER["zh-cn"] = ZH_CN_Phonemizer.name()
-DEF_LANG_TO_PHONEMIZER["ko-kr"] = KO_KR_Phonemizer.name()
-DEF_LANG_TO_PHONEMIZER["bn"] = BN_Phonemizer.name()
-DEF_LANG_TO_PHONEMIZER["be"] = BEL_Phonemizer.name()
-
-
-# JA phonemizer has deal breaking dependencies like MeCab for some systems.
-# So we only have it when we have it.
-if JA_JP_Phonemizer is not None:
-    PHONEMIZERS[JA_JP_Phonemizer.name()] = JA_JP_Phonemizer
-    DEF_LANG_TO_PHONEMIZER["ja-jp"] = JA_JP_Phonemizer.name()
-
-
-def get_phonemizer_by_name(name: str, **kwargs) -> BasePhonemizer:
-    """Initiate a phonemizer by name
-
-    Args:
-        name (str):
-            Name of the phonemizer that should match `phonemizer.name()`.
-
-        kwargs (dict):
-            Extra keyword arguments that should be passed to the phonemizer.
-    """
-    if name == "espeak":
-        return ESpeak(**kwargs)
-    if name == "gruut":
-        return Gruut(**kwargs)
-    if name == "zh_cn_phonemizer":
-        return ZH_CN_Phonemizer(**kwargs)
-    if name == "ja_jp_phonemizer":
-        if JA_JP_Phonemizer is None:
-            raise ValueError(" ❗ You need to install JA phonemizer dependencies. Try `pip install TTS[ja]`.")
-        return JA_JP_Phonemizer(**kwargs)
-    if name == "ko_kr_phonemizer":
-        return KO_KR_Phonemizer(**kwargs)
-    if name == "bn_phonemizer":
-        return BN_Phonemizer(**kwargs)
-    if name == "be_phonemizer":
-        return BEL_Phonemizer(**kwargs)
-    raise ValueError(f"Phonemizer {name} not found")
-
-
-if __name__ == "__main__":
-    print(DEF_LANG_TO_PHONEMIZER)
+import importlib
+from typing import Dict, Tuple
+
+from TTS.tts.utils.text.phonemizers.base import BasePhonemizer
+
+# Phonemizer backends are imported on first use. Their dependencies (gruut, pypinyin, jamo, ...) are slow to import
+# and a model only ever needs one or two of them.
+_PHONEMIZER_MODULES: Dict[str, Tuple[str, str]] = {
+    "espeak": ("espeak_wrapper", "ESpeak"),
+    "gruut": ("gruut_wrapper", "Gruut"),
+    "zh_cn_phonemizer": ("zh_cn_phonemizer", "ZH_CN_Phonemizer"),
+    "ja_jp_phonemizer": ("ja_jp_phonemizer", "JA_JP_Phonemizer"),
+    "ko_kr_phonemizer": ("ko_kr_phonemizer", "KO_KR_Phonemizer"),
+    "bn_phonemizer": ("bangla_phonemizer", "BN_Phonemizer"),
+    "be_phonemizer": ("belarusian_phonemizer", "BEL_Phonemizer"),
+}
+_CLASS_TO_PHONEMIZER = {class_name: name for name, (_, class_name) in _PHONEMIZER_MODULES.items()}
+
+
+def _load_phonemizer_class(name: str):
+    """Import a phonemizer class by its `phonemizer.name()`.
+
+    Returns None for the JA phonemizer when its optional dependencies are missing.
+    """
+    module_name, class_name = _PHONEMIZER_MODULES[name]
+    try:
+        module = importlib.import_module(f"{__name__}.{module_name}")
+    except ImportError:
+        # JA phonemizer has deal breaking dependencies like MeCab for some systems.
+        # So we only have it when we have it.
+        if name == "ja_jp_phonemizer":
+            return None
+        raise
+    return getattr(module, class_name)
+
+
+def _get_phonemizers() -> Dict:
+    phonemizers = {
+        name: _load_phonemizer_class(name) for name in ("espeak", "gruut", "ko_kr_phonemizer", "bn_phonemizer")
+    }
+    ja_phonemizer = _load_phonemizer_class("ja_jp_phonemizer")
+    if ja_phonemizer is not None:
+        phonemizers[ja_phonemizer.name()] = ja_phonemizer
+    return phonemizers
+
+
+def _get_def_lang_to_phonemizer() -> Dict:
+    # Dict setting default phonemizers for each language
+    # Add Gruut languages
+    def_lang_to_phonemizer = {lang: "gruut" for lang in _lazy_attribute("GRUUT_LANGS")}
+
+    # Add ESpeak languages and override any existing ones
+    def_lang_to_phonemizer.update({lang: "espeak" for lang in _lazy_attribute("ESPEAK_LANGS")})
+
+    # Force default for some languages
+    def_lang_to_phonemizer["en"] = def_lang_to_phonemizer["en-us"]
+    def_lang_to_phonemizer["zh-cn"] = "zh_cn_phonemizer"
+    def_lang_to_phonemizer["ko-kr"] = "ko_kr_phonemizer"
+    def_lang_to_phonemizer["bn"] = "bn_phonemizer"
+    def_lang_to_phonemizer["be"] = "be_phonemizer"
+    if _lazy_attribute("JA_JP_Phonemizer") is not None:
+        def_lang_to_phonemizer["ja-jp"] = "ja_jp_phonemizer"
+    return def_lang_to_phonemizer
+
+
+_LAZY_ATTRIBUTES = {
+    "PHONEMIZERS": _get_phonemizers,
+    "ESPEAK_LANGS": lambda: list(_lazy_attribute("ESpeak").supported_languages().keys()),
+    "GRUUT_LANGS": lambda: list(_lazy_attribute("Gruut").supported_languages()),
+    "DEF_LANG_TO_PHONEMIZER": _get_def_lang_to_phonemizer,
+}
+
+
+def _lazy_attribute(name: str):
+    if name in globals():
+        return globals()[name]
+    if name in _CLASS_TO_PHONEMIZER:
+        value = _load_phonemizer_class(_CLASS_TO_PHONEMIZER[name])
+    else:
+        value = _LAZY_ATTRIBUTES[name]()
+    # cache the value so that `__getattr__` is not called again
+    globals()[name] = value
+    return value
+
+
+def __getattr__(name: str):
+    if name in _CLASS_TO_PHONEMIZER or name in _LAZY_ATTRIBUTES:
+        return _lazy_attribute(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_CLASS_TO_PHONEMIZER) + list(_LAZY_ATTRIBUTES))
+
+
+def get_phonemizer_by_name(name: str, **kwargs) -> BasePhonemizer:
+    """Initiate a phonemizer by name
+
+    Args:
+        name (str):
+            Name of the phonemizer that should match `phonemizer.name()`.
+
+        kwargs (dict):
+            Extra keyword arguments that should be passed to the phonemizer.
+    """
+    if name not in _PHONEMIZER_MODULES:
+        raise ValueError(f"Phonemizer {name} not found")
+    phonemizer = _lazy_attribute(_PHONEMIZER_MODULES[name][1])
+    if phonemizer is None:
+        raise ValueError(" ❗ You need to install JA phonemizer dependencies. Try `pip install TTS[ja]`.")
+    return phonemizer(**kwargs)
+
+
+if __name__ == "__main__":
+    print(_lazy_attribute("DEF_LANG_TO_PHONEMIZER"))
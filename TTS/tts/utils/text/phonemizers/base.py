@@ -1,6 +1,7 @@
 import abc
 from typing import List, Tuple
 
+from TTS.tts.utils.text.phonemizers.phoneme_cache import PhonemeCache
 from TTS.tts.utils.text.punctuation import Punctuation
 
 
@@ -20,6 +21,8 @@ class BasePhonemizer(abc.ABC):
             - join phonemes
             - restore punctuation marks
 
+    The outputs can be memoized by calling :meth:`enable_cache`.
+
     Args:
         language (str):
             Language used by the phonemizer.
@@ -43,6 +46,11 @@ class BasePhonemizer(abc.ABC):
         self._keep_puncs = keep_puncs
         self._punctuator = Punctuation(punctuations)
 
+        # phoneme memoization, disabled by default
+        self.phoneme_cache = None
+        self._cache_word_level = False
+        self._cache_prefix = None
+
     def _init_language(self, language):
         """Language initialization
 
@@ -113,6 +121,80 @@ class BasePhonemizer(abc.ABC):
             return self._punctuator.restore(phonemized, punctuations)[0]
         return phonemized[0]
 
+    def _join_words(self, words: List[str], separator: str) -> str:  # pylint: disable=unused-argument
+        """Join the phonemes of the words phonemized one by one
+
+        Override this if the backend separates the words differently
+        """
+        return " ".join(words)
+
+    def _cache_namespace(self) -> List[str]:
+        """Backend settings changing the phonemes, used in the cache keys
+
+        Override this if the backend has more settings
+        """
+        return [self.name(), str(self.version()), self.language, str(self._keep_puncs)]
+
+    def enable_cache(
+        self, max_size: int = 100000, cache_path: str = None, word_level: bool = False, cache: PhonemeCache = None
+    ) -> PhonemeCache:
+        """Memoize the phonemized sentences and optionally words
+
+        Args:
+            max_size (int):
+                Maximum number of entries kept in memory. Defaults to 100000.
+
+            cache_path (str):
+                Path to an SQLite database persisting the cache and sharing it between processes. Defaults to None.
+
+            word_level (bool):
+                Also memoize the phonemes of the single words. The words are then phonemized one by one, which can
+                change the output of backends with context dependent pronunciations, e.g. espeak's weak forms.
+                Defaults to False.
+
+            cache (PhonemeCache):
+                Existing cache to share with other phonemizers. `max_size` and `cache_path` are ignored. Defaults to
+                None.
+
+        Returns:
+            (PhonemeCache): The cache, exposing the `hits` and `misses` counters.
+        """
+        self.phoneme_cache = cache if cache is not None else PhonemeCache(max_size=max_size, cache_path=cache_path)
+        self._cache_word_level = word_level
+        self._cache_prefix = "\t".join(self._cache_namespace())
+        return self.phoneme_cache
+
+    def disable_cache(self):
+        self.phoneme_cache = None
+
+    def _cached(self, fn, granularity: str, text: str, separator: str) -> str:
+        key = f"{self._cache_prefix}\t{granularity}\t{separator}\t{text}"
+        phonemized = self.phoneme_cache.get(key)
+        if phonemized is None:
+            phonemized = fn(text, separator)
+            self.phoneme_cache.put(key, phonemized)
+        return phonemized
+
+    def _phonemize_words(self, text: str, separator: str) -> str:
+        words = [self._cached(self._phonemize, "word", word, separator) for word in text.split()]
+        return self._join_words(words, separator)
+
+    def _phonemize_text(self, text: str, separator: str) -> str:
+        """Run the phonemization steps
+
+        Override this to skip pre-post processing steps
+        """
+        text, punctuations = self._phonemize_preprocess(text)
+        phonemized = []
+        for t in text:
+            if self.phoneme_cache is not None and self._cache_word_level:
+                p = self._phonemize_words(t, separator)
+            else:
+                p = self._phonemize(t, separator)
+            phonemized.append(p)
+        phonemized = self._phonemize_postprocess(phonemized, punctuations)
+        return phonemized
+
     def phonemize(self, text: str, separator="|", language: str = None) -> str:  # pylint: disable=unused-argument
         """Returns the `text` phonemized for the given language
 
@@ -126,15 +208,13 @@ class BasePhonemizer(abc.ABC):
         Returns:
             (str): Phonemized text
         """
-        text, punctuations = self._phonemize_preprocess(text)
-        phonemized = []
-        for t in text:
-            p = self._phonemize(t, separator)
-            phonemized.append(p)
-        phonemized = self._phonemize_postprocess(phonemized, punctuations)
-        return phonemized
+        if self.phoneme_cache is None:
+            return self._phonemize_text(text, separator)
+        return self._cached(self._phonemize_text, "sentence", text, separator)
 
     def print_logs(self, level: int = 0):
         indent = "\t" * level
         print(f"{indent}| > phoneme language: {self.language}")
         print(f"{indent}| > phoneme backend: {self.name()}")
+        if self.phoneme_cache is not None:
+            print(f"{indent}| > phoneme cache: {self.phoneme_cache.info()}")
@@ -1,6 +1,12 @@
+import ctypes
+import ctypes.util
+import functools
 import logging
+import multiprocessing
+import os
 import re
 import subprocess
+import threading
 from typing import Dict, List
 
 from packaging.version import Version
@@ -80,6 +86,78 @@ def _espeak_exe(espeak_lib: str, args: List, sync=False) -> List[str]:
     return res2
 
 
+class EspeakLib:
+    """ctypes binding of `libespeak-ng` to phonemize text in-process.
+
+    It produces the same output as the `espeak-ng` command-line with `--ipa=1` without starting a new process for
+    every call. The library has a global state, so the calls are serialized with a lock and every process uses its
+    own instance returned by :func:`get_espeak_lib`.
+
+    Args:
+        lib_path (str): path to the shared library.
+    """
+
+    AUDIO_OUTPUT_SYNCHRONOUS = 0x02
+    CHARS_UTF8 = 0x01
+    PHONEMES_IPA = 0x02
+
+    def __init__(self, lib_path: str):
+        self._lib = ctypes.cdll.LoadLibrary(lib_path)
+        self._lib.espeak_Initialize.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_char_p, ctypes.c_int]
+        self._lib.espeak_Initialize.restype = ctypes.c_int
+        self._lib.espeak_SetVoiceByName.argtypes = [ctypes.c_char_p]
+        self._lib.espeak_SetVoiceByName.restype = ctypes.c_int
+        self._lib.espeak_TextToPhonemes.argtypes = [ctypes.POINTER(ctypes.c_char_p), ctypes.c_int, ctypes.c_int]
+        self._lib.espeak_TextToPhonemes.restype = ctypes.c_char_p
+        if self._lib.espeak_Initialize(self.AUDIO_OUTPUT_SYNCHRONOUS, 0, None, 0) <= 0:
+            raise RuntimeError(f" [!] Failed to initialize {lib_path}.")
+        self.lock = threading.Lock()
+        self._voice = None
+
+    def text_to_phonemes(self, text: str, language: str, separator: str = "_") -> List[str]:
+        """Return the IPA phonemes of each clause of the text, as the lines printed by the command-line."""
+        with self.lock:
+            if language != self._voice:
+                if self._lib.espeak_SetVoiceByName(language.encode("utf8")) != 0:
+                    raise RuntimeError(f" [!] Failed to set espeak voice to {language}.")
+                self._voice = language
+            text_ptr = ctypes.c_char_p(text.encode("utf8"))
+            phoneme_mode = self.PHONEMES_IPA | (ord(separator) << 8)
+            clauses = []
+            # each call converts one clause and moves the pointer to the next one, or sets it to NULL at the end
+            while text_ptr.value is not None:
+                phonemes = self._lib.espeak_TextToPhonemes(ctypes.byref(text_ptr), self.CHARS_UTF8, phoneme_mode)
+                clauses.append((phonemes or b"").decode("utf8"))
+            return clauses
+
+
+_ESPEAK_LIB = None
+_ESPEAK_LIB_PID = None
+
+
+def get_espeak_lib() -> EspeakLib:
+    """Return the `libespeak-ng` binding of this process or None if the library is not found.
+
+    The library path can be set with the `PHONEMIZER_ESPEAK_LIBRARY` environment variable, like for the
+    `phonemizer` package.
+    """
+    global _ESPEAK_LIB, _ESPEAK_LIB_PID  # pylint: disable=global-statement
+    if _ESPEAK_LIB_PID == os.getpid():
+        return _ESPEAK_LIB
+    if _ESPEAK_LIB is not None:
+        # forked from a process that loaded the library, another thread may have held the lock at fork time
+        _ESPEAK_LIB.lock = threading.Lock()
+    else:
+        lib_path = os.environ.get("PHONEMIZER_ESPEAK_LIBRARY") or ctypes.util.find_library("espeak-ng")
+        if lib_path is not None:
+            try:
+                _ESPEAK_LIB = EspeakLib(lib_path)
+            except (OSError, RuntimeError) as e:
+                logging.warning(" [!] Failed to load %s, falling back to the espeak-ng executable: %s", lib_path, e)
+    _ESPEAK_LIB_PID = os.getpid()
+    return _ESPEAK_LIB
+
+
 class ESpeak(BasePhonemizer):
     """ESpeak wrapper calling `espeak` or `espeak-ng` from the command-line the perform G2P
 
@@ -97,6 +175,10 @@ class ESpeak(BasePhonemizer):
         keep_puncs (bool):
             If True, keep the punctuations after phonemization. Defaults to True.
 
+        use_lib (bool):
+            If True, call `libespeak-ng` in-process instead of starting an `espeak-ng` process for every text when
+            the library is found. The output is the same. Defaults to True.
+
     Example:
 
         >>> from TTS.tts.utils.text.phonemizers import ESpeak
@@ -109,7 +191,9 @@ class ESpeak(BasePhonemizer):
     _ESPEAK_LIB = _DEF_ESPEAK_LIB
     _ESPEAK_VER = _DEF_ESPEAK_VER
 
-    def __init__(self, language: str, backend=None, punctuations=Punctuation.default_puncs(), keep_puncs=True):
+    def __init__(
+        self, language: str, backend=None, punctuations=Punctuation.default_puncs(), keep_puncs=True, use_lib=True
+    ):
         if self._ESPEAK_LIB is None:
             raise Exception(" [!] No espeak backend found. Install espeak-ng or espeak to your system.")
         self.backend = self._ESPEAK_LIB
@@ -123,6 +207,7 @@ class ESpeak(BasePhonemizer):
         super().__init__(language, punctuations=punctuations, keep_puncs=keep_puncs)
         if backend is not None:
             self.backend = backend
+        self.use_lib = use_lib
 
     @property
     def backend(self):
@@ -164,6 +249,11 @@ class ESpeak(BasePhonemizer):
                 consecutive characters of a single phoneme. Else separate phoneme
                 with '_'. This option requires espeak>=1.49. Default to False.
         """
+        lib = get_espeak_lib() if self.use_lib and self.backend == "espeak-ng" and not tie else None
+        if lib is not None:
+            lines = lib.text_to_phonemes(text, self._language)
+            return "".join(re.sub(r"\(.+?\)", "", line).strip() for line in lines).replace("_", separator)
+
         # set arguments
         args = ["-v", f"{self._language}"]
         # espeak and espeak-ng parses `ipa` differently
@@ -208,6 +298,31 @@ class ESpeak(BasePhonemizer):
     def _phonemize(self, text, separator=None):
         return self.phonemize_espeak(text, separator, tie=False)
 
+    def _cache_namespace(self):
+        # `version()` runs the executable, the backend version is already known
+        return [self.name(), self.backend, str(self.backend_version), self.language, str(self._keep_puncs)]
+
+    def phonemize_batch(self, texts: List[str], separator="|", num_workers: int = 0, chunk_size: int = 64) -> List[str]:
+        """Phonemize many texts with a bounded pool of worker processes.
+
+        Every worker keeps its own espeak library or runs the executable, and receives the texts in chunks of
+        `chunk_size` to amortize the inter-process communication.
+
+        Args:
+            texts (List[str]): Texts to be converted to phonemes.
+            separator (str): Phoneme separator. Defaults to "|".
+            num_workers (int): Number of worker processes. 0 phonemizes the texts in the current process.
+                Defaults to 0.
+            chunk_size (int): Number of texts sent to a worker at once. Defaults to 64.
+
+        Returns:
+            List[str]: Phonemes of each text.
+        """
+        if num_workers <= 1:
+            return [self.phonemize(text, separator=separator) for text in texts]
+        with multiprocessing.Pool(num_workers) as pool:
+            return pool.map(functools.partial(self.phonemize, separator=separator), texts, chunksize=chunk_size)
+
     @staticmethod
     def supported_languages() -> Dict:
         """Get a dictionary of supported languages.
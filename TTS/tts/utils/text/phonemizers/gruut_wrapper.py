@@ -109,6 +109,12 @@ class Gruut(BasePhonemizer):
     def _phonemize(self, text, separator):
         return self.phonemize_gruut(text, separator, tie=False)
 
+    def _join_words(self, words, separator):
+        return f"{separator} ".join(words)
+
+    def _cache_namespace(self):
+        return super()._cache_namespace() + [str(self.use_espeak_phonemes), str(self.keep_stress)]
+
     def is_supported_language(self, language):
         """Returns True if `language` is supported by the backend"""
         return gruut.is_language_supported(language)
@@ -1,6 +1,8 @@
 from typing import Dict, List
 
-from TTS.tts.utils.text.phonemizers import DEF_LANG_TO_PHONEMIZER, get_phonemizer_by_name
+from TTS.tts.utils.text import phonemizers
+from TTS.tts.utils.text.phonemizers import get_phonemizer_by_name
+from TTS.tts.utils.text.phonemizers.phoneme_cache import PhonemeCache
 
 
 class MultiPhonemizer:
@@ -18,8 +20,8 @@ class MultiPhonemizer:
 
     def __init__(self, lang_to_phonemizer_name: Dict = {}) -> None:  # pylint: disable=dangerous-default-value
         for k, v in lang_to_phonemizer_name.items():
-            if v == "" and k in DEF_LANG_TO_PHONEMIZER.keys():
-                lang_to_phonemizer_name[k] = DEF_LANG_TO_PHONEMIZER[k]
+            if v == "" and k in phonemizers.DEF_LANG_TO_PHONEMIZER.keys():
+                lang_to_phonemizer_name[k] = phonemizers.DEF_LANG_TO_PHONEMIZER[k]
             elif v == "":
                 raise ValueError(f"Phonemizer wasn't set for language {k} and doesn't have a default.")
         self.lang_to_phonemizer_name = lang_to_phonemizer_name
@@ -44,6 +46,17 @@ class MultiPhonemizer:
     def supported_languages(self) -> List:
         return list(self.lang_to_phonemizer.keys())
 
+    def enable_cache(self, max_size: int = 100000, cache_path: str = None, word_level: bool = False) -> PhonemeCache:
+        """Memoize the outputs of all the phonemizers in a shared cache. See `BasePhonemizer.enable_cache()`."""
+        cache = PhonemeCache(max_size=max_size, cache_path=cache_path)
+        for phonemizer in self.lang_to_phonemizer.values():
+            phonemizer.enable_cache(word_level=word_level, cache=cache)
+        return cache
+
+    def disable_cache(self):
+        for phonemizer in self.lang_to_phonemizer.values():
+            phonemizer.disable_cache()
+
     def print_logs(self, level: int = 0):
         indent = "\t" * level
         print(f"{indent}| > phoneme language: {self.supported_languages()}")
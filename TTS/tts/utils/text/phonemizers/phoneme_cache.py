@@ -0,0 +1,110 @@
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+class PhonemeCache:
+    """Size-bounded LRU memo of phonemizer outputs.
+
+    The phonemizers look up their outputs here before running G2P when the cache is enabled with
+    :meth:`BasePhonemizer.enable_cache`. The keys include the backend name, version, language and settings, so a single
+    cache can be shared by several phonemizers.
+
+    If `cache_path` is set, the entries are also stored in an SQLite database. It persists the cache across restarts and
+    shares it between processes: a worker process missing an entry in memory reads the ones written by the others.
+    Only the in-memory part is bounded by `max_size`.
+
+    Args:
+        max_size (int): maximum number of entries kept in memory. Defaults to 100000.
+        cache_path (str): path to the SQLite database. Defaults to None.
+
+    Example:
+        >>> phonemizer = ESpeak("en-us")
+        >>> cache = phonemizer.enable_cache(max_size=50000, cache_path="phonemes.db")
+        >>> phonemizer.phonemize("Your call is important to us.")
+        >>> cache.hits, cache.misses
+    """
+
+    def __init__(self, max_size: int = 100000, cache_path: str = None):
+        if max_size < 1:
+            raise ValueError(f" [!] `max_size` must be a positive number, got {max_size}.")
+        self.max_size = max_size
+        self.cache_path = cache_path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_pid = None
+
+    def __getstate__(self):
+        # locks and database connections cannot be pickled, the other process opens its own
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        state["_db"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get_db(self) -> sqlite3.Connection:
+        if self.cache_path is None:
+            return None
+        # a connection must not be used by a forked process
+        if self._db is None or self._db_pid != os.getpid():
+            self._db = sqlite3.connect(self.cache_path, timeout=30, isolation_level=None, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS phonemes (key TEXT PRIMARY KEY, phonemes TEXT NOT NULL)")
+            self._db_pid = os.getpid()
+        return self._db
+
+    def _add(self, key: str, value: str) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> str:
+        """Return the cached phonemes or None, and count the hit or miss."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            else:
+                db = self._get_db()
+                if db is not None:
+                    row = db.execute("SELECT phonemes FROM phonemes WHERE key = ?", (key,)).fetchone()
+                    if row is not None:
+                        value = row[0]
+                        self._add(key, value)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        with self._lock:
+            self._add(key, value)
+            db = self._get_db()
+            if db is not None:
+                db.execute("INSERT OR REPLACE INTO phonemes (key, phonemes) VALUES (?, ?)", (key, value))
+
+    def clear(self) -> None:
+        """Remove all the entries, also from the database, and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            db = self._get_db()
+            if db is not None:
+                db.execute("DELETE FROM phonemes")
+
+    def info(self) -> dict:
+        """Return the hit and miss counters and the number of entries in memory."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "max_size": self.max_size}
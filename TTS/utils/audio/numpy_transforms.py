@@ -1,3 +1,4 @@
+import struct
 from io import BytesIO
 from typing import Tuple
 
@@ -447,6 +448,44 @@ def save_wav(*, wav: np.ndarray, path: str, sample_rate: int = None, pipe_out=No
     scipy.io.wavfile.write(path, sample_rate, wav_norm)
 
 
+def wav_stream_header(*, sample_rate: int, **kwargs) -> bytes:
+    """Header of a mono 16-bit PCM WAV stream whose length is not known in advance.
+
+    The RIFF and data chunk sizes are set to the maximum value so that players keep reading until the stream ends.
+
+    Args:
+        sample_rate (int): Sampling rate of the stream.
+
+    Returns:
+        bytes: 44 bytes WAV header.
+    """
+    unknown_size = 0xFFFFFFFF
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        unknown_size,
+        b"WAVE",
+        b"fmt ",
+        16,  # fmt chunk size
+        1,  # PCM
+        1,  # channels
+        sample_rate,
+        sample_rate * 2,  # byte rate
+        2,  # block align
+        16,  # bits per sample
+        b"data",
+        unknown_size,
+    )
+
+
+def wav_to_pcm16(*, wav: np.ndarray, **kwargs) -> bytes:
+    """Convert a float waveform in range [-1, 1] to little-endian 16-bit PCM bytes.
+
+    Unlike `save_wav()`, the waveform is not peak normalized since the next chunks of a stream are not known yet.
+    """
+    return (np.clip(wav, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
 def mulaw_encode(*, wav: np.ndarray, mulaw_qc: int, **kwargs) -> np.ndarray:
     mu = 2**mulaw_qc - 1
     signal = np.sign(wav) * np.log(1 + mu * np.abs(wav)) / np.log(1.0 + mu)
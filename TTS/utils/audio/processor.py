@@ -1,10 +1,11 @@
 from io import BytesIO
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 
 import librosa
 import numpy as np
 import scipy.io.wavfile
 import scipy.signal
+import torch
 
 from TTS.tts.utils.helpers import StandardScaler
 from TTS.utils.audio.numpy_transforms import (
@@ -25,6 +26,7 @@ from TTS.utils.audio.numpy_transforms import (
     trim_silence,
     volume_norm,
 )
+from TTS.utils.audio.torch_transforms import TorchGriffinLim, TorchSTFT
 
 # pylint: disable=too-many-public-methods
 
@@ -109,6 +111,10 @@ class AudioProcessor(object):
         griffin_lim_iters (int, optional):
             Number of GriffinLim iterations. Defaults to None.
 
+        griffin_lim_momentum (float, optional):
+            Momentum of the fast GriffinLim used by `inv_spectrogram_batch()`. 0 runs the plain GriffinLim.
+            Defaults to 0.0.
+
         do_trim_silence (bool, optional):
             enable/disable silence trimming when loading the audio signal. Defaults to False.
 
@@ -164,6 +170,7 @@ class AudioProcessor(object):
         stft_pad_mode="reflect",
         clip_norm=True,
         griffin_lim_iters=None,
+        griffin_lim_momentum=0.0,
         do_trim_silence=False,
         trim_db=60,
         do_sound_norm=False,
@@ -188,6 +195,7 @@ class AudioProcessor(object):
         self.power = power
         self.preemphasis = preemphasis
         self.griffin_lim_iters = griffin_lim_iters
+        self.griffin_lim_momentum = griffin_lim_momentum
         self.signal_norm = signal_norm
         self.symmetric_norm = symmetric_norm
         self.mel_fmin = mel_fmin or 0
@@ -240,6 +248,7 @@ class AudioProcessor(object):
             mel_fmax=self.mel_fmax,
             mel_fmin=self.mel_fmin,
         )
+        self._torch_griffin_lim = {}
         # setup scaler
         if stats_path and signal_norm:
             mel_mean, mel_std, linear_mean, linear_std, _ = self.load_stats(stats_path)
@@ -457,6 +466,47 @@ class AudioProcessor(object):
         W = self._griffin_lim(S**self.power)
         return self.apply_inv_preemphasis(W) if self.preemphasis != 0 else W
 
+    def inv_spectrogram_batch(self, spectrograms: List[np.ndarray], mel: bool = True) -> List[np.ndarray]:
+        """Convert a batch of spectrograms to waveforms using the batched torch Griffin-Lim vocoder.
+
+        The spectrograms are padded and reconstructed together by :class:`TorchGriffinLim`, which is much faster than
+        calling `inv_melspectrogram()` or `inv_spectrogram()` on each of them.
+
+        Args:
+            spectrograms (List[np.ndarray]): normalized spectrograms of any length. Shape :math:`[C, T]`.
+            mel (bool): the spectrograms are melspectrograms. Defaults to True.
+
+        Returns:
+            List[np.ndarray]: waveforms of `(T - 1) * hop_length` samples.
+        """
+        specs = [db_to_amp(x=self.denormalize(spec), gain=self.spec_gain, base=self.base) for spec in spectrograms]
+        lengths = torch.tensor([spec.shape[1] for spec in specs])
+        batch = torch.zeros(len(specs), specs[0].shape[0], int(lengths.max()))
+        for idx, spec in enumerate(specs):
+            batch[idx, :, : spec.shape[1]] = torch.from_numpy(np.asarray(spec, dtype=np.float32))
+        wavs = self._get_torch_griffin_lim(mel)(batch, lengths).numpy()
+        wavs = [wav[: (length - 1) * self.hop_length] for wav, length in zip(wavs, lengths.tolist())]
+        if self.preemphasis != 0:
+            wavs = [self.apply_inv_preemphasis(wav) for wav in wavs]
+        return wavs
+
+    def _get_torch_griffin_lim(self, mel: bool) -> TorchGriffinLim:
+        if mel not in self._torch_griffin_lim:
+            stft = TorchSTFT(
+                n_fft=self.fft_size,
+                hop_length=self.hop_length,
+                win_length=self.win_length,
+                sample_rate=self.sample_rate,
+                n_mels=self.num_mels,
+            )
+            if mel:
+                stft.use_mel = True
+                stft.mel_basis = torch.from_numpy(self.mel_basis).float()
+            self._torch_griffin_lim[mel] = TorchGriffinLim(
+                stft, num_iter=self.griffin_lim_iters, momentum=self.griffin_lim_momentum, power=self.power or 1.0
+            )
+        return self._torch_griffin_lim[mel]
+
     def out_linear_to_mel(self, linear_spec: np.ndarray) -> np.ndarray:
         """Convert a full scale linear spectrogram output of a network to a melspectrogram.
 
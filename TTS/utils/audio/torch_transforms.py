@@ -163,3 +163,118 @@ class TorchSTFT(nn.Module):  # pylint: disable=abstract-method
     @staticmethod
     def _db_to_amp(x, spec_gain=1.0):
         return torch.exp(x) / spec_gain
+
+
+class TorchGriffinLim(nn.Module):  # pylint: disable=abstract-method
+    """Batched Griffin-Lim phase reconstruction using the STFT parameters of a :class:`TorchSTFT`.
+
+    It runs the fast Griffin-Lim algorithm (Perraudin et al., 2013) on a padded batch of spectrograms: the phase
+    estimate of each iteration is extrapolated with `momentum` from the previous one, which converges in fewer
+    iterations than the plain algorithm. All the spectrograms of the batch go through the same `torch.stft` and
+    `torch.istft` calls, which use all the intra-op threads of torch on CPU.
+
+    If `stft.use_mel` is True the inputs are melspectrograms that are converted back to linear spectrograms with the
+    pseudo-inverse of `stft.mel_basis`.
+
+    Args:
+        stft (TorchSTFT): STFT module defining `n_fft`, `hop_length`, `win_length`, the window and the mel basis.
+
+        num_iter (int, optional):
+            number of Griffin-Lim iterations. Defaults to 60.
+
+        momentum (float, optional):
+            momentum of the fast Griffin-Lim. 0 runs the plain Griffin-Lim. Defaults to 0.99.
+
+        power (float, optional):
+            exponent applied to the linear spectrogram before the phase reconstruction. Defaults to 1.0.
+    """
+
+    def __init__(self, stft: TorchSTFT, num_iter: int = 60, momentum: float = 0.99, power: float = 1.0):
+        super().__init__()
+        if not 0 <= momentum < 1:
+            raise ValueError(f" [!] `momentum` must be in [0, 1), got {momentum}.")
+        self.stft = stft
+        self.num_iter = num_iter
+        self.momentum = momentum
+        self.power = power
+        self.inv_mel_basis = None
+        if stft.use_mel:
+            self.inv_mel_basis = torch.linalg.pinv(stft.mel_basis)
+
+    def _stft(self, x):
+        return torch.stft(
+            x,
+            self.stft.n_fft,
+            self.stft.hop_length,
+            self.stft.win_length,
+            self.stft.window,
+            center=True,
+            pad_mode="reflect",
+            onesided=True,
+            return_complex=True,
+        )
+
+    def _istft(self, x, length):
+        return torch.istft(
+            x,
+            self.stft.n_fft,
+            self.stft.hop_length,
+            self.stft.win_length,
+            self.stft.window,
+            center=True,
+            onesided=True,
+            length=length,
+        )
+
+    @torch.no_grad()
+    def forward(self, x, lengths=None):
+        """Reconstruct the waveforms of a batch of magnitude spectrograms.
+
+        Args:
+            x (Tensor): magnitude (mel)spectrograms, zero padded.
+            lengths (Tensor, optional): number of frames of each spectrogram. Defaults to None.
+
+        Returns:
+            Tensor: waveforms. The samples past `(lengths - 1) * hop_length` are zero.
+
+        Shapes:
+            x: :math:`[B, C, T]`
+            lengths: :math:`[B]`
+            Returns: :math:`[B, (T - 1) * hop_length]`
+        """
+        x = x.float()
+        if self.inv_mel_basis is not None:
+            x = torch.clamp(torch.matmul(self.inv_mel_basis.to(x), x), min=1e-10)
+        x = x**self.power
+        out_length = (x.shape[2] - 1) * self.stft.hop_length
+        # the reflect padding of `torch.stft` needs more than `n_fft // 2` samples
+        min_frames = self.stft.n_fft // self.stft.hop_length + 2
+        if x.shape[2] < min_frames:
+            if lengths is None:
+                lengths = torch.full((x.shape[0],), x.shape[2])
+            x = torch.nn.functional.pad(x, (0, min_frames - x.shape[2]))
+        wav_length = (x.shape[2] - 1) * self.stft.hop_length
+        wav_mask = None
+        if lengths is not None:
+            lengths = lengths.to(x.device)
+            frame_mask = torch.arange(x.shape[2], device=x.device)[None, :] < lengths[:, None]
+            x = x * frame_mask[:, None, :]
+            wav_mask = (
+                torch.arange(wav_length, device=x.device)[None, :] < ((lengths - 1) * self.stft.hop_length)[:, None]
+            )
+
+        angles = torch.exp(2j * torch.pi * torch.rand(x.shape, device=x.device))
+        prev_rebuilt = torch.zeros_like(angles)
+        for _ in range(self.num_iter):
+            wav = self._istft(x * angles, wav_length)
+            if wav_mask is not None:
+                # the padding stays silent so it does not leak into the last frames of the shorter samples
+                wav = wav * wav_mask
+            rebuilt = self._stft(wav)
+            angles = rebuilt - prev_rebuilt * (self.momentum / (1 + self.momentum))
+            angles = angles / (angles.abs() + 1e-16)
+            prev_rebuilt = rebuilt
+        wav = self._istft(x * angles, wav_length)
+        if wav_mask is not None:
+            wav = wav * wav_mask
+        return wav[:, :out_length]
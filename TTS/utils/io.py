@@ -1,5 +1,9 @@
+import io
+import json
 import os
 import pickle as pickle_tts
+import struct
+import zipfile
 from typing import Any, Callable, Dict, Union
 
 import fsspec
@@ -24,6 +28,128 @@ class AttrDict(dict):
         self.__dict__ = self
 
 
+# checkpoint entries only used to resume training
+TRAINING_STATE_KEYS = ["optimizer", "scaler", "scheduler"]
+
+
+def get_inference_checkpoint_path(path: str) -> str:
+    """Return the path of the `.safetensors` inference checkpoint next to a checkpoint if there is one.
+
+    The `.safetensors` file is only used if it is not older than the checkpoint, so a checkpoint retrained or
+    downloaded again after the conversion is not replaced by stale weights. See `TTS/bin/convert_checkpoint.py`.
+    """
+    safetensors_path = os.path.splitext(path)[0] + ".safetensors"
+    if path.endswith(".safetensors") or not os.path.isfile(safetensors_path):
+        return path
+    if os.path.isfile(path) and os.stat(safetensors_path).st_mtime_ns < os.stat(path).st_mtime_ns:
+        print(f" [!] Ignoring {safetensors_path}: it is older than {path}. Convert the checkpoint again.")
+        return path
+    return safetensors_path
+
+
+def get_inference_state(state: Dict) -> Dict:
+    """Drop the optimizer, scaler and scheduler states of a checkpoint."""
+    return {
+        key: value
+        for key, value in state.items()
+        if not any(key.startswith(training_key) for training_key in TRAINING_STATE_KEYS)
+    }
+
+
+def _read_safetensors_metadata(f) -> Dict[str, str]:
+    header_size = struct.unpack("<Q", f.read(8))[0]
+    return json.loads(f.read(header_size)).get("__metadata__", {})
+
+
+def load_safetensors(path: str, map_location: Union[str, torch.device] = None, cache: bool = True) -> Dict[str, Any]:
+    """Load a checkpoint saved by :func:`save_inference_checkpoint` in the safetensors format.
+
+    Local files are memory-mapped, the weights are read from the disk when they are used.
+
+    Args:
+        path: Any path or url supported by fsspec.
+        map_location: torch.device or str. Defaults to the CPU.
+        cache: If True, cache a remote file locally for subsequent calls. Defaults to True.
+
+    Returns:
+        Dict: the checkpoint, with the weights in `model` and the other entries, or the state dict if a state dict
+        was saved.
+    """
+    try:
+        from safetensors.torch import load as load_safetensors_bytes  # pylint: disable=import-outside-toplevel
+        from safetensors.torch import load_file  # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+        raise ImportError(
+            " [!] Loading .safetensors checkpoints needs safetensors. Install it with `pip install safetensors`."
+        ) from e
+    device = str(map_location) if isinstance(map_location, (str, torch.device)) else "cpu"
+    is_local = os.path.isfile(path)
+    if cache and not is_local:
+        path = fsspec.open_local(f"filecache::{path}", filecache={"cache_storage": str(get_user_data_dir("tts_cache"))})
+        is_local = True
+    if is_local:
+        with open(path, "rb") as f:
+            metadata = _read_safetensors_metadata(f)
+        weights = load_file(path, device=device)
+    else:
+        with fsspec.open(path, "rb") as f:
+            data = f.read()
+        metadata = _read_safetensors_metadata(io.BytesIO(data))
+        weights = {key: value.to(device) for key, value in load_safetensors_bytes(data).items()}
+    if metadata.get("tts_format") == "state_dict":
+        return weights
+    state = json.loads(metadata.get("tts_state", "{}"))
+    state["model"] = weights
+    return state
+
+
+def save_inference_checkpoint(state: Dict, path: str) -> None:
+    """Save the weights and the small entries of a checkpoint, without the training state.
+
+    A path ending with `.safetensors` is saved in the safetensors format, the other entries of the checkpoint are
+    stored as JSON in its metadata. Other paths are saved with `torch.save`, they can be memory-mapped by
+    `torch.load(mmap=True)`.
+
+    Args:
+        state (Dict): checkpoint with the weights in `model`, or a state dict.
+        path (str): output path.
+    """
+    is_checkpoint = "model" in state and isinstance(state["model"], dict)
+    state = get_inference_state(state) if is_checkpoint else state
+    if not path.endswith(".safetensors"):
+        with fsspec.open(path, "wb") as f:
+            torch.save(state, f)
+        return
+    try:
+        from safetensors.torch import save  # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+        raise ImportError(
+            " [!] Saving .safetensors checkpoints needs safetensors. Install it with `pip install safetensors`."
+        ) from e
+    weights = state["model"] if is_checkpoint else state
+    # safetensors does not store tensors sharing memory, e.g. tied weights
+    storages = set()
+    tensors = {}
+    for key, value in weights.items():
+        if value.untyped_storage().data_ptr() in storages:
+            value = value.clone()
+        storages.add(value.untyped_storage().data_ptr())
+        tensors[key] = value.contiguous()
+    metadata = {"format": "pt", "tts_format": "checkpoint" if is_checkpoint else "state_dict"}
+    if is_checkpoint:
+        extras = {}
+        for key, value in state.items():
+            if key == "model":
+                continue
+            try:
+                extras[key] = json.loads(json.dumps(value))
+            except TypeError:
+                print(f" [!] Skipping the checkpoint entry {key}, it cannot be stored as JSON.")
+        metadata["tts_state"] = json.dumps(extras)
+    with fsspec.open(path, "wb") as f:
+        f.write(save(tensors, metadata=metadata))
+
+
 def load_fsspec(
     path: str,
     map_location: Union[str, Callable, torch.device, Dict[Union[str, torch.device], Union[str, torch.device]]] = None,
@@ -32,6 +158,9 @@ def load_fsspec(
 ) -> Any:
     """Like torch.load but can load from other locations (e.g. s3:// , gs://).
 
+    Local checkpoints are memory-mapped, so the tensors that are not used, like the optimizer state, are not read
+    from the disk. `.safetensors` checkpoints are loaded with :func:`load_safetensors`.
+
     Args:
         path: Any path or url supported by fsspec.
         map_location: torch.device or str.
@@ -41,6 +170,8 @@ def load_fsspec(
     Returns:
         Object stored in path.
     """
+    if str(path).endswith(".safetensors"):
+        return load_safetensors(path, map_location=map_location, cache=cache)
     is_local = os.path.isdir(path) or os.path.isfile(path)
     if cache and not is_local:
         with fsspec.open(
@@ -49,6 +180,10 @@ def load_fsspec(
             mode="rb",
         ) as f:
             return torch.load(f, map_location=map_location, **kwargs)
+    elif os.path.isfile(path) and zipfile.is_zipfile(path):
+        # only the zip format saved by torch>=1.6 can be memory-mapped
+        kwargs.setdefault("mmap", True)
+        return torch.load(path, map_location=map_location, **kwargs)
     else:
         with fsspec.open(path, "rb") as f:
             return torch.load(f, map_location=map_location, **kwargs)
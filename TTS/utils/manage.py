@@ -13,6 +13,7 @@ from tqdm import tqdm
 
 from TTS.config import load_config, read_json_with_comments
 from TTS.utils.generic_utils import get_user_data_dir
+from TTS.utils.io import get_inference_checkpoint_path
 
 LICENSE_URLS = {
     "cc by-nc-nd 4.0": "https://creativecommons.org/licenses/by-nc-nd/4.0/",
@@ -435,7 +436,8 @@ class ModelManager(object):
         config_file = None
         for file_name in os.listdir(output_path):
             if file_name in ["model_file.pth", "model_file.pth.tar", "model.pth"]:
-                model_file = os.path.join(output_path, file_name)
+                # prefer the inference checkpoint made by `TTS/bin/convert_checkpoint.py`
+                model_file = get_inference_checkpoint_path(os.path.join(output_path, file_name))
             elif file_name == "config.json":
                 config_file = os.path.join(output_path, file_name)
         if model_file is None:
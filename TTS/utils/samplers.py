@@ -14,7 +14,7 @@ class SubsetSampler(Sampler):
     """
 
     def __init__(self, indices):
-        super().__init__(indices)
+        super().__init__()
         self.indices = indices
 
     def __iter__(self):
@@ -48,7 +48,7 @@ class PerfectBatchSampler(Sampler):
         drop_last=False,
         label_key="class_name",
     ):
-        super().__init__(dataset_items)
+        super().__init__()
         assert (
             batch_size % (num_classes_in_batch * num_gpus) == 0
         ), "Batch size must be divisible by number of classes times the number of data parallel devices (if enabled)."
@@ -136,7 +136,7 @@ class SortedSampler(Sampler):
     """
 
     def __init__(self, data, sort_key: Callable = identity):
-        super().__init__(data)
+        super().__init__()
         self.data = data
         self.sort_key = sort_key
         zip_ = [(i, self.sort_key(row)) for i, row in enumerate(self.data)]
@@ -161,13 +161,16 @@ class BucketBatchSampler(BatchSampler):
         drop_last (bool): If `True` the sampler will drop the last batch if its size would be less
             than `batch_size`.
         data (list): List of data samples.
-        sort_key (callable, optional): Callable to specify a comparison key for sorting.
+        sort_key (callable or list, optional): Callable to specify a comparison key for sorting, or the
+            precomputed keys of the samples, e.g. the `audio_length` of the samples of a `TTSDataset`.
         bucket_size_multiplier (int, optional): Buckets are of size
             `batch_size * bucket_size_multiplier`.
 
     Example:
         >>> sampler = WeightedRandomSampler(weights, len(weights))
         >>> sampler = BucketBatchSampler(sampler, data=data_items, batch_size=32, drop_last=True)
+        >>> lengths = [item["audio_length"] for item in data_items]
+        >>> sampler = BucketBatchSampler(sampler, data=data_items, batch_size=32, drop_last=True, sort_key=lengths)
     """
 
     def __init__(
@@ -189,8 +192,11 @@ class BucketBatchSampler(BatchSampler):
 
     def __iter__(self):
         for idxs in self.bucket_sampler:
-            bucket_data = [self.data[idx] for idx in idxs]
-            sorted_sampler = SortedSampler(bucket_data, self.sort_key)
+            if callable(self.sort_key):
+                sorted_sampler = SortedSampler([self.data[idx] for idx in idxs], self.sort_key)
+            else:
+                # sort the bucket by the precomputed keys
+                sorted_sampler = SortedSampler([self.sort_key[idx] for idx in idxs])
             for batch_idx in SubsetRandomSampler(list(BatchSampler(sorted_sampler, self.batch_size, self.drop_last))):
                 sorted_idxs = [idxs[i] for i in batch_idx]
                 yield sorted_idxs
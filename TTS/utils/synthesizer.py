@@ -1,26 +1,22 @@
 import os
 import time
-from typing import List
+from typing import Iterator, List, Tuple
 
 import numpy as np
-import pysbd
 import torch
 from torch import nn
 
 from TTS.config import load_config
-from TTS.tts.configs.vits_config import VitsConfig
-from TTS.tts.models import setup_model as setup_tts_model
-from TTS.tts.models.vits import Vits
 
 # pylint: disable=unused-wildcard-import
 # pylint: disable=wildcard-import
-from TTS.tts.utils.synthesis import synthesis, transfer_voice, trim_silence
-from TTS.utils.audio import AudioProcessor
-from TTS.utils.audio.numpy_transforms import save_wav
-from TTS.vc.models import setup_model as setup_vc_model
-from TTS.vocoder.models import setup_model as setup_vocoder_model
+from TTS.tts.utils.synthesis import batch_synthesis, inv_spectrogram_batch, synthesis, transfer_voice, trim_silence
 from TTS.vocoder.utils.generic_utils import interpolate_vocoder_input
 
+# The model, vocoder and text segmentation modules are imported where they are used. Each model family pulls in its
+# own stack of dependencies and a `Synthesizer` only ever needs the ones of the models it loads.
+# pylint: disable=import-outside-toplevel
+
 
 class Synthesizer(nn.Module):
     def __init__(
@@ -119,6 +115,8 @@ class Synthesizer(nn.Module):
         Returns:
             [type]: [description]
         """
+        import pysbd
+
         return pysbd.Segmenter(language=lang, clean=True)
 
     def _load_vc(self, vc_checkpoint: str, vc_config_path: str, use_cuda: bool) -> None:
@@ -134,6 +132,8 @@ class Synthesizer(nn.Module):
             tts_config_path (str): path to the model config file.
             use_cuda (bool): enable/disable CUDA use.
         """
+        from TTS.vc.models import setup_model as setup_vc_model
+
         # pylint: disable=global-statement
         self.vc_config = load_config(vc_config_path)
         self.vc_model = setup_vc_model(config=self.vc_config)
@@ -146,6 +146,9 @@ class Synthesizer(nn.Module):
 
         We assume it is VITS and the model knows how to load itself from the directory and there is a config.json file in the directory.
         """
+        from TTS.tts.configs.vits_config import VitsConfig
+        from TTS.tts.models.vits import Vits
+
         self.tts_config = VitsConfig()
         self.tts_model = Vits.init_from_config(self.tts_config)
         self.tts_model.load_fairseq_checkpoint(self.tts_config, checkpoint_dir=model_dir, eval=True)
@@ -158,6 +161,8 @@ class Synthesizer(nn.Module):
 
         We assume the model knows how to load itself from the directory and there is a config.json file in the directory.
         """
+        from TTS.tts.models import setup_model as setup_tts_model
+
         config = load_config(os.path.join(model_dir, "config.json"))
         self.tts_config = config
         self.tts_model = setup_tts_model(config)
@@ -179,6 +184,8 @@ class Synthesizer(nn.Module):
             tts_config_path (str): path to the model config file.
             use_cuda (bool): enable/disable CUDA use.
         """
+        from TTS.tts.models import setup_model as setup_tts_model
+
         # pylint: disable=global-statement
         self.tts_config = load_config(tts_config_path)
         if self.tts_config["use_phonemes"] and self.tts_config["phonemizer"] is None:
@@ -217,6 +224,9 @@ class Synthesizer(nn.Module):
             model_config (str): path to the model config file.
             use_cuda (bool): enable/disable CUDA use.
         """
+        from TTS.utils.audio import AudioProcessor
+        from TTS.vocoder.models import setup_model as setup_vocoder_model
+
         self.vocoder_config = load_config(model_config)
         self.vocoder_ap = AudioProcessor(verbose=False, **self.vocoder_config.audio)
         self.vocoder_model = setup_vocoder_model(self.vocoder_config)
@@ -248,60 +258,24 @@ class Synthesizer(nn.Module):
             wav = wav.cpu().numpy()
         if isinstance(wav, list):
             wav = np.array(wav)
+        from TTS.utils.audio.numpy_transforms import save_wav
+
         save_wav(wav=wav, path=path, sample_rate=self.output_sample_rate, pipe_out=pipe_out)
 
     def voice_conversion(self, source_wav: str, target_wav: str) -> List[int]:
         output_wav = self.vc_model.voice_conversion(source_wav, target_wav)
         return output_wav
 
-    def tts(
-        self,
-        text: str = "",
-        speaker_name: str = "",
-        language_name: str = "",
-        speaker_wav=None,
-        style_wav=None,
-        style_text=None,
-        reference_wav=None,
-        reference_speaker_name=None,
-        split_sentences: bool = True,
-        **kwargs,
-    ) -> List[int]:
-        """🐸 TTS magic. Run all the models and generate speech.
+    def _get_speaker_input(self, speaker_name: str = "", speaker_wav=None) -> Tuple[int, np.ndarray]:
+        """Resolve the speaker id or the speaker embedding used to condition the TTS model.
 
         Args:
-            text (str): input text.
             speaker_name (str, optional): speaker id for multi-speaker models. Defaults to "".
-            language_name (str, optional): language id for multi-language models. Defaults to "".
             speaker_wav (Union[str, List[str]], optional): path to the speaker wav for voice cloning. Defaults to None.
-            style_wav ([type], optional): style waveform for GST. Defaults to None.
-            style_text ([type], optional): transcription of style_wav for Capacitron. Defaults to None.
-            reference_wav ([type], optional): reference waveform for voice conversion. Defaults to None.
-            reference_speaker_name ([type], optional): speaker id of reference waveform. Defaults to None.
-            split_sentences (bool, optional): split the input text into sentences. Defaults to True.
-            **kwargs: additional arguments to pass to the TTS model.
+
         Returns:
-            List[int]: [description]
+            Tuple[int, np.ndarray]: speaker id and speaker embedding.
         """
-        start_time = time.time()
-        wavs = []
-
-        if not text and not reference_wav:
-            raise ValueError(
-                "You need to define either `text` (for sythesis) or a `reference_wav` (for voice conversion) to use the Coqui TTS API."
-            )
-
-        if text:
-            sens = [text]
-            if split_sentences:
-                print(" > Text splitted to sentences.")
-                sens = self.split_into_sentences(text)
-            print(sens)
-
-        # handle multi-speaker
-        if "voice_dir" in kwargs:
-            self.voice_dir = kwargs["voice_dir"]
-            kwargs.pop("voice_dir")
         speaker_embedding = None
         speaker_id = None
         if self.tts_speakers_file or hasattr(self.tts_model.speaker_manager, "name_to_id"):
@@ -332,10 +306,28 @@ class Synthesizer(nn.Module):
                     "Define path for speaker.json if it is a multi-speaker model or remove defined speaker idx. "
                 )
 
-        # handle multi-lingual
+        # compute a new d_vector from the given clip.
+        if (
+            speaker_wav is not None
+            and self.tts_model.speaker_manager is not None
+            and hasattr(self.tts_model.speaker_manager, "encoder_ap")
+            and self.tts_model.speaker_manager.encoder_ap is not None
+        ):
+            speaker_embedding = self.tts_model.speaker_manager.compute_embedding_from_clip(speaker_wav)
+        return speaker_id, speaker_embedding
+
+    def _get_language_id(self, language_name: str = "") -> int:
+        """Resolve the language id used to condition multi-lingual TTS models.
+
+        Args:
+            language_name (str, optional): language id for multi-language models. Defaults to "".
+
+        Returns:
+            int: language id or None for single-language models.
+        """
         language_id = None
         if self.tts_languages_file or (
-            hasattr(self.tts_model, "language_manager") 
+            hasattr(self.tts_model, "language_manager")
             and self.tts_model.language_manager is not None
             and not self.tts_config.model == "xtts"
         ):
@@ -363,80 +355,360 @@ class Synthesizer(nn.Module):
                     f" [!] Missing language_ids.json file path for selecting language {language_name}."
                     "Define path for language_ids.json if it is a multi-lingual model or remove defined language idx. "
                 )
+        return language_id
+
+    def _vocode(self, mel_specs: List[np.ndarray]) -> List[np.ndarray]:
+        """Run the vocoder model on the spectrograms predicted by the TTS model.
+
+        Multiple spectrograms are padded and vocoded in a single forward pass, then each waveform is trimmed back
+        to the length of its own spectrogram. WaveRNN already folds a single input into a batch, so its inputs are
+        vocoded one by one.
+
+        Args:
+            mel_specs (List[np.ndarray]): TTS model output spectrograms in shape :math:`[T, C]`.
+
+        Returns:
+            List[np.ndarray]: vocoded waveforms.
+        """
+        vocoder_device = next(self.vocoder_model.parameters()).device
+        if self.use_cuda:
+            vocoder_device = "cuda"
+        # compute scale factor for possible sample rate mismatch
+        scale_factor = [
+            1,
+            self.vocoder_config["audio"]["sample_rate"] / self.tts_model.ap.sample_rate,
+        ]
+        vocoder_inputs = []
+        for mel_postnet_spec in mel_specs:
+            # denormalize tts output based on tts audio config
+            mel_postnet_spec = self.tts_model.ap.denormalize(mel_postnet_spec.T).T
+            # renormalize spectrogram based on vocoder config
+            vocoder_input = self.vocoder_ap.normalize(mel_postnet_spec.T)
+            if scale_factor[1] != 1:
+                print(" > interpolating tts model output.")
+                vocoder_input = interpolate_vocoder_input(scale_factor, vocoder_input)[0]
+            else:
+                vocoder_input = torch.tensor(vocoder_input)  # pylint: disable=not-callable
+            vocoder_inputs.append(vocoder_input)
+
+        if len(vocoder_inputs) == 1 or self.vocoder_config.model.lower() == "wavernn":
+            # run vocoder model
+            # [1, T, C]
+            waveforms = [self.vocoder_model.inference(x.unsqueeze(0).to(vocoder_device)) for x in vocoder_inputs]
+        else:
+            # pad with the minimum value of each spectrogram that corresponds to silence
+            max_len = max(x.shape[-1] for x in vocoder_inputs)
+            vocoder_input = torch.stack(
+                [torch.nn.functional.pad(x, (0, max_len - x.shape[-1]), value=x.min().item()) for x in vocoder_inputs]
+            )
+            kwargs = {}
+            if self.vocoder_config.model.lower() == "wavegrad":
+                # keep the padding silent
+                kwargs["lengths"] = torch.tensor([x.shape[-1] for x in vocoder_inputs])
+            # run vocoder model
+            # [B, T, C]
+            outputs = self.vocoder_model.inference(vocoder_input.to(vocoder_device), **kwargs)
+            hop_length = self.vocoder_ap.hop_length
+            waveforms = [outputs[idx, ..., : x.shape[-1] * hop_length] for idx, x in enumerate(vocoder_inputs)]
+        return [waveform.cpu().numpy() for waveform in waveforms]
+
+    def _postprocess_waveform(self, waveform) -> np.ndarray:
+        """Squeeze the waveform and trim the trailing silence if it is enabled by the TTS audio config."""
+        waveform = waveform.squeeze()
+        # trim silence
+        if "do_trim_silence" in self.tts_config.audio and self.tts_config.audio["do_trim_silence"]:
+            waveform = trim_silence(waveform, self.tts_model.ap)
+        return waveform
+
+    def _synthesize_sentence(
+        self,
+        sen: str,
+        speaker_name: str = "",
+        speaker_id: int = None,
+        speaker_embedding: np.ndarray = None,
+        speaker_wav=None,
+        language_name: str = "",
+        language_id: int = None,
+        style_wav=None,
+        style_text=None,
+        **kwargs,
+    ) -> np.ndarray:
+        """Run the TTS model and the vocoder on a single sentence."""
+        use_gl = self.vocoder_model is None
+        if hasattr(self.tts_model, "synthesize"):
+            outputs = self.tts_model.synthesize(
+                text=sen,
+                config=self.tts_config,
+                speaker_id=speaker_name,
+                voice_dirs=self.voice_dir,
+                d_vector=speaker_embedding,
+                speaker_wav=speaker_wav,
+                language=language_name,
+                **kwargs,
+            )
+        else:
+            # synthesize voice
+            outputs = synthesis(
+                model=self.tts_model,
+                text=sen,
+                CONFIG=self.tts_config,
+                use_cuda=self.use_cuda,
+                speaker_id=speaker_id,
+                style_wav=style_wav,
+                style_text=style_text,
+                use_griffin_lim=use_gl,
+                d_vector=speaker_embedding,
+                language_id=language_id,
+            )
+        waveform = outputs["wav"]
+        if not use_gl:
+            waveform = self._vocode([outputs["outputs"]["model_outputs"][0].detach().cpu().numpy()])[0]
+        return self._postprocess_waveform(waveform)
+
+    def synthesize_batch(
+        self,
+        sentences: List[str],
+        speaker_name: str = "",
+        language_name: str = "",
+        speaker_wav=None,
+        style_wav=None,
+        style_text=None,
+        speaker_input: Tuple[int, np.ndarray] = None,
+        **kwargs,
+    ) -> List[np.ndarray]:
+        """Synthesize a list of sentences that share the same speaker, language and style.
+
+        For models with ``SUPPORTS_BATCH_INFERENCE`` the sentences are padded and passed through the TTS model and
+        the vocoder in a single forward pass each. Other models fall back to synthesizing one sentence at a time.
+
+        Args:
+            sentences (List[str]): sentences to synthesize.
+            speaker_name (str, optional): speaker id for multi-speaker models. Defaults to "".
+            language_name (str, optional): language id for multi-language models. Defaults to "".
+            speaker_wav (Union[str, List[str]], optional): path to the speaker wav for voice cloning. Defaults to None.
+            style_wav ([type], optional): style waveform for GST. Defaults to None.
+            style_text ([type], optional): transcription of style_wav for Capacitron. Defaults to None.
+            speaker_input (Tuple[int, np.ndarray], optional): speaker id and embedding already resolved by
+                `_get_speaker_input()` for the same speaker, so they are not computed again for every batch of a
+                text. Defaults to None.
+            **kwargs: additional arguments to pass to the TTS model.
+
+        Returns:
+            List[np.ndarray]: one waveform per sentence, without the silence inserted between sentences by `tts()`.
+        """
+        if speaker_input is None:
+            speaker_input = self._get_speaker_input(speaker_name, speaker_wav)
+        speaker_id, speaker_embedding = speaker_input
+        language_id = self._get_language_id(language_name)
+
+        if hasattr(self.tts_model, "synthesize_batch"):
+            # models decoding the sentences together themselves, like XTTS
+            if "voice_dir" in kwargs:
+                self.voice_dir = kwargs.pop("voice_dir")
+            waveforms = self.tts_model.synthesize_batch(
+                sentences,
+                self.tts_config,
+                speaker_wav=speaker_wav,
+                language=language_name,
+                speaker_id=speaker_name or None,
+                **kwargs,
+            )
+            return [self._postprocess_waveform(waveform) for waveform in waveforms]
 
-        # compute a new d_vector from the given clip.
         if (
-            speaker_wav is not None
-            and self.tts_model.speaker_manager is not None
-            and hasattr(self.tts_model.speaker_manager, "encoder_ap")
-            and self.tts_model.speaker_manager.encoder_ap is not None
+            hasattr(self.tts_model, "synthesize")
+            or not getattr(self.tts_model, "SUPPORTS_BATCH_INFERENCE", False)
+            or style_wav is not None
+            or style_text is not None
+            or self.tts_config.get("use_capacitron_vae", False)
         ):
-            speaker_embedding = self.tts_model.speaker_manager.compute_embedding_from_clip(speaker_wav)
+            return [
+                self._synthesize_sentence(
+                    sen,
+                    speaker_name=speaker_name,
+                    speaker_id=speaker_id,
+                    speaker_embedding=speaker_embedding,
+                    speaker_wav=speaker_wav,
+                    language_name=language_name,
+                    language_id=language_id,
+                    style_wav=style_wav,
+                    style_text=style_text,
+                    **kwargs,
+                )
+                for sen in sentences
+            ]
+
+        outputs = batch_synthesis(
+            model=self.tts_model,
+            texts=sentences,
+            CONFIG=self.tts_config,
+            use_cuda=self.use_cuda,
+            speaker_id=speaker_id,
+            d_vector=speaker_embedding,
+            language_id=language_id,
+        )
+        if outputs[0].ndim == 1:  # [T,]
+            waveforms = outputs
+        elif self.vocoder_model is None:  # [T, C_spec]
+            waveforms = inv_spectrogram_batch(outputs, self.tts_model.ap, self.tts_config)
+        else:
+            waveforms = self._vocode(outputs)
+        return [self._postprocess_waveform(waveform) for waveform in waveforms]
+
+    def tts_stream(
+        self,
+        text: str = "",
+        speaker_name: str = "",
+        language_name: str = "",
+        speaker_wav=None,
+        style_wav=None,
+        style_text=None,
+        split_sentences: bool = True,
+        **kwargs,
+    ) -> Iterator[np.ndarray]:
+        """Generator version of `tts()` that yields the waveform while the text is being synthesized.
+
+        Each sentence is yielded as soon as it is vocoded, followed by the silence `tts()` puts between sentences.
+        Models implementing `synthesize_stream()`, like XTTS, yield smaller chunks while a sentence is decoded.
+        Voice conversion is not supported.
+
+        Args:
+            text (str): input text.
+            speaker_name (str, optional): speaker id for multi-speaker models. Defaults to "".
+            language_name (str, optional): language id for multi-language models. Defaults to "".
+            speaker_wav (Union[str, List[str]], optional): path to the speaker wav for voice cloning. Defaults to None.
+            style_wav ([type], optional): style waveform for GST. Defaults to None.
+            style_text ([type], optional): transcription of style_wav for Capacitron. Defaults to None.
+            split_sentences (bool, optional): split the input text into sentences. Defaults to True.
+            **kwargs: additional arguments to pass to the TTS model.
+
+        Yields:
+            np.ndarray: waveform chunks.
+        """
+        if not text:
+            raise ValueError("You need to define `text` to use the streaming synthesis.")
+
+        sens = [text]
+        if split_sentences:
+            sens = self.split_into_sentences(text)
+
+        if "voice_dir" in kwargs:
+            self.voice_dir = kwargs["voice_dir"]
+            kwargs.pop("voice_dir")
+        speaker_id, speaker_embedding = self._get_speaker_input(speaker_name, speaker_wav)
+        language_id = self._get_language_id(language_name)
+
+        for sen in sens:
+            if hasattr(self.tts_model, "synthesize_stream"):
+                yield from self.tts_model.synthesize_stream(
+                    text=sen,
+                    config=self.tts_config,
+                    speaker_wav=speaker_wav,
+                    language=language_name,
+                    speaker_id=speaker_name or None,
+                    **kwargs,
+                )
+            else:
+                yield self._synthesize_sentence(
+                    sen,
+                    speaker_name=speaker_name,
+                    speaker_id=speaker_id,
+                    speaker_embedding=speaker_embedding,
+                    speaker_wav=speaker_wav,
+                    language_name=language_name,
+                    language_id=language_id,
+                    style_wav=style_wav,
+                    style_text=style_text,
+                    **kwargs,
+                )
+            yield np.zeros(10000, dtype=np.float32)
+
+    def tts(
+        self,
+        text: str = "",
+        speaker_name: str = "",
+        language_name: str = "",
+        speaker_wav=None,
+        style_wav=None,
+        style_text=None,
+        reference_wav=None,
+        reference_speaker_name=None,
+        split_sentences: bool = True,
+        batch_size: int = 1,
+        **kwargs,
+    ) -> List[int]:
+        """🐸 TTS magic. Run all the models and generate speech.
+
+        Args:
+            text (str): input text.
+            speaker_name (str, optional): speaker id for multi-speaker models. Defaults to "".
+            language_name (str, optional): language id for multi-language models. Defaults to "".
+            speaker_wav (Union[str, List[str]], optional): path to the speaker wav for voice cloning. Defaults to None.
+            style_wav ([type], optional): style waveform for GST. Defaults to None.
+            style_text ([type], optional): transcription of style_wav for Capacitron. Defaults to None.
+            reference_wav ([type], optional): reference waveform for voice conversion. Defaults to None.
+            reference_speaker_name ([type], optional): speaker id of reference waveform. Defaults to None.
+            split_sentences (bool, optional): split the input text into sentences. Defaults to True.
+            batch_size (int, optional): number of sentences synthesized together by `synthesize_batch()`. Models
+                without batched inference support still synthesize one sentence at a time. Defaults to 1.
+            **kwargs: additional arguments to pass to the TTS model.
+        Returns:
+            List[int]: [description]
+        """
+        start_time = time.time()
+        wavs = []
+
+        if not text and not reference_wav:
+            raise ValueError(
+                "You need to define either `text` (for sythesis) or a `reference_wav` (for voice conversion) to use the Coqui TTS API."
+            )
+
+        if text:
+            sens = [text]
+            if split_sentences:
+                print(" > Text splitted to sentences.")
+                sens = self.split_into_sentences(text)
+            print(sens)
+
+        # handle multi-speaker
+        if "voice_dir" in kwargs:
+            self.voice_dir = kwargs["voice_dir"]
+            kwargs.pop("voice_dir")
+        speaker_id, speaker_embedding = self._get_speaker_input(speaker_name, speaker_wav)
+
+        # handle multi-lingual
+        language_id = self._get_language_id(language_name)
 
-        vocoder_device = "cpu"
         use_gl = self.vocoder_model is None
-        if not use_gl:
-            vocoder_device = next(self.vocoder_model.parameters()).device
-        if self.use_cuda:
-            vocoder_device = "cuda"
 
-        if not reference_wav:  # not voice conversion
+        if not reference_wav and batch_size > 1:
+            for idx in range(0, len(sens), batch_size):
+                for waveform in self.synthesize_batch(
+                    sens[idx : idx + batch_size],
+                    speaker_name=speaker_name,
+                    language_name=language_name,
+                    speaker_wav=speaker_wav,
+                    style_wav=style_wav,
+                    style_text=style_text,
+                    speaker_input=(speaker_id, speaker_embedding),
+                    **kwargs,
+                ):
+                    wavs += list(waveform)
+                    wavs += [0] * 10000
+        elif not reference_wav:  # not voice conversion
             for sen in sens:
-                if hasattr(self.tts_model, "synthesize"):
-                    outputs = self.tts_model.synthesize(
-                        text=sen,
-                        config=self.tts_config,
-                        speaker_id=speaker_name,
-                        voice_dirs=self.voice_dir,
-                        d_vector=speaker_embedding,
-                        speaker_wav=speaker_wav,
-                        language=language_name,
-                        **kwargs,
-                    )
-                else:
-                    # synthesize voice
-                    outputs = synthesis(
-                        model=self.tts_model,
-                        text=sen,
-                        CONFIG=self.tts_config,
-                        use_cuda=self.use_cuda,
-                        speaker_id=speaker_id,
-                        style_wav=style_wav,
-                        style_text=style_text,
-                        use_griffin_lim=use_gl,
-                        d_vector=speaker_embedding,
-                        language_id=language_id,
-                    )
-                waveform = outputs["wav"]
-                if not use_gl:
-                    mel_postnet_spec = outputs["outputs"]["model_outputs"][0].detach().cpu().numpy()
-                    # denormalize tts output based on tts audio config
-                    mel_postnet_spec = self.tts_model.ap.denormalize(mel_postnet_spec.T).T
-                    # renormalize spectrogram based on vocoder config
-                    vocoder_input = self.vocoder_ap.normalize(mel_postnet_spec.T)
-                    # compute scale factor for possible sample rate mismatch
-                    scale_factor = [
-                        1,
-                        self.vocoder_config["audio"]["sample_rate"] / self.tts_model.ap.sample_rate,
-                    ]
-                    if scale_factor[1] != 1:
-                        print(" > interpolating tts model output.")
-                        vocoder_input = interpolate_vocoder_input(scale_factor, vocoder_input)
-                    else:
-                        vocoder_input = torch.tensor(vocoder_input).unsqueeze(0)  # pylint: disable=not-callable
-                    # run vocoder model
-                    # [1, T, C]
-                    waveform = self.vocoder_model.inference(vocoder_input.to(vocoder_device))
-                if torch.is_tensor(waveform) and waveform.device != torch.device("cpu") and not use_gl:
-                    waveform = waveform.cpu()
-                if not use_gl:
-                    waveform = waveform.numpy()
-                waveform = waveform.squeeze()
-
-                # trim silence
-                if "do_trim_silence" in self.tts_config.audio and self.tts_config.audio["do_trim_silence"]:
-                    waveform = trim_silence(waveform, self.tts_model.ap)
-
+                waveform = self._synthesize_sentence(
+                    sen,
+                    speaker_name=speaker_name,
+                    speaker_id=speaker_id,
+                    speaker_embedding=speaker_embedding,
+                    speaker_wav=speaker_wav,
+                    language_name=language_name,
+                    language_id=language_id,
+                    style_wav=style_wav,
+                    style_text=style_text,
+                    **kwargs,
+                )
                 wavs += list(waveform)
                 wavs += [0] * 10000
         else:
@@ -473,28 +745,9 @@ class Synthesizer(nn.Module):
             )
             waveform = outputs
             if not use_gl:
-                mel_postnet_spec = outputs[0].detach().cpu().numpy()
-                # denormalize tts output based on tts audio config
-                mel_postnet_spec = self.tts_model.ap.denormalize(mel_postnet_spec.T).T
-                # renormalize spectrogram based on vocoder config
-                vocoder_input = self.vocoder_ap.normalize(mel_postnet_spec.T)
-                # compute scale factor for possible sample rate mismatch
-                scale_factor = [
-                    1,
-                    self.vocoder_config["audio"]["sample_rate"] / self.tts_model.ap.sample_rate,
-                ]
-                if scale_factor[1] != 1:
-                    print(" > interpolating tts model output.")
-                    vocoder_input = interpolate_vocoder_input(scale_factor, vocoder_input)
-                else:
-                    vocoder_input = torch.tensor(vocoder_input).unsqueeze(0)  # pylint: disable=not-callable
-                # run vocoder model
-                # [1, T, C]
-                waveform = self.vocoder_model.inference(vocoder_input.to(vocoder_device))
+                waveform = self._vocode([outputs[0].detach().cpu().numpy()])[0]
             if torch.is_tensor(waveform) and waveform.device != torch.device("cpu"):
                 waveform = waveform.cpu()
-            if not use_gl:
-                waveform = waveform.numpy()
             wavs = waveform.squeeze()
 
         # compute stats
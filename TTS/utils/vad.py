@@ -34,9 +34,13 @@ def map_timestamps_to_new_sr(vad_sr, new_sr, timestamps, just_begging_end=False)
     return new_timestamps
 
 
-def get_vad_model_and_utils(use_cuda=False, use_onnx=False):
+def get_vad_model_and_utils(use_cuda=False, use_onnx=False, force_reload=True):
     model, utils = torch.hub.load(
-        repo_or_dir="snakers4/silero-vad", model="silero_vad", force_reload=True, onnx=use_onnx, force_onnx_cpu=True
+        repo_or_dir="snakers4/silero-vad",
+        model="silero_vad",
+        force_reload=force_reload,
+        onnx=use_onnx,
+        force_onnx_cpu=True,
     )
     if use_cuda:
         model = model.cuda()
@@ -45,19 +49,27 @@ def get_vad_model_and_utils(use_cuda=False, use_onnx=False):
     return model, get_speech_timestamps, save_audio, collect_chunks
 
 
-def remove_silence(
-    model_and_utils, audio_path, out_path, vad_sample_rate=8000, trim_just_beginning_and_end=True, use_cuda=False
+def get_speech(
+    model_and_utils, wav, gt_sample_rate, vad_sample_rate=8000, trim_just_beginning_and_end=True, use_cuda=False
 ):
+    """Cut the nonspeech parts of a waveform.
+
+    Args:
+        model_and_utils (Tuple): VAD model and functions returned by `get_vad_model_and_utils()`.
+        wav (torch.Tensor): Mono waveform.
+        gt_sample_rate (int): Sample rate of the waveform.
+        vad_sample_rate (int): Sample rate the VAD runs at. Defaults to 8000.
+        trim_just_beginning_and_end (bool): Only trim the nonspeech parts at the beginning and the end.
+            Defaults to True.
+        use_cuda (bool): Run the VAD on the GPU. Defaults to False.
+
+    Returns:
+        Tuple[torch.Tensor, bool]: The trimmed waveform and whether any speech was found. The waveform is returned as
+        is if there is no speech.
+    """
     # get the VAD model and utils functions
     model, get_speech_timestamps, _, collect_chunks = model_and_utils
 
-    # read ground truth wav and resample the audio for the VAD
-    try:
-        wav, gt_sample_rate = read_audio(audio_path)
-    except:
-        print(f"> ❗ Failed to read {audio_path}")
-        return None, False
-
     # if needed, resample the audio for the VAD model
     if gt_sample_rate != vad_sample_rate:
         wav_vad = resample_wav(wav, gt_sample_rate, vad_sample_rate)
@@ -75,13 +87,27 @@ def remove_silence(
         vad_sample_rate, gt_sample_rate, speech_timestamps, trim_just_beginning_and_end
     )
 
-    # if have speech timestamps else save the wav
+    # if have speech timestamps else keep the wav
     if new_speech_timestamps:
-        wav = collect_chunks(new_speech_timestamps, wav)
-        is_speech = True
-    else:
+        return collect_chunks(new_speech_timestamps, wav), True
+    return wav, False
+
+
+def remove_silence(
+    model_and_utils, audio_path, out_path, vad_sample_rate=8000, trim_just_beginning_and_end=True, use_cuda=False
+):
+    # read ground truth wav and resample the audio for the VAD
+    try:
+        wav, gt_sample_rate = read_audio(audio_path)
+    except:
+        print(f"> ❗ Failed to read {audio_path}")
+        return None, False
+
+    wav, is_speech = get_speech(
+        model_and_utils, wav, gt_sample_rate, vad_sample_rate, trim_just_beginning_and_end, use_cuda
+    )
+    if not is_speech:
         print(f"> The file {audio_path} probably does not have speech please check it !!")
-        is_speech = False
 
     # save
     torchaudio.save(out_path, wav[None, :], gt_sample_rate)
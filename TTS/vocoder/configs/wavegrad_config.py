@@ -46,6 +46,10 @@ class WavegradConfig(BaseVocoderConfig):
                 "num_steps": 50,
             }
             `
+        inference_max_rtf (float):
+            Use the most accurate noise schedule searched by `bin/tune_wavegrad.py` that runs under this real-time
+            factor instead of `test_noise_schedule`. The real-time factors are measured by the search, on its
+            hardware. Defaults to None.
         grad_clip (float):
             Gradient clipping threshold. If <= 0.0, no clipping is applied. Defaults to 1.0
         lr (float):
@@ -80,6 +84,7 @@ class WavegradConfig(BaseVocoderConfig):
             "num_steps": 50,
         }
     )
+    inference_max_rtf: float = None
 
     # optimizer overrides
     grad_clip: float = 1.0
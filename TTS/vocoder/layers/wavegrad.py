@@ -25,7 +25,7 @@ class PositionalEncoding(nn.Module):
     def forward(self, x, noise_level):
         if x.shape[2] > self.pe.shape[1]:
             self.init_pe_matrix(x.shape[1], x.shape[2], x)
-        return x + noise_level[..., None, None] + self.pe[:, : x.size(2)].repeat(x.shape[0], 1, 1) / self.C
+        return x + noise_level[..., None, None] + self.pe[None, :, : x.size(2)] / self.C
 
     def init_pe_matrix(self, n_channels, max_len, x):
         pe = torch.zeros(max_len, n_channels)
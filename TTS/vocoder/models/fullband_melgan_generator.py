@@ -30,4 +30,4 @@ class FullbandMelganGenerator(MelganGenerator):
         cond_features = torch.nn.functional.pad(
             cond_features, (self.inference_padding, self.inference_padding), "replicate"
         )
-        return self.layers(cond_features)
+        return self._inference_forward(cond_features)
@@ -1,5 +1,5 @@
 from inspect import signature
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Tuple
 
 import numpy as np
 import torch
@@ -16,6 +16,7 @@ from TTS.vocoder.layers.losses import DiscriminatorLoss, GeneratorLoss
 from TTS.vocoder.models import setup_discriminator, setup_generator
 from TTS.vocoder.models.base_vocoder import BaseVocoder
 from TTS.vocoder.utils.generic_utils import plot_results
+from TTS.vocoder.utils.streaming import StreamingVocoder, measure_receptive_field
 
 
 class GAN(BaseVocoder):
@@ -43,6 +44,7 @@ class GAN(BaseVocoder):
         self.train_disc = False  # if False, train only the generator.
         self.y_hat_g = None  # the last generator prediction to be passed onto the discriminator
         self.ap = ap
+        self.stream_context_size = None  # receptive field of the generator, measured on the first streaming call
 
     def forward(self, x: torch.Tensor) -> torch.Tensor:
         """Run the generator's forward pass.
@@ -65,6 +67,23 @@ class GAN(BaseVocoder):
         """
         return self.model_g.inference(x)
 
+    def inference_stream(self, x: torch.Tensor, chunk_size: int = 32) -> Iterator[torch.Tensor]:
+        """Run the generator's inference pass on chunks of `chunk_size` frames and yield the output of each chunk.
+
+        The output is the same as `inference()` up to floating point differences. See
+        :class:`TTS.vocoder.utils.streaming.StreamingVocoder` to push the input frames as they are generated.
+
+        Args:
+            x (torch.Tensor): Input tensor.
+            chunk_size (int): number of frames vocoded at once. Defaults to 32.
+
+        Yields:
+            torch.Tensor: consecutive parts of the output of the GAN generator network.
+        """
+        if self.stream_context_size is None:
+            self.stream_context_size = measure_receptive_field(self.model_g, x.shape[1])
+        yield from StreamingVocoder(self.model_g, chunk_size, self.stream_context_size).stream(x)
+
     def train_step(self, batch: Dict, criterion: Dict, optimizer_idx: int) -> Tuple[Dict, Dict]:
         """Compute model outputs and the loss values. `optimizer_idx` selects the generator or the discriminator for
         network on the current pass.
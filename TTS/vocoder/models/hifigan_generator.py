@@ -279,6 +279,10 @@ class HifiganGenerator(torch.nn.Module):
         """
         c = c.to(self.conv_pre.weight.device)
         c = torch.nn.functional.pad(c, (self.inference_padding, self.inference_padding), "replicate")
+        return self._inference_forward(c)
+
+    def _inference_forward(self, c):
+        """Run `inference()` on an input that is already padded. Used by the streaming vocoder."""
         return self.forward(c)
 
     def remove_weight_norm(self):
@@ -74,6 +74,10 @@ class MelganGenerator(nn.Module):
     def inference(self, c):
         c = c.to(self.layers[1].weight.device)
         c = torch.nn.functional.pad(c, (self.inference_padding, self.inference_padding), "replicate")
+        return self._inference_forward(c)
+
+    def _inference_forward(self, c):
+        """Run `inference()` on an input that is already padded. Used by the streaming vocoder."""
         return self.layers(c)
 
     def remove_weight_norm(self):
@@ -38,4 +38,8 @@ class MultibandMelganGenerator(MelganGenerator):
         cond_features = torch.nn.functional.pad(
             cond_features, (self.inference_padding, self.inference_padding), "replicate"
         )
-        return self.pqmf_synthesis(self.layers(cond_features))
+        return self._inference_forward(cond_features)
+
+    def _inference_forward(self, c):
+        """Run `inference()` on an input that is already padded. Used by the streaming vocoder."""
+        return self.pqmf_synthesis(self.layers(c))
@@ -1,3 +1,4 @@
+import os
 from dataclasses import dataclass, field
 from typing import Dict, List, Tuple
 
@@ -16,6 +17,7 @@ from TTS.vocoder.datasets import WaveGradDataset
 from TTS.vocoder.layers.wavegrad import Conv1d, DBlock, FiLM, UBlock
 from TTS.vocoder.models.base_vocoder import BaseVocoder
 from TTS.vocoder.utils.generic_utils import plot_results
+from TTS.vocoder.utils.noise_schedule import NoiseScheduleCache
 
 
 @dataclass
@@ -70,6 +72,7 @@ class Wavegrad(BaseVocoder):
         self.c1 = None
         self.c2 = None
         self.sigma = None
+        self.noise_schedules = None  # schedules searched by `TTS/bin/tune_wavegrad.py`
 
         # dblocks
         self.y_conv = Conv1d(1, config.model_params.y_conv_channels, 5, padding=2)
@@ -123,25 +126,74 @@ class Wavegrad(BaseVocoder):
         beta = np.load(path, allow_pickle=True).item()["beta"]  # pylint: disable=unexpected-keyword-arg
         self.compute_noise_level(beta)
 
+    def set_noise_schedule(self, max_rtf: float = None, num_steps: int = None) -> Dict:
+        """Use a noise schedule of the cache loaded with the checkpoint.
+
+        Args:
+            max_rtf (float): use the most accurate schedule with a lower real-time factor. Defaults to None.
+            num_steps (int): use the schedule with this number of steps. Defaults to None.
+
+        Returns:
+            Dict: the schedule with its error and real-time factor.
+        """
+        schedule = self.select_noise_schedule(max_rtf=max_rtf, num_steps=num_steps)
+        self.compute_noise_level(np.array(schedule["beta"]))
+        return schedule
+
+    def select_noise_schedule(self, max_rtf: float = None, num_steps: int = None) -> Dict:
+        """Pick a noise schedule of the cache loaded with the checkpoint without using it.
+
+        Args:
+            max_rtf (float): pick the most accurate schedule with a lower real-time factor. Defaults to None.
+            num_steps (int): pick the schedule with this number of steps. Defaults to None.
+
+        Returns:
+            Dict: the schedule with its error and real-time factor.
+        """
+        if self.noise_schedules is None:
+            raise RuntimeError(" [!] No noise schedule cache. Search the schedules with `TTS/bin/tune_wavegrad.py`.")
+        return self.noise_schedules.select(max_rtf=max_rtf, num_steps=num_steps)
+
     @torch.no_grad()
-    def inference(self, x, y_n=None):
+    def inference(self, x, y_n=None, lengths=None, max_rtf=None):
         """
+        Args:
+            x (torch.Tensor): melspectrograms, padded at the end.
+            y_n (torch.Tensor): initial noise. Defaults to random noise.
+            lengths (torch.Tensor): number of frames of each melspectrogram. The samples past the end are kept at
+                zero, so the padding does not add noise to the end of the shorter waveforms. Defaults to None.
+            max_rtf (float): use the most accurate cached noise schedule running under this real-time factor for
+                this call only. `set_noise_schedule()` changes the schedule of all the calls. Defaults to None.
+
         Shapes:
             x: :math:`[B, C , T]`
             y_n: :math:`[B, 1, T]`
+            lengths: :math:`[B]`
         """
+        if max_rtf is None:
+            noise_level, alpha, c1, c2, sigma = self.noise_level, self.alpha, self.c1, self.c2, self.sigma
+        else:
+            schedule = self.select_noise_schedule(max_rtf=max_rtf)
+            noise_level, alpha, _, c1, c2, sigma = self.get_noise_level(np.array(schedule["beta"]))
         if y_n is None:
             y_n = torch.randn(x.shape[0], 1, self.hop_len * x.shape[-1])
         else:
             y_n = torch.FloatTensor(y_n).unsqueeze(0).unsqueeze(0)
         y_n = y_n.type_as(x)
-        sqrt_alpha_hat = self.noise_level.to(x)
-        for n in range(len(self.alpha) - 1, -1, -1):
-            y_n = self.c1[n] * (y_n - self.c2[n] * self.forward(y_n, x, sqrt_alpha_hat[n].repeat(x.shape[0])))
+        mask = None
+        if lengths is not None:
+            positions = torch.arange(y_n.shape[-1], device=x.device)
+            mask = (positions[None, :] < lengths.to(x.device)[:, None] * self.hop_len).unsqueeze(1).type_as(y_n)
+            y_n = y_n * mask
+        sqrt_alpha_hat = noise_level.to(x)
+        for n in range(len(alpha) - 1, -1, -1):
+            y_n = c1[n] * (y_n - c2[n] * self.forward(y_n, x, sqrt_alpha_hat[n].expand(x.shape[0])))
             if n > 0:
                 z = torch.randn_like(y_n)
-                y_n += self.sigma[n - 1] * z
+                y_n += sigma[n - 1] * z
             y_n.clamp_(-1.0, 1.0)
+            if mask is not None:
+                y_n = y_n * mask
         return y_n
 
     def compute_y_n(self, y_0):
@@ -157,23 +209,34 @@ class Wavegrad(BaseVocoder):
         noisy_audio = noise_scale * y_0 + (1.0 - noise_scale**2) ** 0.5 * noise
         return noise.unsqueeze(1), noisy_audio.unsqueeze(1), noise_scale[:, 0]
 
-    def compute_noise_level(self, beta):
-        """Compute noise schedule parameters"""
-        self.num_steps = len(beta)
+    @staticmethod
+    def get_noise_level(beta: np.ndarray) -> Tuple[torch.Tensor, ...]:
+        """Compute the noise schedule parameters of `beta`.
+
+        Returns:
+            Tuple[torch.Tensor, ...]: `noise_level`, `alpha`, `alpha_hat`, `c1`, `c2` and `sigma`.
+        """
         alpha = 1 - beta
         alpha_hat = np.cumprod(alpha)
-        noise_level = np.concatenate([[1.0], alpha_hat**0.5], axis=0)
         noise_level = alpha_hat**0.5
 
         # pylint: disable=not-callable
-        self.beta = torch.tensor(beta.astype(np.float32))
-        self.alpha = torch.tensor(alpha.astype(np.float32))
-        self.alpha_hat = torch.tensor(alpha_hat.astype(np.float32))
-        self.noise_level = torch.tensor(noise_level.astype(np.float32))
+        beta = torch.tensor(beta.astype(np.float32))
+        alpha = torch.tensor(alpha.astype(np.float32))
+        alpha_hat = torch.tensor(alpha_hat.astype(np.float32))
+        noise_level = torch.tensor(noise_level.astype(np.float32))
+
+        c1 = 1 / alpha**0.5
+        c2 = (1 - alpha) / (1 - alpha_hat) ** 0.5
+        sigma = ((1.0 - alpha_hat[:-1]) / (1.0 - alpha_hat[1:]) * beta[1:]) ** 0.5
+        return noise_level, alpha, alpha_hat, c1, c2, sigma
 
-        self.c1 = 1 / self.alpha**0.5
-        self.c2 = (1 - self.alpha) / (1 - self.alpha_hat) ** 0.5
-        self.sigma = ((1.0 - self.alpha_hat[:-1]) / (1.0 - self.alpha_hat[1:]) * self.beta[1:]) ** 0.5
+    def compute_noise_level(self, beta):
+        """Compute noise schedule parameters"""
+        self.num_steps = len(beta)
+        # pylint: disable=not-callable
+        self.beta = torch.tensor(beta.astype(np.float32))
+        self.noise_level, self.alpha, self.alpha_hat, self.c1, self.c2, self.sigma = self.get_noise_level(beta)
 
     def remove_weight_norm(self):
         for _, layer in enumerate(self.dblocks):
@@ -234,6 +297,10 @@ class Wavegrad(BaseVocoder):
                 config["test_noise_schedule"]["num_steps"],
             )
             self.compute_noise_level(betas)
+            self.load_noise_schedules(checkpoint_path)
+            if self.noise_schedules is not None and config.get("inference_max_rtf", None) is not None:
+                schedule = self.set_noise_schedule(max_rtf=config["inference_max_rtf"])
+                print(f" > Using the noise schedule with {schedule['num_steps']} steps - RTF: {schedule['rtf']:.3f}")
         else:
             betas = np.linspace(
                 config["train_noise_schedule"]["min_val"],
@@ -242,6 +309,17 @@ class Wavegrad(BaseVocoder):
             )
             self.compute_noise_level(betas)
 
+    def load_noise_schedules(self, checkpoint_path: str) -> None:
+        """Load the noise schedule cache of a checkpoint if there is one for this exact checkpoint."""
+        cache_path = NoiseScheduleCache.get_path(checkpoint_path)
+        if not os.path.exists(cache_path):
+            return
+        cache = NoiseScheduleCache.load(cache_path)
+        if not cache.is_for_checkpoint(checkpoint_path):
+            print(f" [!] Ignoring {cache_path}: the schedules were searched for another checkpoint.")
+            return
+        self.noise_schedules = cache
+
     def train_step(self, batch: Dict, criterion: Dict) -> Tuple[Dict, Dict]:
         # format data
         x = batch["input"]
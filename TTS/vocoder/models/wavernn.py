@@ -1,7 +1,5 @@
-import sys
-import time
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Tuple
 
 import numpy as np
 import torch
@@ -18,11 +16,6 @@ from TTS.utils.io import load_fsspec
 from TTS.vocoder.datasets.wavernn_dataset import WaveRNNDataset
 from TTS.vocoder.layers.losses import WaveRNNLoss
 from TTS.vocoder.models.base_vocoder import BaseVocoder
-from TTS.vocoder.utils.distribution import sample_from_discretized_mix_logistic, sample_from_gaussian
-
-
-def stream(string, variables):
-    sys.stdout.write(f"\r{string}" % variables)
 
 
 # pylint: disable=abstract-method
@@ -91,7 +84,7 @@ class UpsampleNetwork(nn.Module):
         use_aux_net,
     ):
         super().__init__()
-        self.total_scale = np.cumproduct(upsample_scales)[-1]
+        self.total_scale = np.cumprod(upsample_scales)[-1]
         self.indent = pad * self.total_scale
         self.use_aux_net = use_aux_net
         if use_aux_net:
@@ -239,7 +232,7 @@ class Wavernn(BaseVocoder):
 
         if self.args.use_upsample_net:
             assert (
-                np.cumproduct(self.args.upsample_factors)[-1] == config.audio.hop_length
+                np.cumprod(self.args.upsample_factors)[-1] == config.audio.hop_length
             ), " [!] upsample scales needs to be equal to hop_length"
             self.upsample = UpsampleNetwork(
                 self.args.feat_dims,
@@ -313,112 +306,224 @@ class Wavernn(BaseVocoder):
         return self.fc3(x)
 
     def inference(self, mels, batched=None, target=None, overlap=None):
-        self.eval()
-        output = []
-        start = time.time()
-        rnn1 = self.get_gru_cell(self.rnn1)
-        rnn2 = self.get_gru_cell(self.rnn2)
+        """Generate the waveform of a melspectrogram.
+
+        Args:
+            mels (Union[Tensor, np.ndarray]): melspectrogram. Shape :math:`[C, T]` or :math:`[1, C, T]`.
+            batched (bool): split the input into folds generated in parallel and crossfade them. Defaults to None.
+            target (int): number of samples of each fold in batched mode.
+            overlap (int): number of samples of the crossfade between the folds in batched mode.
 
+        Returns:
+            Union[Tensor, np.ndarray]: the waveform as a float64 array in batched mode, as a tensor otherwise.
+        """
+        self.eval()
         with torch.no_grad():
-            if isinstance(mels, np.ndarray):
-                mels = torch.FloatTensor(mels).to(str(next(self.parameters()).device))
+            mels, aux, wave_len = self._prepare_inference_input(mels)
+            if batched:
+                output = np.concatenate(
+                    list(self._generate_folds(mels, aux, wave_len, target, overlap, num_parallel_folds=None))
+                )
+            else:
+                output = self._generate(mels, aux)[0].cpu().numpy().astype(np.float64)
+                output = torch.from_numpy(self._postprocess_chunk(output, 0, wave_len).astype(np.float32))
+        self.train()
+        return output
 
-            if mels.ndim == 2:
-                mels = mels.unsqueeze(0)
-            wave_len = (mels.size(-1) - 1) * self.config.audio.hop_length
+    @torch.no_grad()
+    def inference_stream(self, mels, target=None, overlap=None, num_parallel_folds=4) -> Iterator[np.ndarray]:
+        """Generate the waveform of a melspectrogram and yield it while it is being generated.
 
-            mels = self.pad_tensor(mels.transpose(1, 2), pad=self.args.pad, side="both")
-            mels, aux = self.upsample(mels.transpose(1, 2))
+        The input is split into folds like in the batched `inference()`, but the folds are generated
+        `num_parallel_folds` at a time from the start of the input. After each group of folds, the samples that no
+        later fold overlaps are crossfaded and yielded, so the first chunk is ready after generating
+        `target + 2 * overlap` samples per fold instead of the whole input. Larger groups use the CPU better, smaller
+        groups yield sooner.
 
-            if batched:
-                mels = self.fold_with_overlap(mels, target, overlap)
-                if aux is not None:
-                    aux = self.fold_with_overlap(aux, target, overlap)
-
-            b_size, seq_len, _ = mels.size()
-
-            h1 = torch.zeros(b_size, self.args.rnn_dims).type_as(mels)
-            h2 = torch.zeros(b_size, self.args.rnn_dims).type_as(mels)
-            x = torch.zeros(b_size, 1).type_as(mels)
-
-            if self.args.use_aux_net:
-                d = self.aux_dims
-                aux_split = [aux[:, :, d * i : d * (i + 1)] for i in range(4)]
-
-            for i in range(seq_len):
-                m_t = mels[:, i, :]
-
-                if self.args.use_aux_net:
-                    a1_t, a2_t, a3_t, a4_t = (a[:, i, :] for a in aux_split)
-
-                x = torch.cat([x, m_t, a1_t], dim=1) if self.args.use_aux_net else torch.cat([x, m_t], dim=1)
-                x = self.I(x)
-                h1 = rnn1(x, h1)
-
-                x = x + h1
-                inp = torch.cat([x, a2_t], dim=1) if self.args.use_aux_net else x
-                h2 = rnn2(inp, h2)
-
-                x = x + h2
-                x = torch.cat([x, a3_t], dim=1) if self.args.use_aux_net else x
-                x = F.relu(self.fc1(x))
-
-                x = torch.cat([x, a4_t], dim=1) if self.args.use_aux_net else x
-                x = F.relu(self.fc2(x))
-
-                logits = self.fc3(x)
-
-                if self.args.mode == "mold":
-                    sample = sample_from_discretized_mix_logistic(logits.unsqueeze(0).transpose(1, 2))
-                    output.append(sample.view(-1))
-                    x = sample.transpose(0, 1).type_as(mels)
-                elif self.args.mode == "gauss":
-                    sample = sample_from_gaussian(logits.unsqueeze(0).transpose(1, 2))
-                    output.append(sample.view(-1))
-                    x = sample.transpose(0, 1).type_as(mels)
-                elif isinstance(self.args.mode, int):
-                    posterior = F.softmax(logits, dim=1)
-                    distrib = torch.distributions.Categorical(posterior)
-
-                    sample = 2 * distrib.sample().float() / (self.n_classes - 1.0) - 1.0
-                    output.append(sample)
-                    x = sample.unsqueeze(-1)
-                else:
-                    raise RuntimeError("Unknown model mode value - ", self.args.mode)
-
-                if i % 100 == 0:
-                    self.gen_display(i, seq_len, b_size, start)
-
-        output = torch.stack(output).transpose(0, 1)
-        output = output.cpu()
-        if batched:
-            output = output.numpy()
-            output = output.astype(np.float64)
-
-            output = self.xfade_and_unfold(output, target, overlap)
-        else:
-            output = output[0]
+        Args:
+            mels (Union[Tensor, np.ndarray]): melspectrogram. Shape :math:`[C, T]` or :math:`[1, C, T]`.
+            target (int): number of samples of each fold. Defaults to `config.target_samples`.
+            overlap (int): number of samples of the crossfade between the folds. Defaults to `config.overlap_samples`.
+            num_parallel_folds (int): number of folds generated together. Defaults to 4.
 
+        Yields:
+            np.ndarray: consecutive chunks of the waveform, the same samples as the batched `inference()`.
+        """
+        target = target or self.config.target_samples
+        overlap = overlap or self.config.overlap_samples
+        self.eval()
+        mels, aux, wave_len = self._prepare_inference_input(mels)
+        yield from self._generate_folds(mels, aux, wave_len, target, overlap, num_parallel_folds)
+
+    def _prepare_inference_input(self, mels):
+        if isinstance(mels, np.ndarray):
+            mels = torch.FloatTensor(mels).to(str(next(self.parameters()).device))
+        if mels.ndim == 2:
+            mels = mels.unsqueeze(0)
+        wave_len = (mels.size(-1) - 1) * self.config.audio.hop_length
+        mels = self.pad_tensor(mels.transpose(1, 2), pad=self.args.pad, side="both")
+        mels, aux = self.upsample(mels.transpose(1, 2))
+        return mels, aux, wave_len
+
+    def _generate_folds(self, mels, aux, wave_len, target, overlap, num_parallel_folds=None):
+        """Generate the folds of the input by groups and yield the crossfaded samples finished after each group."""
+        mels = self.fold_with_overlap(mels, target, overlap)
+        if aux is not None:
+            aux = self.fold_with_overlap(aux, target, overlap)
+        num_folds = mels.size(0)
+        num_parallel_folds = num_parallel_folds or num_folds
+        fold_len = target + 2 * overlap
+        step = target + overlap
+        fade_in, fade_out = self._get_xfade_windows(overlap)
+        # the overlap of the last fold of the previous group, waiting for the next fold
+        pending = np.zeros(overlap, dtype=np.float64)
+        start = 0
+        for first in range(0, num_folds, num_parallel_folds):
+            folds = slice(first, first + num_parallel_folds)
+            y = self._generate(mels[folds], aux[folds] if aux is not None else None).cpu().numpy().astype(np.float64)
+            y[:, :overlap] *= fade_in
+            y[:, -overlap:] *= fade_out
+            chunk = np.zeros(y.shape[0] * step + overlap, dtype=np.float64)
+            for i in range(y.shape[0]):
+                chunk[i * step : i * step + fold_len] += y[i]
+            chunk[:overlap] += pending
+            if first + num_parallel_folds < num_folds:
+                pending = chunk[-overlap:]
+                chunk = chunk[:-overlap]
+            chunk = self._postprocess_chunk(chunk, start, wave_len)
+            start += len(chunk)
+            if len(chunk) > 0:
+                yield chunk
+            if start >= wave_len:
+                break
+
+    def _postprocess_chunk(self, chunk, start, wave_len):
+        """Decode and trim the samples `[start, start + len(chunk))` of the waveform and fade out its end."""
+        chunk = chunk[: max(wave_len - start, 0)]
         if self.args.mulaw and isinstance(self.args.mode, int):
-            output = mulaw_decode(wav=output, mulaw_qc=self.args.mode)
-
+            chunk = mulaw_decode(wav=chunk, mulaw_qc=self.args.mode)
         # Fade-out at the end to avoid signal cutting out suddenly
-        fade_out = np.linspace(1, 0, 20 * self.config.audio.hop_length)
-        output = output[:wave_len]
-
-        if wave_len > len(fade_out):
-            output[-20 * self.config.audio.hop_length :] *= fade_out
-
-        self.train()
+        fade_len = 20 * self.config.audio.hop_length
+        if wave_len > fade_len:
+            fade_out = np.linspace(1, 0, fade_len)
+            fade_start = wave_len - fade_len
+            if start + len(chunk) > fade_start:
+                offset = max(fade_start - start, 0)
+                chunk[offset:] *= fade_out[start + offset - fade_start : start + len(chunk) - fade_start]
+        return chunk
+
+    def _generate(self, mels, aux, block_size=256):
+        """Run the autoregressive loop on upsampled features and return the samples, before mu-law decoding.
+
+        The parts of the layer inputs that only depend on the conditioning features are computed for `block_size`
+        steps at once, so each step only multiplies the recurrent states. The GRU gates are computed in place in
+        preallocated buffers and the sampling noise is drawn once per block, which makes sampling a single
+        `argmax` or a few element-wise ops per step.
+
+        Shapes:
+            mels: :math:`[B, T, C]`
+            aux: :math:`[B, T, 4 * aux_dims]`
+            Returns: :math:`[B, T]`
+        """
+        b_size, seq_len, _ = mels.size()
+        rnn_dims = self.args.rnn_dims
+        use_aux = self.args.use_aux_net
+        d = self.aux_dims
+
+        # the weights applied to the previous sample and to the recurrent states
+        w_in_sample = self.I.weight[:, 0]
+        w_ih1_sample = torch.mv(self.rnn1.weight_ih_l0, w_in_sample)
+        w_hh1 = self.rnn1.weight_hh_l0.t()
+        w_ih2 = self.rnn2.weight_ih_l0[:, :rnn_dims].t()
+        w_hh2 = self.rnn2.weight_hh_l0.t()
+        w_fc1 = self.fc1.weight[:, :rnn_dims].t()
+        w_fc2 = self.fc2.weight[:, : self.args.fc_dims].t()
+        w_fc3 = self.fc3.weight.t()
+
+        output = mels.new_empty(b_size, seq_len)
+        h1 = mels.new_zeros(b_size, rnn_dims)
+        h2 = mels.new_zeros(b_size, rnn_dims)
+        sample = mels.new_zeros(b_size, 1)
+        x = mels.new_empty(b_size, rnn_dims)
+        gi = mels.new_empty(b_size, 3 * rnn_dims)
+        gh = mels.new_empty(b_size, 3 * rnn_dims)
+        rz = mels.new_empty(b_size, 2 * rnn_dims)
+        n = mels.new_empty(b_size, rnn_dims)
+        fc1_out = mels.new_empty(b_size, self.args.fc_dims)
+        fc2_out = mels.new_empty(b_size, self.args.fc_dims)
+        logits = mels.new_empty(b_size, self.n_classes)
+
+        for block_start in range(0, seq_len, block_size):
+            block = slice(block_start, block_start + block_size)
+            cond = mels[:, block]
+            if use_aux:
+                a1, a2, a3, a4 = (aux[:, block, d * i : d * (i + 1)] for i in range(4))
+                cond = torch.cat([cond, a1], dim=2)
+            x_cond = F.linear(cond, self.I.weight[:, 1:], self.I.bias)
+            gi1_cond = F.linear(x_cond, self.rnn1.weight_ih_l0, self.rnn1.bias_ih_l0)
+            if use_aux:
+                gi2_cond = F.linear(a2, self.rnn2.weight_ih_l0[:, rnn_dims:], self.rnn2.bias_ih_l0)
+                fc1_cond = F.linear(a3, self.fc1.weight[:, rnn_dims:], self.fc1.bias)
+                fc2_cond = F.linear(a4, self.fc2.weight[:, self.args.fc_dims :], self.fc2.bias)
+            else:
+                gi2_cond = self.rnn2.bias_ih_l0.expand(b_size, x_cond.size(1), -1)
+                fc1_cond = self.fc1.bias.expand(b_size, x_cond.size(1), -1)
+                fc2_cond = self.fc2.bias.expand(b_size, x_cond.size(1), -1)
+            noise = self._sampling_noise(b_size, x_cond.size(1), mels)
+
+            for t in range(x_cond.size(1)):
+                torch.addcmul(x_cond[:, t], sample, w_in_sample, out=x)
+                torch.addcmul(gi1_cond[:, t], sample, w_ih1_sample, out=gi)
+                self._gru_step(gi, h1, w_hh1, self.rnn1.bias_hh_l0, gh, rz, n)
+                x.add_(h1)
+                torch.addmm(gi2_cond[:, t], x, w_ih2, out=gi)
+                self._gru_step(gi, h2, w_hh2, self.rnn2.bias_hh_l0, gh, rz, n)
+                x.add_(h2)
+                torch.addmm(fc1_cond[:, t], x, w_fc1, out=fc1_out).relu_()
+                torch.addmm(fc2_cond[:, t], fc1_out, w_fc2, out=fc2_out).relu_()
+                torch.addmm(self.fc3.bias, fc2_out, w_fc3, out=logits)
+                sample = self._sample(logits, [values[:, t] for values in noise])
+                output[:, block_start + t] = sample[:, 0]
         return output
 
-    def gen_display(self, i, seq_len, b_size, start):
-        gen_rate = (i + 1) / (time.time() - start) * b_size / 1000
-        realtime_ratio = gen_rate * 1000 / self.config.audio.sample_rate
-        stream(
-            "%i/%i -- batch_size: %i -- gen_rate: %.1f kHz -- x_realtime: %.1f  ",
-            (i * b_size, seq_len * b_size, b_size, gen_rate, realtime_ratio),
-        )
+    @staticmethod
+    def _gru_step(gi, h, w_hh, b_hh, gh, rz, n):
+        """Update the GRU state `h` in place. `gi` is the input projection of the step."""
+        dims = h.size(1)
+        torch.addmm(b_hh, h, w_hh, out=gh)
+        torch.add(gi[:, : 2 * dims], gh[:, : 2 * dims], out=rz).sigmoid_()
+        torch.addcmul(gi[:, 2 * dims :], rz[:, :dims], gh[:, 2 * dims :], out=n).tanh_()
+        # h = n + z * (h - n)
+        h.sub_(n).mul_(rz[:, dims:]).add_(n)
+
+    def _sampling_noise(self, b_size, num_steps, like):
+        """Draw the random numbers used by `_sample()` for `num_steps` steps."""
+        if isinstance(self.args.mode, int):
+            # Gumbel noise, the argmax of the noisy logits is a sample of the softmax
+            u = like.new_empty(b_size, num_steps, self.n_classes).uniform_(1e-5, 1.0 - 1e-5)
+            return [-torch.log(-torch.log(u))]
+        if self.args.mode == "mold":
+            u = like.new_empty(b_size, num_steps, self.n_classes // 3).uniform_(1e-5, 1.0 - 1e-5)
+            v = like.new_empty(b_size, num_steps).uniform_(1e-5, 1.0 - 1e-5)
+            return [-torch.log(-torch.log(u)), torch.log(v) - torch.log(1.0 - v)]
+        return [like.new_empty(b_size, num_steps).normal_()]
+
+    def _sample(self, logits, noise):
+        """Sample from the output distribution with the noise of the step.
+
+        It draws from the same distributions as `TTS.vocoder.utils.distribution.sample_from_*()`.
+        """
+        if isinstance(self.args.mode, int):
+            sample = torch.argmax(logits + noise[0], dim=1, keepdim=True)
+            return 2 * sample.float() / (self.n_classes - 1.0) - 1.0
+        if self.args.mode == "mold":
+            nr_mix = self.n_classes // 3
+            idx = torch.argmax(logits[:, :nr_mix] + noise[0], dim=1, keepdim=True)
+            means = torch.gather(logits[:, nr_mix : 2 * nr_mix], 1, idx)
+            log_scales = torch.gather(logits[:, 2 * nr_mix :], 1, idx).clamp_(min=float(np.log(1e-14)))
+            return torch.addcmul(means, log_scales.exp_(), noise[1][:, None]).clamp_(-1.0, 1.0)
+        log_std = logits[:, 1:].clamp(min=-7.0)
+        return torch.addcmul(logits[:, :1], log_std.exp_(), noise[0][:, None]).clamp_(-1.0, 1.0)
 
     def fold_with_overlap(self, x, target, overlap):
         """Fold the tensor with overlap for quick batched inference.
@@ -462,15 +567,6 @@ class Wavernn(BaseVocoder):
 
         return folded
 
-    @staticmethod
-    def get_gru_cell(gru):
-        gru_cell = nn.GRUCell(gru.input_size, gru.hidden_size)
-        gru_cell.weight_hh.data = gru.weight_hh_l0.data
-        gru_cell.weight_ih.data = gru.weight_ih_l0.data
-        gru_cell.bias_hh.data = gru.bias_hh_l0.data
-        gru_cell.bias_ih.data = gru.bias_ih_l0.data
-        return gru_cell
-
     @staticmethod
     def pad_tensor(x, pad, side="both"):
         # NB - this is just a quick method i need right now
@@ -511,20 +607,7 @@ class Wavernn(BaseVocoder):
         num_folds, length = y.shape
         target = length - 2 * overlap
         total_len = num_folds * (target + overlap) + overlap
-
-        # Need some silence for the rnn warmup
-        silence_len = overlap // 2
-        fade_len = overlap - silence_len
-        silence = np.zeros((silence_len), dtype=np.float64)
-
-        # Equal power crossfade
-        t = np.linspace(-1, 1, fade_len, dtype=np.float64)
-        fade_in = np.sqrt(0.5 * (1 + t))
-        fade_out = np.sqrt(0.5 * (1 - t))
-
-        # Concat the silence to the fades
-        fade_in = np.concatenate([silence, fade_in])
-        fade_out = np.concatenate([fade_out, silence])
+        fade_in, fade_out = Wavernn._get_xfade_windows(overlap)
 
         # Apply the gain to the overlap samples
         y[:, :overlap] *= fade_in
@@ -540,6 +623,23 @@ class Wavernn(BaseVocoder):
 
         return unfolded
 
+    @staticmethod
+    def _get_xfade_windows(overlap):
+        # Need some silence for the rnn warmup
+        silence_len = overlap // 2
+        fade_len = overlap - silence_len
+        silence = np.zeros((silence_len), dtype=np.float64)
+
+        # Equal power crossfade
+        t = np.linspace(-1, 1, fade_len, dtype=np.float64)
+        fade_in = np.sqrt(0.5 * (1 + t))
+        fade_out = np.sqrt(0.5 * (1 - t))
+
+        # Concat the silence to the fades
+        fade_in = np.concatenate([silence, fade_in])
+        fade_out = np.concatenate([fade_out, silence])
+        return fade_in, fade_out
+
     def load_checkpoint(
         self, config, checkpoint_path, eval=False, cache=False
     ):  # pylint: disable=unused-argument, redefined-builtin
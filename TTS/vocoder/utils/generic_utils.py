@@ -1,11 +1,10 @@
-from typing import Dict
+from typing import TYPE_CHECKING, Dict
 
 import numpy as np
 import torch
-from matplotlib import pyplot as plt
 
-from TTS.tts.utils.visual import plot_spectrogram
-from TTS.utils.audio import AudioProcessor
+if TYPE_CHECKING:
+    from TTS.utils.audio import AudioProcessor
 
 
 def interpolate_vocoder_input(scale_factor, spec):
@@ -29,7 +28,7 @@ def interpolate_vocoder_input(scale_factor, spec):
     return spec
 
 
-def plot_results(y_hat: torch.tensor, y: torch.tensor, ap: AudioProcessor, name_prefix: str = None) -> Dict:
+def plot_results(y_hat: torch.tensor, y: torch.tensor, ap: "AudioProcessor", name_prefix: str = None) -> Dict:
     """Plot the predicted and the real waveform and their spectrograms.
 
     Args:
@@ -41,6 +40,11 @@ def plot_results(y_hat: torch.tensor, y: torch.tensor, ap: AudioProcessor, name_
     Returns:
         Dict: output figures keyed by the name of the figures.
     """ """Plot vocoder model results"""
+    # matplotlib is only needed for training logs, keep it out of the inference imports
+    from matplotlib import pyplot as plt  # pylint: disable=import-outside-toplevel
+
+    from TTS.tts.utils.visual import plot_spectrogram  # pylint: disable=import-outside-toplevel
+
     if name_prefix is None:
         name_prefix = ""
 
@@ -0,0 +1,213 @@
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, Tuple
+
+import fsspec
+import numpy as np
+import torch
+from tqdm import tqdm
+
+from TTS.utils.audio import AudioProcessor
+
+
+def get_checkpoint_hash(checkpoint_path: str) -> str:
+    """Return the MD5 hash of a checkpoint file."""
+    md5 = hashlib.md5()
+    with fsspec.open(checkpoint_path, "rb") as f:
+        for block in iter(lambda: f.read(2**20), b""):
+            md5.update(block)
+    return md5.hexdigest()
+
+
+def get_checkpoint_stat(checkpoint_path: str) -> Dict:
+    """Return the size and the modification time of a checkpoint file."""
+    stat = os.stat(checkpoint_path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+
+class NoiseScheduleCache:
+    """Noise schedules searched for a WaveGrad checkpoint with their measured error and real-time factor.
+
+    It keeps the schedule with the lowest error for each number of inference iterations. The cache is stored in a
+    JSON file next to the checkpoint with the hash, the size and the modification time of the checkpoint, so the
+    schedules of a different checkpoint are not used by mistake. The checkpoint is only hashed again when its size or
+    modification time changes.
+
+    Args:
+        checkpoint_hash (str): hash of the checkpoint the schedules are searched for. Defaults to None.
+        schedules (List[Dict]): schedules with the keys `num_steps`, `beta`, `error` and `rtf`. Defaults to None.
+        checkpoint_stat (Dict): size and modification time of the checkpoint. Defaults to None.
+
+    Example:
+        >>> cache = search_noise_schedules(model, mels, lengths, ap, num_steps=[6, 12, 25])
+        >>> cache.save(NoiseScheduleCache.get_path(checkpoint_path))
+        >>> cache.select(max_rtf=0.5)["num_steps"]
+    """
+
+    def __init__(self, checkpoint_hash: str = None, schedules: List[Dict] = None, checkpoint_stat: Dict = None):
+        self.checkpoint_hash = checkpoint_hash
+        self.checkpoint_stat = checkpoint_stat
+        self.schedules = {}
+        for schedule in schedules or []:
+            self.add(schedule["beta"], schedule["error"], schedule["rtf"])
+
+    def __len__(self):
+        return len(self.schedules)
+
+    @staticmethod
+    def get_path(checkpoint_path: str) -> str:
+        """Return the path of the cache of a checkpoint."""
+        return os.path.splitext(checkpoint_path)[0] + "_noise_schedules.json"
+
+    @classmethod
+    def load(cls, path: str) -> "NoiseScheduleCache":
+        with fsspec.open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["checkpoint_hash"], data["schedules"], data.get("checkpoint_stat", None))
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint_path: str) -> "NoiseScheduleCache":
+        """Create an empty cache for a checkpoint."""
+        return cls(get_checkpoint_hash(checkpoint_path), checkpoint_stat=get_checkpoint_stat(checkpoint_path))
+
+    def is_for_checkpoint(self, checkpoint_path: str) -> bool:
+        """Check if the schedules were searched for this checkpoint.
+
+        The checkpoint is only hashed if its size or modification time is not the one recorded in the cache.
+        """
+        if self.checkpoint_stat is not None and self.checkpoint_stat == get_checkpoint_stat(checkpoint_path):
+            return True
+        return self.checkpoint_hash == get_checkpoint_hash(checkpoint_path)
+
+    def save(self, path: str) -> None:
+        data = {
+            "checkpoint_hash": self.checkpoint_hash,
+            "checkpoint_stat": self.checkpoint_stat,
+            "schedules": [self.schedules[n] for n in sorted(self.schedules)],
+        }
+        with fsspec.open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+
+    def add(self, beta: np.ndarray, error: float, rtf: float) -> bool:
+        """Add a schedule if it is better than the cached one with the same number of steps.
+
+        Returns:
+            bool: True if the schedule is added.
+        """
+        num_steps = len(beta)
+        if num_steps in self.schedules and self.schedules[num_steps]["error"] <= error:
+            return False
+        self.schedules[num_steps] = {
+            "num_steps": num_steps,
+            "beta": [float(b) for b in beta],
+            "error": float(error),
+            "rtf": float(rtf),
+        }
+        return True
+
+    def select(self, max_rtf: float = None, num_steps: int = None) -> Dict:
+        """Pick a schedule.
+
+        Args:
+            max_rtf (float): pick the schedule with the lowest error among the ones with a lower real-time factor. If
+                none is fast enough, the fastest one. Defaults to None.
+            num_steps (int): pick the schedule with this number of steps. Defaults to None.
+
+        Returns:
+            Dict: the schedule. With no argument, the one with the lowest error.
+        """
+        if not self.schedules:
+            raise RuntimeError(" [!] The noise schedule cache is empty.")
+        if num_steps is not None:
+            if num_steps not in self.schedules:
+                raise KeyError(f" [!] No noise schedule with {num_steps} steps, cached: {sorted(self.schedules)}.")
+            return self.schedules[num_steps]
+        schedules = list(self.schedules.values())
+        if max_rtf is not None:
+            fast_schedules = [schedule for schedule in schedules if schedule["rtf"] <= max_rtf]
+            if not fast_schedules:
+                schedule = min(schedules, key=lambda schedule: schedule["rtf"])
+                print(f" [!] No noise schedule runs under RTF {max_rtf}, using the fastest one: {schedule['rtf']:.3f}")
+                return schedule
+            schedules = fast_schedules
+        return min(schedules, key=lambda schedule: schedule["error"])
+
+
+def get_candidate_schedules(num_steps: int, search_depth: int = 5) -> List[np.ndarray]:
+    """Return geometric noise schedules for a grid of `search_depth` first and `search_depth` last values."""
+    min_vals = np.logspace(-6, -3, search_depth)
+    max_vals = np.logspace(-2, np.log10(0.8), search_depth)
+    return [np.geomspace(min_val, max_val, num_steps) for min_val in min_vals for max_val in max_vals]
+
+
+@torch.no_grad()
+def evaluate_noise_schedule(
+    model: "Wavegrad", beta: np.ndarray, mels: torch.Tensor, lengths: torch.Tensor, ap: AudioProcessor, seed: int = 0
+) -> Tuple[float, float]:
+    """Vocode a batch with a noise schedule and measure the error of the melspectrograms of the outputs.
+
+    The initial noise is drawn from `seed`, so every schedule starts from the same noise.
+
+    Args:
+        model (Wavegrad): WaveGrad model.
+        beta (np.ndarray): noise schedule.
+        mels (torch.Tensor): padded melspectrograms. Shape :math:`[B, C, T]`.
+        lengths (torch.Tensor): number of frames of the melspectrograms. Shape :math:`[B]`.
+        ap (AudioProcessor): audio processor computing the melspectrograms.
+        seed (int): random seed of the noise. Defaults to 0.
+
+    Returns:
+        Tuple[float, float]: mean squared error of the melspectrograms and real-time factor.
+    """
+    model.compute_noise_level(beta)
+    devices = [mels.device] if mels.is_cuda else []
+    with torch.random.fork_rng(devices=devices):
+        torch.manual_seed(seed)
+        start_time = time.time()
+        wavs = model.inference(mels, lengths=lengths)
+        if mels.is_cuda:
+            torch.cuda.synchronize()
+        process_time = time.time() - start_time
+    wavs = wavs.cpu().numpy()
+    error = 0.0
+    for idx, length in enumerate(lengths.tolist()):
+        mel_hat = ap.melspectrogram(wavs[idx, 0, : length * ap.hop_length])[:, :-1]
+        error += np.sum((mels[idx, :, :length].cpu().numpy() - mel_hat) ** 2)
+    num_frames = int(lengths.sum())
+    rtf = process_time / (num_frames * ap.hop_length / ap.sample_rate)
+    return error / (num_frames * mels.shape[1]), rtf
+
+
+def search_noise_schedules(
+    model: "Wavegrad",
+    mels: torch.Tensor,
+    lengths: torch.Tensor,
+    ap: AudioProcessor,
+    num_steps: List[int] = (6, 12, 25),
+    search_depth: int = 5,
+    cache: NoiseScheduleCache = None,
+) -> NoiseScheduleCache:
+    """Search the best noise schedule for each number of steps on a batch of melspectrograms.
+
+    Args:
+        model (Wavegrad): WaveGrad model.
+        mels (torch.Tensor): padded melspectrograms. Shape :math:`[B, C, T]`.
+        lengths (torch.Tensor): number of frames of the melspectrograms. Shape :math:`[B]`.
+        ap (AudioProcessor): audio processor computing the melspectrograms.
+        num_steps (List[int]): numbers of steps to search schedules for. Defaults to (6, 12, 25).
+        search_depth (int): size of each dimension of the grid of candidates. Defaults to 5.
+        cache (NoiseScheduleCache): cache updated with the better schedules. Defaults to a new cache.
+
+    Returns:
+        NoiseScheduleCache: the cache with the best schedules.
+    """
+    if cache is None:
+        cache = NoiseScheduleCache()
+    for n in num_steps:
+        for beta in tqdm(get_candidate_schedules(n, search_depth), desc=f" > {n} steps"):
+            error, rtf = evaluate_noise_schedule(model, beta, mels, lengths, ap)
+            if cache.add(beta, error, rtf):
+                print(f" > Found a better schedule for {n} steps - MSE: {error:.5f} - RTF: {rtf:.3f}")
+    return cache
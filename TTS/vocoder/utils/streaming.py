@@ -0,0 +1,162 @@
+from typing import Iterator
+
+import torch
+from torch import nn
+
+
+@torch.no_grad()
+def measure_receptive_field(generator: nn.Module, num_channels: int, max_frames: int = 1024) -> int:
+    """Measure how many input frames on each side of a frame change the output samples of that frame.
+
+    It perturbs the center frame of a random input and looks for the furthest output sample that changes. The size
+    of the input doubles until the changes do not reach its edges.
+
+    Args:
+        generator (nn.Module): generator implementing `_inference_forward()`.
+        num_channels (int): number of input channels.
+        max_frames (int): largest input size tried. Defaults to 1024.
+
+    Returns:
+        int: one-sided receptive field in frames.
+    """
+    param = next(generator.parameters())
+    num_frames = 32
+    while True:
+        x = torch.randn(1, num_channels, 2 * num_frames + 1, device=param.device, dtype=param.dtype)
+        y = generator._inference_forward(x)  # pylint: disable=protected-access
+        x[:, :, num_frames] += 1.0
+        changed = (generator._inference_forward(x) != y).any(dim=1)[0]  # pylint: disable=protected-access
+        hop_length = y.shape[-1] // x.shape[-1]
+        changed_frames = torch.nonzero(changed).squeeze(1) // hop_length
+        if len(changed_frames) == 0:
+            return 0
+        reach = max(num_frames - int(changed_frames.min()), int(changed_frames.max()) - num_frames)
+        if reach < num_frames - 1 or 2 * num_frames > max_frames:
+            return reach
+        num_frames *= 2
+
+
+class StreamingVocoder:
+    """Vocode a melspectrogram chunk by chunk as its frames come in.
+
+    The frames are vocoded in chunks of `chunk_size` frames with `context_size` frames of the neighbouring chunks on
+    each side. The samples of the context frames are dropped, so if the context covers the receptive field of the
+    generator, the output is the same as `generator.inference()` on the whole melspectrogram, up to floating point
+    differences. Only the frames of the current chunk and its context are kept, so the memory use and the latency of
+    the first samples do not depend on the length of the input.
+
+    The generator needs to implement `_inference_forward()`, the forward pass of `inference()` without the input
+    padding. The HiFiGAN and MelGAN generators do.
+
+    Args:
+        generator (nn.Module): vocoder generator.
+        chunk_size (int): number of frames vocoded at once. Defaults to 32.
+        context_size (int): number of context frames on each side of a chunk. Defaults to the receptive field
+            measured by :func:`measure_receptive_field`.
+
+    Example:
+        >>> vocoder = StreamingVocoder(model.model_g, chunk_size=16)
+        >>> for frames in tts_frames:
+        >>>     play(vocoder.push(frames))
+        >>> play(vocoder.flush())
+    """
+
+    def __init__(self, generator: nn.Module, chunk_size: int = 32, context_size: int = None):
+        if chunk_size < 1:
+            raise ValueError(f" [!] `chunk_size` must be a positive number, got {chunk_size}.")
+        self.generator = generator
+        self.chunk_size = chunk_size
+        self.context_size = context_size
+        self.padding = getattr(generator, "inference_padding", 0)
+        self.hop_length = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop the buffered frames to start a new utterance."""
+        self._frames = None  # padded input frames from `_start - context_size` on
+        self._offset = 0  # index of the first buffered frame in the padded input
+        self._start = 0  # index of the first frame not vocoded yet
+
+    def _setup(self, frames: torch.Tensor) -> None:
+        if self.context_size is None:
+            self.context_size = measure_receptive_field(self.generator, frames.shape[1])
+        if self.hop_length is None:
+            x = frames.new_zeros(1, frames.shape[1], 16)
+            self.hop_length = self.generator._inference_forward(x).shape[-1] // 16  # pylint: disable=protected-access
+
+    def _vocode(self, end: int, last: bool) -> torch.Tensor:
+        """Vocode the buffered frames up to `end`, in chunks with their context."""
+        outputs = []
+        num_frames = self._offset + self._frames.shape[-1]
+        while self._start < end:
+            chunk_end = min(self._start + self.chunk_size, end)
+            if not last and chunk_end - self._start < self.chunk_size:
+                # wait for a full chunk
+                break
+            context_start = max(self._start - self.context_size, self._offset)
+            context_end = min(chunk_end + self.context_size, num_frames)
+            x = self._frames[:, :, context_start - self._offset : context_end - self._offset]
+            y = self.generator._inference_forward(x)  # pylint: disable=protected-access
+            left = (self._start - context_start) * self.hop_length
+            outputs.append(y[..., left : left + (chunk_end - self._start) * self.hop_length])
+            self._start = chunk_end
+        # keep the left context of the next chunk
+        drop = max(self._start - self.context_size - self._offset, 0)
+        self._frames = self._frames[:, :, drop:]
+        self._offset += drop
+        if not outputs:
+            return self._frames.new_zeros(self._frames.shape[0], 1, 0)
+        return torch.cat(outputs, dim=-1)
+
+    @torch.no_grad()
+    def push(self, frames: torch.Tensor) -> torch.Tensor:
+        """Add new frames and return the samples that are ready.
+
+        Args:
+            frames (Tensor): next frames of the melspectrogram. Shape :math:`[B, C, T]`.
+
+        Returns:
+            Tensor: next samples of the waveform. Shape :math:`[B, 1, T_{wav}]`, :math:`T_{wav}` may be 0.
+        """
+        frames = frames.to(next(self.generator.parameters()).device)
+        if self._frames is None:
+            self._setup(frames)
+            # the same padding as `inference()`
+            frames = torch.nn.functional.pad(frames, (self.padding, 0), "replicate")
+            self._frames = frames
+        else:
+            self._frames = torch.cat([self._frames, frames], dim=-1)
+        # a chunk is vocoded once its right context is available
+        return self._vocode(self._offset + self._frames.shape[-1] - self.context_size, last=False)
+
+    @torch.no_grad()
+    def flush(self) -> torch.Tensor:
+        """Vocode the remaining frames at the end of the input and reset the vocoder.
+
+        Returns:
+            Tensor: last samples of the waveform. Shape :math:`[B, 1, T_{wav}]`.
+        """
+        if self._frames is None:
+            raise RuntimeError(" [!] No frames were pushed to the streaming vocoder.")
+        self._frames = torch.nn.functional.pad(self._frames, (0, self.padding), "replicate")
+        output = self._vocode(self._offset + self._frames.shape[-1], last=True)
+        self.reset()
+        return output
+
+    def stream(self, mel: torch.Tensor, frames_per_push: int = None) -> Iterator[torch.Tensor]:
+        """Vocode a whole melspectrogram and yield the waveform chunk by chunk.
+
+        Args:
+            mel (Tensor): melspectrogram. Shape :math:`[B, C, T]`.
+            frames_per_push (int): number of frames pushed at once. Defaults to `chunk_size`.
+
+        Yields:
+            Tensor: consecutive parts of the waveform. Shape :math:`[B, 1, T_{wav}]`.
+        """
+        frames_per_push = frames_per_push or self.chunk_size
+        self.reset()
+        for idx in range(0, mel.shape[-1], frames_per_push):
+            output = self.push(mel[:, :, idx : idx + frames_per_push])
+            if output.shape[-1] > 0:
+                yield output
+        yield self.flush()
@@ -188,3 +188,24 @@ class TestAudio(unittest.TestCase):
         pitch = ap.compute_f0(wav)
         mel = ap.melspectrogram(wav)
         assert pitch.shape[0] == mel.shape[1]
+
+    def test_inv_spectrogram_batch(self):
+        # the fast Griffin-Lim is opt-in, so existing configs keep the plain algorithm
+        self.assertEqual(AudioProcessor(**conf).griffin_lim_momentum, 0.0)
+        for momentum in [0.0, 0.99]:
+            fast_conf = conf.copy()
+            fast_conf.griffin_lim_momentum = momentum
+            ap = AudioProcessor(**fast_conf)
+            wav = ap.load_wav(WAV_FILE)
+            mels = [ap.melspectrogram(wav), ap.melspectrogram(wav[: len(wav) // 2])]
+            wavs = ap.inv_spectrogram_batch(mels)
+            for mel, wav_ in zip(mels, wavs):
+                self.assertEqual(len(wav_), (mel.shape[1] - 1) * ap.hop_length)
+                # the batched reconstruction is as close to the input as the one of the numpy Griffin-Lim
+                error = abs(ap.denormalize(ap.melspectrogram(wav_)) - ap.denormalize(mel)).mean()
+                reference_error = abs(
+                    ap.denormalize(ap.melspectrogram(ap.inv_melspectrogram(mel))) - ap.denormalize(mel)
+                )
+                self.assertLess(error, reference_error.mean() + 1.0)
+        linear = ap.spectrogram(wav)
+        self.assertEqual(len(ap.inv_spectrogram_batch([linear], mel=False)[0]), (linear.shape[1] - 1) * ap.hop_length)
@@ -0,0 +1,59 @@
+import json
+import os
+import unittest
+
+from trainer.io import save_checkpoint
+
+from tests import get_tests_data_path, get_tests_input_path, get_tests_output_path
+from TTS.bin.compute_embeddings import compute_embeddings
+from TTS.config import load_config
+from TTS.encoder.utils.generic_utils import setup_encoder_model
+from TTS.tts.utils.managers import load_file
+
+encoder_config_path = os.path.join(get_tests_input_path(), "test_speaker_encoder_config.json")
+
+
+class TestComputeEmbeddings(unittest.TestCase):
+    def setUp(self):
+        self.output_path = os.path.join(get_tests_output_path(), "compute_embeddings")
+        os.makedirs(self.output_path, exist_ok=True)
+        config = load_config(encoder_config_path)
+        save_checkpoint(config, setup_encoder_model(config), None, None, 0, 0, self.output_path)
+        self.model_path = os.path.join(self.output_path, "checkpoint_0.pth")
+
+    def _compute(self, output_file):
+        compute_embeddings(
+            self.model_path,
+            encoder_config_path,
+            output_file,
+            formatter_name="ljspeech",
+            dataset_name="ljspeech",
+            dataset_path=os.path.join(get_tests_data_path(), "ljspeech"),
+            meta_file_train="metadata.csv",
+            disable_cuda=True,
+            no_eval=True,
+            batch_size=3,
+        )
+        self.assertFalse(os.path.exists(output_file + ".partial.jsonl"))
+        return load_file(output_file)
+
+    def test_resume(self):
+        output_file = os.path.join(self.output_path, "speakers.json")
+        embeddings = self._compute(output_file)
+        self.assertEqual(len(embeddings), 8)
+        self.assertTrue(all(len(item["embedding"]) == 256 for item in embeddings.values()))
+
+        # an interrupted run left one embedding and a cut line behind
+        key = list(embeddings.keys())[0]
+        with open(output_file + ".partial.jsonl", "w", encoding="utf-8") as f:
+            f.write(json.dumps({"audio_unique_name": key, "embedding": [0.0] * 256}) + "\n")
+            f.write('{"audio_unique_name": "ljspeech#wa')
+        resumed_embeddings = self._compute(output_file)
+        self.assertEqual(list(resumed_embeddings.keys()), list(embeddings.keys()))
+        self.assertEqual(resumed_embeddings[key]["embedding"], [0.0] * 256)
+        for other_key in list(embeddings.keys())[1:]:
+            self.assertEqual(resumed_embeddings[other_key]["name"], embeddings[other_key]["name"])
+            for value, other_value in zip(
+                resumed_embeddings[other_key]["embedding"], embeddings[other_key]["embedding"]
+            ):
+                self.assertAlmostEqual(value, other_value, places=5)
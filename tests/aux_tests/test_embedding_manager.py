@@ -5,7 +5,7 @@ import numpy as np
 import torch
 from trainer.io import save_checkpoint
 
-from tests import get_tests_input_path
+from tests import get_tests_input_path, get_tests_output_path
 from TTS.config import load_config
 from TTS.encoder.utils.generic_utils import setup_encoder_model
 from TTS.tts.utils.managers import EmbeddingManager
@@ -18,6 +18,7 @@ sample_wav_path2 = os.path.join(get_tests_input_path(), "../data/ljspeech/wavs/L
 embedding_file_path = os.path.join(get_tests_input_path(), "../data/dummy_speakers.json")
 embeddings_file_path2 = os.path.join(get_tests_input_path(), "../data/dummy_speakers2.json")
 embeddings_file_pth_path = os.path.join(get_tests_input_path(), "../data/dummy_speakers.pth")
+ljspeech_wavs_path = os.path.join(get_tests_input_path(), "../data/ljspeech/wavs/")
 
 
 class EmbeddingManagerTest(unittest.TestCase):
@@ -90,3 +91,68 @@ class EmbeddingManagerTest(unittest.TestCase):
         manager = EmbeddingManager(embedding_file_path=[embeddings_file_pth_path, embeddings_file_path2])
         self.assertEqual(manager.embedding_dim, 256)
         self.assertEqual(manager.num_embeddings, 384 * 2)
+
+    def test_compute_embeddings_from_clips(self):
+        config = load_config(encoder_config_path)
+        config.audio.resample = True
+        config.model_params = {"model_name": "resnet", "input_dim": 40, "proj_dim": 256, "use_torch_spec": True}
+        model = setup_encoder_model(config)
+        output_path = os.path.join(get_tests_output_path(), "embedding_manager")
+        os.makedirs(output_path, exist_ok=True)
+        save_checkpoint(config, model, None, None, 0, 0, output_path)
+        config_path = os.path.join(output_path, "config.json")
+        config.save_json(config_path)
+        manager = EmbeddingManager(
+            encoder_model_path=os.path.join(output_path, "checkpoint_0.pth"), encoder_config_path=config_path
+        )
+
+        # clips shorter than the encoder window are batched separately
+        wav_files = [os.path.join(ljspeech_wavs_path, f"LJ001-000{idx}.wav") for idx in range(1, 10)]
+        for num_workers, max_pending_clips in [(0, None), (2, None), (0, 2)]:
+            embeddings = manager.compute_embeddings_from_clips(
+                wav_files, batch_size=3, num_workers=num_workers, max_pending_clips=max_pending_clips
+            )
+            embeddings = dict(embeddings)
+            self.assertEqual(sorted(embeddings.keys()), list(range(len(wav_files))))
+            for idx, wav_file in enumerate(wav_files):
+                embedding = torch.FloatTensor(manager.compute_embedding_from_clip(wav_file))
+                torch.testing.assert_close(torch.FloatTensor(embeddings[idx]), embedding, rtol=1e-4, atol=1e-5)
+
+    def test_embedding_index(self):
+        manager = EmbeddingManager(embedding_file_path=embeddings_file_pth_path)
+        name = manager.embedding_names[0]
+        clip_id = manager.clip_ids[0]
+        expected_mean = np.stack(manager.get_embeddings_by_name(name)).mean(0)
+        np.testing.assert_allclose(manager.get_mean_embedding(name), expected_mean, rtol=1e-5, atol=1e-6)
+
+        # the closest clip to a clip embedding is itself
+        embedding = manager.get_embedding_by_clip(clip_id)
+        (closest_clip, similarity), *_ = manager.search_embeddings(embedding, k=3, by="clip")
+        self.assertEqual(closest_clip, clip_id)
+        self.assertAlmostEqual(similarity, 1.0, places=5)
+        results = manager.search_embeddings(np.stack([embedding, embedding]), k=2, by="clip")
+        self.assertEqual(len(results), 2)
+        self.assertEqual(len(results[0]), 2)
+        self.assertGreaterEqual(results[0][0][1], results[0][1][1])
+        self.assertEqual(manager.search_embeddings(embedding, k=2, by="name")[0][0], name)
+
+        # memory-mapped index file
+        index_path = os.path.join(get_tests_output_path(), "dummy_speakers.npy")
+        manager.save_embeddings_to_file(index_path)
+        manager2 = EmbeddingManager(embedding_file_path=index_path)
+        self.assertIsInstance(manager2.embedding_index.embeddings, np.memmap)
+        self.assertEqual(sorted(manager2.clip_ids), sorted(manager.clip_ids))
+        self.assertEqual(manager2.embedding_names, manager.embedding_names)
+        np.testing.assert_allclose(manager2.get_embedding_by_clip(clip_id), embedding, rtol=1e-6)
+        np.testing.assert_allclose(manager2.get_mean_embedding(name), expected_mean, rtol=1e-5, atol=1e-6)
+        self.assertEqual(manager2.search_embeddings(embedding, by="clip")[0][0], clip_id)
+
+        # the index is not used after the embeddings change
+        new_embedding = np.ones_like(embedding)
+        manager2.embeddings["new_clip"] = {"name": name, "embedding": new_embedding}
+        manager2.embeddings_by_names[name].append(new_embedding)
+        expected_mean = np.stack(manager.get_embeddings_by_name(name) + [new_embedding]).mean(0)
+        np.testing.assert_allclose(manager2.get_mean_embedding(name), expected_mean, rtol=1e-5, atol=1e-6)
+        self.assertEqual(manager2.search_embeddings(new_embedding, by="clip")[0][0], "new_clip")
+        manager2.embeddings = {clip_id: manager.embeddings[clip_id]}
+        self.assertEqual(len(manager2.embedding_index), 1)
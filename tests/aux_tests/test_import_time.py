@@ -0,0 +1,18 @@
+import unittest
+
+from TTS.bin.benchmark_import_time import HEAVY_MODULES, get_import_times
+
+
+class TestImportTime(unittest.TestCase):
+    def test_api_import_is_lazy(self):
+        import_times = get_import_times("import TTS.api")
+        self.assertIn("TTS.api", import_times)
+        self.assertEqual([name for name in HEAVY_MODULES if name in import_times], [])
+
+    def test_phonemizers_are_lazy(self):
+        statement = "from TTS.tts.utils.text.phonemizers import ESpeak, get_phonemizer_by_name"
+        import_times = get_import_times(statement)
+        self.assertNotIn("gruut", import_times)
+        self.assertNotIn("pypinyin", import_times)
+        import_times = get_import_times(f"{statement}; get_phonemizer_by_name('gruut', language='en-us')")
+        self.assertIn("gruut", import_times)
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+import torch
+
+from TTS.utils.io import get_inference_checkpoint_path, load_fsspec, save_inference_checkpoint
+
+
+class TestInferenceCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.model = torch.nn.Sequential(torch.nn.Linear(4, 3), torch.nn.Linear(3, 4))
+        # tied weights
+        self.model[1].weight = torch.nn.Parameter(self.model[0].weight.T)
+        optimizer = torch.optim.Adam(self.model.parameters())
+        self.model(torch.rand(2, 4)).sum().backward()
+        optimizer.step()
+        self.state = {
+            "model": self.model.state_dict(),
+            "optimizer": optimizer.state_dict(),
+            "scaler": None,
+            "step": 10,
+            "config": {"model": "test", "r": 2},
+        }
+
+    def _check(self, state):
+        self.assertEqual(sorted(state.keys()), ["config", "model", "step"])
+        self.assertEqual(state["step"], 10)
+        self.assertEqual(state["config"]["r"], 2)
+        model = torch.nn.Sequential(torch.nn.Linear(4, 3), torch.nn.Linear(3, 4))
+        model.load_state_dict(state["model"])
+        for param, param_ref in zip(model.parameters(), self.model.parameters()):
+            self.assertTrue(torch.equal(param, param_ref))
+
+    def test_safetensors(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            checkpoint_path = os.path.join(tmp_dir, "model_file.pth")
+            torch.save(self.state, checkpoint_path)
+            self.assertEqual(get_inference_checkpoint_path(checkpoint_path), checkpoint_path)
+            save_inference_checkpoint(self.state, os.path.join(tmp_dir, "model_file.safetensors"))
+            inference_path = get_inference_checkpoint_path(checkpoint_path)
+            self.assertEqual(inference_path, os.path.join(tmp_dir, "model_file.safetensors"))
+            self._check(load_fsspec(inference_path, map_location="cpu"))
+            # a checkpoint saved after the conversion is newer than its inference checkpoint
+            stat = os.stat(inference_path)
+            os.utime(checkpoint_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+            self.assertEqual(get_inference_checkpoint_path(checkpoint_path), checkpoint_path)
+
+            # a state dict is stored as is
+            state_dict_path = os.path.join(tmp_dir, "state_dict.safetensors")
+            save_inference_checkpoint(self.state["model"], state_dict_path)
+            self.assertEqual(load_fsspec(state_dict_path).keys(), self.state["model"].keys())
+
+    def test_torch(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            checkpoint_path = os.path.join(tmp_dir, "model_inference.pth")
+            save_inference_checkpoint(self.state, checkpoint_path)
+            self._check(load_fsspec(checkpoint_path, map_location="cpu"))
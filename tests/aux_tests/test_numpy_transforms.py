@@ -1,6 +1,8 @@
+import io
 import math
 import os
 import unittest
+import wave
 from dataclasses import dataclass
 
 import librosa
@@ -104,3 +106,15 @@ class TestNumpyTransforms(unittest.TestCase):
         wav_resample = np_transforms.load_wav(filename=WAV_FILE, resample=True, sample_rate=16000)
         self.assertEqual(wav.shape, (self.sample_wav.shape[0],))
         self.assertNotEqual(wav_resample.shape, (self.sample_wav.shape[0],))
+
+    def test_wav_stream(self):
+        header = np_transforms.wav_stream_header(sample_rate=22050)
+        pcm = np_transforms.wav_to_pcm16(wav=self.sample_wav)
+        self.assertEqual(len(header), 44)
+        self.assertEqual(len(pcm), 2 * self.sample_wav.shape[0])
+        # players read the stream until it ends
+        with wave.open(io.BytesIO(header + pcm)) as wav_file:
+            self.assertEqual(wav_file.getframerate(), 22050)
+            self.assertEqual(wav_file.getsampwidth(), 2)
+            frames = np.frombuffer(wav_file.readframes(self.sample_wav.shape[0]), dtype="<i2")
+        self.assertEqual(frames.shape[0], self.sample_wav.shape[0])
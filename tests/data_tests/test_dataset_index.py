@@ -0,0 +1,64 @@
+import os
+import shutil
+import unittest
+from unittest import mock
+
+from tests import get_tests_data_path, get_tests_output_path
+from TTS.config.shared_configs import BaseDatasetConfig
+from TTS.tts.datasets import load_tts_samples
+from TTS.tts.datasets.dataset import get_audio_size
+from TTS.tts.datasets.dataset_index import DatasetIndex
+
+
+class TestDatasetIndex(unittest.TestCase):
+    def setUp(self):
+        self.output_path = os.path.join(get_tests_output_path(), "dataset_index")
+        shutil.rmtree(self.output_path, ignore_errors=True)
+        os.makedirs(self.output_path)
+        # a copy of the meta file to modify it
+        self.data_path = os.path.join(get_tests_data_path(), "ljspeech")
+        shutil.copy(os.path.join(self.data_path, "metadata_wav.csv"), self.output_path)
+        self.meta_file = os.path.join(self.output_path, "metadata_wav.csv")
+        self.dataset_config = BaseDatasetConfig(
+            formatter="coqui",
+            meta_file_train=self.meta_file,
+            path=self.data_path,
+            language="en",
+            index_path=os.path.join(self.output_path, "index.json"),
+        )
+
+    def test_load_tts_samples(self):
+        with mock.patch("TTS.tts.datasets.dataset.get_audio_size", side_effect=get_audio_size) as audio_size:
+            samples, _ = load_tts_samples(self.dataset_config, eval_split=False)
+            self.assertEqual(audio_size.call_count, len(samples))
+            self.assertTrue(os.path.exists(self.dataset_config.index_path))
+            for item in samples:
+                self.assertEqual(item["audio_length"], get_audio_size(item["audio_file"]))
+                self.assertEqual(item["text_length"], len(item["text"]))
+                self.assertEqual(item["language"], "en")
+
+            # the next runs read the index
+            audio_size.reset_mock()
+            with mock.patch("TTS.tts.datasets.coqui") as formatter:
+                indexed_samples, _ = load_tts_samples(self.dataset_config, eval_split=False)
+            formatter.assert_not_called()
+            audio_size.assert_not_called()
+            self.assertEqual(indexed_samples, samples)
+
+        # changing the meta file rebuilds its entry
+        with open(self.meta_file, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+        with open(self.meta_file, "w", encoding="utf-8") as f:
+            f.writelines(lines[:-1])
+        samples, _ = load_tts_samples(self.dataset_config, eval_split=False)
+        self.assertEqual(len(samples), len(indexed_samples) - 1)
+
+    def test_samples_are_copied(self):
+        samples, _ = load_tts_samples(self.dataset_config, eval_split=False)
+        index = DatasetIndex(self.dataset_config.index_path)
+        indexed_samples = index.get_samples("coqui", self.data_path, self.meta_file)
+        indexed_samples[0]["text"] = ""
+        del indexed_samples[1:]
+        self.assertEqual(len(index.get_samples("coqui", self.data_path, self.meta_file)), len(samples))
+        self.assertIsNone(index.get_samples("ljspeech", self.data_path, self.meta_file))
+        self.assertIsNone(index.get_samples("coqui", self.data_path, self.meta_file, ignored_speakers=["ljspeech"]))
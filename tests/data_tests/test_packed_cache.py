@@ -0,0 +1,76 @@
+import os
+import pickle
+import shutil
+import unittest
+
+import numpy as np
+
+from tests import get_tests_data_path, get_tests_output_path
+from TTS.tts.configs.shared_configs import BaseDatasetConfig, BaseTTSConfig
+from TTS.tts.datasets import load_tts_samples
+from TTS.tts.datasets.dataset import EnergyDataset, string2filename
+from TTS.tts.datasets.packed_cache import PackedArrayCache
+from TTS.utils.audio import AudioProcessor
+
+OUTPATH = os.path.join(get_tests_output_path(), "packed_cache_tests/")
+
+
+class TestPackedArrayCache(unittest.TestCase):
+    def setUp(self):
+        shutil.rmtree(OUTPATH, ignore_errors=True)
+        os.makedirs(OUTPATH)
+
+    def tearDown(self):
+        shutil.rmtree(OUTPATH, ignore_errors=True)
+
+    def test_put_get(self):
+        cache = PackedArrayCache(OUTPATH, "pitch", np.float32)
+        arrays = {f"key{idx}": np.random.rand(idx * 7).astype(np.float32) for idx in range(5)}
+        for key, array in arrays.items():
+            cache.put(key, array)
+        self.assertIsNone(cache.get("missing"))
+        for key, array in arrays.items():
+            np.testing.assert_array_equal(cache.get(key), array)
+        # a new instance, or another dataloader worker, reads the entries from the files
+        cache2 = pickle.loads(pickle.dumps(PackedArrayCache(OUTPATH, "pitch", np.float32)))
+        self.assertEqual(len(cache2), 5)
+        np.testing.assert_array_equal(cache2.get("key3"), arrays["key3"])
+        # new entries appended by the first instance are picked up after the data file was mapped
+        cache.put("key5", np.arange(4))
+        np.testing.assert_array_equal(cache2.get("key5"), np.arange(4, dtype=np.float32))
+        self.assertEqual(sorted(os.listdir(OUTPATH)), ["pitch.bin", "pitch.idx"])
+
+    def test_get_or_compute(self):
+        cache = PackedArrayCache(OUTPATH, "phonemes", np.int32)
+        np.save(os.path.join(OUTPATH, "legacy_phoneme.npy"), np.array([1, 2, 3]))
+        ids = cache.get_or_compute("legacy", lambda: [4], legacy_file=os.path.join(OUTPATH, "legacy_phoneme.npy"))
+        np.testing.assert_array_equal(ids, [1, 2, 3])
+        self.assertEqual(cache.get_or_compute("new", lambda: [4, 5]), [4, 5])
+        np.testing.assert_array_equal(cache.get_or_compute("new", lambda: [6]), [4, 5])
+        self.assertEqual(cache.keys(), ["legacy", "new"])
+
+    def test_import_files(self):
+        arrays = {f"key{idx}": np.random.rand(idx + 1).astype(np.float32) for idx in range(3)}
+        for key, array in arrays.items():
+            np.save(os.path.join(OUTPATH, f"{key}_energy.npy"), array)
+        cache = PackedArrayCache(OUTPATH, "energy", np.float32)
+        self.assertEqual(cache.import_files("_energy.npy", remove=True), 3)
+        for key, array in arrays.items():
+            np.testing.assert_array_equal(cache.get(key), array)
+        self.assertEqual(sorted(os.listdir(OUTPATH)), ["energy.bin", "energy.idx"])
+
+    def test_energy_dataset(self):
+        c = BaseTTSConfig()
+        dataset_config = BaseDatasetConfig(
+            formatter="ljspeech", meta_file_train="metadata.csv", path=os.path.join(get_tests_data_path(), "ljspeech")
+        )
+        samples, _ = load_tts_samples(dataset_config, eval_split=False)
+        samples = samples[:4]
+        ap = AudioProcessor(**c.audio)
+        cache_path = os.path.join(OUTPATH, "energy_cache")
+        dataset = EnergyDataset(samples, ap, cache_path=cache_path, normalize_energy=True)
+        self.assertEqual(sorted(os.listdir(cache_path)), ["energy.bin", "energy.idx", "energy_stats.npy"])
+        for idx, item in enumerate(samples):
+            energy = dataset.cache.get(string2filename(item["audio_unique_name"]))
+            np.testing.assert_allclose(energy, dataset._compute_and_save_energy(ap, item["audio_file"]), rtol=1e-6)
+            np.testing.assert_allclose(dataset[idx]["energy"], dataset.normalize(energy))
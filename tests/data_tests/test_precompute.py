@@ -0,0 +1,63 @@
+import os
+import shutil
+import unittest
+
+import numpy as np
+
+from tests import get_tests_data_path, get_tests_output_path
+from TTS.tts.configs.shared_configs import BaseDatasetConfig, BaseTTSConfig
+from TTS.tts.datasets import load_tts_samples
+from TTS.tts.datasets.dataset import EnergyDataset, string2filename
+from TTS.tts.datasets.precompute import RunningStats
+from TTS.utils.audio import AudioProcessor
+
+OUTPATH = os.path.join(get_tests_output_path(), "precompute_tests/")
+
+
+class TestRunningStats(unittest.TestCase):
+    def test_update_merge(self):
+        batches = [np.random.rand(length) * 100 + 50 for length in [10, 1, 0, 300, 57]]
+        stats = RunningStats()
+        for batch in batches[:3]:
+            stats.update(batch)
+        other = RunningStats()
+        for batch in batches[3:]:
+            other.update(batch)
+        stats.merge(other)
+        values = np.concatenate(batches)
+        self.assertEqual(stats.count, len(values))
+        self.assertAlmostEqual(stats.mean, np.mean(values))
+        self.assertAlmostEqual(stats.std, np.std(values))
+
+
+class TestPrecompute(unittest.TestCase):
+    def setUp(self):
+        shutil.rmtree(OUTPATH, ignore_errors=True)
+        dataset_config = BaseDatasetConfig(
+            formatter="ljspeech", meta_file_train="metadata.csv", path=os.path.join(get_tests_data_path(), "ljspeech")
+        )
+        self.samples, _ = load_tts_samples(dataset_config, eval_split=False)
+        self.ap = AudioProcessor(**BaseTTSConfig().audio)
+
+    def tearDown(self):
+        shutil.rmtree(OUTPATH, ignore_errors=True)
+
+    def test_parallel_precompute(self):
+        dataset = EnergyDataset(self.samples, self.ap, cache_path=OUTPATH, precompute_num_workers=2)
+        energies = [dataset._compute_and_save_energy(self.ap, item["audio_file"]) for item in self.samples]
+        mean, std = EnergyDataset.compute_energy_stats(energies)
+        self.assertAlmostEqual(dataset.mean, mean, places=4)
+        self.assertAlmostEqual(dataset.std, std, places=4)
+        self.assertEqual(len(dataset.cache), len(self.samples))
+
+    def test_resume(self):
+        # an interrupted run left the first samples in the cache and no stats
+        dataset = EnergyDataset(self.samples[:3], self.ap, cache_path=OUTPATH, normalize_energy=False)
+        self.assertEqual(len(dataset.cache), 3)
+        dataset = EnergyDataset(self.samples, self.ap, cache_path=OUTPATH, normalize_energy=False)
+        self.assertEqual(dataset.get_missing_indices(), [])
+        self.assertEqual(dataset.cache.keys(), [string2filename(item["audio_unique_name"]) for item in self.samples])
+        self.assertFalse(os.path.exists(os.path.join(OUTPATH, "energy_stats.npy")))
+        dataset = EnergyDataset(self.samples, self.ap, cache_path=OUTPATH)
+        self.assertTrue(os.path.exists(os.path.join(OUTPATH, "energy_stats.npy")))
+        self.assertEqual(len(dataset.cache), len(self.samples))
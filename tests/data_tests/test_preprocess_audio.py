@@ -0,0 +1,72 @@
+import json
+import os
+import shutil
+import unittest
+
+import soundfile as sf
+
+from tests import get_tests_data_path, get_tests_output_path
+from TTS.tts.configs.shared_configs import BaseDatasetConfig
+from TTS.tts.datasets import load_tts_samples
+from TTS.tts.datasets.preprocess import MANIFEST_NAME, add_manifest_lengths, load_manifest, preprocess_dataset
+
+
+class TestPreprocessAudio(unittest.TestCase):
+    def setUp(self):
+        self.input_dir = os.path.join(get_tests_data_path(), "ljspeech")
+        self.output_dir = os.path.join(get_tests_output_path(), "preprocess_audio")
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def _preprocess(self, **kwargs):
+        return preprocess_dataset(
+            self.input_dir,
+            self.output_dir,
+            audio_glob="wavs/LJ001-000[1-5].wav",
+            copy_globs=["metadata.csv"],
+            sample_rate=16000,
+            db_level=-27.0,
+            **kwargs,
+        )
+
+    def test_preprocess_dataset(self):
+        manifest = self._preprocess()
+        self.assertEqual(len(manifest), 5)
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, "metadata.csv")))
+        for output_path, record in manifest.items():
+            info = sf.info(output_path)
+            self.assertEqual(info.samplerate, 16000)
+            self.assertEqual(info.frames, record["num_samples"])
+            source_info = sf.info(os.path.join(self.input_dir, record["source_file"]))
+            self.assertAlmostEqual(record["duration"], source_info.duration, places=2)
+        self.assertEqual(load_manifest(self.output_dir), manifest)
+
+        # processed files are skipped, a cut manifest line is ignored
+        removed_path = sorted(manifest)[-1]
+        os.remove(removed_path)
+        with open(os.path.join(self.output_dir, MANIFEST_NAME), "a", encoding="utf-8") as f:
+            f.write('{"audio_file": "wavs/LJ0')
+        self._preprocess()
+        with open(os.path.join(self.output_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            lines = f.readlines()
+        self.assertTrue(os.path.exists(removed_path))
+        self.assertEqual(json.loads(lines[-1])["audio_file"], os.path.relpath(removed_path, self.output_dir))
+        self.assertEqual(load_manifest(self.output_dir), manifest)
+
+    def test_load_tts_samples_lengths(self):
+        manifest = self._preprocess(num_workers=2)
+        dataset_config = BaseDatasetConfig(
+            formatter="ljspeech", meta_file_train="metadata.csv", path=self.output_dir, language="en"
+        )
+        samples, _ = load_tts_samples(dataset_config, eval_split=False)
+        lengths = {item["audio_file"]: item.get("audio_length") for item in samples}
+        for output_path, record in manifest.items():
+            self.assertEqual(lengths[output_path], record["num_samples"])
+        # files that are not in the manifest have no length
+        self.assertEqual(sum(length is not None for length in lengths.values()), len(manifest))
+
+    def test_add_manifest_lengths(self):
+        manifest = {os.path.abspath("wavs/a.wav"): {"num_samples": 16000}}
+        samples = [{"audio_file": "wavs/a.wav"}, {"audio_file": "wavs/b.wav"}]
+        add_manifest_lengths(samples, manifest)
+        self.assertEqual(samples[0]["audio_length"], 16000)
+        self.assertNotIn("audio_length", samples[1])
@@ -0,0 +1,132 @@
+import asyncio
+import io
+import json
+import os
+import pickle
+import time
+import unittest
+import wave
+
+import numpy as np
+import torch
+from trainer.io import save_checkpoint
+
+from tests import get_tests_input_path
+from TTS.config import load_config
+from TTS.server.asgi import ModelWorkerPool, TTSApp
+from TTS.tts.models import setup_model
+from TTS.utils.audio.numpy_transforms import save_wav
+from TTS.utils.synthesizer import Synthesizer
+
+
+class DummySynthesizer:
+    """Synthesizer stand-in returning a waveform of `len(text)` samples, sleeping on texts starting with `slow`."""
+
+    def __init__(self):
+        self.tts_model = torch.nn.Linear(4, 4)
+        self.vocoder_model = None
+        self.output_sample_rate = 16000
+
+    def tts(self, text, speaker_name="", language_name="", style_wav=None):  # pylint: disable=unused-argument
+        if text.startswith("slow"):
+            time.sleep(1)
+        if text == "fail":
+            raise RuntimeError("synthesis failed")
+        return np.full(len(text), 0.5)
+
+    def save_wav(self, wav, path):
+        save_wav(wav=wav, path=path, sample_rate=self.output_sample_rate)
+
+
+async def request(app, path="/api/tts", query=b"", body=b"", headers=None, method="GET"):
+    scope = {"type": "http", "path": path, "method": method, "query_string": query, "headers": headers or []}
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    response = {}
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = dict(message["headers"])
+        else:
+            response["body"] = message["body"]
+
+    await app(scope, receive, send)
+    return response
+
+
+class TTSAppTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = ModelWorkerPool(DummySynthesizer(), num_workers=2, max_queue_size=3)
+        cls.pool.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.stop()
+
+    def test_tts(self):
+        app = TTSApp(self.pool)
+
+        async def run():
+            return await asyncio.gather(
+                request(app, query=b"text=Hello%20there."),
+                request(app, body=b"text=Hi", method="POST"),
+                request(app, headers=[(b"text", b"Hey!")]),
+            )
+
+        for response, text in zip(asyncio.run(run()), ["Hello there.", "Hi", "Hey!"]):
+            self.assertEqual(response["status"], 200)
+            self.assertEqual(response["headers"][b"content-type"], b"audio/wav")
+            with wave.open(io.BytesIO(response["body"])) as wav:
+                self.assertEqual(wav.getnframes(), len(text))
+
+    def test_errors(self):
+        app = TTSApp(self.pool, request_timeout=0.5)
+
+        async def run():
+            return await asyncio.gather(*[request(app, query=f"text=slow{idx}".encode()) for idx in range(4)])
+
+        statuses = sorted(response["status"] for response in asyncio.run(run()))
+        # 3 requests fit in the queue and time out, the last one is rejected
+        self.assertEqual(statuses, [429, 504, 504, 504])
+        time.sleep(1.5)  # let the workers skip the expired requests
+
+        response = asyncio.run(request(app, query=b"text=fail"))
+        self.assertEqual(response["status"], 500)
+        self.assertIn("synthesis failed", json.loads(response["body"])["error"])
+        self.assertEqual(asyncio.run(request(app, query=b"text=%20"))["status"], 400)
+        self.assertEqual(asyncio.run(request(app, path="/nope"))["status"], 404)
+        response = asyncio.run(request(app, path="/health"))
+        self.assertEqual(json.loads(response["body"]), {"workers": 2, "pending": 0})
+
+
+class TTSAppSynthesizerTest(unittest.TestCase):
+    """Serve a real, randomly initialized model: the workers receive the pickled `Synthesizer`."""
+
+    @classmethod
+    def setUpClass(cls):
+        config_path = os.path.join(get_tests_input_path(), "dummy_model_config.json")
+        config = load_config(config_path)
+        save_checkpoint(config, setup_model(config), None, None, 10, 1, get_tests_input_path())
+        cls.synthesizer = Synthesizer(os.path.join(get_tests_input_path(), "checkpoint_10.pth"), config_path)
+        # the random model never predicts the stop token
+        cls.synthesizer.tts_model.decoder.max_decoder_steps = 50
+
+    def test_pickle(self):
+        synthesizer = pickle.loads(pickle.dumps(self.synthesizer))
+        self.assertGreater(len(synthesizer.tts("Hello there.")), 0)
+
+    def test_tts(self):
+        pool = ModelWorkerPool(self.synthesizer, num_workers=1)
+        pool.start()
+        try:
+            response = asyncio.run(request(TTSApp(pool), query=b"text=Hello%20there."))
+        finally:
+            pool.stop()
+        self.assertEqual(response["status"], 200)
+        with wave.open(io.BytesIO(response["body"])) as wav:
+            self.assertEqual(wav.getframerate(), self.synthesizer.output_sample_rate)
+            self.assertGreater(wav.getnframes(), 0)
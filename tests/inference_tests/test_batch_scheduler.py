@@ -0,0 +1,144 @@
+import threading
+import unittest
+
+import numpy as np
+
+from TTS.server.scheduler import BatchScheduler
+
+
+class DummySynthesizer:
+    """Synthesizer stand-in returning a waveform of `len(sentence)` samples filled with the sentence index."""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.batches = []
+        self.speaker_lookups = []
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def split_into_sentences(text):
+        return [sen.strip() for sen in text.split(".") if sen.strip()]
+
+    def _get_speaker_input(self, speaker_name):
+        self.speaker_lookups.append(speaker_name)
+        return speaker_name, None
+
+    def synthesize_batch(
+        self, sentences, speaker_name="", language_name="", style_wav=None, speaker_input=None
+    ):  # pylint: disable=unused-argument
+        assert speaker_input == (speaker_name, None)
+        with self.lock:
+            self.batches.append((list(sentences), speaker_name))
+        if self.fail_on in sentences:
+            raise RuntimeError("synthesis failed")
+        return [np.full(len(sen), float(len(sen))) for sen in sentences]
+
+    def tts_stream(self, text, speaker_name="", language_name="", style_wav=None, split_sentences=True):
+        with self.lock:
+            self.batches.append(([text], speaker_name))
+        if self.fail_on == text:
+            raise RuntimeError("synthesis failed")
+        for char in text:
+            yield np.full(1, float(ord(char)))
+        yield np.zeros(10000)
+
+
+class BatchSchedulerTest(unittest.TestCase):
+    def test_single_request(self):
+        synthesizer = DummySynthesizer()
+        with BatchScheduler(synthesizer, max_batch_size=4, max_wait_time=0.01) as scheduler:
+            wav = scheduler.submit("one. three").result(timeout=10)
+        # each sentence is followed by the silence `Synthesizer.tts()` uses
+        self.assertEqual(len(wav), 3 + 10000 + 5 + 10000)
+        np.testing.assert_array_equal(wav[:3], 3.0)
+        np.testing.assert_array_equal(wav[3:10003], 0.0)
+        np.testing.assert_array_equal(wav[10003:10008], 5.0)
+
+    def test_requests_are_batched(self):
+        synthesizer = DummySynthesizer()
+        scheduler = BatchScheduler(synthesizer, max_batch_size=8, max_wait_time=0.5)
+        futures = [scheduler.submit(f"sentence {idx}. another one") for idx in range(3)]
+        scheduler.start()
+        for future in futures:
+            self.assertEqual(len(future.result(timeout=10)), len("sentence 0") + len("another one") + 20000)
+        scheduler.stop()
+        # the 6 queued sentences fit in one batch
+        self.assertEqual(len(synthesizer.batches), 1)
+        self.assertEqual(len(synthesizer.batches[0][0]), 6)
+
+    def test_max_batch_size(self):
+        synthesizer = DummySynthesizer()
+        scheduler = BatchScheduler(synthesizer, max_batch_size=2, max_wait_time=0.01)
+        futures = [scheduler.submit("a. b. c") for _ in range(2)]
+        with scheduler:
+            for future in futures:
+                future.result(timeout=10)
+        self.assertEqual([len(batch) for batch, _ in synthesizer.batches], [2, 2, 2])
+
+    def test_groups_by_speaker(self):
+        synthesizer = DummySynthesizer()
+        scheduler = BatchScheduler(synthesizer, max_batch_size=8, max_wait_time=0.01)
+        futures = [scheduler.submit("hello", speaker_name=name) for name in ["a", "b", "a"]]
+        with scheduler:
+            for future in futures:
+                future.result(timeout=10)
+        self.assertEqual(sorted(synthesizer.batches, key=lambda x: x[1]), [(["hello", "hello"], "a"), (["hello"], "b")])
+
+    def test_failed_request(self):
+        synthesizer = DummySynthesizer(fail_on="broken")
+        scheduler = BatchScheduler(synthesizer, max_batch_size=1, max_wait_time=0.01)
+        failed = scheduler.submit("broken. not reached")
+        passed = scheduler.submit("fine")
+        with scheduler:
+            with self.assertRaises(RuntimeError):
+                failed.result(timeout=10)
+            self.assertEqual(len(passed.result(timeout=10)), 4 + 10000)
+        # the remaining sentence of the failed request is skipped
+        self.assertNotIn((["not reached"], ""), synthesizer.batches)
+
+    def test_failed_request_in_batch(self):
+        synthesizer = DummySynthesizer(fail_on="broken")
+        scheduler = BatchScheduler(synthesizer, max_batch_size=8, max_wait_time=0.01)
+        failed = scheduler.submit("broken")
+        passed = scheduler.submit("fine. also fine")
+        with scheduler:
+            with self.assertRaises(RuntimeError):
+                failed.result(timeout=10)
+            self.assertEqual(len(passed.result(timeout=10)), 4 + 9 + 20000)
+        # the sentences of the failed batch are retried one by one
+        self.assertEqual(
+            synthesizer.batches,
+            [(["broken", "fine", "also fine"], ""), (["broken"], ""), (["fine"], ""), (["also fine"], "")],
+        )
+
+    def test_speaker_input_is_resolved_once(self):
+        synthesizer = DummySynthesizer()
+        scheduler = BatchScheduler(synthesizer, max_batch_size=1, max_wait_time=0.01)
+        future = scheduler.submit("a. b. c", speaker_name="speaker")
+        with scheduler:
+            future.result(timeout=10)
+        self.assertEqual(len(synthesizer.batches), 3)
+        self.assertEqual(synthesizer.speaker_lookups, ["speaker"])
+
+    def test_empty_text(self):
+        with BatchScheduler(DummySynthesizer()) as scheduler:
+            with self.assertRaises(ValueError):
+                scheduler.submit("").result(timeout=10)
+
+    def test_stream(self):
+        synthesizer = DummySynthesizer()
+        with BatchScheduler(synthesizer, max_batch_size=8, max_wait_time=0.01) as scheduler:
+            chunks = list(scheduler.submit_stream("ab. c"))
+        self.assertEqual([len(chunk) for chunk in chunks], [1, 1, 10000, 1, 10000])
+        self.assertEqual(chunks[0][0], ord("a"))
+        self.assertEqual(chunks[3][0], ord("c"))
+        # streamed sentences are synthesized one by one
+        self.assertEqual(synthesizer.batches, [(["ab"], ""), (["c"], "")])
+
+    def test_stream_failure(self):
+        synthesizer = DummySynthesizer(fail_on="broken")
+        with BatchScheduler(synthesizer) as scheduler:
+            with self.assertRaises(RuntimeError):
+                list(scheduler.submit_stream("fine. broken"))
+            with self.assertRaises(ValueError):
+                list(scheduler.submit_stream(""))
@@ -0,0 +1,98 @@
+import threading
+import unittest
+
+import numpy as np
+import torch
+
+from TTS.server.model_registry import ModelRegistry
+
+
+class DummySynthesizer:
+    """Synthesizer stand-in with `num_params` weights returning a waveform of `len(sentence)` samples."""
+
+    def __init__(self, name, num_params=256, block=None):
+        self.name = name
+        self.tts_model = torch.nn.Linear(num_params, 1, bias=False)
+        self.vocoder_model = None
+        self.block = block
+
+    @staticmethod
+    def split_into_sentences(text):
+        return [text]
+
+    @staticmethod
+    def _get_speaker_input(speaker_name):  # pylint: disable=unused-argument
+        return None, None
+
+    def synthesize_batch(
+        self, sentences, speaker_name="", language_name="", style_wav=None, speaker_input=None
+    ):  # pylint: disable=unused-argument
+        if self.block is not None:
+            self.block.wait(timeout=10)
+        return [np.full(len(sen), 1.0) for sen in sentences]
+
+
+class ModelRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.loads = []
+        self.blocks = {}
+
+    def loader(self, model_name):
+        self.loads.append(model_name)
+        return DummySynthesizer(model_name, block=self.blocks.get(model_name))
+
+    def test_lazy_load_and_lru_eviction(self):
+        registry = ModelRegistry(None, ["a", "b", "c"], max_models=2, loader=self.loader)
+        self.assertEqual(registry.loaded_models, [])
+        self.assertFalse(registry.is_available("d"))
+        for model_name in ["a", "b", "a", "c"]:
+            with registry.model(model_name) as model:
+                self.assertEqual(model.synthesizer.name, model_name)
+                self.assertEqual(len(model.scheduler.submit("hello").result(timeout=10)), 5 + 10000)
+        # "b" is the least recently used model
+        self.assertEqual(registry.loaded_models, ["a", "c"])
+        self.assertEqual(self.loads, ["a", "b", "c"])
+        with registry.model("b"):
+            pass
+        self.assertEqual(registry.loaded_models, ["c", "b"])
+        self.assertEqual(self.loads, ["a", "b", "c", "b"])
+
+    def test_memory_limit(self):
+        # each model has 256 float32 weights
+        registry = ModelRegistry(None, ["a", "b", "c"], max_models=3, max_memory=2048, loader=self.loader)
+        for model_name in ["a", "b", "c"]:
+            registry.load(model_name).result(timeout=10)
+        self.assertEqual(registry.loaded_models, ["b", "c"])
+        self.assertEqual(registry.memory, 2048)
+
+    def test_pinned_model(self):
+        registry = ModelRegistry(None, ["a", "b"], max_models=1, loader=self.loader)
+        registry.add("default", DummySynthesizer("default"), pinned=True)
+        self.assertTrue(registry.is_available("default"))
+        for model_name in ["a", "b"]:
+            registry.load(model_name).result(timeout=10)
+        self.assertEqual(registry.loaded_models, ["default", "b"])
+        registry.load("default", reload=True).result(timeout=10)
+        self.assertIn("default", registry.loaded_models)
+
+    def test_in_flight_requests_survive_eviction_and_reload(self):
+        self.blocks["a"] = threading.Event()
+        registry = ModelRegistry(None, ["a", "b"], max_models=1, loader=self.loader)
+        model = registry.acquire("a")
+        future = model.scheduler.submit("hello")
+        # reloading and evicting the model do not stop its scheduler while the request runs
+        self.blocks.pop("a")
+        new_model = registry.load("a", reload=True).result(timeout=10)
+        self.assertIsNot(new_model, model)
+        registry.load("b").result(timeout=10)
+        self.assertEqual(registry.loaded_models, ["b"])
+        self.assertTrue(model.scheduler.is_running)
+        self.assertFalse(new_model.scheduler.is_running)
+        model.synthesizer.block.set()
+        self.assertEqual(len(future.result(timeout=10)), 5 + 10000)
+        registry.release(model)
+        self.assertFalse(model.scheduler.is_running)
+
+
+if __name__ == "__main__":
+    unittest.main()
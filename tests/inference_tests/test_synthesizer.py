@@ -26,6 +26,37 @@ class SynthesizerTest(unittest.TestCase):
         synthesizer = Synthesizer(tts_checkpoint, tts_config, None, None)
         synthesizer.tts("Better this test works!!")
 
+    def test_synthesize_batch(self):
+        self._create_random_model()
+        tts_root_path = get_tests_input_path()
+        tts_checkpoint = os.path.join(tts_root_path, "checkpoint_10.pth")
+        tts_config = os.path.join(tts_root_path, "dummy_model_config.json")
+        synthesizer = Synthesizer(tts_checkpoint, tts_config, None, None)
+        wavs = synthesizer.synthesize_batch(["Better this test works!!", "And this one too."])
+        self.assertEqual(len(wavs), 2)
+        for wav in wavs:
+            self.assertEqual(wav.ndim, 1)
+
+    def test_tts_batch_size(self):
+        self._create_random_model()
+        tts_root_path = get_tests_input_path()
+        tts_checkpoint = os.path.join(tts_root_path, "checkpoint_10.pth")
+        tts_config = os.path.join(tts_root_path, "dummy_model_config.json")
+        synthesizer = Synthesizer(tts_checkpoint, tts_config, None, None)
+        wav = synthesizer.tts("Better this test works!! And this one too. And a third one.", batch_size=2)
+        self.assertGreater(len(wav), 3 * 10000)
+
+    def test_tts_stream(self):
+        self._create_random_model()
+        tts_root_path = get_tests_input_path()
+        tts_checkpoint = os.path.join(tts_root_path, "checkpoint_10.pth")
+        tts_config = os.path.join(tts_root_path, "dummy_model_config.json")
+        synthesizer = Synthesizer(tts_checkpoint, tts_config, None, None)
+        chunks = list(synthesizer.tts_stream("Better this test works!! And this one too."))
+        # a waveform and a silence for each sentence
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(len(chunks[1]), 10000)
+
     def test_split_into_sentences(self):
         """Check demo server sentences split as expected"""
         print("\n > Testing demo server sentence splitting")
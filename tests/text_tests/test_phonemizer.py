@@ -1,10 +1,13 @@
+import os
 import unittest
 
 from packaging.version import Version
 
+from tests import get_tests_output_path
 from TTS.tts.utils.text.phonemizers import ESpeak, Gruut, JA_JP_Phonemizer, ZH_CN_Phonemizer
 from TTS.tts.utils.text.phonemizers.bangla_phonemizer import BN_Phonemizer
 from TTS.tts.utils.text.phonemizers.multi_phonemizer import MultiPhonemizer
+from TTS.tts.utils.text.phonemizers.phoneme_cache import PhonemeCache
 
 EXAMPLE_TEXTs = [
     "Recent research at Harvard has shown meditating",
@@ -119,6 +122,15 @@ class TestEspeakNgPhonemizer(unittest.TestCase):
     def test_name(self):
         self.assertEqual(self.phonemizer.name(), "espeak")
 
+    def test_executable_backend(self):
+        # the espeak-ng executable and the library give the same phonemes
+        phonemizer = ESpeak(language="en-us", backend="espeak-ng", use_lib=False)
+        for text, ph in zip(EXAMPLE_TEXTs, EXPECTED_ESPEAKNG_PHONEMES):
+            self.assertEqual(phonemizer.phonemize(text), ph)
+
+    def test_phonemize_batch(self):
+        self.assertEqual(self.phonemizer.phonemize_batch(EXAMPLE_TEXTs, num_workers=2), EXPECTED_ESPEAKNG_PHONEMES)
+
     def test_get_supported_languages(self):
         self.assertIsInstance(self.phonemizer.supported_languages(), dict)
 
@@ -163,6 +175,37 @@ class TestGruutPhonemizer(unittest.TestCase):
         output = self.phonemizer.phonemize(text, separator="")
         self.assertEqual(output, gt)
 
+    def test_phoneme_cache(self):
+        cache_path = os.path.join(get_tests_output_path(), "phoneme_cache.db")
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        cache = self.phonemizer.enable_cache(max_size=2, cache_path=cache_path)
+        for _ in range(2):
+            for text, ph in zip(EXAMPLE_TEXTs, self.EXPECTED_PHONEMES):
+                self.assertEqual(self.phonemizer.phonemize(text, separator="|"), ph)
+        # the LRU keeps the last 2 sentences, the others are read back from the database
+        self.assertEqual(cache.info(), {"hits": 4, "misses": 4, "size": 2, "max_size": 2})
+        # a new process with the same settings shares the database
+        phonemizer = Gruut(language="en-us", use_espeak_phonemes=True, keep_stress=False)
+        cache = phonemizer.enable_cache(cache_path=cache_path)
+        self.assertEqual(phonemizer.phonemize(EXAMPLE_TEXTs[0], separator="|"), self.EXPECTED_PHONEMES[0])
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+        # different settings do not share the entries
+        phonemizer = Gruut(language="en-us", use_espeak_phonemes=True, keep_stress=True)
+        cache = phonemizer.enable_cache(cache_path=cache_path)
+        phonemizer.phonemize(EXAMPLE_TEXTs[0], separator="|")
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.phonemizer.disable_cache()
+        os.remove(cache_path)
+
+    def test_phoneme_cache_word_level(self):
+        cache = self.phonemizer.enable_cache(word_level=True)
+        text = "Be a voice, not an echo. Be a voice!"
+        self.assertEqual(self.phonemizer.phonemize(text, separator=""), "biː ɐ vɔɪs, nɑːt ɐn ɛkoʊ. biː ɐ vɔɪs!")
+        # 1 sentence, 6 distinct words and 3 repeated words
+        self.assertEqual((cache.hits, cache.misses), (3, 7))
+        self.phonemizer.disable_cache()
+
     def test_name(self):
         self.assertEqual(self.phonemizer.name(), "gruut")
 
@@ -293,3 +336,17 @@ class TestMultiPhonemizer(unittest.TestCase):
 
     def test_get_supported_languages(self):
         self.assertIsInstance(self.phonemizer.supported_languages(), list)
+
+
+class TestPhonemeCache(unittest.TestCase):
+    def test_lru(self):
+        cache = PhonemeCache(max_size=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        self.assertEqual(cache.get("a"), "1")
+        cache.put("c", "3")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "3")
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        cache.clear()
+        self.assertEqual(cache.info(), {"hits": 0, "misses": 0, "size": 0, "max_size": 2})
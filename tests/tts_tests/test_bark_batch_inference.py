@@ -0,0 +1,103 @@
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+import torch
+from encodec import EncodecModel
+
+from TTS.tts.layers.bark.batch_inference import (
+    generate_coarse_batch,
+    generate_fine_batch,
+    generate_text_semantic_batch,
+    iter_audio_batch,
+)
+from TTS.tts.layers.bark.inference_funcs import generate_coarse, generate_fine, generate_text_semantic
+from TTS.tts.layers.bark.model import GPT, GPTConfig
+from TTS.tts.layers.bark.model_fine import FineGPT, FineGPTConfig
+
+torch.manual_seed(1)
+NO_PROMPT = (None, None, None)
+
+
+class CharTokenizer:
+    def encode(self, text, add_special_tokens=False):  # pylint: disable=unused-argument
+        return [ord(c) % 100 for c in text]
+
+
+def get_model():
+    """A tiny Bark model with the constants of `BarkConfig`."""
+    config = SimpleNamespace(
+        SEMANTIC_RATE_HZ=49.9,
+        SEMANTIC_VOCAB_SIZE=10_000,
+        CODEBOOK_SIZE=1024,
+        N_COARSE_CODEBOOKS=2,
+        N_FINE_CODEBOOKS=8,
+        COARSE_RATE_HZ=75,
+        TEXT_ENCODING_OFFSET=10_048,
+        SEMANTIC_PAD_TOKEN=10_000,
+        TEXT_PAD_TOKEN=129_595,
+        SEMANTIC_INFER_TOKEN=129_599,
+        COARSE_SEMANTIC_PAD_TOKEN=12_048,
+        COARSE_INFER_TOKEN=12_050,
+    )
+    args = {"n_layer": 1, "n_head": 2, "n_embd": 16}
+    encodec = EncodecModel.encodec_model_24khz(pretrained=False)
+    encodec.set_target_bandwidth(6.0)
+    return SimpleNamespace(
+        config=config,
+        device=torch.device("cpu"),
+        tokenizer=CharTokenizer(),
+        semantic_model=GPT(GPTConfig(input_vocab_size=129_600, output_vocab_size=10_048, **args)).eval(),
+        coarse_model=GPT(GPTConfig(input_vocab_size=12_096, output_vocab_size=12_096, **args)).eval(),
+        fine_model=FineGPT(FineGPTConfig(input_vocab_size=1056, output_vocab_size=1056, **args)).eval(),
+        encodec=encodec.eval(),
+    )
+
+
+class BarkBatchInferenceTest(unittest.TestCase):
+    def setUp(self):
+        self.model = get_model()
+
+    def test_generate_text_semantic_batch(self):
+        texts = ["Hello world.", "This is a longer sentence than the first one."]
+        # top_k=1 makes the sampling deterministic
+        outputs = generate_text_semantic_batch(texts, self.model, top_k=1, silent=True, max_gen_duration_s=0.5)
+        for text, output in zip(texts, outputs):
+            expected = generate_text_semantic(
+                text, self.model, history_prompt=NO_PROMPT, top_k=1, silent=True, max_gen_duration_s=0.5
+            )
+            np.testing.assert_array_equal(output, expected)
+
+    def test_generate_coarse_batch(self):
+        # the sequences leave the batch at different windows
+        x_semantics = [np.random.randint(0, 10_000, size=length) for length in [30, 70, 45]]
+        outputs = generate_coarse_batch(x_semantics, self.model, top_k=1, silent=True)
+        for x_semantic, output in zip(x_semantics, outputs):
+            expected = generate_coarse(x_semantic, self.model, history_prompt=NO_PROMPT, top_k=1, silent=True)
+            np.testing.assert_array_equal(output, expected)
+
+    def test_generate_fine_batch(self):
+        x_coarse_gens = [np.random.randint(0, 1024, size=(2, length)) for length in [50, 120]]
+        fine_histories = [None, np.random.randint(0, 1024, size=(8, 600))]
+        outputs = generate_fine_batch(x_coarse_gens, self.model, fine_histories, temp=None)
+        for x_coarse_gen, fine_history, output in zip(x_coarse_gens, fine_histories, outputs):
+            # `generate_fine()` only reads the fine history of complete prompts
+            history_prompt = NO_PROMPT if fine_history is None else (np.zeros(1), fine_history[:2], fine_history)
+            expected = generate_fine(x_coarse_gen, self.model, history_prompt=history_prompt, temp=None)
+            np.testing.assert_array_equal(output, expected)
+
+    def test_iter_audio_batch(self):
+        texts = ["Hello world.", "Another sentence."]
+        chunks = [[], []]
+        for idx, audio_chunk in iter_audio_batch(
+            texts, self.model, stream_chunk_size=20, silent=True, max_gen_duration_s=0.5
+        ):
+            chunks[idx].append(audio_chunk)
+        for text_chunks in chunks:
+            self.assertGreater(len(text_chunks), 1)
+            for audio_chunk in text_chunks:
+                self.assertEqual(audio_chunk.ndim, 1)
+                self.assertLessEqual(audio_chunk.shape[0], 20 * 320)
+                self.assertEqual(audio_chunk.shape[0] % 320, 0)
+        with self.assertRaises(ValueError):
+            next(iter_audio_batch(texts, self.model, stream_chunk_size=600))
@@ -1,6 +1,15 @@
 import torch as T
 
-from TTS.tts.utils.helpers import average_over_durations, generate_path, rand_segments, segment, sequence_mask
+from TTS.tts.utils.helpers import (
+    CYTHON,
+    NUMBA,
+    average_over_durations,
+    generate_path,
+    maximum_path,
+    rand_segments,
+    segment,
+    sequence_mask,
+)
 
 
 def average_over_durations_test():  # pylint: disable=no-self-use
@@ -86,3 +95,20 @@ def generate_path_test():
             assert all(path[b, t, :current_idx] == 0.0)
             assert all(path[b, t, current_idx + durations[b, t].item() :] == 0.0)
             current_idx += durations[b, t].item()
+
+
+def test_maximum_path_backends():
+    value = T.randn(6, 13, 40)
+    x_length = T.tensor([13, 1, 5, 9, 13, 7])
+    y_length = T.tensor([40, 3, 5, 30, 13, 25])
+    attn_mask = (sequence_mask(x_length, 13).unsqueeze(2) * sequence_mask(y_length, 40).unsqueeze(1)).float()
+    path = maximum_path(value, attn_mask, "numpy")
+    # one encoder step for each decoder step, moving forward by at most one step
+    assert all(path.sum(1).sum(1) == y_length)
+    for b in range(6):
+        steps = path[b, :, : y_length[b]].argmax(0)
+        assert steps[0] == 0 and steps[-1] == x_length[b] - 1
+        assert all(steps.diff() >= 0) and all(steps.diff() <= 1)
+    backends = ["torch"] + (["numba"] if NUMBA else []) + (["cython"] if CYTHON else [])
+    for backend in backends:
+        assert T.equal(maximum_path(value, attn_mask, backend), path), backend
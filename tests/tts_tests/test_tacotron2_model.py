@@ -77,6 +77,21 @@ class TacotronTrainTest(unittest.TestCase):
             )
             count += 1
 
+    def test_batch_inference(self):  # pylint: disable=no-self-use
+        config = config_global.copy()
+        config.use_speaker_embedding = False
+        config.num_speakers = 1
+        config.max_decoder_steps = 50
+
+        input_dummy = torch.randint(0, 24, (4, 32)).long().to(device)
+        input_lengths = torch.tensor([32, 24, 17, 9]).long().to(device)
+        model = Tacotron2(config).to(device)
+        model.eval()
+        outputs = model.inference(input_dummy, aux_input={"x_lengths": input_lengths})
+        assert outputs["model_outputs"].shape[0] == 4
+        assert outputs["y_mask"].shape == (4, 1, outputs["model_outputs"].shape[1])
+        assert (outputs["y_mask"].sum([1, 2]) > 0).all()
+
 
 class MultiSpeakerTacotronTrainTest(unittest.TestCase):
     """Test multi-speaker Tacotron2 with speaker embedding layer"""
@@ -0,0 +1,171 @@
+import unittest
+from unittest import mock
+
+import torch
+import torch.nn.functional as F
+
+from TTS.tts.configs.tortoise_config import TortoiseConfig
+from TTS.tts.models.tortoise import (
+    Tortoise,
+    TortoiseArgs,
+    fix_autoregressive_output,
+    get_diffusion_output_length,
+    get_reusable_latents_length,
+    trim_at_calm_tokens,
+)
+
+torch.manual_seed(1)
+MAX_MEL_TOKENS = 30
+
+
+def get_model():
+    """A tiny randomly initialized Tortoise."""
+    args = TortoiseArgs(
+        autoregressive_batch_size=4,
+        ar_layers=1,
+        ar_model_dim=64,
+        ar_heads=2,
+        ar_max_mel_tokens=40,
+        ar_max_text_tokens=60,
+        diff_model_channels=64,
+        diff_num_layers=1,
+        diff_in_latent_channels=64,
+        diff_num_heads=2,
+        clvp_dim_text=32,
+        clvp_dim_speech=32,
+        clvp_dim_latent=32,
+        clvp_text_enc_depth=1,
+        clvp_speech_enc_depth=1,
+        clvp_text_heads=2,
+        clvp_speech_heads=2,
+        clvp_use_xformers=False,
+    )
+    model = Tortoise(TortoiseConfig(model_args=args)).eval()
+    model.autoregressive.post_init_gpt2_config(kv_cache=True)
+    return model
+
+
+class TortoiseCodesTest(unittest.TestCase):
+    def test_trim_at_calm_tokens(self):
+        self.assertEqual(trim_at_calm_tokens(torch.tensor([1, 2, 3])), 3)
+        # the first run of more than 8 calm tokens is cut after its 8th token
+        self.assertEqual(trim_at_calm_tokens(torch.tensor([1, 2] + [83] * 12)), 10)
+        self.assertEqual(trim_at_calm_tokens(torch.tensor([1] + [83] * 8 + [2] + [83] * 9 + [3])), 18)
+        self.assertEqual(trim_at_calm_tokens(torch.tensor([1] + [5] * 10), calm_token=5, max_calm_tokens=2), 3)
+
+    def test_get_reusable_latents_length(self):
+        self.assertEqual(get_reusable_latents_length(torch.tensor([1, 2, 3]), stop_token=9), 3)
+        self.assertEqual(get_reusable_latents_length(torch.tensor([1, 2, 9, 9, 9]), stop_token=9), 3)
+        self.assertEqual(get_reusable_latents_length(torch.tensor([9, 2, 9]), stop_token=9), 1)
+
+
+class TortoiseInferenceTest(unittest.TestCase):
+    def setUp(self):
+        self.model = get_model()
+        self.autoregressive = self.model.autoregressive
+        self.auto_conditioning = torch.randn(1, 64, device=self.model.device)
+        self.text_tokens = torch.randint(1, 100, (1, 8), dtype=torch.int32, device=self.model.device)
+
+    def _sample(self, stop_logit_bias):
+        """Sample a batch of codes with their latents like `Tortoise._generate_stage()` does."""
+        with torch.no_grad():
+            self.autoregressive.mel_head.bias[self.autoregressive.stop_mel_token] = stop_logit_bias
+            codes, latents = self.autoregressive.inference_speech(
+                self.auto_conditioning,
+                self.text_tokens,
+                do_sample=True,
+                top_p=0.8,
+                temperature=0.8,
+                num_return_sequences=4,
+                max_generate_length=MAX_MEL_TOKENS,
+                return_latents=True,
+            )
+        codes = F.pad(codes, (0, MAX_MEL_TOKENS - codes.shape[1]), value=self.autoregressive.stop_mel_token)
+        return codes, latents
+
+    def _check_best_latents(self, codes, latents):
+        """The latents kept from the generation must be the ones computed again from the fixed codes."""
+        with torch.no_grad():
+            candidates = self.model._rank_candidates(
+                self.model.clvp, self.text_tokens, codes.clone(), latents, [], k=codes.shape[0], timings={}
+            )
+            # the latents kept from the generation are not computed again
+            with mock.patch.object(self.autoregressive, "forward", side_effect=AssertionError):
+                best_latents = self.model._get_best_latents(candidates, self.auto_conditioning, self.text_tokens, {})
+            best_codes = torch.stack([candidate[1] for candidate in candidates])
+            expected = self.autoregressive(
+                self.auto_conditioning.repeat(len(candidates), 1),
+                self.text_tokens.repeat(len(candidates), 1),
+                torch.tensor([self.text_tokens.shape[-1]]),
+                best_codes,
+                torch.tensor([best_codes.shape[-1] * self.autoregressive.mel_length_compression]),
+                return_latent=True,
+                clip_inputs=False,
+            )
+        for (_, candidate_codes, kept_latents), candidate_latents, expected_latents in zip(
+            candidates, best_latents, expected
+        ):
+            # the latents end where the codes turn to silence or at the stop token
+            self.assertEqual(candidate_latents.shape[0], min(trim_at_calm_tokens(candidate_codes), len(kept_latents)))
+            torch.testing.assert_close(candidate_latents, expected_latents[: candidate_latents.shape[0]])
+        return candidates
+
+    def test_latents_reuse(self):
+        codes, latents = self._sample(stop_logit_bias=-1e4)
+        candidates = self._check_best_latents(codes, latents)
+        # without stop token the latents of the generation reach the silence
+        for _, candidate_codes, candidate_latents in candidates:
+            self.assertGreaterEqual(candidate_latents.shape[0], trim_at_calm_tokens(candidate_codes))
+
+    def test_latents_reuse_early_stop(self):
+        codes, latents = self._sample(stop_logit_bias=3.0)
+        stop_lengths = [
+            get_reusable_latents_length(sample_codes, self.autoregressive.stop_mel_token) for sample_codes in codes
+        ]
+        # a sample stops early enough for its calm tokens to fit in the latents generated for the rest of the batch
+        self.assertLess(min(stop_lengths) + 8, latents.shape[1])
+        candidates = self._check_best_latents(codes, latents)
+        # the latents generated from the padding after the stop token are not kept
+        for _, _, candidate_latents in candidates:
+            self.assertIn(candidate_latents.shape[0], stop_lengths)
+
+    def test_decode_stage_batch(self):
+        lengths = [10, 17, 6]
+        state = {
+            "latents": [torch.randn(length, 64) for length in lengths],
+            "diffusion_conditioning": torch.randn(1, 128),
+            "timings": {},
+            "text": "Hello there.",
+        }
+        for diffusion_batch_size in [1, 2]:
+            wavs = self.model._decode_stage(
+                state, verbose=False, diffusion_iterations=2, diffusion_batch_size=diffusion_batch_size
+            )["wav"]
+            # the padded latents of a batch are trimmed to the output length of each candidate
+            self.assertEqual(
+                [wav.shape[-1] for wav in wavs], [get_diffusion_output_length(length) * 256 for length in lengths]
+            )
+
+    def test_sample_adaptively(self):
+        # `top_p` keeps only the most likely token, so the sampling is greedy
+        kwargs = {"temperature": 0.8, "top_p": 1e-6, "repetition_penalty": 2.0}
+        with torch.no_grad():
+            expected = self.autoregressive.inference_speech(
+                self.auto_conditioning, self.text_tokens, do_sample=True, max_generate_length=MAX_MEL_TOKENS, **kwargs
+            )
+            candidates = self.model._sample_adaptively(
+                self.auto_conditioning,
+                self.text_tokens,
+                k=2,
+                max_samples=2,
+                wave_size=2,
+                max_mel_tokens=MAX_MEL_TOKENS,
+                half=False,
+                verbose=False,
+                **kwargs,
+            )
+        expected = F.pad(expected[0], (0, MAX_MEL_TOKENS - expected.shape[1]), value=self.autoregressive.stop_mel_token)
+        expected = fix_autoregressive_output(expected, self.autoregressive.stop_mel_token)
+        self.assertEqual(len(candidates), 2)
+        for _, codes, _ in candidates:
+            self.assertTrue(torch.equal(codes.cpu(), expected))
@@ -0,0 +1,63 @@
+import unittest
+
+import torch
+
+from TTS.vocoder.configs import MultibandMelganConfig
+from TTS.vocoder.models.gan import GAN
+from TTS.vocoder.models.hifigan_generator import HifiganGenerator
+from TTS.vocoder.models.melgan_generator import MelganGenerator
+from TTS.vocoder.utils.streaming import StreamingVocoder, measure_receptive_field
+
+torch.manual_seed(1)
+
+
+class TestStreamingVocoder(unittest.TestCase):
+    def test_measure_receptive_field(self):
+        # 3 residual stacks of kernel 3 and dilations 1, 3, 9 after a convolution of kernel 7
+        model = MelganGenerator(
+            in_channels=8, base_channels=16, upsample_factors=(2, 2), res_kernel=3, num_res_blocks=3
+        )
+        self.assertGreater(measure_receptive_field(model, 8), 0)
+        self.assertLessEqual(measure_receptive_field(model, 8), 3 + 13 + 1 + 3)
+
+    def test_stream_matches_inference(self):
+        generators = [
+            MelganGenerator(in_channels=8, base_channels=16, upsample_factors=(2, 2), num_res_blocks=2),
+            HifiganGenerator(
+                in_channels=8,
+                out_channels=1,
+                resblock_type="1",
+                resblock_dilation_sizes=[[1, 3, 5]],
+                resblock_kernel_sizes=[3],
+                upsample_kernel_sizes=[4, 4],
+                upsample_initial_channel=16,
+                upsample_factors=[2, 2],
+                inference_padding=2,
+            ),
+        ]
+        mel = torch.randn(2, 8, 45)
+        for model in generators:
+            model.eval()
+            wav = model.inference(mel)
+            vocoder = StreamingVocoder(model, chunk_size=8)
+            for frames_per_push in [1, 5, 100]:
+                chunks = list(vocoder.stream(mel, frames_per_push))
+                torch.testing.assert_close(torch.cat(chunks, dim=-1), wav, rtol=0, atol=1e-5)
+
+    def test_push_flush(self):
+        model = MelganGenerator(in_channels=8, base_channels=16, upsample_factors=(2, 2), num_res_blocks=2).eval()
+        vocoder = StreamingVocoder(model, chunk_size=4, context_size=5)
+        self.assertEqual(vocoder.push(torch.randn(1, 8, 3)).shape, (1, 1, 0))
+        self.assertEqual(vocoder.push(torch.randn(1, 8, 10)).shape[-1] % (4 * 4), 0)
+        self.assertGreater(vocoder.flush().shape[-1], 0)
+        with self.assertRaises(RuntimeError):
+            vocoder.flush()
+
+    def test_gan_inference_stream(self):
+        config = MultibandMelganConfig()
+        config.generator_model_params = {"base_channels": 64, "upsample_factors": [8, 4, 2], "num_res_blocks": 2}
+        model = GAN(config).eval()
+        mel = torch.randn(1, config.audio.num_mels, 30)
+        wav = torch.cat(list(model.inference_stream(mel, chunk_size=7)), dim=-1)
+        torch.testing.assert_close(wav, model.inference(mel), rtol=0, atol=1e-5)
+        self.assertIsNotNone(model.stream_context_size)
@@ -49,3 +49,55 @@ def test_wavernn():
     assert np.all(output.shape == (2, 1280, 2**4)), output.shape
     output = model.inference(dummy_y, True, 5500, 550)
     assert np.all(output.shape == (256 * (y_size - 1),))
+
+
+def _small_wavernn(mode, use_aux_net=True):
+    config = WavernnConfig()
+    config.model_args = WavernnArgs(
+        rnn_dims=64,
+        fc_dims=64,
+        mode=mode,
+        mulaw=True,
+        pad=2,
+        use_aux_net=use_aux_net,
+        use_upsample_net=True,
+        upsample_factors=[4, 8, 8],
+        feat_dims=80,
+        compute_dims=32,
+        res_out_dims=32,
+        num_res_blocks=2,
+    )
+    config.audio.hop_length = 256
+    return Wavernn(config).eval()
+
+
+def test_wavernn_generate_matches_forward():
+    """The inference kernel computes the same outputs as the training forward pass given the same samples"""
+    for mode, use_aux_net in [("mold", True), ("gauss", False), (9, True)]:
+        model = _small_wavernn(mode, use_aux_net)
+        mels = torch.rand(1, 80, 5)
+        logits = []
+
+        def sample(step_logits, _):
+            logits.append(step_logits.clone())
+            return torch.tanh(step_logits[:, :1])
+
+        model._sample = sample  # pylint: disable=protected-access
+        with torch.no_grad():
+            upsampled_mels, aux, _ = model._prepare_inference_input(mels)  # pylint: disable=protected-access
+            samples = model._generate(upsampled_mels, aux, block_size=100)  # pylint: disable=protected-access
+            inputs = torch.cat([torch.zeros(1, 1), samples[:, :-1]], dim=1)
+            padded_mels = model.pad_tensor(mels.transpose(1, 2), pad=2, side="both").transpose(1, 2)
+            outputs = model(inputs, padded_mels)
+        assert torch.allclose(torch.stack(logits, dim=1), outputs, atol=1e-5)
+
+
+def test_wavernn_inference_stream():
+    model = _small_wavernn(9)
+    model._sample = lambda logits, _: torch.tanh(logits[:, :1])  # pylint: disable=protected-access
+    mels = torch.rand(80, 30)
+    output = model.inference(mels, True, 1000, 100)
+    assert output.shape == (256 * 29,)
+    chunks = list(model.inference_stream(mels, 1000, 100, num_parallel_folds=2))
+    assert len(chunks) == 4
+    assert np.allclose(np.concatenate(chunks), output, atol=1e-6)
@@ -1,11 +1,16 @@
+import os
+import tempfile
 import unittest
+from unittest import mock
 
 import numpy as np
 import torch
 from torch import optim
 
+from TTS.utils.audio import AudioProcessor
 from TTS.vocoder.configs import WavegradConfig
 from TTS.vocoder.models.wavegrad import Wavegrad, WavegradArgs
+from TTS.vocoder.utils.noise_schedule import NoiseScheduleCache, evaluate_noise_schedule, search_noise_schedules
 
 # pylint: disable=unused-variable
 
@@ -57,3 +62,76 @@ class WavegradTrainTest(unittest.TestCase):
                 count, param.shape, param, param_ref
             )
             count += 1
+
+
+def _small_wavegrad():
+    args = WavegradArgs(
+        y_conv_channels=8,
+        x_conv_channels=32,
+        dblock_out_channels=[8, 8, 16, 16],
+        ublock_out_channels=[16, 16, 16, 8, 8],
+    )
+    model = Wavegrad(WavegradConfig(model_params=args))
+    model.compute_noise_level(np.linspace(1e-6, 1e-2, 6))
+    return model.eval()
+
+
+class WavegradInferenceTest(unittest.TestCase):
+    def test_inference_lengths(self):  # pylint: disable=no-self-use
+        model = _small_wavegrad()
+        mel = torch.rand(2, 80, 10)
+        y = model.inference(mel, lengths=torch.tensor([10, 6]))
+        assert y.shape == (2, 1, 10 * 256)
+        assert (y[1, :, 6 * 256 :] == 0).all()
+        assert (y[0] != 0).any()
+
+    def test_noise_schedule_cache(self):
+        model = _small_wavegrad()
+        ap = AudioProcessor(**WavegradConfig().audio)
+        mel = torch.rand(2, 80, 10)
+        cache = search_noise_schedules(model, mel, torch.tensor([10, 7]), ap, num_steps=[2, 3], search_depth=2)
+        self.assertEqual(sorted(cache.schedules), [2, 3])
+        # the error and the real-time factor are measured on the same noise
+        error, _ = evaluate_noise_schedule(model, np.array(cache.schedules[2]["beta"]), mel, torch.tensor([10, 7]), ap)
+        self.assertAlmostEqual(error, cache.schedules[2]["error"], places=4)
+
+        cache.schedules[2]["rtf"], cache.schedules[3]["rtf"] = 0.1, 0.2
+        cache.schedules[2]["error"], cache.schedules[3]["error"] = 2.0, 1.0
+        self.assertEqual(cache.select()["num_steps"], 3)
+        self.assertEqual(cache.select(max_rtf=0.15)["num_steps"], 2)
+        self.assertEqual(cache.select(max_rtf=0.01)["num_steps"], 2)
+        self.assertFalse(cache.add(np.ones(2), 3.0, 0.0))
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "noise_schedules.json")
+            cache.save(path)
+            model.noise_schedules = NoiseScheduleCache.load(path)
+        model.compute_noise_level(np.linspace(1e-6, 1e-2, 6))
+        torch.manual_seed(0)
+        y = model.inference(mel, max_rtf=0.15)
+        self.assertEqual(y.shape, (2, 1, 10 * 256))
+        # the schedule picked for a call is not kept for the next calls
+        self.assertEqual(model.num_steps, 6)
+        model.set_noise_schedule(max_rtf=0.15)
+        self.assertEqual(model.num_steps, 2)
+        torch.manual_seed(0)
+        self.assertTrue(torch.equal(model.inference(mel), y))
+
+    def test_noise_schedule_cache_checkpoint(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            checkpoint_path = os.path.join(tmp_dir, "checkpoint.pth")
+            with open(checkpoint_path, "wb") as f:
+                f.write(b"weights")
+            cache = NoiseScheduleCache.from_checkpoint(checkpoint_path)
+            cache.save(NoiseScheduleCache.get_path(checkpoint_path))
+            cache = NoiseScheduleCache.load(NoiseScheduleCache.get_path(checkpoint_path))
+            # the checkpoint is not hashed again while its size and modification time are the same
+            with mock.patch("TTS.vocoder.utils.noise_schedule.get_checkpoint_hash") as get_hash:
+                self.assertTrue(cache.is_for_checkpoint(checkpoint_path))
+                get_hash.assert_not_called()
+            # a copy of the same checkpoint has the same hash
+            os.utime(checkpoint_path, ns=(0, 0))
+            self.assertTrue(cache.is_for_checkpoint(checkpoint_path))
+            with open(checkpoint_path, "wb") as f:
+                f.write(b"new weights")
+            self.assertFalse(cache.is_for_checkpoint(checkpoint_path))
@@ -0,0 +1,91 @@
+import unittest
+
+import torch
+import torch.nn.functional as F
+
+from TTS.tts.layers.xtts.gpt import GPT
+from TTS.tts.layers.xtts.gpt_batch_decoder import GPTBatchDecoder
+
+torch.manual_seed(1)
+
+START_AUDIO_TOKEN = 128
+STOP_AUDIO_TOKEN = 129
+START_TEXT_TOKEN = 98
+STOP_TEXT_TOKEN = 99
+
+
+def get_gpt():
+    gpt = GPT(
+        layers=2,
+        model_dim=64,
+        heads=4,
+        max_text_tokens=50,
+        max_mel_tokens=60,
+        max_prompt_tokens=20,
+        number_text_tokens=100,
+        num_audio_tokens=130,
+        start_audio_token=START_AUDIO_TOKEN,
+        stop_audio_token=STOP_AUDIO_TOKEN,
+        start_text_token=START_TEXT_TOKEN,
+        stop_text_token=STOP_TEXT_TOKEN,
+    ).eval()
+    gpt.init_gpt_for_inference(kv_cache=True)
+    return gpt
+
+
+@torch.no_grad()
+def greedy_decode(gpt, cond_latents, text_tokens, max_new_tokens):
+    """Reference greedy decoding of a single sequence without KV-cache."""
+    text_tokens = F.pad(F.pad(text_tokens, (0, 1), value=STOP_TEXT_TOKEN), (1, 0), value=START_TEXT_TOKEN)
+    prefix_emb = torch.cat([cond_latents, gpt.text_embedding(text_tokens) + gpt.text_pos_embedding(text_tokens)], 1)
+    tokens = [START_AUDIO_TOKEN]
+    while len(tokens) <= max_new_tokens:
+        mel_tokens = torch.tensor([tokens])
+        mel_emb = gpt.mel_embedding(mel_tokens) + gpt.mel_pos_embedding(mel_tokens)
+        hidden_states = gpt.gpt(inputs_embeds=torch.cat([prefix_emb, mel_emb], 1)).last_hidden_state[:, -1]
+        tokens.append(int(gpt.mel_head(gpt.final_norm(hidden_states)).argmax()))
+        if tokens[-1] == STOP_AUDIO_TOKEN:
+            break
+    return tokens[1:]
+
+
+class GPTBatchDecoderTest(unittest.TestCase):
+    def test_matches_single_sequence_decoding(self):
+        gpt = get_gpt()
+        cond_latents = [torch.randn(1, 8, 64), torch.randn(1, 8, 64)]
+        text_tokens = [torch.randint(0, 90, (1, length)) for length in [5, 12, 3, 20, 7]]
+        # more sequences than slots, with different lengths and voices, so sequences are swapped in and out
+        decoder = GPTBatchDecoder(gpt, max_batch_size=3)
+        seqs = [
+            decoder.add(cond_latents[idx % 2], tokens, max_new_tokens=15 + idx, do_sample=False, repetition_penalty=1.0)
+            for idx, tokens in enumerate(text_tokens)
+        ]
+        decoder.run()
+        self.assertEqual(decoder.num_pending, 0)
+        for idx, (seq, tokens) in enumerate(zip(seqs, text_tokens)):
+            self.assertTrue(seq.finished)
+            self.assertEqual(seq.tokens, greedy_decode(gpt, cond_latents[idx % 2], tokens, 15 + idx))
+
+    def test_sampling(self):
+        gpt = get_gpt()
+        decoder = GPTBatchDecoder(gpt, max_batch_size=2)
+        seqs = [decoder.add(torch.randn(1, 8, 64), torch.randint(0, 90, (1, 6)), max_new_tokens=10) for _ in range(3)]
+        finished = []
+        while decoder.num_pending:
+            finished += decoder.step()
+        self.assertEqual(len(finished), 3)
+        for seq in seqs:
+            self.assertLessEqual(seq.codes.shape[1], 10)
+
+    def test_cancel(self):
+        gpt = get_gpt()
+        decoder = GPTBatchDecoder(gpt, max_batch_size=2)
+        seqs = [decoder.add(torch.randn(1, 8, 64), torch.randint(0, 90, (1, 6)), max_new_tokens=10) for _ in range(3)]
+        decoder.step()
+        dropped = decoder.cancel()
+        self.assertEqual(decoder.num_pending, 0)
+        self.assertEqual(len(dropped), sum(not seq.finished for seq in seqs))
+        # the decoder is still usable
+        seq = decoder.add(torch.randn(1, 8, 64), torch.randint(0, 90, (1, 6)), max_new_tokens=5)
+        decoder.run()
+        self.assertTrue(seq.finished)
@@ -0,0 +1,77 @@
+import copy
+import os
+import pickle
+import shutil
+import unittest
+
+import torch
+
+from tests import get_tests_data_path, get_tests_output_path
+from TTS.tts.layers.xtts.latent_cache import ConditioningLatentCache
+
+WAV_FILE = os.path.join(get_tests_data_path(), "ljspeech", "wavs", "LJ001-0001.wav")
+WAV_FILE2 = os.path.join(get_tests_data_path(), "ljspeech", "wavs", "LJ001-0002.wav")
+
+
+class ConditioningLatentCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = os.path.join(get_tests_output_path(), "xtts_latent_cache")
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_compute_key(self):
+        key = ConditioningLatentCache.compute_key(WAV_FILE, gpt_cond_len=6)
+        # the key depends on the file content, not on the path
+        copy_path = os.path.join(get_tests_output_path(), "latent_cache_copy.wav")
+        shutil.copy(WAV_FILE, copy_path)
+        self.assertEqual(ConditioningLatentCache.compute_key([copy_path], gpt_cond_len=6), key)
+        os.remove(copy_path)
+        self.assertNotEqual(ConditioningLatentCache.compute_key(WAV_FILE2, gpt_cond_len=6), key)
+        self.assertNotEqual(ConditioningLatentCache.compute_key(WAV_FILE, gpt_cond_len=12), key)
+        self.assertNotEqual(ConditioningLatentCache.compute_key([WAV_FILE, WAV_FILE2], gpt_cond_len=6), key)
+
+    def test_lru_eviction(self):
+        cache = ConditioningLatentCache(max_size=2)
+        for key in ["a", "b", "c"]:
+            cache.put(key, torch.rand(1, 1024, 32), torch.rand(1, 512, 1))
+            if key == "b":
+                cache.get("a")
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+
+    def test_disk_cache(self):
+        gpt_cond_latent, speaker_embedding = torch.rand(1, 1024, 32), torch.rand(1, 512, 1)
+        ConditioningLatentCache(cache_dir=self.cache_dir).put("a", gpt_cond_latent, speaker_embedding)
+        # a new cache, as after a restart, loads the latents from disk
+        cache = ConditioningLatentCache(cache_dir=self.cache_dir)
+        latents = cache.get("a")
+        self.assertTrue(torch.equal(latents[0], gpt_cond_latent))
+        self.assertTrue(torch.equal(latents[1], speaker_embedding))
+        self.assertEqual(len(cache), 1)
+        self.assertIsNone(cache.get("b"))
+
+    def test_mmap_disk_cache(self):
+        ConditioningLatentCache(cache_dir=self.cache_dir).put("a", torch.rand(1, 1024, 32), torch.rand(1, 512, 1))
+        latents = ConditioningLatentCache(cache_dir=self.cache_dir, max_size=0).get("a")
+        # the tensors are backed by the mapped files and writable without changing them
+        latents[0].zero_()
+        self.assertFalse(torch.equal(ConditioningLatentCache(cache_dir=self.cache_dir).get("a")[0], latents[0]))
+
+    def test_compute_fingerprint(self):
+        layer = torch.nn.Linear(4, 4)
+        fingerprint = ConditioningLatentCache.compute_fingerprint(layer.state_dict())
+        self.assertEqual(ConditioningLatentCache.compute_fingerprint(copy.deepcopy(layer).state_dict()), fingerprint)
+        with torch.no_grad():
+            layer.weight[0, 0] += 1
+        self.assertNotEqual(ConditioningLatentCache.compute_fingerprint(layer.state_dict()), fingerprint)
+
+    def test_pickle(self):
+        cache = ConditioningLatentCache(cache_dir=self.cache_dir)
+        cache.put("a", torch.rand(1, 1024, 32), torch.rand(1, 512, 1))
+        cache = pickle.loads(pickle.dumps(cache))
+        self.assertEqual(len(cache), 1)
+        cache.put("b", torch.rand(1, 1024, 32), torch.rand(1, 512, 1))
+        self.assertIsNotNone(cache.get("b"))